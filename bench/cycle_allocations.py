@@ -0,0 +1,102 @@
+"""Measure the bytes allocated per multigrid cycle.
+
+The cycle in multilevel_solver reuses per-level work vectors.  This script
+compares the bytes allocated (as traced by tracemalloc) by a solve with one
+V, W and F cycle against a reference that allocates the residual and the
+coarse vectors on every level, as multilevel_solver did before the work
+vectors were introduced.
+
+Usage:
+    python cycle_allocations.py [n]
+
+where the test problem is a 2D Poisson problem on an n x n grid.
+"""
+import sys
+import tracemalloc
+
+import numpy as np
+import pyamg
+from pyamg.gallery import poisson
+from pyamg.util.linalg import residual_norm
+
+
+def allocating_cycle(ml, lvl, x, b, cycle):
+    """Reference cycle that allocates temporaries on every level."""
+    A = ml.levels[lvl].A
+    ml.levels[lvl].presmoother(A, x, b)
+    residual = b - A * x
+    coarse_b = ml.levels[lvl].R * residual
+    coarse_x = np.zeros_like(coarse_b)
+    if lvl == len(ml.levels) - 2:
+        coarse_x[:] = ml.coarse_solver(ml.levels[-1].A, coarse_b)
+    elif cycle == 'V':
+        allocating_cycle(ml, lvl + 1, coarse_x, coarse_b, 'V')
+    elif cycle == 'W':
+        allocating_cycle(ml, lvl + 1, coarse_x, coarse_b, cycle)
+        allocating_cycle(ml, lvl + 1, coarse_x, coarse_b, cycle)
+    elif cycle == 'F':
+        allocating_cycle(ml, lvl + 1, coarse_x, coarse_b, cycle)
+        allocating_cycle(ml, lvl + 1, coarse_x, coarse_b, 'V')
+    x += ml.levels[lvl].P * coarse_x
+    ml.levels[lvl].postsmoother(A, x, b)
+
+
+def allocating_solve(ml, b, x0, cycle):
+    """Reference solve with one cycle, computing the residuals as before."""
+    A = ml.levels[0].A
+    x = np.array(x0)
+    residuals = [residual_norm(A, x, b)]
+    allocating_cycle(ml, 0, x, b, cycle)
+    residuals.append(residual_norm(A, x, b))
+    return x
+
+
+def allocated_per_call(fn):
+    """Return the bytes allocated during a single call to fn.
+
+    tracemalloc reports the memory in use, so its peak over the whole call
+    counts the temporaries that are freed again only once.  Instead, the
+    peak is added up and the traces are cleared on every call, line and
+    return event of the Python code run by fn.  Memory allocated and freed
+    within a single call into C is counted once per event, and the trace
+    function itself adds a few bytes per event.
+    """
+    total = [0]
+
+    def trace(frame, event, arg):
+        total[0] += tracemalloc.get_traced_memory()[1]
+        tracemalloc.clear_traces()
+        return trace
+
+    fn()
+    tracemalloc.start()
+    sys.settrace(trace)
+    try:
+        fn()
+    finally:
+        sys.settrace(None)
+        total[0] += tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return total[0]
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    A = poisson((n, n), format='csr')
+    b = np.random.rand(A.shape[0])
+    ml = pyamg.smoothed_aggregation_solver(A, max_coarse=10)
+    print(ml)
+
+    print('bytes allocated during a solve with one cycle')
+    print('%6s %20s %20s' % ('cycle', 'reference', 'multilevel_solver'))
+    for cycle in ['V', 'W', 'F']:
+        x = np.zeros_like(b)
+
+        def reference():
+            allocating_solve(ml, b, x, cycle)
+
+        def current():
+            ml.solve(b, x0=x, maxiter=1, tol=0, cycle=cycle)
+
+        print('%6s %20d %20d' % (cycle, allocated_per_call(reference),
+                                 allocated_per_call(current)))
@@ -8,7 +8,8 @@ import scipy as sp
 from .version import git_revision as __git_revision__
 from .version import version as __version__
 
-from .multilevel import coarse_grid_solver, multilevel_solver
+from .multilevel import coarse_grid_solver, multilevel_solver, \
+    multilevel_profile, load_hierarchy
 from .classical import ruge_stuben_solver
 from .aggregation import smoothed_aggregation_solver, rootnode_solver
 from .gallery import demo
@@ -17,7 +18,8 @@ from .blackbox import solve, solver, solver_configuration
 import warnings
 
 __all__ = [__git_revision__, __version__,
-           coarse_grid_solver, multilevel_solver,
+           coarse_grid_solver, multilevel_solver, multilevel_profile,
+           load_hierarchy,
            ruge_stuben_solver, smoothed_aggregation_solver, rootnode_solver,
            demo, solve, solver, solver_configuration]
 
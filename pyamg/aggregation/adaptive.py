@@ -17,7 +17,8 @@ from pyamg.relaxation.smoothing import change_smoothers, rho_D_inv_A
 from pyamg.krylov import gmres
 from pyamg.util.linalg import norm, approximate_spectral_radius
 from .aggregation import smoothed_aggregation_solver
-from .aggregate import standard_aggregation, lloyd_aggregation
+from .aggregate import standard_aggregation, lloyd_aggregation, \
+    parallel_standard_aggregation
 from .smooth import jacobi_prolongation_smoother,\
     energy_prolongation_smoother, richardson_prolongation_smoother
 from .tentative import fit_candidates
@@ -159,13 +160,13 @@ def adaptive_sa_solver(A, initial_candidates=None, symmetry='hermitian',
     strength : ['symmetric', 'classical', 'evolution', ('predefined', {'C': csr_matrix}), None]
         Method used to determine the strength of connection between unknowns of
         the linear system.  See smoothed_aggregation_solver(...) documentation.
-    aggregate : ['standard', 'lloyd', 'naive', ('predefined', {'AggOp': csr_matrix})]
+    aggregate : ['standard', 'parallel_standard', 'lloyd', 'naive', ('predefined', {'AggOp': csr_matrix})]
         Method used to aggregate nodes.  See smoothed_aggregation_solver(...)
         documentation.
     smooth : ['jacobi', 'richardson', 'energy', None]
         Method used used to smooth the tentative prolongator.  See
         smoothed_aggregation_solver(...) documentation
-    coarse_solver : ['splu', 'lu', 'cholesky, 'pinv', 'gauss_seidel', ... ]
+    coarse_solver : ['splu', 'direct', 'lu', 'cholesky, 'pinv', ... ]
         Solver used at the coarsest level of the MG hierarchy.
         Optionally, may be a tuple (fn, args), where fn is a string such as
         ['splu', 'lu', ...] or a callable function, and args is a dictionary of
@@ -476,6 +477,8 @@ def initial_setup_stage(A, symmetry, pdef, candidate_iters, epsilon,
         fn, kwargs = unpack_arg(aggregate[len(As) - 1])
         if fn == 'standard':
             AggOp = standard_aggregation(C_l, **kwargs)[0]
+        elif fn == 'parallel_standard':
+            AggOp = parallel_standard_aggregation(C_l, **kwargs)[0]
         elif fn == 'lloyd':
             AggOp = lloyd_aggregation(C_l, **kwargs)[0]
         elif fn == 'predefined':
@@ -5,8 +5,11 @@ import numpy as np
 import scipy.sparse as sparse
 from pyamg import amg_core
 from pyamg.graph import lloyd_cluster
+from pyamg.util.utils import get_num_threads
 
-__all__ = ['standard_aggregation', 'naive_aggregation', 'lloyd_aggregation', 'balanced_lloyd_aggregation']
+__all__ = ['standard_aggregation', 'parallel_standard_aggregation',
+           'naive_aggregation', 'lloyd_aggregation',
+           'balanced_lloyd_aggregation']
 
 
 def standard_aggregation(C):
@@ -71,6 +74,86 @@ def standard_aggregation(C):
     fn = amg_core.standard_aggregation
 
     num_aggregates = fn(num_rows, C.indptr, C.indices, Tj, Cpts)
+
+    return _aggregation_operator(Tj, Cpts, num_aggregates)
+
+
+def parallel_standard_aggregation(C, num_threads=None, rows_per_block=65536):
+    """Compute the sparsity pattern of the tentative prolongator in parallel.
+
+    The rows of C are split into consecutive blocks, and each block is
+    aggregated as in standard_aggregation, ignoring the connections between
+    blocks.  The blocks are distributed over the threads, so the aggregates
+    depend on rows_per_block, but not on num_threads.  If C has at most
+    rows_per_block rows, the result is that of standard_aggregation.
+
+    Parameters
+    ----------
+    C : csr_matrix
+        strength of connection matrix
+    num_threads : int
+        Number of threads, see pyamg.util.utils.get_num_threads
+    rows_per_block : int
+        Number of consecutive rows aggregated together.  Smaller blocks
+        expose more parallelism, but give more irregular aggregates near
+        the block boundaries.
+
+    Returns
+    -------
+    AggOp : csr_matrix
+        aggregation operator which determines the sparsity pattern
+        of the tentative prolongator
+    Cpts : array
+        array of Cpts, i.e., Cpts[i] = root node of aggregate i
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.aggregation.aggregate import parallel_standard_aggregation
+    >>> A = poisson((8,), format='csr')   # 1D mesh with 8 vertices
+    >>> parallel_standard_aggregation(A, rows_per_block=4)[0].toarray()
+    matrix([[1, 0, 0, 0],
+            [1, 0, 0, 0],
+            [0, 1, 0, 0],
+            [0, 1, 0, 0],
+            [0, 0, 1, 0],
+            [0, 0, 1, 0],
+            [0, 0, 0, 1],
+            [0, 0, 0, 1]], dtype=int8)
+
+    See Also
+    --------
+    amg_core.parallel_standard_aggregation
+
+    """
+    if not sparse.isspmatrix_csr(C):
+        raise TypeError('expected csr_matrix')
+
+    if C.shape[0] != C.shape[1]:
+        raise ValueError('expected square matrix')
+
+    index_type = C.indptr.dtype
+    num_rows = C.shape[0]
+
+    Tj = np.empty(num_rows, dtype=index_type)  # stores the aggregate #s
+    Cpts = np.empty(num_rows, dtype=index_type)  # stores the Cpts
+
+    fn = amg_core.parallel_standard_aggregation
+
+    num_aggregates = fn(num_rows, C.indptr, C.indices, Tj, Cpts,
+                        rows_per_block, get_num_threads(num_threads))
+
+    return _aggregation_operator(Tj, Cpts, num_aggregates)
+
+
+def _aggregation_operator(Tj, Cpts, num_aggregates):
+    """Build the aggregation operator from the aggregate number of each node.
+
+    Tj[i] is the aggregate of node i, or -1 if node i is not aggregated,
+    and Cpts[:num_aggregates] are the roots of the aggregates.
+    """
+    index_type = Tj.dtype
+    num_rows = len(Tj)
     Cpts = Cpts[:num_aggregates]
 
     if num_aggregates == 0:
@@ -177,7 +260,8 @@ def naive_aggregation(C):
         return sparse.csr_matrix((Tx, Tj, Tp), shape=shape), Cpts
 
 
-def lloyd_aggregation(C, ratio=0.03, distance='unit', maxiter=10):
+def lloyd_aggregation(C, ratio=0.03, distance='unit', maxiter=10,
+                      num_threads=None):
     """Aggregate nodes using Lloyd Clustering.
 
     Parameters
@@ -201,6 +285,13 @@ def lloyd_aggregation(C, ratio=0.03, distance='unit', maxiter=10):
 
     maxiter : int
         Maximum number of iterations to perform
+    num_threads : int
+        Number of threads used by lloyd_cluster, see
+        pyamg.util.utils.get_num_threads.  With more than one thread, the
+        clustering uses Jacobi-style Bellman-Ford sweeps instead of the
+        serial Gauss-Seidel-style sweeps, so the aggregates computed with
+        one thread and with more threads may differ.  They are the same
+        for any number of threads greater than one.
 
     Returns
     -------
@@ -262,7 +353,8 @@ def lloyd_aggregation(C, ratio=0.03, distance='unit', maxiter=10):
 
     num_seeds = int(min(max(ratio * G.shape[0], 1), G.shape[0]))
 
-    distances, clusters, seeds = lloyd_cluster(G, num_seeds, maxiter=maxiter)
+    distances, clusters, seeds = lloyd_cluster(G, num_seeds, maxiter=maxiter,
+                                               num_threads=num_threads)
 
     row = (clusters >= 0).nonzero()[0]
     col = clusters[row]
@@ -7,7 +7,9 @@ import numpy as np
 from scipy.sparse import csr_matrix, isspmatrix_csr, isspmatrix_bsr,\
     SparseEfficiencyWarning
 
-from pyamg.multilevel import multilevel_solver
+from pyamg.multilevel import multilevel_solver, _make_profile, _make_timer,\
+    _galerkin_flops, _levelize_sparsify, _sparsify_level, _store_level,\
+    _saved_level_attributes, _coarsest_level
 from pyamg.relaxation.smoothing import change_smoothers
 from pyamg.util.utils import relaxation_as_linear_operator,\
     eliminate_diag_dom_nodes, blocksize,\
@@ -17,12 +19,12 @@ from pyamg.strength import classical_strength_of_connection,\
     energy_based_strength_of_connection, distance_strength_of_connection,\
     algebraic_distance, affinity_distance
 from .aggregate import standard_aggregation, naive_aggregation,\
-    lloyd_aggregation
+    lloyd_aggregation, parallel_standard_aggregation
 from .tentative import fit_candidates
 from .smooth import jacobi_prolongation_smoother,\
     richardson_prolongation_smoother, energy_prolongation_smoother
 
-__all__ = ['smoothed_aggregation_solver']
+__all__ = ['smoothed_aggregation_solver', 'estimate_setup_memory']
 
 
 def smoothed_aggregation_solver(A, B=None, BH=None,
@@ -39,7 +41,7 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
                                                     None],
                                 max_levels=10, max_coarse=10,
                                 diagonal_dominance=False,
-                                keep=False, **kwargs):
+                                keep=False, sparsify=None, **kwargs):
     """Create a multilevel solver using classical-style Smoothed Aggregation (SA).
 
     Parameters
@@ -73,7 +75,7 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
 
     aggregate : string or list
         Method used to aggregate nodes.
-        Choose from 'standard', 'lloyd', 'naive',
+        Choose from 'standard', 'parallel_standard', 'lloyd', 'naive',
         ('predefined', {'AggOp' : csr_matrix})
 
     smooth : list
@@ -102,8 +104,12 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
     max_levels : integer
         Maximum number of levels to be used in the multilevel solver.
 
-    max_coarse : integer
-        Maximum number of variables permitted on the coarse grid.
+    max_coarse : integer, 'auto'
+        Maximum number of variables permitted on the coarse grid.  If 'auto',
+        then coarsening stops at the level where the estimated cost of a
+        V-cycle, i.e., the smoothing on the finer levels plus one solve with
+        coarse_solver, is lowest, see
+        multilevel_solver.coarse_solve_complexity.
 
     diagonal_dominance : bool, tuple
         If True (or the first tuple entry is True), then avoid coarsening
@@ -114,19 +120,49 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
     keep : bool
         Flag to indicate keeping extra operators in the hierarchy for
         diagnostics.  For example, if True, then strength of connection (C),
-        tentative prolongation (T), and aggregation (AggOp) are kept.
+        tentative prolongation (T), and aggregation (AggOp) are kept.  These
+        are required by multilevel_solver.update with reuse='aggregation'.
+
+    sparsify : None, dict or list
+        Truncation of P and R and sparsification of the coarse operator on
+        each level (a list gives the option level by level, and the last
+        entry is used on the remaining levels).  The dict may contain
+        'trunc_factor' and 'max_elements', see
+        pyamg.util.utils.truncate_interpolation, 'theta', see
+        pyamg.util.utils.sparsify_operator, and 'target', a target operator
+        complexity, for which the thresholds are increased automatically,
+        e.g. sparsify={'target': 1.4}.  The truncation preserves P*B for
+        the coarse near null-space modes B, and the sparsification preserves
+        the row sums of the coarse operator.
 
     Other Parameters
     ----------------
     cycle_type : ['V','W','F']
         Structrure of multigrid cycle
 
-    coarse_solver : ['splu', 'lu', 'cholesky, 'pinv', 'gauss_seidel', ... ]
+    coarse_solver : ['splu', 'direct', 'lu', 'cholesky, 'pinv', ... ]
         Solver used at the coarsest level of the MG hierarchy.
         Optionally, may be a tuple (fn, args), where fn is a string such as
         ['splu', 'lu', ...] or a callable function, and args is a dictionary of
         arguments to be passed to fn.
 
+    profile : {False, True, multilevel_profile}
+        If True, then the phases of the setup and of the cycle are timed on
+        each level and stored in ml.profile, see multilevel_profile.
+
+    precision : {'full', 'mixed'}
+        If 'mixed', then P, R and the coarse operators are rounded to single
+        precision after the setup, see multilevel_solver.
+
+    store : string
+        Directory for a low-memory setup.  Each level is moved to
+        memory-mapped files in store as soon as it is finished, i.e., its
+        operators except the input A, and the intermediates C, AggOp and T
+        are freed before the Galerkin product unless keep is True.  The
+        operators of the hierarchy are read-only and stay in store for the
+        lifetime of ml, so store must not be reused while ml is in use.  See
+        estimate_setup_memory for the expected peak memory of this setup.
+
     Returns
     -------
     ml : multilevel_solver
@@ -230,8 +266,8 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
 
     # Right near nullspace candidates use constant for each variable as default
     if B is None:
-        B = np.kron(np.ones((int(A.shape[0]/blocksize(A)), 1), dtype=A.dtype),
-                    np.eye(blocksize(A), dtype=A.dtype))
+        B = np.tile(np.eye(blocksize(A), dtype=A.dtype),
+                    (int(A.shape[0]/blocksize(A)), 1))
     else:
         B = np.asarray(B, dtype=A.dtype)
         if len(B.shape) == 1:
@@ -263,6 +299,7 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
     improve_candidates =\
         levelize_smooth_or_improve_candidates(improve_candidates, max_levels)
     smooth = levelize_smooth_or_improve_candidates(smooth, max_levels)
+    sparsify = _levelize_sparsify(sparsify, max_levels)
 
     # Construct multilevel structure
     levels = []
@@ -274,23 +311,127 @@ def smoothed_aggregation_solver(A, B=None, BH=None,
     if A.symmetry == 'nonsymmetric':
         levels[-1].BH = BH    # left candidates
 
-    while len(levels) < max_levels and\
-            int(levels[-1].A.shape[0]/blocksize(levels[-1].A)) > max_coarse:
-        extend_hierarchy(levels, strength, aggregate, smooth,
-                         improve_candidates, diagonal_dominance, keep)
+    profile = _make_profile(kwargs.pop('profile', None))
+    store = kwargs.pop('store', None)
 
-    ml = multilevel_solver(levels, **kwargs)
+    coarsest = _coarsest_level(max_coarse,
+                               kwargs.get('coarse_solver', 'pinv2'))
+    while len(levels) < max_levels and coarsest.coarsen_further(
+            levels, int(levels[-1].A.shape[0]/blocksize(levels[-1].A))):
+        extend_hierarchy(levels, strength, aggregate, smooth,
+                         improve_candidates, diagonal_dominance, keep,
+                         profile=profile, sparsify=sparsify)
+        if store is not None:
+            # the next to last level is finished, the input A stays in memory
+            n = len(levels) - 2
+            _store_level(levels[n], n, store,
+                         [name for name in _saved_level_attributes
+                          if n > 0 or name != 'A'])
+    built = len(levels)
+    levels = coarsest.select(levels, store)
+    if store is not None and 1 < len(levels) == built:
+        # a level cut by select was stored when it was finished
+        _store_level(levels[-1], len(levels) - 1, store)
+
+    ml = multilevel_solver(levels, profile=profile, **kwargs)
     change_smoothers(ml, presmoother, postsmoother)
     return ml
 
 
+def estimate_setup_memory(A, B=None, symmetry='hermitian', maxiter=15):
+    """Estimate the peak memory of a low-memory smoothed aggregation setup.
+
+    Parameters
+    ----------
+    A : csr_matrix, bsr_matrix
+        Matrix passed to smoothed_aggregation_solver
+    B : array
+        Near nullspace candidates, by default blocksize(A) candidates
+    symmetry : string
+        'symmetric', 'hermitian' or 'nonsymmetric', see
+        smoothed_aggregation_solver
+    maxiter : int
+        Number of Arnoldi iterations of the spectral radius estimates
+
+    Returns
+    -------
+    nbytes : int
+        Estimated peak memory in bytes, including A
+
+    Notes
+    -----
+    The estimate is for smoothed_aggregation_solver with the store parameter
+    and keep=False, where each finished level is moved to memory-mapped
+    files, so that the setup of the finest level determines the peak.  It
+    models the memory of the three phases that dominate this setup for the
+    default 'symmetric' strength, 'standard' aggregation and 'jacobi'
+    prolongation smoothing, and is typically within 15% of the measured
+    peak.
+
+    - strength: A, B and the strength matrix C, which has the pattern of A
+    - prolongation: A, B, the aggregation, T, and the larger of the Krylov
+      basis of the spectral radius estimate and the prolongation smoother,
+      i.e., the update D^-1 A T, P and the restriction R
+    - galerkin: A, B, P, R and the coarse operator with its temporaries
+
+    The number of nonzeros of P is estimated from the average number of
+    nonzeros in a row of A, as aggregates of standard aggregation have about
+    the size of a row.  Memory of other strength, aggregation or smoothing
+    methods, of the smoothers, and of the Python interpreter is not included.
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.aggregation import estimate_setup_memory
+    >>> A = poisson((100, 100), format='csr')
+    >>> nbytes = estimate_setup_memory(A)
+
+    """
+    if not (isspmatrix_csr(A) or isspmatrix_bsr(A)):
+        raise TypeError('expected csr_matrix or bsr_matrix')
+
+    n = A.shape[0]
+    bs = blocksize(A)
+    k = bs if B is None else (1 if len(B.shape) == 1 else B.shape[1])
+    item = np.dtype(A.dtype).itemsize
+    index = A.indices.dtype.itemsize
+    nodes = int(n/bs)
+    blocks = A.indices.shape[0]
+
+    A_bytes = A.data.nbytes + A.indices.nbytes + A.indptr.nbytes
+    B_bytes = n*k*item
+    C_bytes = blocks*(item + index) + (nodes + 1)*index
+    AggOp_bytes = nodes*(2*index + 1) + index
+    T_bytes = n*k*item + (2*nodes + 1)*index
+    # a row of P couples to at most about 1 + sqrt(r) aggregates, for r
+    # blocks in a row of A
+    P_blocks = nodes*(1.0 + np.sqrt(blocks/max(nodes, 1)))
+    P_bytes = P_blocks*(bs*k*item + index) + (nodes + 1)*index
+    vectors = n*item
+
+    if symmetry == 'nonsymmetric':
+        # A^H, BH, TH and R are formed separately
+        A_bytes += A_bytes
+        B_bytes += B_bytes
+        T_bytes += T_bytes
+
+    strength = C_bytes + vectors
+    # the Arnoldi basis has maxiter + 1 vectors, plus about five work vectors
+    prolongation = AggOp_bytes + T_bytes + 2*vectors +\
+        max((maxiter + 6)*vectors, 3*P_bytes)
+    galerkin = 4*P_bytes
+
+    return int(A_bytes + B_bytes + max(strength, prolongation, galerkin))
+
+
 def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
-                     diagonal_dominance=False, keep=True):
+                     diagonal_dominance=False, keep=True, profile=None,
+                     sparsify=None):
     """Extend the multigrid hierarchy.
 
     Service routine to implement the strength of connection, aggregation,
     tentative prolongation construction, and prolongation smoothing.  Called by
-    smoothed_aggregation_solver.
+    smoothed_aggregation_solver.  The phases are timed in profile, if given.
 
     """
     def unpack_arg(v):
@@ -299,6 +440,7 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         else:
             return v, {}
 
+    timer = _make_timer(profile, 'setup', len(levels) - 1)
     A = levels[-1].A
     B = levels[-1].B
     if A.symmetry == "nonsymmetric":
@@ -337,6 +479,7 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     flag, kwargs = unpack_arg(diagonal_dominance)
     if flag:
         C = eliminate_diag_dom_nodes(A, C, **kwargs)
+    timer.lap('strength', A)
 
     # Compute the aggregation matrix AggOp (i.e., the nodal coarsening of A).
     # AggOp is a boolean matrix, where the sparsity pattern for the k-th column
@@ -344,6 +487,8 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     fn, kwargs = unpack_arg(aggregate[len(levels)-1])
     if fn == 'standard':
         AggOp = standard_aggregation(C, **kwargs)[0]
+    elif fn == 'parallel_standard':
+        AggOp = parallel_standard_aggregation(C, **kwargs)[0]
     elif fn == 'naive':
         AggOp = naive_aggregation(C, **kwargs)[0]
     elif fn == 'lloyd':
@@ -352,6 +497,13 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         AggOp = kwargs['AggOp'].tocsr()
     else:
         raise ValueError('unrecognized aggregation method %s' % str(fn))
+    timer.lap('aggregation', C)
+
+    # Free C early, unless the prolongation smoother filters with it
+    fn, kwargs = unpack_arg(smooth[len(levels)-1])
+    if not keep and fn != 'energy' and\
+            not (fn == 'jacobi' and kwargs.get('filter', False)):
+        C = None
 
     # Improve near nullspace candidates by relaxing on A B = 0
     fn, kwargs = unpack_arg(improve_candidates[len(levels)-1])
@@ -362,6 +514,7 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         if A.symmetry == "nonsymmetric":
             BH = relaxation_as_linear_operator((fn, kwargs), AH, b) * BH
             levels[-1].BH = BH
+        timer.lap('candidates', A, k=B.shape[1])
 
     # Compute the tentative prolongator, T, which is a tentative interpolation
     # matrix from the coarse-grid to the fine-grid.  T exactly interpolates
@@ -369,10 +522,91 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     T, B = fit_candidates(AggOp, B)
     if A.symmetry == "nonsymmetric":
         TH, BH = fit_candidates(AggOp, BH)
+    timer.lap('tentative', T)
+
+    # Smooth the tentative prolongator and form the restriction
+    if A.symmetry == "nonsymmetric":
+        P, R = smooth_tentative(A, T, C, B, smooth[len(levels)-1], TH, BH)
+    else:
+        P, R = smooth_tentative(A, T, C, B, smooth[len(levels)-1])
+    timer.lap('prolongation', A, T)
+    symmetry = A.symmetry
+
+    if keep:
+        levels[-1].C = C  # strength of connection matrix
+        levels[-1].AggOp = AggOp  # aggregation operator
+        levels[-1].T = T  # tentative prolongator
+        levels[-1].smooth = smooth[len(levels)-1]  # prolongation smoother
+    else:
+        # free the intermediates before the Galerkin product
+        del C, AggOp, T
+        if symmetry == 'nonsymmetric':
+            del AH, TH
+
+    # Truncate P and R and form the Galerkin operator, possibly sparsified
+    P, R, A, settings = _sparsify_level(
+        levels, P, R, sparsify[len(levels)-1], B,
+        BH if symmetry == 'nonsymmetric' else None)
+    if settings:
+        levels[-1].sparsify = settings
+
+    levels[-1].P = P  # smoothed prolongator
+    levels[-1].R = R  # restriction operator
+
+    levels.append(multilevel_solver.level())
+    A.symmetry = symmetry
+    levels[-1].A = A
+    levels[-1].B = B           # right near nullspace candidates
+    timer.lap('galerkin', levels[-2].A, P, R,
+              flops=_galerkin_flops(levels[-2].A, P, R))
+
+    if A.symmetry == "nonsymmetric":
+        levels[-1].BH = BH     # left near nullspace candidates
+
+
+def smooth_tentative(A, T, C, B, smooth, TH=None, BH=None):
+    """Smooth the tentative prolongator and form the restriction.
+
+    Service routine of extend_hierarchy, also used by
+    multilevel_solver.update to recompute P and R for a new A on a fixed
+    aggregation.
+
+    Parameters
+    ----------
+    A : {csr_matrix, bsr_matrix}
+        Matrix of the level, with the symmetry attribute set
+    T : {csr_matrix, bsr_matrix}
+        Tentative prolongator
+    C : {csr_matrix}
+        Strength of connection matrix
+    B : array
+        Right near null-space modes of the coarse level
+    smooth : string, tuple
+        Prolongation smoother of the level, see smoothed_aggregation_solver
+    TH, BH : {bsr_matrix, array}
+        Tentative prolongator and left near null-space modes of the coarse
+        level, only used if A is nonsymmetric
+
+    Returns
+    -------
+    P, R : {bsr_matrix, None}
+        Prolongation and restriction operators.  R is None if A is
+        symmetric or Hermitian, i.e., R = P.T or P.H is formed by the caller
+        after the Galerkin product, see _sparsify_level.
+
+    """
+    def unpack_arg(v):
+        if isinstance(v, tuple):
+            return v[0], v[1]
+        else:
+            return v, {}
+
+    if A.symmetry == "nonsymmetric":
+        AH = A.H.asformat(A.format)
 
     # Smooth the tentative prolongator, so that it's accuracy is greatly
     # improved for algebraically smooth error.
-    fn, kwargs = unpack_arg(smooth[len(levels)-1])
+    fn, kwargs = unpack_arg(smooth)
     if fn == 'jacobi':
         P = jacobi_prolongation_smoother(A, T, C, B, **kwargs)
     elif fn == 'richardson':
@@ -388,14 +622,11 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
 
     # Compute the restriction matrix, R, which interpolates from the fine-grid
     # to the coarse-grid.  If A is nonsymmetric, then R must be constructed
-    # based on A.H.  Otherwise R = P.H or P.T.
-    symmetry = A.symmetry
-    if symmetry == 'hermitian':
-        R = P.H
-    elif symmetry == 'symmetric':
-        R = P.T
-    elif symmetry == 'nonsymmetric':
-        fn, kwargs = unpack_arg(smooth[len(levels)-1])
+    # based on A.H.  Otherwise R = P.H or P.T, which is not formed here, so
+    # that the Galerkin product is computed as P.H*A*P.
+    R = None
+    if A.symmetry == 'nonsymmetric':
+        fn, kwargs = unpack_arg(smooth)
         if fn == 'jacobi':
             R = jacobi_prolongation_smoother(AH, TH, C, BH, **kwargs).H
         elif fn == 'richardson':
@@ -410,19 +641,4 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
             raise ValueError('unrecognized prolongation smoother method %s' %
                              str(fn))
 
-    if keep:
-        levels[-1].C = C  # strength of connection matrix
-        levels[-1].AggOp = AggOp  # aggregation operator
-        levels[-1].T = T  # tentative prolongator
-
-    levels[-1].P = P  # smoothed prolongator
-    levels[-1].R = R  # restriction operator
-
-    levels.append(multilevel_solver.level())
-    A = R * A * P              # Galerkin operator
-    A.symmetry = symmetry
-    levels[-1].A = A
-    levels[-1].B = B           # right near nullspace candidates
-
-    if A.symmetry == "nonsymmetric":
-        levels[-1].BH = BH     # left near nullspace candidates
+    return P, R
@@ -7,7 +7,8 @@ from warnings import warn
 from scipy.sparse import csr_matrix, isspmatrix_csr, isspmatrix_bsr,\
     SparseEfficiencyWarning
 
-from pyamg.multilevel import multilevel_solver
+from pyamg.multilevel import multilevel_solver, _make_profile, _make_timer,\
+    _galerkin_flops, _levelize_sparsify, _sparsify_level, _coarsest_level
 from pyamg.relaxation.smoothing import change_smoothers
 from pyamg.util.utils import relaxation_as_linear_operator,\
     scale_T, get_Cpt_params, \
@@ -19,7 +20,7 @@ from pyamg.strength import classical_strength_of_connection,\
     energy_based_strength_of_connection, distance_strength_of_connection,\
     algebraic_distance, affinity_distance
 from .aggregate import standard_aggregation, naive_aggregation, \
-    lloyd_aggregation
+    lloyd_aggregation, parallel_standard_aggregation
 from .tentative import fit_candidates
 from .smooth import energy_prolongation_smoother
 
@@ -37,7 +38,8 @@ def rootnode_solver(A, B=None, BH=None,
                                         {'sweep': 'symmetric',
                                          'iterations': 4}),
                     max_levels=10, max_coarse=10,
-                    diagonal_dominance=False, keep=False, **kwargs):
+                    diagonal_dominance=False, keep=False, sparsify=None,
+                    **kwargs):
     """Create a multilevel solver using root-node based Smoothed Aggregation (SA).
 
     See the notes below, for the major differences with the classical-style
@@ -105,8 +107,12 @@ def rootnode_solver(A, B=None, BH=None,
     max_levels : integer
         Maximum number of levels to be used in the multilevel solver.
 
-    max_coarse : integer
-        Maximum number of variables permitted on the coarse grid.
+    max_coarse : integer, 'auto'
+        Maximum number of variables permitted on the coarse grid.  If 'auto',
+        then coarsening stops at the level where the estimated cost of a
+        V-cycle, i.e., the smoothing on the finer levels plus one solve with
+        coarse_solver, is lowest, see
+        multilevel_solver.coarse_solve_complexity.
 
     diagonal_dominance : bool, tuple
         If True (or the first tuple entry is True), then avoid coarsening
@@ -119,17 +125,36 @@ def rootnode_solver(A, B=None, BH=None,
         diagnostics.  For example, if True, then strength of connection (C),
         tentative prolongation (T), aggregation (AggOp), and arrays
         storing the C-points (Cpts) and F-points (Fpts) are kept at
-        each level.
+        each level.  These are required by multilevel_solver.update with
+        reuse='aggregation'.
+
+    sparsify : None, dict or list
+        Truncation of P and R and sparsification of the coarse operator on
+        each level (a list gives the option level by level, and the last
+        entry is used on the remaining levels).  The dict may contain
+        'trunc_factor' and 'max_elements', see
+        pyamg.util.utils.truncate_interpolation, 'theta', see
+        pyamg.util.utils.sparsify_operator, and 'target', a target operator
+        complexity, for which the thresholds are increased automatically,
+        e.g. sparsify={'target': 1.4}.  The truncation preserves P*B for
+        the coarse near null-space modes B, and the sparsification preserves
+        the row sums of the coarse operator.
 
     Other Parameters
     ----------------
     cycle_type : ['V','W','F']
         Structrure of multigrid cycle
-    coarse_solver : ['splu', 'lu', 'cholesky, 'pinv', 'gauss_seidel', ... ]
+    coarse_solver : ['splu', 'direct', 'lu', 'cholesky, 'pinv', ... ]
         Solver used at the coarsest level of the MG hierarchy.
         Optionally, may be a tuple (fn, args), where fn is a string such as
         ['splu', 'lu', ...] or a callable function, and args is a dictionary of
         arguments to be passed to fn.
+    profile : {False, True, multilevel_profile}
+        If True, then the phases of the setup and of the cycle are timed on
+        each level and stored in ml.profile, see multilevel_profile.
+    precision : {'full', 'mixed'}
+        If 'mixed', then P, R and the coarse operators are rounded to single
+        precision after the setup, see multilevel_solver.
 
     Returns
     -------
@@ -253,8 +278,8 @@ def rootnode_solver(A, B=None, BH=None,
         raise ValueError('expected square matrix')
     # Right near nullspace candidates use constant for each variable as default
     if B is None:
-        B = np.kron(np.ones((int(A.shape[0]/blocksize(A)), 1), dtype=A.dtype),
-                    np.eye(blocksize(A)))
+        B = np.tile(np.eye(blocksize(A), dtype=A.dtype),
+                    (int(A.shape[0]/blocksize(A)), 1))
     else:
         B = np.asarray(B, dtype=A.dtype)
         if len(B.shape) == 1:
@@ -289,6 +314,7 @@ def rootnode_solver(A, B=None, BH=None,
     improve_candidates =\
         levelize_smooth_or_improve_candidates(improve_candidates, max_levels)
     smooth = levelize_smooth_or_improve_candidates(smooth, max_levels)
+    sparsify = _levelize_sparsify(sparsify, max_levels)
 
     # Construct multilevel structure
     levels = []
@@ -300,23 +326,30 @@ def rootnode_solver(A, B=None, BH=None,
     if A.symmetry == 'nonsymmetric':
         levels[-1].BH = BH    # left candidates
 
-    while len(levels) < max_levels and \
-            int(levels[-1].A.shape[0]/blocksize(levels[-1].A)) > max_coarse:
+    profile = _make_profile(kwargs.pop('profile', None))
+
+    coarsest = _coarsest_level(max_coarse,
+                               kwargs.get('coarse_solver', 'pinv2'))
+    while len(levels) < max_levels and coarsest.coarsen_further(
+            levels, int(levels[-1].A.shape[0]/blocksize(levels[-1].A))):
         extend_hierarchy(levels, strength, aggregate, smooth,
-                         improve_candidates, diagonal_dominance, keep)
+                         improve_candidates, diagonal_dominance, keep,
+                         profile=profile, sparsify=sparsify)
+    levels = coarsest.select(levels)
 
-    ml = multilevel_solver(levels, **kwargs)
+    ml = multilevel_solver(levels, profile=profile, **kwargs)
     change_smoothers(ml, presmoother, postsmoother)
     return ml
 
 
 def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
-                     diagonal_dominance=False, keep=True):
+                     diagonal_dominance=False, keep=True, profile=None,
+                     sparsify=None):
     """Extend the multigrid hierarchy.
 
     Service routine to implement the strength of connection, aggregation,
     tentative prolongation construction, and prolongation smoothing.  Called by
-    smoothed_aggregation_solver.
+    smoothed_aggregation_solver.  The phases are timed in profile, if given.
 
     """
     def unpack_arg(v):
@@ -325,6 +358,7 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         else:
             return v, {}
 
+    timer = _make_timer(profile, 'setup', len(levels) - 1)
     A = levels[-1].A
     B = levels[-1].B
     if A.symmetry == "nonsymmetric":
@@ -363,6 +397,7 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     flag, kwargs = unpack_arg(diagonal_dominance)
     if flag:
         C = eliminate_diag_dom_nodes(A, C, **kwargs)
+    timer.lap('strength', A)
 
     # Compute the aggregation matrix AggOp (i.e., the nodal coarsening of A).
     # AggOp is a boolean matrix, where the sparsity pattern for the k-th column
@@ -370,6 +405,8 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     fn, kwargs = unpack_arg(aggregate[len(levels)-1])
     if fn == 'standard':
         AggOp, Cnodes = standard_aggregation(C, **kwargs)
+    elif fn == 'parallel_standard':
+        AggOp, Cnodes = parallel_standard_aggregation(C, **kwargs)
     elif fn == 'naive':
         AggOp, Cnodes = naive_aggregation(C, **kwargs)
     elif fn == 'lloyd':
@@ -379,6 +416,7 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         Cnodes = kwargs['Cnodes']
     else:
         raise ValueError('unrecognized aggregation method %s' % str(fn))
+    timer.lap('aggregation', C)
 
     # Improve near nullspace candidates by relaxing on A B = 0
     fn, kwargs = unpack_arg(improve_candidates[len(levels)-1])
@@ -389,6 +427,7 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         if A.symmetry == "nonsymmetric":
             BH = relaxation_as_linear_operator((fn, kwargs), AH, b) * BH
             levels[-1].BH = BH
+        timer.lap('candidates', A, k=B.shape[1])
 
     # Compute the tentative prolongator, T, which is a tentative interpolation
     # matrix from the coarse-grid to the fine-grid.  T exactly interpolates
@@ -410,38 +449,17 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
     B = Cpt_params[1]['P_I'].T*levels[-1].B
     if A.symmetry == "nonsymmetric":
         BH = Cpt_params[1]['P_I'].T*levels[-1].BH
+    timer.lap('tentative', T)
 
-    # Smooth the tentative prolongator, so that it's accuracy is greatly
-    # improved for algebraically smooth error.
-    fn, kwargs = unpack_arg(smooth[len(levels)-1])
-    if fn == 'energy':
-        P = energy_prolongation_smoother(A, T, C, B, levels[-1].B,
-                                         Cpt_params=Cpt_params, **kwargs)
-    elif fn is None:
-        P = T
+    # Smooth the tentative prolongator and form the restriction
+    if A.symmetry == "nonsymmetric":
+        P, R = smooth_tentative(A, T, C, B, levels[-1].B, Cpt_params,
+                                smooth[len(levels)-1], TH, BH, levels[-1].BH)
     else:
-        raise ValueError('unrecognized prolongation smoother \
-                          method %s' % str(fn))
-
-    # Compute the restriction matrix R, which interpolates from the fine-grid
-    # to the coarse-grid.  If A is nonsymmetric, then R must be constructed
-    # based on A.H.  Otherwise R = P.H or P.T.
+        P, R = smooth_tentative(A, T, C, B, levels[-1].B, Cpt_params,
+                                smooth[len(levels)-1])
+    timer.lap('prolongation', A, T)
     symmetry = A.symmetry
-    if symmetry == 'hermitian':
-        R = P.H
-    elif symmetry == 'symmetric':
-        R = P.T
-    elif symmetry == 'nonsymmetric':
-        fn, kwargs = unpack_arg(smooth[len(levels)-1])
-        if fn == 'energy':
-            R = energy_prolongation_smoother(AH, TH, C, BH, levels[-1].BH,
-                                             Cpt_params=Cpt_params, **kwargs)
-            R = R.H
-        elif fn is None:
-            R = T.H
-        else:
-            raise ValueError('unrecognized prolongation smoother \
-                              method %s' % str(fn))
 
     if keep:
         levels[-1].C = C                      # strength of connection matrix
@@ -451,16 +469,98 @@ def extend_hierarchy(levels, strength, aggregate, smooth, improve_candidates,
         levels[-1].P_I = Cpt_params[1]['P_I']   # Injection operator
         levels[-1].I_F = Cpt_params[1]['I_F']   # Identity on F-pts
         levels[-1].I_C = Cpt_params[1]['I_C']   # Identity on C-pts
+        levels[-1].smooth = smooth[len(levels)-1]  # prolongation smoother
+
+    # Truncate P and R and form the Galerkin operator, possibly sparsified
+    P, R, A, settings = _sparsify_level(
+        levels, P, R, sparsify[len(levels)-1], B,
+        BH if symmetry == 'nonsymmetric' else None)
+    if settings:
+        levels[-1].sparsify = settings
 
     levels[-1].P = P                          # smoothed prolongator
     levels[-1].R = R                          # restriction operator
     levels[-1].Cpts = Cpt_params[1]['Cpts']      # Cpts (i.e., rootnodes)
 
     levels.append(multilevel_solver.level())
-    A = R * A * P                                 # Galerkin operator
     A.symmetry = symmetry
     levels[-1].A = A
     levels[-1].B = B                          # right near nullspace candidates
+    timer.lap('galerkin', levels[-2].A, P, R,
+              flops=_galerkin_flops(levels[-2].A, P, R))
 
     if A.symmetry == "nonsymmetric":
         levels[-1].BH = BH                   # left near nullspace candidates
+
+
+def smooth_tentative(A, T, C, B, B_fine, Cpt_params, smooth, TH=None,
+                     BH=None, BH_fine=None):
+    """Smooth the tentative prolongator and form the restriction.
+
+    Service routine of extend_hierarchy, also used by
+    multilevel_solver.update to recompute P and R for a new A on a fixed
+    aggregation.
+
+    Parameters
+    ----------
+    A : {csr_matrix, bsr_matrix}
+        Matrix of the level, with the symmetry attribute set
+    T : {bsr_matrix}
+        Tentative prolongator, scaled for the root nodes
+    C : {csr_matrix}
+        Strength of connection matrix
+    B, B_fine : array
+        Right near null-space modes of the coarse and of this level
+    Cpt_params : tuple
+        Root node matrices, see get_Cpt_params
+    smooth : string, tuple
+        Prolongation smoother of the level, see rootnode_solver
+    TH, BH, BH_fine : {bsr_matrix, array}
+        Tentative prolongator and left near null-space modes, only used if A
+        is nonsymmetric
+
+    Returns
+    -------
+    P, R : {bsr_matrix, None}
+        Prolongation and restriction operators.  R is None if A is
+        symmetric or Hermitian, see aggregation.smooth_tentative.
+
+    """
+    def unpack_arg(v):
+        if isinstance(v, tuple):
+            return v[0], v[1]
+        else:
+            return v, {}
+
+    if A.symmetry == "nonsymmetric":
+        AH = A.H.asformat(A.format)
+
+    # Smooth the tentative prolongator, so that it's accuracy is greatly
+    # improved for algebraically smooth error.
+    fn, kwargs = unpack_arg(smooth)
+    if fn == 'energy':
+        P = energy_prolongation_smoother(A, T, C, B, B_fine,
+                                         Cpt_params=Cpt_params, **kwargs)
+    elif fn is None:
+        P = T
+    else:
+        raise ValueError('unrecognized prolongation smoother \
+                          method %s' % str(fn))
+
+    # Compute the restriction matrix R, which interpolates from the fine-grid
+    # to the coarse-grid.  If A is nonsymmetric, then R must be constructed
+    # based on A.H.  Otherwise R = P.H or P.T, which is not formed here.
+    R = None
+    if A.symmetry == 'nonsymmetric':
+        fn, kwargs = unpack_arg(smooth)
+        if fn == 'energy':
+            R = energy_prolongation_smoother(AH, TH, C, BH, BH_fine,
+                                             Cpt_params=Cpt_params, **kwargs)
+            R = R.H
+        elif fn is None:
+            R = T.H
+        else:
+            raise ValueError('unrecognized prolongation smoother \
+                              method %s' % str(fn))
+
+    return P, R
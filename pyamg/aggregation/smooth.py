@@ -7,8 +7,9 @@ import scipy.sparse as sparse
 import scipy.linalg as la
 from pyamg.util.utils import scale_rows, get_diagonal, get_block_diag, \
     UnAmal, filter_operator, compute_BtBinv, filter_matrix_rows, \
-    truncate_rows
+    truncate_rows, _common_index_type
 from pyamg.util.linalg import approximate_spectral_radius
+from pyamg.relaxation.smoothing import rho_D_inv_A, rho_block_D_inv_A
 import pyamg.amg_core
 
 __all__ = ['jacobi_prolongation_smoother', 'richardson_prolongation_smoother',
@@ -60,6 +61,25 @@ def Satisfy_Constraints(U, B, BtBinv):
     return U
 
 
+def _incomplete_mat_mult_bsr(A, B, S):
+    """Compute A*B restricted to the sparsity pattern of S.
+
+    S.data is modified in place, see amg_core.incomplete_mat_mult_bsr.  The
+    index arrays may mix int and int64, see _common_index_type.
+    """
+    A, B, S = _common_index_type(A, B, S)
+    pyamg.amg_core.incomplete_mat_mult_bsr(A.indptr, A.indices,
+                                           np.ravel(A.data),
+                                           B.indptr, B.indices,
+                                           np.ravel(B.data),
+                                           S.indptr, S.indices,
+                                           np.ravel(S.data),
+                                           int(S.shape[0]/S.blocksize[0]),
+                                           int(S.shape[1]/S.blocksize[1]),
+                                           A.blocksize[0], A.blocksize[1],
+                                           S.blocksize[1])
+
+
 def jacobi_prolongation_smoother(S, T, C, B, omega=4.0/3.0, degree=1,
                                  filter=False, weighting='diagonal'):
     """Jacobi prolongation smoother.
@@ -152,28 +172,37 @@ def jacobi_prolongation_smoother(S, T, C, B, omega=4.0/3.0, degree=1,
         S = S.multiply(C)
         S.eliminate_zeros()
 
+    # The spectral radii are cached with S, e.g., for the Jacobi smoothers.
+    # D^-1 S P is computed by scaling the rows of S P, so that no scaled copy
+    # of S is formed.
     if weighting == 'diagonal':
         # Use diagonal of S
         D_inv = get_diagonal(S, inv=True)
-        D_inv_S = scale_rows(S, D_inv, copy=True)
-        D_inv_S = (omega/approximate_spectral_radius(D_inv_S))*D_inv_S
+        D_inv *= omega/rho_D_inv_A(S)
+
+        def D_inv_S_times(P):
+            return scale_rows(S*P, D_inv, copy=False)
     elif weighting == 'block':
         # Use block diagonal of S
         D_inv = get_block_diag(S, blocksize=S.blocksize[0], inv_flag=True)
-        D_inv = sparse.bsr_matrix((D_inv, np.arange(D_inv.shape[0]),
+        rho = rho_block_D_inv_A(S, D_inv)
+        D_inv = sparse.bsr_matrix(((omega/rho)*D_inv,
+                                   np.arange(D_inv.shape[0]),
                                    np.arange(D_inv.shape[0]+1)),
                                   shape=S.shape)
-        D_inv_S = D_inv*S
-        D_inv_S = (omega/approximate_spectral_radius(D_inv_S))*D_inv_S
+
+        def D_inv_S_times(P):
+            return D_inv*(S*P)
     elif weighting == 'local':
         # Use the Gershgorin estimate as each row's weight, instead of a global
         # spectral radius estimate
         D = np.abs(S)*np.ones((S.shape[0], 1), dtype=S.dtype)
         D_inv = np.zeros_like(D)
         D_inv[D != 0] = 1.0 / np.abs(D[D != 0])
+        D_inv = omega*np.ravel(D_inv)
 
-        D_inv_S = scale_rows(S, D_inv, copy=True)
-        D_inv_S = omega*D_inv_S
+        def D_inv_S_times(P):
+            return scale_rows(S*P, D_inv, copy=False)
     else:
         raise ValueError('Incorrect weighting option')
 
@@ -182,7 +211,7 @@ def jacobi_prolongation_smoother(S, T, C, B, omega=4.0/3.0, degree=1,
         # apply satisfy constraints so that U*B = 0
         P = T
         for i in range(degree):
-            U = (D_inv_S*P).tobsr(blocksize=P.blocksize)
+            U = D_inv_S_times(P).tobsr(blocksize=P.blocksize)
 
             # Enforce U*B = 0 (1) Construct array of inv(Bi'Bi), where Bi is B
             # restricted to row i's sparsity pattern in Sparsity Pattern. This
@@ -198,7 +227,7 @@ def jacobi_prolongation_smoother(S, T, C, B, omega=4.0/3.0, degree=1,
         # Carry out Jacobi as normal
         P = T
         for i in range(degree):
-            P = P - (D_inv_S*P)
+            P = P - D_inv_S_times(P)
 
     return P
 
@@ -355,16 +384,7 @@ def cg_prolongation_smoothing(A, T, B, BtBinv, Sparsity_Pattern, maxiter, tol,
     R = sparse.bsr_matrix((uones, Sparsity_Pattern.indices,
                            Sparsity_Pattern.indptr),
                           shape=(Sparsity_Pattern.shape))
-    pyamg.amg_core.incomplete_mat_mult_bsr(A.indptr, A.indices,
-                                           np.ravel(A.data),
-                                           T.indptr, T.indices,
-                                           np.ravel(T.data),
-                                           R.indptr, R.indices,
-                                           np.ravel(R.data),
-                                           int(T.shape[0]/T.blocksize[0]),
-                                           int(T.shape[1]/T.blocksize[1]),
-                                           A.blocksize[0], A.blocksize[1],
-                                           T.blocksize[1])
+    _incomplete_mat_mult_bsr(A, T, R)
     R.data *= -1.0
 
     # Enforce R*B = 0
@@ -408,16 +428,7 @@ def cg_prolongation_smoothing(A, T, B, BtBinv, Sparsity_Pattern, maxiter, tol,
         #   with the added constraint that explicit zeros are in AP wherever
         #   AP = 0 and Sparsity_Pattern does not  !!!!
         AP.data[:] = 0.0
-        pyamg.amg_core.incomplete_mat_mult_bsr(A.indptr, A.indices,
-                                               np.ravel(A.data),
-                                               P.indptr, P.indices,
-                                               np.ravel(P.data),
-                                               AP.indptr, AP.indices,
-                                               np.ravel(AP.data),
-                                               int(T.shape[0]/T.blocksize[0]),
-                                               int(T.shape[1]/T.blocksize[1]),
-                                               A.blocksize[0], A.blocksize[1],
-                                               P.blocksize[1])
+        _incomplete_mat_mult_bsr(A, P, AP)
 
         # Enforce AP*B = 0
         Satisfy_Constraints(AP, B, BtBinv)
@@ -522,16 +533,7 @@ def cgnr_prolongation_smoothing(A, T, B, BtBinv, Sparsity_Pattern, maxiter,
                           shape=(Sparsity_Pattern.shape))
     AT = -1.0*A*T
     R.data[:] = 0.0
-    pyamg.amg_core.incomplete_mat_mult_bsr(Ah.indptr, Ah.indices,
-                                           np.ravel(Ah.data),
-                                           AT.indptr, AT.indices,
-                                           np.ravel(AT.data),
-                                           R.indptr, R.indices,
-                                           np.ravel(R.data),
-                                           int(T.shape[0]/T.blocksize[0]),
-                                           int(T.shape[1]/T.blocksize[1]),
-                                           Ah.blocksize[0], Ah.blocksize[1],
-                                           T.blocksize[1])
+    _incomplete_mat_mult_bsr(Ah, AT, R)
 
     # Enforce R*B = 0
     Satisfy_Constraints(R, B, BtBinv)
@@ -577,16 +579,7 @@ def cgnr_prolongation_smoothing(A, T, B, BtBinv, Sparsity_Pattern, maxiter,
         #  AP = 0 and Sparsity_Pattern does not
         AP_temp = A*P
         AP.data[:] = 0.0
-        pyamg.amg_core.incomplete_mat_mult_bsr(Ah.indptr, Ah.indices,
-                                               np.ravel(Ah.data),
-                                               AP_temp.indptr, AP_temp.indices,
-                                               np.ravel(AP_temp.data),
-                                               AP.indptr, AP.indices,
-                                               np.ravel(AP.data),
-                                               int(T.shape[0]/T.blocksize[0]),
-                                               int(T.shape[1]/T.blocksize[1]),
-                                               Ah.blocksize[0],
-                                               Ah.blocksize[1], T.blocksize[1])
+        _incomplete_mat_mult_bsr(Ah, AP_temp, AP)
         del AP_temp
 
         # Enforce AP*B = 0
@@ -740,16 +733,7 @@ def gmres_prolongation_smoothing(A, T, B, BtBinv, Sparsity_Pattern, maxiter,
     R = sparse.bsr_matrix((uones, Sparsity_Pattern.indices,
                            Sparsity_Pattern.indptr),
                           shape=(Sparsity_Pattern.shape))
-    pyamg.amg_core.incomplete_mat_mult_bsr(A.indptr, A.indices,
-                                           np.ravel(A.data),
-                                           T.indptr, T.indices,
-                                           np.ravel(T.data),
-                                           R.indptr, R.indices,
-                                           np.ravel(R.data),
-                                           int(T.shape[0]/T.blocksize[0]),
-                                           int(T.shape[1]/T.blocksize[1]),
-                                           A.blocksize[0], A.blocksize[1],
-                                           T.blocksize[1])
+    _incomplete_mat_mult_bsr(A, T, R)
     R.data *= -1.0
 
     # Apply diagonal preconditioner
@@ -791,16 +775,7 @@ def gmres_prolongation_smoothing(A, T, B, BtBinv, Sparsity_Pattern, maxiter,
         #   with the added constraint that explicit zeros are in AP wherever
         #   AP = 0 and Sparsity_Pattern does not
         AV.data[:] = 0.0
-        pyamg.amg_core.incomplete_mat_mult_bsr(A.indptr, A.indices,
-                                               np.ravel(A.data),
-                                               V[i].indptr, V[i].indices,
-                                               np.ravel(V[i].data),
-                                               AV.indptr, AV.indices,
-                                               np.ravel(AV.data),
-                                               int(T.shape[0]/T.blocksize[0]),
-                                               int(T.shape[1]/T.blocksize[1]),
-                                               A.blocksize[0], A.blocksize[1],
-                                               T.blocksize[1])
+        _incomplete_mat_mult_bsr(A, V[i], AV)
 
         if weighting == 'local' or weighting == 'diagonal':
             AV = scale_rows(AV, Dinv)
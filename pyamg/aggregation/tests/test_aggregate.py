@@ -3,7 +3,8 @@ import scipy.sparse as sparse
 
 from pyamg.gallery import poisson, load_example
 from pyamg.strength import symmetric_strength_of_connection
-from pyamg.aggregation.aggregate import standard_aggregation, naive_aggregation
+from pyamg.aggregation.aggregate import standard_aggregation,\
+    naive_aggregation, parallel_standard_aggregation
 
 from numpy.testing import TestCase, assert_equal
 
@@ -45,6 +46,33 @@ class TestAggregate(TestCase):
         assert_equal(result.toarray(), expected)
         assert_equal(Cpts.shape[0], 0)
 
+    def test_parallel_standard_aggregation(self):
+        for A in self.cases:
+            S = symmetric_strength_of_connection(A)
+
+            # a single block is standard aggregation
+            (expected, expected_Cpts) = standard_aggregation(S)
+            (result, Cpts) = parallel_standard_aggregation(S, num_threads=2)
+            assert_equal((result - expected).nnz, 0)
+            assert_equal(Cpts, expected_Cpts)
+
+            # every connected node is in exactly one aggregate, which
+            # contains its root, and the threads do not change the result
+            connected = (S - sparse.diags(S.diagonal())).getnnz(axis=1) > 0
+            for rows_per_block in [1, 3, 16]:
+                (result, Cpts) = parallel_standard_aggregation(
+                    S, rows_per_block=rows_per_block)
+                assert_equal(result.getnnz(axis=1), connected)
+                assert_equal(result.shape[1], max(Cpts.shape[0], 1))
+                assert_equal(result[Cpts].indices, np.arange(Cpts.shape[0]))
+
+                for num_threads in [2, 3]:
+                    (result_t, Cpts_t) = parallel_standard_aggregation(
+                        S, num_threads=num_threads,
+                        rows_per_block=rows_per_block)
+                    assert_equal((result_t - result).nnz, 0)
+                    assert_equal(Cpts_t, Cpts)
+
     def test_naive_aggregation(self):
         for A in self.cases:
             S = symmetric_strength_of_connection(A)
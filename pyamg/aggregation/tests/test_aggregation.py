@@ -6,11 +6,15 @@ from pyamg.util.utils import diag_sparse
 from pyamg.gallery import poisson, linear_elasticity,\
     gauge_laplacian, load_example
 
-from pyamg.aggregation.aggregation import smoothed_aggregation_solver
+from pyamg.aggregation.aggregation import smoothed_aggregation_solver,\
+    estimate_setup_memory
 
 from numpy.testing import TestCase, assert_approx_equal,\
     assert_array_almost_equal
 
+import os
+import shutil
+import tempfile
 import warnings
 
 
@@ -44,7 +48,8 @@ class TestParameters(TestCase):
             self.run_cases({'strength': strength})
 
     def test_aggregation_method(self):
-        for aggregate in ['standard', 'lloyd']:
+        for aggregate in ['standard', 'lloyd',
+                          ('parallel_standard', {'rows_per_block': 64})]:
             self.run_cases({'aggregate': aggregate})
 
     def test_prolongation_smoother(self):
@@ -386,6 +391,40 @@ class TestSolverPerformance(TestCase):
             assert_array_almost_equal(symm_lvl.A.toarray(),
                                       nonsymm_lvl.A.toarray())
 
+    def test_sparsify(self):
+        # truncation of P and sparsification of the coarse operators, with
+        # the settings chosen for a target operator complexity
+        A = poisson((30, 30, 30), format='csr')
+        E, B = linear_elasticity((30, 30), format='bsr')
+        np.random.seed(0)
+        cases = [(A, None, {'trunc_factor': 0.2, 'theta': 0.05}),
+                 (A, None, {'target': 1.4}),
+                 (E, B, {'max_elements': 4, 'theta': 0.1}),
+                 (E, B, {'target': 1.26})]
+
+        for A, B, sparsify in cases:
+            b = np.random.rand(A.shape[0])
+            ml = smoothed_aggregation_solver(A, B=B, max_coarse=50)
+            ml_sp = smoothed_aggregation_solver(A, B=B, max_coarse=50,
+                                                sparsify=sparsify)
+            oc = ml_sp.operator_complexity()
+            assert(oc < ml.operator_complexity())
+            if 'target' in sparsify:
+                assert(oc < sparsify['target'])
+            else:
+                assert(ml_sp.levels[0].sparsify == sparsify)
+
+            res = []
+            ml_sp.solve(b, maxiter=60, tol=1e-8, residuals=res, accel='cg')
+            assert(res[-1] < 1e-8 * res[0])
+
+        # a target that is met already changes nothing
+        ml_sp = smoothed_aggregation_solver(A, B=B, max_coarse=50,
+                                            sparsify={'target': 5.0})
+        assert(not hasattr(ml_sp.levels[0], 'sparsify'))
+        assert_approx_equal(ml_sp.operator_complexity(),
+                            ml.operator_complexity())
+
     def test_coarse_solver_opts(self):
         # these tests are meant to test whether coarse solvers are correctly
         # passed parameters
@@ -429,6 +468,102 @@ class TestSolverPerformance(TestCase):
             assert(np.abs(np.ravel(sa_old.levels[-1].A.toarray() - sa_new.levels[-1].A.toarray())).max() < 0.01)
             sa_old = sa_new
 
+    def test_index_types(self):
+        # int64 indices yield the same hierarchy as int indices
+        A = poisson((15, 15), format='csr')
+        E, B = linear_elasticity((8, 8), format='bsr')
+        cases = [(A, None, 'jacobi'), (A, None, 'energy'),
+                 (E, B, 'jacobi'), (E, B, 'energy')]
+
+        for A, B, smooth in cases:
+            A64 = A.copy()
+            A64.indptr = A64.indptr.astype(np.int64)
+            A64.indices = A64.indices.astype(np.int64)
+            b = np.arange(A.shape[0], dtype=float)
+
+            np.random.seed(2727)
+            sa32 = smoothed_aggregation_solver(A, B=B, smooth=smooth,
+                                               max_coarse=10)
+            np.random.seed(2727)
+            sa64 = smoothed_aggregation_solver(A64, B=B, smooth=smooth,
+                                               max_coarse=10)
+            assert(np.shares_memory(sa64.levels[0].A.indices, A64.indices))
+            assert(len(sa32.levels) == len(sa64.levels))
+            for l32, l64 in zip(sa32.levels, sa64.levels):
+                assert_array_almost_equal(l32.A.toarray(), l64.A.toarray())
+            assert_array_almost_equal(sa32.solve(b, maxiter=5),
+                                      sa64.solve(b, maxiter=5))
+
+    def test_store(self):
+        # the low-memory setup yields the same, memory-mapped hierarchy
+        A = poisson((30, 30), format='csr')
+        E, B = linear_elasticity((12, 12), format='bsr')
+        cases = [(A, None, {}), (E, B, {}), (A, None, {'keep': True}),
+                 (A, None, {'symmetry': 'nonsymmetric'})]
+
+        for A, B, kwargs in cases:
+            b = np.arange(A.shape[0], dtype=float)
+            path = tempfile.mkdtemp()
+            try:
+                # copies of A, so that both draw the same spectral radius
+                # estimates instead of sharing them
+                A0 = A.copy()
+                np.random.seed(2728)
+                sa = smoothed_aggregation_solver(A.copy(), B=B, max_coarse=10,
+                                                 **kwargs)
+                np.random.seed(2728)
+                sa_store = smoothed_aggregation_solver(A0, B=B, max_coarse=10,
+                                                       store=path, **kwargs)
+                assert(np.shares_memory(sa_store.levels[0].A.data, A0.data))
+                assert(len(sa.levels) == len(sa_store.levels))
+                for n, (lvl, lvl_store) in enumerate(zip(sa.levels,
+                                                         sa_store.levels)):
+                    # memory-mapped arrays are read-only
+                    if n > 0:
+                        assert(not lvl_store.A.data.flags.writeable)
+                    if n < len(sa.levels) - 1:
+                        assert(not lvl_store.P.data.flags.writeable)
+                        assert_array_almost_equal(lvl.P.toarray(),
+                                                  lvl_store.P.toarray())
+                    assert_array_almost_equal(lvl.A.toarray(),
+                                              lvl_store.A.toarray())
+                assert(hasattr(sa_store.levels[0], 'C') == ('keep' in kwargs))
+                assert(os.path.exists(os.path.join(path, 'level0_P_data.npy')))
+                assert_array_almost_equal(sa.solve(b, maxiter=5),
+                                          sa_store.solve(b, maxiter=5))
+                del sa_store
+            finally:
+                shutil.rmtree(path)
+
+            # the estimate covers at least A, B and the Krylov basis
+            nbytes = A.data.nbytes + A.indices.nbytes + A.indptr.nbytes
+            assert(nbytes < estimate_setup_memory(A, B) < 20 * nbytes)
+
+        # the files of the levels dropped by max_coarse='auto' are removed
+        A = poisson((200, 200), format='csr')
+        path = tempfile.mkdtemp()
+        try:
+            np.random.seed(2728)
+            sa = smoothed_aggregation_solver(A.copy(), max_coarse='auto',
+                                             coarse_solver='splu')
+            np.random.seed(2728)
+            sa_store = smoothed_aggregation_solver(A, max_coarse='auto',
+                                                   coarse_solver='splu',
+                                                   store=path)
+            k = len(sa_store.levels) - 1
+            assert(len(sa.levels) == k + 1)
+            for filename in os.listdir(path):
+                n, name = filename[5:-4].split('_', 1)
+                assert(int(n) < k or name.split('_')[0] in ['A', 'B'])
+            assert(os.path.exists(os.path.join(path, 'level%d_A_data.npy'
+                                               % k)))
+            b = np.arange(A.shape[0], dtype=float)
+            assert_array_almost_equal(sa.solve(b, maxiter=5),
+                                      sa_store.solve(b, maxiter=5))
+            del sa_store
+        finally:
+            shutil.rmtree(path)
+
 
 class TestComplexSolverPerformance(TestCase):
     ''' Imaginary tests from
@@ -444,8 +444,8 @@ void evolution_strength_helper(      T Sx[], const int Sx_size,
         //Write first NullDim Entries of RHS
         //  Bi^H*D_A*z ==> RHS
         gemm( DBi, NullDim, length, 'F',
-                z, length,       1, 'F',
-              RHS, NullDim,      1, 'F',
+                z, length,  (I) 1, 'F',
+              RHS, NullDim, (I) 1, 'F',
               'T');
         //Double the first NullDim entries in RHS
         for(I j = 0; j < NullDim; j++)
@@ -458,8 +458,8 @@ void evolution_strength_helper(      T Sx[], const int Sx_size,
 
         //Find best approximation to z in span(Bi), Bi*RHS[0:NullDim] ==> zhat
         gemm(  Bi,   length, NullDim, 'F',
-              RHS,  NullDim,       1, 'F',
-             zhat,   length,       1, 'F',
+              RHS,  NullDim,   (I) 1, 'F',
+             zhat,   length,   (I) 1, 'F',
               'T');
 
         //Need to filter out numerically zero values in zhat, because the sign of each
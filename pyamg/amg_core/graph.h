@@ -261,7 +261,7 @@ T vertex_coloring_jones_plassmann(const I num_rows,
     T K = 0; //iteration number
 
     while(N < num_rows){
-        N += maximal_independent_set_parallel(num_rows,Ap,Ap_size,Aj,Aj_size,-1,K,-2,x,x_size,z,z_size,1);
+        N += maximal_independent_set_parallel(num_rows,Ap,Ap_size,Aj,Aj_size,(T)-1,K,(T)-2,x,x_size,z,z_size,(I)1);
         for(I i = 0; i < num_rows; i++){
             if(x[i] == -2)
                 x[i] = -1;
@@ -319,7 +319,7 @@ T vertex_coloring_LDF(const I num_rows,
             weights[i] = y[i] + num_neighbors;
         }
 
-        N += maximal_independent_set_parallel(num_rows,Ap,Ap_size,Aj,Aj_size,-1,K,-2,x,x_size,&weights[0],num_rows,1);
+        N += maximal_independent_set_parallel(num_rows,Ap,Ap_size,Aj,Aj_size,(T)-1,K,(T)-2,x,x_size,&weights[0],(int)num_rows,(I)1);
         for(I i = 0; i < num_rows; i++){
             if(x[i] == -2)
                 x[i] = -1;
@@ -815,6 +815,150 @@ void lloyd_cluster(const I num_nodes,
 }
 
 
+/*
+ * Apply one Jacobi-style Bellman-Ford sweep on a distance graph stored
+ * in CSR format: every node is updated from the distances and clusters
+ * of the previous sweep, so the rows can be split among threads.
+ *
+ *  Parameters
+ *      num_nodes - (IN)  number of nodes (number of rows in A)
+ *      Ap[]      - (IN)  CSR row pointer
+ *      Aj[]      - (IN)  CSR index array
+ *      Ax[]      - (IN)  CSR data array (edge lengths)
+ *      d0[]      - (IN)  distance to nearest center
+ *     cm0[]      - (IN)  cluster index for each node
+ *      d[]       - (OUT) updated distance to nearest center
+ *     cm[]       - (OUT) updated cluster index for each node
+ *     num_threads - (IN) number of OpenMP threads
+ *
+ *  Returns
+ *      the number of nodes whose distance changed
+ */
+template<class I, class T>
+I bellman_ford_sweep(const I num_nodes,
+                     const I Ap[], const I Aj[], const T Ax[],
+                     const T d0[], const I cm0[],
+                           T  d[],       I  cm[],
+                     const I num_threads)
+{
+    const T inf = std::numeric_limits<T>::max();
+    I num_changed = 0;
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static) reduction(+:num_changed)
+    for(I i = 0; i < num_nodes; i++){
+        T di = d0[i];
+        I cmi = cm0[i];
+        for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+            const I j = Aj[jj];
+            if(d0[j] == inf)
+                continue;
+            const T dd = Ax[jj] + d0[j];
+            if(dd < di){
+                di = dd;
+                cmi = cm0[j];
+            }
+        }
+        if(di != d0[i])
+            num_changed++;
+        d[i] = di;
+        cm[i] = cmi;
+    }
+
+    return num_changed;
+}
+
+
+/*
+ * Perform one iteration of Lloyd clustering on a distance graph
+ * using thread-parallel distance propagation
+ *
+ * This is lloyd_cluster with the Gauss-Seidel style Bellman-Ford sweeps
+ * replaced by Jacobi-style sweeps (see bellman_ford_sweep).  The
+ * distances are the same, but a node that is equally far from two
+ * centers may be assigned to a different cluster than in lloyd_cluster.
+ * The result does not depend on num_threads.
+ *
+ *  Parameters
+ *      num_nodes       - (IN)  number of nodes (number of rows in A)
+ *      Ap[]            - (IN)  CSR row pointer for adjacency matrix A
+ *      Aj[]            - (IN)  CSR index array
+ *      Ax[]            - (IN)  CSR data array (edge lengths)
+ *      num_clusters    - (IN)  number of clusters (seeds)
+ *      d[num_nodes]    - (OUT) distance to nearest seed
+ *     cm[num_nodes]    - (OUT) cluster index for each node
+ *      c[num_clusters] - (INOUT)  cluster centers
+ *     num_threads      - (IN)  number of OpenMP threads
+ *
+ */
+template<class I, class T>
+void lloyd_cluster_parallel(const I num_nodes,
+                            const I Ap[], const int Ap_size,
+                            const I Aj[], const int Aj_size,
+                            const T Ax[], const int Ax_size,
+                            const I num_clusters,
+                                  T  d[], const int  d_size,
+                                  I cm[], const int cm_size,
+                                  I  c[], const int  c_size,
+                            const I num_threads)
+{
+    const T inf = std::numeric_limits<T>::max();
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < num_nodes; i++){
+        d[i] = inf;
+        cm[i] = -1;
+    }
+    for(I a = 0; a < num_clusters; a++){
+        I i = c[a];
+        coreassert(i >= 0 && i < num_nodes, "");
+        d[i] = 0;
+        cm[i] = a;
+    }
+
+    std::vector<T> d_work(num_nodes);
+    std::vector<I> cm_work(num_nodes);
+
+    // propagate distances outward, then (from the cluster boundaries) inward
+    for(int pass = 0; pass < 2; pass++){
+        T *d0 = d, *d1 = &d_work[0];
+        I *cm0 = cm, *cm1 = &cm_work[0];
+
+        // the last sweep changes nothing, so both buffers hold the result
+        while(bellman_ford_sweep(num_nodes, Ap, Aj, Ax, d0, cm0, d1, cm1, num_threads) > 0){
+            std::swap(d0, d1);
+            std::swap(cm0, cm1);
+        }
+
+        if(pass == 1)
+            break;
+
+        //find boundaries
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+        for(I i = 0; i < num_nodes; i++){
+            d[i] = inf;
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                if( cm[i] != cm[Aj[jj]] ){
+                    d[i] = 0;
+                    break;
+                }
+            }
+        }
+    }
+
+    // compute new seeds
+    for(I i = 0; i < num_nodes; i++){
+        const I a = cm[i];
+
+        if (a == -1) //node belongs to no cluster
+            continue;
+
+        coreassert(a >= 0 && a < num_clusters, "");
+
+        if( d[c[a]] < d[i] )
+            c[a] = i;
+    }
+}
+
 /*
  * Perform one iteration of Lloyd clustering on a distance graph
  *
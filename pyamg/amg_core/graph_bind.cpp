@@ -357,6 +357,45 @@ void _lloyd_cluster(
                                );
 }
 
+template<class I, class T>
+void _lloyd_cluster_parallel(
+        const I num_nodes,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+     const I num_clusters,
+       py::array_t<T> & d,
+      py::array_t<I> & cm,
+       py::array_t<I> & c,
+      const I num_threads
+                             )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_d = d.mutable_unchecked();
+    auto py_cm = cm.mutable_unchecked();
+    auto py_c = c.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    T *_d = py_d.mutable_data();
+    I *_cm = py_cm.mutable_data();
+    I *_c = py_c.mutable_data();
+
+    return lloyd_cluster_parallel<I, T>(
+                num_nodes,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+             num_clusters,
+                       _d, d.shape(0),
+                      _cm, cm.shape(0),
+                       _c, c.shape(0),
+              num_threads
+                                        );
+}
+
 template<class I, class T>
 void _lloyd_cluster_adv(
         const I num_nodes,
@@ -530,6 +569,7 @@ PYBIND11_MODULE(graph, m) {
     bellman_ford_adv
     bellman_ford_balanced
     lloyd_cluster
+    lloyd_cluster_parallel
     lloyd_cluster_adv
     lloyd_cluster_exact
     maximal_independent_set_k_parallel
@@ -541,6 +581,8 @@ PYBIND11_MODULE(graph, m) {
     options.disable_function_signatures();
 
     m.def("maximal_independent_set_serial", &_maximal_independent_set_serial<int, int>,
+        py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("active"), py::arg("C"), py::arg("F"), py::arg("x").noconvert());
+    m.def("maximal_independent_set_serial", &_maximal_independent_set_serial<int64_t, int64_t>,
         py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("active"), py::arg("C"), py::arg("F"), py::arg("x").noconvert(),
 R"pbdoc(
 Compute a maximal independent set for a graph stored in CSR format
@@ -566,6 +608,8 @@ Compute a maximal independent set for a graph stored in CSR format
      MIS or not.)pbdoc");
 
     m.def("maximal_independent_set_parallel", &_maximal_independent_set_parallel<int, int, double>,
+        py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("active"), py::arg("C"), py::arg("F"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("max_iters"));
+    m.def("maximal_independent_set_parallel", &_maximal_independent_set_parallel<int64_t, int64_t, double>,
         py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("active"), py::arg("C"), py::arg("F"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("max_iters"),
 R"pbdoc(
 Compute a maximal independent set for a graph stored in CSR format
@@ -594,6 +638,8 @@ Compute a maximal independent set for a graph stored in CSR format
      MIS or not.)pbdoc");
 
     m.def("vertex_coloring_mis", &_vertex_coloring_mis<int, int>,
+        py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert());
+    m.def("vertex_coloring_mis", &_vertex_coloring_mis<int64_t, int64_t>,
         py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(),
 R"pbdoc(
 Compute a vertex coloring for a graph stored in CSR format.
@@ -608,6 +654,8 @@ Compute a vertex coloring for a graph stored in CSR format.
  of the i-th vertex.)pbdoc");
 
     m.def("vertex_coloring_jones_plassmann", &_vertex_coloring_jones_plassmann<int, int, double>,
+        py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("z").noconvert());
+    m.def("vertex_coloring_jones_plassmann", &_vertex_coloring_jones_plassmann<int64_t, int64_t, double>,
         py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("z").noconvert(),
 R"pbdoc(
 Compute a vertex coloring of a graph using the Jones-Plassmann algorithm
@@ -629,6 +677,8 @@ Compute a vertex coloring of a graph using the Jones-Plassmann algorithm
      http://citeseer.ist.psu.edu/jones92parallel.html)pbdoc");
 
     m.def("vertex_coloring_LDF", &_vertex_coloring_LDF<int, int, double>,
+        py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("y").noconvert());
+    m.def("vertex_coloring_LDF", &_vertex_coloring_LDF<int64_t, int64_t, double>,
         py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("y").noconvert(),
 R"pbdoc(
 Compute a vertex coloring of a graph using the parallel
@@ -648,6 +698,8 @@ Largest-Degree-First (LDF) algorithm
     http://citeseerx.ist.psu.edu/viewdoc/summary?doi=10.1.1.45.4650)pbdoc");
 
     m.def("cluster_node_incidence", &_cluster_node_incidence<int>,
+        py::arg("num_nodes"), py::arg("num_clusters"), py::arg("cm").noconvert(), py::arg("ICp").noconvert(), py::arg("ICi").noconvert(), py::arg("L").noconvert());
+    m.def("cluster_node_incidence", &_cluster_node_incidence<int64_t>,
         py::arg("num_nodes"), py::arg("num_clusters"), py::arg("cm").noconvert(), py::arg("ICp").noconvert(), py::arg("ICi").noconvert(), py::arg("L").noconvert(),
 R"pbdoc(
 Compute the incidence matrix for a clustering
@@ -691,6 +743,12 @@ L is an additional vector (length num_rows) to store local indexes.
     m.def("cluster_center", &_cluster_center<int, float>,
         py::arg("a"), py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("cm").noconvert(), py::arg("ICp").noconvert(), py::arg("ICi").noconvert(), py::arg("L").noconvert());
     m.def("cluster_center", &_cluster_center<int, double>,
+        py::arg("a"), py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("cm").noconvert(), py::arg("ICp").noconvert(), py::arg("ICi").noconvert(), py::arg("L").noconvert());
+    m.def("cluster_center", &_cluster_center<int64_t, int64_t>,
+        py::arg("a"), py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("cm").noconvert(), py::arg("ICp").noconvert(), py::arg("ICi").noconvert(), py::arg("L").noconvert());
+    m.def("cluster_center", &_cluster_center<int64_t, float>,
+        py::arg("a"), py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("cm").noconvert(), py::arg("ICp").noconvert(), py::arg("ICi").noconvert(), py::arg("L").noconvert());
+    m.def("cluster_center", &_cluster_center<int64_t, double>,
         py::arg("a"), py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("cm").noconvert(), py::arg("ICp").noconvert(), py::arg("ICi").noconvert(), py::arg("L").noconvert(),
 R"pbdoc(
 Apply Floyd–Warshall to cluster "a" and use the result to find the
@@ -721,6 +779,12 @@ cluster center
     m.def("bellman_ford", &_bellman_ford<int, float>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert());
     m.def("bellman_ford", &_bellman_ford<int, double>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert());
+    m.def("bellman_ford", &_bellman_ford<int64_t, int64_t>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert());
+    m.def("bellman_ford", &_bellman_ford<int64_t, float>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert());
+    m.def("bellman_ford", &_bellman_ford<int64_t, double>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert(),
 R"pbdoc(
 Apply one iteration of Bellman-Ford iteration on a distance
@@ -742,6 +806,12 @@ graph stored in CSR format.
     m.def("bellman_ford_adv", &_bellman_ford_adv<int, float>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
     m.def("bellman_ford_adv", &_bellman_ford_adv<int, double>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("bellman_ford_adv", &_bellman_ford_adv<int64_t, int64_t>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("bellman_ford_adv", &_bellman_ford_adv<int64_t, float>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("bellman_ford_adv", &_bellman_ford_adv<int64_t, double>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(),
 R"pbdoc(
 Apply one iteration of Bellman-Ford iteration on a distance
@@ -767,6 +837,12 @@ with fewest points in its cluster.
     m.def("bellman_ford_balanced", &_bellman_ford_balanced<int, float>,
         py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert());
     m.def("bellman_ford_balanced", &_bellman_ford_balanced<int, double>,
+        py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert());
+    m.def("bellman_ford_balanced", &_bellman_ford_balanced<int64_t, int64_t>,
+        py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert());
+    m.def("bellman_ford_balanced", &_bellman_ford_balanced<int64_t, float>,
+        py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert());
+    m.def("bellman_ford_balanced", &_bellman_ford_balanced<int64_t, double>,
         py::arg("num_nodes"), py::arg("num_clusters"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("d").noconvert(), py::arg("cm").noconvert(),
 R"pbdoc(
 Apply Bellman-Ford with a heuristic to balance cluster sizes
@@ -793,6 +869,12 @@ sizes.
     m.def("lloyd_cluster", &_lloyd_cluster<int, float>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
     m.def("lloyd_cluster", &_lloyd_cluster<int, double>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("lloyd_cluster", &_lloyd_cluster<int64_t, int64_t>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("lloyd_cluster", &_lloyd_cluster<int64_t, float>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("lloyd_cluster", &_lloyd_cluster<int64_t, double>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(),
 R"pbdoc(
 Perform one iteration of Lloyd clustering on a distance graph
@@ -812,11 +894,50 @@ Perform one iteration of Lloyd clustering on a distance graph
      Algebraic Multigrid for Discrete Differential Forms
      PhD thesis (UIUC), August 2008)pbdoc");
 
+    m.def("lloyd_cluster_parallel", &_lloyd_cluster_parallel<int, int>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(), py::arg("num_threads"));
+    m.def("lloyd_cluster_parallel", &_lloyd_cluster_parallel<int, float>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(), py::arg("num_threads"));
+    m.def("lloyd_cluster_parallel", &_lloyd_cluster_parallel<int, double>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(), py::arg("num_threads"));
+    m.def("lloyd_cluster_parallel", &_lloyd_cluster_parallel<int64_t, int64_t>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(), py::arg("num_threads"));
+    m.def("lloyd_cluster_parallel", &_lloyd_cluster_parallel<int64_t, float>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(), py::arg("num_threads"));
+    m.def("lloyd_cluster_parallel", &_lloyd_cluster_parallel<int64_t, double>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(), py::arg("num_threads"),
+R"pbdoc(
+Perform one iteration of Lloyd clustering on a distance graph
+using thread-parallel distance propagation
+
+This is lloyd_cluster with the Gauss-Seidel style Bellman-Ford sweeps
+replaced by Jacobi-style sweeps (see bellman_ford_sweep).  The
+distances are the same, but a node that is equally far from two
+centers may be assigned to a different cluster than in lloyd_cluster.
+The result does not depend on num_threads.
+
+ Parameters
+     num_nodes       - (IN)  number of nodes (number of rows in A)
+     Ap[]            - (IN)  CSR row pointer for adjacency matrix A
+     Aj[]            - (IN)  CSR index array
+     Ax[]            - (IN)  CSR data array (edge lengths)
+     num_clusters    - (IN)  number of clusters (seeds)
+     d[num_nodes]    - (OUT) distance to nearest seed
+    cm[num_nodes]    - (OUT) cluster index for each node
+     c[num_clusters] - (INOUT)  cluster centers
+    num_threads      - (IN)  number of OpenMP threads)pbdoc");
+
     m.def("lloyd_cluster_adv", &_lloyd_cluster_adv<int, int>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
     m.def("lloyd_cluster_adv", &_lloyd_cluster_adv<int, float>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
     m.def("lloyd_cluster_adv", &_lloyd_cluster_adv<int, double>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("lloyd_cluster_adv", &_lloyd_cluster_adv<int64_t, int64_t>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("lloyd_cluster_adv", &_lloyd_cluster_adv<int64_t, float>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("lloyd_cluster_adv", &_lloyd_cluster_adv<int64_t, double>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(),
 R"pbdoc(
 Perform one iteration of Lloyd clustering on a distance graph
@@ -843,6 +964,12 @@ This adds the tie breaking for bellman_ford_adv
     m.def("lloyd_cluster_exact", &_lloyd_cluster_exact<int, float>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
     m.def("lloyd_cluster_exact", &_lloyd_cluster_exact<int, double>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("lloyd_cluster_exact", &_lloyd_cluster_exact<int64_t, int64_t>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("lloyd_cluster_exact", &_lloyd_cluster_exact<int64_t, float>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert());
+    m.def("lloyd_cluster_exact", &_lloyd_cluster_exact<int64_t, double>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("num_clusters"), py::arg("d").noconvert(), py::arg("cm").noconvert(), py::arg("c").noconvert(),
 R"pbdoc(
 Perform one iteration of Lloyd clustering on a distance graph using
@@ -868,6 +995,8 @@ nearly-equal-sized clusters.
      PhD thesis (UIUC), August 2008)pbdoc");
 
     m.def("maximal_independent_set_k_parallel", &_maximal_independent_set_k_parallel<int, int, double>,
+        py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("k"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("max_iters"));
+    m.def("maximal_independent_set_k_parallel", &_maximal_independent_set_k_parallel<int64_t, int64_t, double>,
         py::arg("num_rows"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("k"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("max_iters"),
 R"pbdoc(
 Compute a distance-k maximal independent set for a graph stored
@@ -887,6 +1016,8 @@ Compute a distance-k maximal independent set for a graph stored
      max_iters  - maximum number of iterations to use (default, no limit))pbdoc");
 
     m.def("breadth_first_search", &_breadth_first_search<int>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("seed"), py::arg("order").noconvert(), py::arg("level").noconvert());
+    m.def("breadth_first_search", &_breadth_first_search<int64_t>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("seed"), py::arg("order").noconvert(), py::arg("level").noconvert(),
 R"pbdoc(
 Compute a breadth first search of a graph in CSR format
@@ -903,6 +1034,8 @@ Compute a breadth first search of a graph in CSR format
      The values of the level must be initialized to -1)pbdoc");
 
     m.def("connected_components", &_connected_components<int>,
+        py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("components").noconvert());
+    m.def("connected_components", &_connected_components<int64_t>,
         py::arg("num_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("components").noconvert(),
 R"pbdoc(
 Compute the connected components of a graph stored in CSR format.
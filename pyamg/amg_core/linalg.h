@@ -5,6 +5,12 @@
 #include <limits>
 #include <complex>
 #include <iostream>
+#include <algorithm>
+#include <vector>
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
 
 /*******************************************************************
  * Overloaded routines for real arithmetic for int, float and double
@@ -542,7 +548,7 @@ I svd_jacobi (const T Ax[], T Tx[], T Bx[], F Sx[], const I m, const I n)
     I sweep = 0;
 
     // Always do at least  30 sweeps
-    I sweepmax = std::max(15*n, 30);
+    I sweepmax = std::max(15*n, (I) 30);
 
     F tolerance = sqrt((F)m)*std::numeric_limits<F>::epsilon();
 
@@ -820,8 +826,8 @@ void svd_solve( T Ax[], I m, I n, T b[], F sing_vals[], T work[], I work_size)
 
     // A^{-1} b = V*Sinv*U.H*b, in 3 steps
     // Step 1, U.H*b
-    gemm(&(U[0]), n, m, trans, &(b[0]), m, 1, trans,
-         &(x[0]), n, 1, trans, 'T');
+    gemm(&(U[0]), n, m, trans, &(b[0]), m, (I) 1, trans,
+         &(x[0]), n, (I) 1, trans, 'T');
 
     // Step 2, scale x by Sinv
     for(I j = 0; j < n; j++)
@@ -835,8 +841,8 @@ void svd_solve( T Ax[], I m, I n, T b[], F sing_vals[], T work[], I work_size)
     // Step 3, multiply by V
     // transpose V so that it is in row major for gemm
     transpose(&(V[0]), &(U[0]), n, n);
-    gemm(&(U[0]), n, n, trans, &(x[0]), n, 1, trans,
-         &(b[0]), n, 1, trans, 'T');
+    gemm(&(U[0]), n, n, trans, &(x[0]), n, (I) 1, trans,
+         &(b[0]), n, (I) 1, trans, 'T');
 
     return;
 }
@@ -1000,4 +1006,1295 @@ void csc_scale_rows(const I n_row,
     }
 }
 
+/*******************************************************************
+ *              Sparse Linear Algebra Routines
+ *******************************************************************/
+
+/* Split the rows of a CSR (or BSR) matrix into n_parts contiguous
+ * ranges holding about the same number of nonzeros (or blocks)
+ *
+ * Parameters
+ * ----------
+ * Ap : {int array}
+ *      row pointer
+ * n_row : {int}
+ *      number of rows
+ * part : {int}
+ *      index of the range, 0 <= part <= n_parts
+ * n_parts : {int}
+ *      number of ranges
+ *
+ * Return
+ * ------
+ * First row of range part, or n_row for part == n_parts
+ *
+ */
+template<class I>
+inline I balanced_row_split(const I Ap[], const I n_row,
+                            const I part, const I n_parts)
+{
+    if (part <= 0)
+        return 0;
+    if (part >= n_parts)
+        return n_row;
+    const long long nnz = (long long) (Ap[n_row] - Ap[0]);
+    const I target = Ap[0] + (I) (nnz * part / n_parts);
+    return (I) (std::lower_bound(Ap, Ap + n_row, target) - Ap);
+}
+
+/* Range of rows [row_start, row_stop) of the calling OpenMP thread,
+ * see balanced_row_split.  Outside of a parallel region, or without
+ * OpenMP, all rows are returned.
+ */
+template<class I>
+inline void thread_row_range(const I Ap[], const I n_row,
+                             I &row_start, I &row_stop)
+{
+#ifdef _OPENMP
+    const I part = omp_get_thread_num();
+    const I n_parts = omp_get_num_threads();
+#else
+    const I part = 0;
+    const I n_parts = 1;
+#endif
+    row_start = balanced_row_split(Ap, n_row, part, n_parts);
+    row_stop  = balanced_row_split(Ap, n_row, part + 1, n_parts);
+}
+
+/*
+ * Compute Y += A*X for CSR matrix A and dense vectors X,Y
+ *
+ * Parameters
+ * ----------
+ * n_row : {int}
+ *      number of rows in A
+ * n_col : {int}
+ *      number of columns in A
+ * Ap : {int array}
+ *      CSR row pointer
+ * Aj : {int array}
+ *      CSR column indices
+ * Ax : {float|complex array}
+ *      CSR data array
+ * Xx : {float|complex array}
+ *      input vector, length n_col, or k vectors stored row-wise as
+ *      an (n_col, k) array in C order
+ * Yx : {float|complex array}
+ *      output vector, length n_row, or an (n_row, k) array in C order
+ * k : {int}
+ *      number of vectors, i.e., columns of Xx and Yx
+ * num_threads : {int}
+ *      number of OpenMP threads, rows are split among the threads in
+ *      contiguous ranges with about the same number of nonzeros
+ *
+ * Return
+ * ------
+ * Yx is modified in place, Yx += A*Xx
+ *
+ * Notes
+ * -----
+ * No temporaries are created, so the product can be accumulated
+ * directly into a preallocated vector.
+ *
+ * See:
+ * https://github.com/scipy/scipy/blob/master/scipy/sparse/sparsetools/csr.h
+ *
+ */
+template <class I, class T>
+void csr_matvec(const I n_row,
+                const I n_col,
+                const I Ap[], const int Ap_size,
+                const I Aj[], const int Aj_size,
+                const T Ax[], const int Ax_size,
+                const T Xx[], const int Xx_size,
+                      T Yx[], const int Yx_size,
+                const I k,
+                const I num_threads)
+{
+    if (k == 1) {
+        #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+        {
+            I row_start, row_stop;
+            thread_row_range(Ap, n_row, row_start, row_stop);
+            for(I i = row_start; i < row_stop; i++){
+                T sum = Yx[i];
+                for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                    sum += Ax[jj] * Xx[Aj[jj]];
+                }
+                Yx[i] = sum;
+            }
+        }
+        return;
+    }
+
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        I row_start, row_stop;
+        thread_row_range(Ap, n_row, row_start, row_stop);
+        for(I i = row_start; i < row_stop; i++){
+            T * y = Yx + k*i;
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const T a = Ax[jj];
+                const T * x = Xx + k*Aj[jj];
+                for(I c = 0; c < k; c++){
+                    y[c] += a * x[c];
+                }
+            }
+        }
+    }
+}
+
+/*
+ * Compute Y += A*X for CSC matrix A and dense vectors X,Y
+ *
+ * Parameters
+ * ----------
+ * n_row : {int}
+ *      number of rows in A
+ * n_col : {int}
+ *      number of columns in A
+ * Ap : {int array}
+ *      CSC column pointer
+ * Ai : {int array}
+ *      CSC row indices
+ * Ax : {float|complex array}
+ *      CSC data array
+ * Xx : {float|complex array}
+ *      input vector, length n_col, or k vectors stored row-wise as
+ *      an (n_col, k) array in C order
+ * Yx : {float|complex array}
+ *      output vector, length n_row, or an (n_row, k) array in C order
+ * k : {int}
+ *      number of vectors, i.e., columns of Xx and Yx
+ *
+ * Return
+ * ------
+ * Yx is modified in place, Yx += A*Xx
+ *
+ */
+template <class I, class T>
+void csc_matvec(const I n_row,
+                const I n_col,
+                const I Ap[], const int Ap_size,
+                const I Ai[], const int Ai_size,
+                const T Ax[], const int Ax_size,
+                const T Xx[], const int Xx_size,
+                      T Yx[], const int Yx_size,
+                const I k)
+{
+    for(I j = 0; j < n_col; j++){
+        const T * x = Xx + k*j;
+        for(I ii = Ap[j]; ii < Ap[j+1]; ii++){
+            const T a = Ax[ii];
+            T * y = Yx + k*Ai[ii];
+            for(I c = 0; c < k; c++){
+                y[c] += a * x[c];
+            }
+        }
+    }
+}
+
+/*
+ * Compute the residual r = b - A*x for CSR matrix A
+ *
+ * Parameters
+ * ----------
+ * n_row : {int}
+ *      number of rows in A
+ * n_col : {int}
+ *      number of columns in A
+ * Ap : {int array}
+ *      CSR row pointer
+ * Aj : {int array}
+ *      CSR column indices
+ * Ax : {float|complex array}
+ *      CSR data array
+ * x : {float|complex array}
+ *      approximate solution, length n_col, or k solutions stored
+ *      row-wise as an (n_col, k) array in C order
+ * b : {float|complex array}
+ *      right hand side, length n_row, or an (n_row, k) array in C order
+ * r : {float|complex array}
+ *      residual, same shape as b
+ * k : {int}
+ *      number of vectors, i.e., columns of x, b and r
+ * num_threads : {int}
+ *      number of OpenMP threads, rows are split among the threads in
+ *      contiguous ranges with about the same number of nonzeros
+ *
+ * Return
+ * ------
+ * r is overwritten with b - A*x
+ *
+ */
+template <class I, class T>
+void csr_residual(const I n_row,
+                  const I n_col,
+                  const I Ap[], const int Ap_size,
+                  const I Aj[], const int Aj_size,
+                  const T Ax[], const int Ax_size,
+                  const T  x[], const int  x_size,
+                  const T  b[], const int  b_size,
+                        T  r[], const int  r_size,
+                  const I k,
+                  const I num_threads)
+{
+    if (k == 1) {
+        #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+        {
+            I row_start, row_stop;
+            thread_row_range(Ap, n_row, row_start, row_stop);
+            for(I i = row_start; i < row_stop; i++){
+                T sum = b[i];
+                for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                    sum -= Ax[jj] * x[Aj[jj]];
+                }
+                r[i] = sum;
+            }
+        }
+        return;
+    }
+
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        I row_start, row_stop;
+        thread_row_range(Ap, n_row, row_start, row_stop);
+        for(I i = row_start; i < row_stop; i++){
+            T * ri = r + k*i;
+            std::copy(b + k*i, b + k*(i+1), ri);
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const T a = Ax[jj];
+                const T * xj = x + k*Aj[jj];
+                for(I c = 0; c < k; c++){
+                    ri[c] -= a * xj[c];
+                }
+            }
+        }
+    }
+}
+
+/*
+ * Compute Y += A*X for BSR matrix A and dense vectors X,Y
+ *
+ * Parameters
+ * ----------
+ * n_brow : {int}
+ *      number of block rows in A
+ * n_bcol : {int}
+ *      number of block columns in A
+ * R : {int}
+ *      rows per block
+ * C : {int}
+ *      columns per block
+ * Ap : {int array}
+ *      BSR row pointer
+ * Aj : {int array}
+ *      BSR column indices
+ * Ax : {float|complex array}
+ *      BSR data array, blocks stored in row major order
+ * Xx : {float|complex array}
+ *      input vector, length C*n_bcol, or k vectors stored row-wise as
+ *      a (C*n_bcol, k) array in C order
+ * Yx : {float|complex array}
+ *      output vector, length R*n_brow, or an (R*n_brow, k) array in C order
+ * k : {int}
+ *      number of vectors, i.e., columns of Xx and Yx
+ * num_threads : {int}
+ *      number of OpenMP threads, rows are split among the threads in
+ *      contiguous ranges with about the same number of nonzeros
+ *
+ * Return
+ * ------
+ * Yx is modified in place, Yx += A*Xx
+ *
+ */
+template <class I, class T>
+void bsr_matvec(const I n_brow,
+                const I n_bcol,
+                const I R,
+                const I C,
+                const I Ap[], const int Ap_size,
+                const I Aj[], const int Aj_size,
+                const T Ax[], const int Ax_size,
+                const T Xx[], const int Xx_size,
+                      T Yx[], const int Yx_size,
+                const I k,
+                const I num_threads)
+{
+    const I RC = R*C;
+
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        I row_start, row_stop;
+        thread_row_range(Ap, n_brow, row_start, row_stop);
+        for(I i = row_start; i < row_stop; i++){
+            T * y = Yx + k*R*i;
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const T * A = Ax + RC*jj;
+                const T * x = Xx + k*C*Aj[jj];
+                if (k == 1) {
+                    for(I m = 0; m < R; m++){
+                        T sum = 0;
+                        for(I n = 0; n < C; n++){
+                            sum += A[m*C + n] * x[n];
+                        }
+                        y[m] += sum;
+                    }
+                }
+                else {
+                    for(I m = 0; m < R; m++){
+                        for(I n = 0; n < C; n++){
+                            const T a = A[m*C + n];
+                            for(I c = 0; c < k; c++){
+                                y[m*k + c] += a * x[n*k + c];
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+/*
+ * Compute the residual r = b - A*x for BSR matrix A
+ *
+ * Parameters
+ * ----------
+ * n_brow : {int}
+ *      number of block rows in A
+ * n_bcol : {int}
+ *      number of block columns in A
+ * R : {int}
+ *      rows per block
+ * C : {int}
+ *      columns per block
+ * Ap : {int array}
+ *      BSR row pointer
+ * Aj : {int array}
+ *      BSR column indices
+ * Ax : {float|complex array}
+ *      BSR data array, blocks stored in row major order
+ * x : {float|complex array}
+ *      approximate solution, length C*n_bcol, or k solutions stored
+ *      row-wise as a (C*n_bcol, k) array in C order
+ * b : {float|complex array}
+ *      right hand side, length R*n_brow, or an (R*n_brow, k) array in
+ *      C order
+ * r : {float|complex array}
+ *      residual, same shape as b
+ * k : {int}
+ *      number of vectors, i.e., columns of x, b and r
+ * num_threads : {int}
+ *      number of OpenMP threads, rows are split among the threads in
+ *      contiguous ranges with about the same number of nonzeros
+ *
+ * Return
+ * ------
+ * r is overwritten with b - A*x
+ *
+ */
+template <class I, class T>
+void bsr_residual(const I n_brow,
+                  const I n_bcol,
+                  const I R,
+                  const I C,
+                  const I Ap[], const int Ap_size,
+                  const I Aj[], const int Aj_size,
+                  const T Ax[], const int Ax_size,
+                  const T  x[], const int  x_size,
+                  const T  b[], const int  b_size,
+                        T  r[], const int  r_size,
+                  const I k,
+                  const I num_threads)
+{
+    const I RC = R*C;
+
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        I row_start, row_stop;
+        thread_row_range(Ap, n_brow, row_start, row_stop);
+        for(I i = row_start; i < row_stop; i++){
+            T * ri = r + k*R*i;
+            std::copy(b + k*R*i, b + k*R*(i+1), ri);
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const T * A = Ax + RC*jj;
+                const T * xj = x + k*C*Aj[jj];
+                if (k == 1) {
+                    for(I m = 0; m < R; m++){
+                        T sum = 0;
+                        for(I n = 0; n < C; n++){
+                            sum += A[m*C + n] * xj[n];
+                        }
+                        ri[m] -= sum;
+                    }
+                }
+                else {
+                    for(I m = 0; m < R; m++){
+                        for(I n = 0; n < C; n++){
+                            const T a = A[m*C + n];
+                            for(I c = 0; c < k; c++){
+                                ri[m*k + c] -= a * xj[n*k + c];
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+/*
+ * Compute the restricted residual y += R*(b - A*x) for CSR matrix A
+ *
+ * Fused kernel: the residual is formed one row at a time and immediately
+ * scattered into y through T = R.T, so A and T are read in a single pass
+ * and the fine level residual is never stored.  The kernel is serial.  If
+ * the rows of R have sorted column indices, the result is bitwise equal to
+ * that of csr_residual_restrict_gather.
+ *
+ * Parameters
+ * ----------
+ * n_row : {int}
+ *      number of rows in A
+ * n_col : {int}
+ *      number of columns in A
+ * Ap : {int array}
+ *      CSR row pointer of A
+ * Aj : {int array}
+ *      CSR column indices of A
+ * Ax : {float|complex array}
+ *      CSR data array of A
+ * x : {float|complex array}
+ *      approximate solution, length n_col, or k solutions stored
+ *      row-wise as an (n_col, k) array in C order
+ * b : {float|complex array}
+ *      right hand side, length n_row, or an (n_row, k) array in C order
+ * Tp : {int array}
+ *      CSR row pointer of T = R.T, an n_row x n_coarse matrix
+ * Tj : {int array}
+ *      CSR column indices of T
+ * Tx : {float|complex array}
+ *      CSR data array of T
+ * y : {float|complex array}
+ *      coarse right hand side, length n_coarse, or an (n_coarse, k)
+ *      array in C order
+ * k : {int}
+ *      number of vectors, i.e., columns of x, b and y
+ *
+ * Return
+ * ------
+ * y is modified in place, y += R*(b - A*x)
+ *
+ */
+template <class I, class T>
+void csr_residual_restrict(const I n_row,
+                           const I n_col,
+                           const I Ap[], const int Ap_size,
+                           const I Aj[], const int Aj_size,
+                           const T Ax[], const int Ax_size,
+                           const T  x[], const int  x_size,
+                           const T  b[], const int  b_size,
+                           const I Tp[], const int Tp_size,
+                           const I Tj[], const int Tj_size,
+                           const T Tx[], const int Tx_size,
+                                 T  y[], const int  y_size,
+                           const I k)
+{
+    if (k == 1) {
+        for(I i = 0; i < n_row; i++){
+            T r = b[i];
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                r -= Ax[jj] * x[Aj[jj]];
+            }
+            for(I jj = Tp[i]; jj < Tp[i+1]; jj++){
+                y[Tj[jj]] += Tx[jj] * r;
+            }
+        }
+        return;
+    }
+
+    std::vector<T> r(k);
+    for(I i = 0; i < n_row; i++){
+        std::copy(b + k*i, b + k*(i+1), r.begin());
+        for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+            const T a = Ax[jj];
+            const T * xj = x + k*Aj[jj];
+            for(I c = 0; c < k; c++){
+                r[c] -= a * xj[c];
+            }
+        }
+        for(I jj = Tp[i]; jj < Tp[i+1]; jj++){
+            const T t = Tx[jj];
+            T * yj = y + k*Tj[jj];
+            for(I c = 0; c < k; c++){
+                yj[c] += t * r[c];
+            }
+        }
+    }
+}
+
+/*
+ * Compute the restricted residual y += R*(b - A*x) for BSR matrix A
+ *
+ * As csr_residual_restrict, for block rows.  The residual is formed one
+ * block row at a time and scattered into y through T = R.T, whose blocks
+ * have as many rows as the blocks of A.
+ *
+ * Parameters
+ * ----------
+ * n_brow : {int}
+ *      number of block rows in A
+ * n_bcol : {int}
+ *      number of block columns in A
+ * RA : {int}
+ *      rows per block of A
+ * CA : {int}
+ *      columns per block of A
+ * D : {int}
+ *      columns per block of T, whose blocks are RA x D
+ * Ap : {int array}
+ *      BSR row pointer of A
+ * Aj : {int array}
+ *      BSR column indices of A
+ * Ax : {float|complex array}
+ *      BSR data array of A, blocks stored in row major order
+ * x : {float|complex array}
+ *      approximate solution, length CA*n_bcol, or k solutions stored
+ *      row-wise as a (CA*n_bcol, k) array in C order
+ * b : {float|complex array}
+ *      right hand side, length RA*n_brow, or an (RA*n_brow, k) array in
+ *      C order
+ * Tp : {int array}
+ *      BSR row pointer of T = R.T
+ * Tj : {int array}
+ *      BSR column indices of T
+ * Tx : {float|complex array}
+ *      BSR data array of T, blocks stored in row major order
+ * y : {float|complex array}
+ *      coarse right hand side, or k of them stored row-wise
+ * k : {int}
+ *      number of vectors, i.e., columns of x, b and y
+ *
+ * Return
+ * ------
+ * y is modified in place, y += R*(b - A*x)
+ *
+ */
+template <class I, class T>
+void bsr_residual_restrict(const I n_brow,
+                           const I n_bcol,
+                           const I RA,
+                           const I CA,
+                           const I D,
+                           const I Ap[], const int Ap_size,
+                           const I Aj[], const int Aj_size,
+                           const T Ax[], const int Ax_size,
+                           const T  x[], const int  x_size,
+                           const T  b[], const int  b_size,
+                           const I Tp[], const int Tp_size,
+                           const I Tj[], const int Tj_size,
+                           const T Tx[], const int Tx_size,
+                                 T  y[], const int  y_size,
+                           const I k)
+{
+    const I RC = RA*CA;
+    const I RD = RA*D;
+    std::vector<T> r(RA*k);
+
+    for(I i = 0; i < n_brow; i++){
+        std::copy(b + k*RA*i, b + k*RA*(i+1), r.begin());
+        for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+            const T * A = Ax + RC*jj;
+            const T * xj = x + k*CA*Aj[jj];
+            if (k == 1) {
+                for(I m = 0; m < RA; m++){
+                    T sum = 0;
+                    for(I n = 0; n < CA; n++){
+                        sum += A[m*CA + n] * xj[n];
+                    }
+                    r[m] -= sum;
+                }
+            }
+            else {
+                for(I m = 0; m < RA; m++){
+                    for(I n = 0; n < CA; n++){
+                        const T a = A[m*CA + n];
+                        for(I c = 0; c < k; c++){
+                            r[m*k + c] -= a * xj[n*k + c];
+                        }
+                    }
+                }
+            }
+        }
+        for(I jj = Tp[i]; jj < Tp[i+1]; jj++){
+            const T * Tb = Tx + RD*jj;
+            T * yj = y + k*D*Tj[jj];
+            if (k == 1) {
+                for(I d = 0; d < D; d++){
+                    T sum = 0;
+                    for(I m = 0; m < RA; m++){
+                        sum += Tb[m*D + d] * r[m];
+                    }
+                    yj[d] += sum;
+                }
+            }
+            else {
+                for(I d = 0; d < D; d++){
+                    for(I m = 0; m < RA; m++){
+                        const T t = Tb[m*D + d];
+                        for(I c = 0; c < k; c++){
+                            yj[d*k + c] += t * r[m*k + c];
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+/*
+ * Compute the restricted residual y += R*(b - A*x) for CSR matrices A, R
+ *
+ * Two-pass kernel, not fused: the residual r = b - A*x is written to a
+ * work array and read again through the rows of R.  Within one parallel
+ * region, the rows of r are split over the threads, and after a barrier
+ * the rows of y, each of which is gathered through the corresponding row
+ * of R.  No transpose of R is needed, and the result does not depend on
+ * the number of threads.  Use csr_residual_restrict if R.T is at hand.
+ *
+ * Parameters
+ * ----------
+ * n_row : {int}
+ *      number of rows in A
+ * n_col : {int}
+ *      number of columns in A
+ * n_coarse : {int}
+ *      number of rows in R
+ * Ap : {int array}
+ *      CSR row pointer of A
+ * Aj : {int array}
+ *      CSR column indices of A
+ * Ax : {float|complex array}
+ *      CSR data array of A
+ * x : {float|complex array}
+ *      approximate solution, length n_col, or k solutions stored
+ *      row-wise as an (n_col, k) array in C order
+ * b : {float|complex array}
+ *      right hand side, length n_row, or an (n_row, k) array in C order
+ * Rp : {int array}
+ *      CSR row pointer of R, an n_coarse x n_row matrix
+ * Rj : {int array}
+ *      CSR column indices of R
+ * Rx : {float|complex array}
+ *      CSR data array of R
+ * r : {float|complex array}
+ *      work array for the residual, same size as b
+ * y : {float|complex array}
+ *      coarse right hand side, length n_coarse, or an (n_coarse, k)
+ *      array in C order
+ * k : {int}
+ *      number of vectors, i.e., columns of x, b, r and y
+ * num_threads : {int}
+ *      number of OpenMP threads, see csr_matvec
+ *
+ * Return
+ * ------
+ * y is modified in place, y += R*(b - A*x), and r holds b - A*x
+ *
+ */
+template <class I, class T>
+void csr_residual_restrict_gather(const I n_row,
+                                  const I n_col,
+                                  const I n_coarse,
+                                  const I Ap[], const int Ap_size,
+                                  const I Aj[], const int Aj_size,
+                                  const T Ax[], const int Ax_size,
+                                  const T  x[], const int  x_size,
+                                  const T  b[], const int  b_size,
+                                  const I Rp[], const int Rp_size,
+                                  const I Rj[], const int Rj_size,
+                                  const T Rx[], const int Rx_size,
+                                        T  r[], const int  r_size,
+                                        T  y[], const int  y_size,
+                                  const I k,
+                                  const I num_threads)
+{
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        I row_start, row_stop;
+        thread_row_range(Ap, n_row, row_start, row_stop);
+        if (k == 1) {
+            for(I i = row_start; i < row_stop; i++){
+                T sum = b[i];
+                for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                    sum -= Ax[jj] * x[Aj[jj]];
+                }
+                r[i] = sum;
+            }
+        } else {
+            for(I i = row_start; i < row_stop; i++){
+                T * ri = r + k*i;
+                std::copy(b + k*i, b + k*(i+1), ri);
+                for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                    const T a = Ax[jj];
+                    const T * xj = x + k*Aj[jj];
+                    for(I c = 0; c < k; c++){
+                        ri[c] -= a * xj[c];
+                    }
+                }
+            }
+        }
+
+        #pragma omp barrier
+
+        thread_row_range(Rp, n_coarse, row_start, row_stop);
+        if (k == 1) {
+            for(I i = row_start; i < row_stop; i++){
+                T sum = y[i];
+                for(I jj = Rp[i]; jj < Rp[i+1]; jj++){
+                    sum += Rx[jj] * r[Rj[jj]];
+                }
+                y[i] = sum;
+            }
+        } else {
+            for(I i = row_start; i < row_stop; i++){
+                T * yi = y + k*i;
+                for(I jj = Rp[i]; jj < Rp[i+1]; jj++){
+                    const T t = Rx[jj];
+                    const T * rj = r + k*Rj[jj];
+                    for(I c = 0; c < k; c++){
+                        yi[c] += t * rj[c];
+                    }
+                }
+            }
+        }
+    }
+}
+
+/*
+ * Compute the restricted residual y += R*(b - A*x) for BSR matrices A, R
+ *
+ * As csr_residual_restrict_gather, for block rows, and also not fused.
+ * The blocks of R have as many columns as the blocks of A have rows.  A
+ * CSR matrix is passed as a BSR matrix with 1 x 1 blocks, but if both A
+ * and R have 1 x 1 blocks, csr_residual_restrict_gather is faster.
+ *
+ * Parameters
+ * ----------
+ * n_brow : {int}
+ *      number of block rows in A
+ * n_bcol : {int}
+ *      number of block columns in A
+ * n_coarse : {int}
+ *      number of block rows in R
+ * RA : {int}
+ *      rows per block of A
+ * CA : {int}
+ *      columns per block of A
+ * D : {int}
+ *      rows per block of R, whose blocks are D x RA
+ * Ap : {int array}
+ *      BSR row pointer of A
+ * Aj : {int array}
+ *      BSR column indices of A
+ * Ax : {float|complex array}
+ *      BSR data array of A, blocks stored in row major order
+ * x : {float|complex array}
+ *      approximate solution, length CA*n_bcol, or k solutions stored
+ *      row-wise as a (CA*n_bcol, k) array in C order
+ * b : {float|complex array}
+ *      right hand side, length RA*n_brow, or an (RA*n_brow, k) array in
+ *      C order
+ * Rp : {int array}
+ *      BSR row pointer of R
+ * Rj : {int array}
+ *      BSR column indices of R
+ * Rx : {float|complex array}
+ *      BSR data array of R, blocks stored in row major order
+ * r : {float|complex array}
+ *      work array for the residual, same size as b
+ * y : {float|complex array}
+ *      coarse right hand side, length D*n_coarse, or k of them stored
+ *      row-wise
+ * k : {int}
+ *      number of vectors, i.e., columns of x, b, r and y
+ * num_threads : {int}
+ *      number of OpenMP threads, see csr_matvec
+ *
+ * Return
+ * ------
+ * y is modified in place, y += R*(b - A*x), and r holds b - A*x
+ *
+ */
+template <class I, class T>
+void bsr_residual_restrict_gather(const I n_brow,
+                                  const I n_bcol,
+                                  const I n_coarse,
+                                  const I RA,
+                                  const I CA,
+                                  const I D,
+                                  const I Ap[], const int Ap_size,
+                                  const I Aj[], const int Aj_size,
+                                  const T Ax[], const int Ax_size,
+                                  const T  x[], const int  x_size,
+                                  const T  b[], const int  b_size,
+                                  const I Rp[], const int Rp_size,
+                                  const I Rj[], const int Rj_size,
+                                  const T Rx[], const int Rx_size,
+                                        T  r[], const int  r_size,
+                                        T  y[], const int  y_size,
+                                  const I k,
+                                  const I num_threads)
+{
+    const I RC = RA*CA;
+    const I DR = D*RA;
+
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        I row_start, row_stop;
+        thread_row_range(Ap, n_brow, row_start, row_stop);
+        for(I i = row_start; i < row_stop; i++){
+            T * ri = r + k*RA*i;
+            std::copy(b + k*RA*i, b + k*RA*(i+1), ri);
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const T * A = Ax + RC*jj;
+                const T * xj = x + k*CA*Aj[jj];
+                if (k == 1) {
+                    for(I m = 0; m < RA; m++){
+                        T sum = 0;
+                        for(I n = 0; n < CA; n++){
+                            sum += A[m*CA + n] * xj[n];
+                        }
+                        ri[m] -= sum;
+                    }
+                }
+                else {
+                    for(I m = 0; m < RA; m++){
+                        for(I n = 0; n < CA; n++){
+                            const T a = A[m*CA + n];
+                            for(I c = 0; c < k; c++){
+                                ri[m*k + c] -= a * xj[n*k + c];
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        #pragma omp barrier
+
+        thread_row_range(Rp, n_coarse, row_start, row_stop);
+        for(I i = row_start; i < row_stop; i++){
+            T * yi = y + k*D*i;
+            for(I jj = Rp[i]; jj < Rp[i+1]; jj++){
+                const T * Rb = Rx + DR*jj;
+                const T * rj = r + k*RA*Rj[jj];
+                if (k == 1) {
+                    for(I d = 0; d < D; d++){
+                        T sum = 0;
+                        for(I m = 0; m < RA; m++){
+                            sum += Rb[d*RA + m] * rj[m];
+                        }
+                        yi[d] += sum;
+                    }
+                }
+                else {
+                    for(I d = 0; d < D; d++){
+                        for(I m = 0; m < RA; m++){
+                            const T t = Rb[d*RA + m];
+                            for(I c = 0; c < k; c++){
+                                yi[d*k + c] += t * rj[m*k + c];
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+/*
+ * Count the nonzeros (blocks) per row of the Galerkin product C = R*A*P
+ *
+ * Only the sparsity patterns of R, A and P are used, the product R*A is
+ * never formed.  The pattern of C can be computed once and reused by
+ * bsr_rap_numeric and bsr_ptap_numeric for operators with new values.
+ *
+ * Parameters
+ * ----------
+ * n_row : {int}
+ *      number of (block) rows in R and C
+ * n_col : {int}
+ *      number of (block) columns in P and C
+ * Rp, Rj : {int array}
+ *      CSR (or BSR) row pointer and column indices of R
+ * Ap, Aj : {int array}
+ *      CSR (or BSR) row pointer and column indices of A
+ * Pp, Pj : {int array}
+ *      CSR (or BSR) row pointer and column indices of P
+ * Cp : {int array}
+ *      row pointer of C, length n_row + 1
+ * num_threads : {int}
+ *      number of OpenMP threads
+ *
+ * Return
+ * ------
+ * Cp is modified in place, the row pointer of C
+ *
+ * Notes
+ * -----
+ * For R = P^T, pass the pattern of P^T for Rp, Rj.
+ *
+ */
+template <class I>
+void rap_symbolic_pass1(const I n_row,
+                        const I n_col,
+                        const I Rp[], const int Rp_size,
+                        const I Rj[], const int Rj_size,
+                        const I Ap[], const int Ap_size,
+                        const I Aj[], const int Aj_size,
+                        const I Pp[], const int Pp_size,
+                        const I Pj[], const int Pj_size,
+                              I Cp[], const int Cp_size,
+                        const I num_threads)
+{
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        std::vector<I> mask(n_col, -1);
+        I row_start, row_stop;
+        thread_row_range(Rp, n_row, row_start, row_stop);
+        for(I i = row_start; i < row_stop; i++){
+            I nnz = 0;
+            for(I rr = Rp[i]; rr < Rp[i+1]; rr++){
+                const I k = Rj[rr];
+                for(I aa = Ap[k]; aa < Ap[k+1]; aa++){
+                    const I l = Aj[aa];
+                    for(I pp = Pp[l]; pp < Pp[l+1]; pp++){
+                        const I j = Pj[pp];
+                        if(mask[j] != i){
+                            mask[j] = i;
+                            nnz++;
+                        }
+                    }
+                }
+            }
+            Cp[i+1] = nnz;
+        }
+    }
+
+    Cp[0] = 0;
+    for(I i = 0; i < n_row; i++){
+        Cp[i+1] += Cp[i];
+    }
+}
+
+/*
+ * Column indices of the Galerkin product C = R*A*P
+ *
+ * Parameters
+ * ----------
+ * n_row, n_col, Rp, Rj, Ap, Aj, Pp, Pj : see rap_symbolic_pass1
+ * Cp : {int array}
+ *      row pointer of C from rap_symbolic_pass1
+ * Cj : {int array}
+ *      column indices of C, length Cp[n_row]
+ * num_threads : {int}
+ *      number of OpenMP threads
+ *
+ * Return
+ * ------
+ * Cj is modified in place, the column indices of C sorted in each row
+ *
+ */
+template <class I>
+void rap_symbolic_pass2(const I n_row,
+                        const I n_col,
+                        const I Rp[], const int Rp_size,
+                        const I Rj[], const int Rj_size,
+                        const I Ap[], const int Ap_size,
+                        const I Aj[], const int Aj_size,
+                        const I Pp[], const int Pp_size,
+                        const I Pj[], const int Pj_size,
+                        const I Cp[], const int Cp_size,
+                              I Cj[], const int Cj_size,
+                        const I num_threads)
+{
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        std::vector<I> mask(n_col, -1);
+        I row_start, row_stop;
+        thread_row_range(Rp, n_row, row_start, row_stop);
+        for(I i = row_start; i < row_stop; i++){
+            I nnz = Cp[i];
+            for(I rr = Rp[i]; rr < Rp[i+1]; rr++){
+                const I k = Rj[rr];
+                for(I aa = Ap[k]; aa < Ap[k+1]; aa++){
+                    const I l = Aj[aa];
+                    for(I pp = Pp[l]; pp < Pp[l+1]; pp++){
+                        const I j = Pj[pp];
+                        if(mask[j] != i){
+                            mask[j] = i;
+                            Cj[nnz++] = j;
+                        }
+                    }
+                }
+            }
+            std::sort(Cj + Cp[i], Cj + Cp[i+1]);
+        }
+    }
+}
+
+/*
+ * Compute the values of the Galerkin product C = R*A*P on a given pattern
+ *
+ * The rows of C are computed one at a time.  For each block R_ik and
+ * A_kl, the product R_ik*A_kl is formed in a small buffer and multiplied
+ * by the blocks of row l of P, so that R*A is never stored.
+ *
+ * Parameters
+ * ----------
+ * n_row : {int}
+ *      number of block rows in R and C
+ * n_col : {int}
+ *      number of block columns in P and C
+ * Rp, Rj, Rx : {int|float|complex array}
+ *      BSR representation of R with (RB x AB) blocks
+ * Ap, Aj, Ax : {int|float|complex array}
+ *      BSR representation of A with (AB x AB) blocks
+ * Pp, Pj, Px : {int|float|complex array}
+ *      BSR representation of P with (AB x PB) blocks
+ * Cp, Cj : {int array}
+ *      pattern of C from rap_symbolic_pass1 and rap_symbolic_pass2
+ * Cx : {float|complex array}
+ *      values of C with (RB x PB) blocks
+ * RB, AB, PB : {int}
+ *      block sizes, 1 for CSR matrices
+ * num_threads : {int}
+ *      number of OpenMP threads
+ *
+ * Return
+ * ------
+ * The number of blocks of R*A*P outside the pattern of C, which are
+ * dropped.  Cx is overwritten with the values of R*A*P.
+ *
+ * Notes
+ * -----
+ * The pattern of C should contain the pattern of R*A*P.  Each row of C is
+ * computed by a single thread, so that the result is identical for any
+ * number of threads.
+ *
+ */
+template <class I, class T>
+I bsr_rap_numeric(const I n_row,
+                     const I n_col,
+                     const I Rp[], const int Rp_size,
+                     const I Rj[], const int Rj_size,
+                     const T Rx[], const int Rx_size,
+                     const I Ap[], const int Ap_size,
+                     const I Aj[], const int Aj_size,
+                     const T Ax[], const int Ax_size,
+                     const I Pp[], const int Pp_size,
+                     const I Pj[], const int Pj_size,
+                     const T Px[], const int Px_size,
+                     const I Cp[], const int Cp_size,
+                     const I Cj[], const int Cj_size,
+                           T Cx[], const int Cx_size,
+                     const I RB,
+                     const I AB,
+                     const I PB,
+                     const I num_threads)
+{
+    const I RA = RB*AB;
+    const I AA = AB*AB;
+    const I AP = AB*PB;
+    const I RP = RB*PB;
+    I missing = 0;
+
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)\
+        reduction(+:missing)
+    {
+        std::vector<I> pos(n_col, -1);
+        std::vector<T> RAb(RA);
+        I row_start, row_stop;
+        thread_row_range(Rp, n_row, row_start, row_stop);
+        for(I i = row_start; i < row_stop; i++){
+            for(I jj = Cp[i]; jj < Cp[i+1]; jj++){
+                pos[Cj[jj]] = jj;
+                std::fill(Cx + RP*jj, Cx + RP*(jj + 1), T(0));
+            }
+            for(I rr = Rp[i]; rr < Rp[i+1]; rr++){
+                const I k = Rj[rr];
+                const T * Rb = Rx + RA*rr;
+                for(I aa = Ap[k]; aa < Ap[k+1]; aa++){
+                    const I l = Aj[aa];
+                    const T * Ab = Ax + AA*aa;
+                    // RAb = R_ik * A_kl
+                    for(I m = 0; m < RB; m++){
+                        for(I n = 0; n < AB; n++){
+                            T sum = 0;
+                            for(I q = 0; q < AB; q++){
+                                sum += Rb[m*AB + q] * Ab[q*AB + n];
+                            }
+                            RAb[m*AB + n] = sum;
+                        }
+                    }
+                    // C_ij += RAb * P_lj
+                    for(I pp = Pp[l]; pp < Pp[l+1]; pp++){
+                        const I jj = pos[Pj[pp]];
+                        if(jj < 0){
+                            missing++;
+                            continue;
+                        }
+                        const T * Pb = Px + AP*pp;
+                        T * Cb = Cx + RP*jj;
+                        for(I m = 0; m < RB; m++){
+                            for(I n = 0; n < AB; n++){
+                                const T ra = RAb[m*AB + n];
+                                for(I q = 0; q < PB; q++){
+                                    Cb[m*PB + q] += ra * Pb[n*PB + q];
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+            for(I jj = Cp[i]; jj < Cp[i+1]; jj++){
+                pos[Cj[jj]] = -1;
+            }
+        }
+    }
+
+    return missing;
+}
+
+/*
+ * Compute the values of the Galerkin product C = P^T*A*P (or P^H*A*P) on
+ * a given pattern, without forming R = P^T
+ *
+ * For each block row k of A, the row k of A*P is accumulated in a
+ * sparse buffer and then scattered to the rows of C given by the
+ * columns of row k of P.
+ *
+ * Parameters
+ * ----------
+ * n_row : {int}
+ *      number of block rows in A and P
+ * n_col : {int}
+ *      number of block columns in P, i.e., block rows of C
+ * Ap, Aj, Ax : {int|float|complex array}
+ *      BSR representation of A with (AB x AB) blocks
+ * Pp, Pj, Px : {int|float|complex array}
+ *      BSR representation of P with (AB x PB) blocks
+ * Cp, Cj : {int array}
+ *      pattern of C from rap_symbolic_pass1 and rap_symbolic_pass2, with
+ *      column indices sorted in each row
+ * Cx : {float|complex array}
+ *      values of C with (PB x PB) blocks
+ * AB, PB : {int}
+ *      block sizes, 1 for CSR matrices
+ * hermitian : {int}
+ *      if nonzero, compute P^H*A*P, otherwise P^T*A*P
+ *
+ * Return
+ * ------
+ * The number of blocks of P^T*A*P outside the pattern of C, which are
+ * dropped.  Cx is overwritten with the values of P^T*A*P or P^H*A*P.
+ *
+ * Notes
+ * -----
+ * The scatter to the rows of C is serial.
+ *
+ */
+template <class I, class T>
+I bsr_ptap_numeric(const I n_row,
+                      const I n_col,
+                      const I Ap[], const int Ap_size,
+                      const I Aj[], const int Aj_size,
+                      const T Ax[], const int Ax_size,
+                      const I Pp[], const int Pp_size,
+                      const I Pj[], const int Pj_size,
+                      const T Px[], const int Px_size,
+                      const I Cp[], const int Cp_size,
+                      const I Cj[], const int Cj_size,
+                            T Cx[], const int Cx_size,
+                      const I AB,
+                      const I PB,
+                      const I hermitian)
+{
+    const I AA = AB*AB;
+    const I AP = AB*PB;
+    const I PP = PB*PB;
+    I missing = 0;
+
+    std::fill(Cx, Cx + (size_t) PP*Cp[n_col], T(0));
+
+    std::vector<I> mask(n_col, -1);
+    std::vector<I> cols;
+    std::vector<T> APx((size_t) n_col * AP);
+    std::vector<T> Ptb(AP);
+
+    for(I k = 0; k < n_row; k++){
+        // row k of A*P
+        cols.clear();
+        for(I aa = Ap[k]; aa < Ap[k+1]; aa++){
+            const I l = Aj[aa];
+            const T * Ab = Ax + AA*aa;
+            for(I pp = Pp[l]; pp < Pp[l+1]; pp++){
+                const I j = Pj[pp];
+                T * APb = &APx[(size_t) j * AP];
+                if(mask[j] != k){
+                    mask[j] = k;
+                    cols.push_back(j);
+                    std::fill(APb, APb + AP, T(0));
+                }
+                const T * Pb = Px + AP*pp;
+                for(I m = 0; m < AB; m++){
+                    for(I n = 0; n < AB; n++){
+                        const T a = Ab[m*AB + n];
+                        for(I q = 0; q < PB; q++){
+                            APb[m*PB + q] += a * Pb[n*PB + q];
+                        }
+                    }
+                }
+            }
+        }
+
+        // C_ij += (P_ki)^T * (A*P)_kj
+        for(I pk = Pp[k]; pk < Pp[k+1]; pk++){
+            const I i = Pj[pk];
+            const T * Pb = Px + AP*pk;
+            for(I m = 0; m < PB; m++){
+                for(I n = 0; n < AB; n++){
+                    Ptb[m*AB + n] = hermitian ? conjugate(Pb[n*PB + m])
+                                              : Pb[n*PB + m];
+                }
+            }
+            const I * row_start = Cj + Cp[i];
+            const I * row_stop = Cj + Cp[i+1];
+            for(size_t c = 0; c < cols.size(); c++){
+                const I j = cols[c];
+                const I * col = std::lower_bound(row_start, row_stop, j);
+                if(col == row_stop || *col != j){
+                    missing++;
+                    continue;
+                }
+                const I jj = (I) (col - Cj);
+                const T * APb = &APx[(size_t) j * AP];
+                T * Cb = Cx + PP*jj;
+                for(I m = 0; m < PB; m++){
+                    for(I n = 0; n < AB; n++){
+                        const T pt = Ptb[m*AB + n];
+                        for(I q = 0; q < PB; q++){
+                            Cb[m*PB + q] += pt * APb[n*PB + q];
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    return missing;
+}
+
 #endif
@@ -85,6 +85,651 @@ void _csc_scale_rows(
                                  );
 }
 
+template <class I, class T>
+void _csr_matvec(
+            const I n_row,
+            const I n_col,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+      py::array_t<T> & Xx,
+      py::array_t<T> & Yx,
+                const I k,
+      const I num_threads
+                 )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_Xx = Xx.unchecked();
+    auto py_Yx = Yx.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const T *_Xx = py_Xx.data();
+    T *_Yx = py_Yx.mutable_data();
+
+    return csr_matvec <I, T>(
+                    n_row,
+                    n_col,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                      _Xx, Xx.shape(0),
+                      _Yx, Yx.shape(0),
+                        k,
+              num_threads
+                             );
+}
+
+template <class I, class T>
+void _csc_matvec(
+            const I n_row,
+            const I n_col,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Ai,
+      py::array_t<T> & Ax,
+      py::array_t<T> & Xx,
+      py::array_t<T> & Yx,
+                const I k
+                 )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Ai = Ai.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_Xx = Xx.unchecked();
+    auto py_Yx = Yx.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Ai = py_Ai.data();
+    const T *_Ax = py_Ax.data();
+    const T *_Xx = py_Xx.data();
+    T *_Yx = py_Yx.mutable_data();
+
+    return csc_matvec <I, T>(
+                    n_row,
+                    n_col,
+                      _Ap, Ap.shape(0),
+                      _Ai, Ai.shape(0),
+                      _Ax, Ax.shape(0),
+                      _Xx, Xx.shape(0),
+                      _Yx, Yx.shape(0),
+                        k
+                             );
+}
+
+template <class I, class T>
+void _csr_residual(
+            const I n_row,
+            const I n_col,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+       py::array_t<T> & r,
+                const I k,
+      const I num_threads
+                   )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.unchecked();
+    auto py_b = b.unchecked();
+    auto py_r = r.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const T *_x = py_x.data();
+    const T *_b = py_b.data();
+    T *_r = py_r.mutable_data();
+
+    return csr_residual <I, T>(
+                    n_row,
+                    n_col,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                       _r, r.shape(0),
+                        k,
+              num_threads
+                               );
+}
+
+template <class I, class T>
+void _bsr_matvec(
+           const I n_brow,
+           const I n_bcol,
+                const I R,
+                const I C,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+      py::array_t<T> & Xx,
+      py::array_t<T> & Yx,
+                const I k,
+      const I num_threads
+                 )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_Xx = Xx.unchecked();
+    auto py_Yx = Yx.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const T *_Xx = py_Xx.data();
+    T *_Yx = py_Yx.mutable_data();
+
+    return bsr_matvec <I, T>(
+                   n_brow,
+                   n_bcol,
+                        R,
+                        C,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                      _Xx, Xx.shape(0),
+                      _Yx, Yx.shape(0),
+                        k,
+              num_threads
+                             );
+}
+
+template <class I, class T>
+void _bsr_residual(
+           const I n_brow,
+           const I n_bcol,
+                const I R,
+                const I C,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+       py::array_t<T> & r,
+                const I k,
+      const I num_threads
+                   )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.unchecked();
+    auto py_b = b.unchecked();
+    auto py_r = r.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const T *_x = py_x.data();
+    const T *_b = py_b.data();
+    T *_r = py_r.mutable_data();
+
+    return bsr_residual <I, T>(
+                   n_brow,
+                   n_bcol,
+                        R,
+                        C,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                       _r, r.shape(0),
+                        k,
+              num_threads
+                               );
+}
+
+template <class I, class T>
+void _csr_residual_restrict(
+            const I n_row,
+            const I n_col,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+      py::array_t<I> & Tp,
+      py::array_t<I> & Tj,
+      py::array_t<T> & Tx,
+       py::array_t<T> & y,
+                const I k
+                            )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.unchecked();
+    auto py_b = b.unchecked();
+    auto py_Tp = Tp.unchecked();
+    auto py_Tj = Tj.unchecked();
+    auto py_Tx = Tx.unchecked();
+    auto py_y = y.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const T *_x = py_x.data();
+    const T *_b = py_b.data();
+    const I *_Tp = py_Tp.data();
+    const I *_Tj = py_Tj.data();
+    const T *_Tx = py_Tx.data();
+    T *_y = py_y.mutable_data();
+
+    return csr_residual_restrict <I, T>(
+                    n_row,
+                    n_col,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                      _Tp, Tp.shape(0),
+                      _Tj, Tj.shape(0),
+                      _Tx, Tx.shape(0),
+                       _y, y.shape(0),
+                        k
+                                        );
+}
+
+template <class I, class T>
+void _bsr_residual_restrict(
+           const I n_brow,
+           const I n_bcol,
+               const I RA,
+               const I CA,
+                const I D,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+      py::array_t<I> & Tp,
+      py::array_t<I> & Tj,
+      py::array_t<T> & Tx,
+       py::array_t<T> & y,
+                const I k
+                            )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.unchecked();
+    auto py_b = b.unchecked();
+    auto py_Tp = Tp.unchecked();
+    auto py_Tj = Tj.unchecked();
+    auto py_Tx = Tx.unchecked();
+    auto py_y = y.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const T *_x = py_x.data();
+    const T *_b = py_b.data();
+    const I *_Tp = py_Tp.data();
+    const I *_Tj = py_Tj.data();
+    const T *_Tx = py_Tx.data();
+    T *_y = py_y.mutable_data();
+
+    return bsr_residual_restrict <I, T>(
+                   n_brow,
+                   n_bcol,
+                       RA,
+                       CA,
+                        D,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                      _Tp, Tp.shape(0),
+                      _Tj, Tj.shape(0),
+                      _Tx, Tx.shape(0),
+                       _y, y.shape(0),
+                        k
+                                        );
+}
+
+template <class I, class T>
+void _csr_residual_restrict_gather(
+            const I n_row,
+            const I n_col,
+         const I n_coarse,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+      py::array_t<I> & Rp,
+      py::array_t<I> & Rj,
+      py::array_t<T> & Rx,
+       py::array_t<T> & r,
+       py::array_t<T> & y,
+                const I k,
+      const I num_threads
+                                   )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.unchecked();
+    auto py_b = b.unchecked();
+    auto py_Rp = Rp.unchecked();
+    auto py_Rj = Rj.unchecked();
+    auto py_Rx = Rx.unchecked();
+    auto py_r = r.mutable_unchecked();
+    auto py_y = y.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const T *_x = py_x.data();
+    const T *_b = py_b.data();
+    const I *_Rp = py_Rp.data();
+    const I *_Rj = py_Rj.data();
+    const T *_Rx = py_Rx.data();
+    T *_r = py_r.mutable_data();
+    T *_y = py_y.mutable_data();
+
+    return csr_residual_restrict_gather <I, T>(
+                    n_row,
+                    n_col,
+                 n_coarse,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                      _Rp, Rp.shape(0),
+                      _Rj, Rj.shape(0),
+                      _Rx, Rx.shape(0),
+                       _r, r.shape(0),
+                       _y, y.shape(0),
+                        k,
+              num_threads
+                                               );
+}
+
+template <class I, class T>
+void _bsr_residual_restrict_gather(
+           const I n_brow,
+           const I n_bcol,
+         const I n_coarse,
+               const I RA,
+               const I CA,
+                const I D,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+      py::array_t<I> & Rp,
+      py::array_t<I> & Rj,
+      py::array_t<T> & Rx,
+       py::array_t<T> & r,
+       py::array_t<T> & y,
+                const I k,
+      const I num_threads
+                                   )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.unchecked();
+    auto py_b = b.unchecked();
+    auto py_Rp = Rp.unchecked();
+    auto py_Rj = Rj.unchecked();
+    auto py_Rx = Rx.unchecked();
+    auto py_r = r.mutable_unchecked();
+    auto py_y = y.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const T *_x = py_x.data();
+    const T *_b = py_b.data();
+    const I *_Rp = py_Rp.data();
+    const I *_Rj = py_Rj.data();
+    const T *_Rx = py_Rx.data();
+    T *_r = py_r.mutable_data();
+    T *_y = py_y.mutable_data();
+
+    return bsr_residual_restrict_gather <I, T>(
+                   n_brow,
+                   n_bcol,
+                 n_coarse,
+                       RA,
+                       CA,
+                        D,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                      _Rp, Rp.shape(0),
+                      _Rj, Rj.shape(0),
+                      _Rx, Rx.shape(0),
+                       _r, r.shape(0),
+                       _y, y.shape(0),
+                        k,
+              num_threads
+                                               );
+}
+
+template <class I>
+void _rap_symbolic_pass1(
+            const I n_row,
+            const I n_col,
+      py::array_t<I> & Rp,
+      py::array_t<I> & Rj,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<I> & Pp,
+      py::array_t<I> & Pj,
+      py::array_t<I> & Cp,
+      const I num_threads
+                         )
+{
+    auto py_Rp = Rp.unchecked();
+    auto py_Rj = Rj.unchecked();
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Pp = Pp.unchecked();
+    auto py_Pj = Pj.unchecked();
+    auto py_Cp = Cp.mutable_unchecked();
+    const I *_Rp = py_Rp.data();
+    const I *_Rj = py_Rj.data();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const I *_Pp = py_Pp.data();
+    const I *_Pj = py_Pj.data();
+    I *_Cp = py_Cp.mutable_data();
+
+    return rap_symbolic_pass1 <I>(
+                    n_row,
+                    n_col,
+                      _Rp, Rp.shape(0),
+                      _Rj, Rj.shape(0),
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Pp, Pp.shape(0),
+                      _Pj, Pj.shape(0),
+                      _Cp, Cp.shape(0),
+              num_threads
+                                  );
+}
+
+template <class I>
+void _rap_symbolic_pass2(
+            const I n_row,
+            const I n_col,
+      py::array_t<I> & Rp,
+      py::array_t<I> & Rj,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<I> & Pp,
+      py::array_t<I> & Pj,
+      py::array_t<I> & Cp,
+      py::array_t<I> & Cj,
+      const I num_threads
+                         )
+{
+    auto py_Rp = Rp.unchecked();
+    auto py_Rj = Rj.unchecked();
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Pp = Pp.unchecked();
+    auto py_Pj = Pj.unchecked();
+    auto py_Cp = Cp.unchecked();
+    auto py_Cj = Cj.mutable_unchecked();
+    const I *_Rp = py_Rp.data();
+    const I *_Rj = py_Rj.data();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const I *_Pp = py_Pp.data();
+    const I *_Pj = py_Pj.data();
+    const I *_Cp = py_Cp.data();
+    I *_Cj = py_Cj.mutable_data();
+
+    return rap_symbolic_pass2 <I>(
+                    n_row,
+                    n_col,
+                      _Rp, Rp.shape(0),
+                      _Rj, Rj.shape(0),
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Pp, Pp.shape(0),
+                      _Pj, Pj.shape(0),
+                      _Cp, Cp.shape(0),
+                      _Cj, Cj.shape(0),
+              num_threads
+                                  );
+}
+
+template <class I, class T>
+I _bsr_rap_numeric(
+            const I n_row,
+            const I n_col,
+      py::array_t<I> & Rp,
+      py::array_t<I> & Rj,
+      py::array_t<T> & Rx,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+      py::array_t<I> & Pp,
+      py::array_t<I> & Pj,
+      py::array_t<T> & Px,
+      py::array_t<I> & Cp,
+      py::array_t<I> & Cj,
+      py::array_t<T> & Cx,
+               const I RB,
+               const I AB,
+               const I PB,
+      const I num_threads
+                   )
+{
+    auto py_Rp = Rp.unchecked();
+    auto py_Rj = Rj.unchecked();
+    auto py_Rx = Rx.unchecked();
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_Pp = Pp.unchecked();
+    auto py_Pj = Pj.unchecked();
+    auto py_Px = Px.unchecked();
+    auto py_Cp = Cp.unchecked();
+    auto py_Cj = Cj.unchecked();
+    auto py_Cx = Cx.mutable_unchecked();
+    const I *_Rp = py_Rp.data();
+    const I *_Rj = py_Rj.data();
+    const T *_Rx = py_Rx.data();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const I *_Pp = py_Pp.data();
+    const I *_Pj = py_Pj.data();
+    const T *_Px = py_Px.data();
+    const I *_Cp = py_Cp.data();
+    const I *_Cj = py_Cj.data();
+    T *_Cx = py_Cx.mutable_data();
+
+    return bsr_rap_numeric <I, T>(
+                    n_row,
+                    n_col,
+                      _Rp, Rp.shape(0),
+                      _Rj, Rj.shape(0),
+                      _Rx, Rx.shape(0),
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                      _Pp, Pp.shape(0),
+                      _Pj, Pj.shape(0),
+                      _Px, Px.shape(0),
+                      _Cp, Cp.shape(0),
+                      _Cj, Cj.shape(0),
+                      _Cx, Cx.shape(0),
+                       RB,
+                       AB,
+                       PB,
+              num_threads
+                                  );
+}
+
+template <class I, class T>
+I _bsr_ptap_numeric(
+            const I n_row,
+            const I n_col,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+      py::array_t<I> & Pp,
+      py::array_t<I> & Pj,
+      py::array_t<T> & Px,
+      py::array_t<I> & Cp,
+      py::array_t<I> & Cj,
+      py::array_t<T> & Cx,
+               const I AB,
+               const I PB,
+        const I hermitian
+                    )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_Pp = Pp.unchecked();
+    auto py_Pj = Pj.unchecked();
+    auto py_Px = Px.unchecked();
+    auto py_Cp = Cp.unchecked();
+    auto py_Cj = Cj.unchecked();
+    auto py_Cx = Cx.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const I *_Pp = py_Pp.data();
+    const I *_Pj = py_Pj.data();
+    const T *_Px = py_Px.data();
+    const I *_Cp = py_Cp.data();
+    const I *_Cj = py_Cj.data();
+    T *_Cx = py_Cx.mutable_data();
+
+    return bsr_ptap_numeric <I, T>(
+                    n_row,
+                    n_col,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                      _Pp, Pp.shape(0),
+                      _Pj, Pj.shape(0),
+                      _Px, Px.shape(0),
+                      _Cp, Cp.shape(0),
+                      _Cj, Cj.shape(0),
+                      _Cx, Cx.shape(0),
+                       AB,
+                       PB,
+                hermitian
+                                   );
+}
+
 PYBIND11_MODULE(linalg, m) {
     m.doc() = R"pbdoc(
     Pybind11 bindings for linalg.h
@@ -125,6 +770,19 @@ PYBIND11_MODULE(linalg, m) {
     pinv_array
     csc_scale_columns
     csc_scale_rows
+    csr_matvec
+    csc_matvec
+    csr_residual
+    bsr_matvec
+    bsr_residual
+    csr_residual_restrict
+    bsr_residual_restrict
+    csr_residual_restrict_gather
+    bsr_residual_restrict_gather
+    rap_symbolic_pass1
+    rap_symbolic_pass2
+    bsr_rap_numeric
+    bsr_ptap_numeric
     )pbdoc";
 
     py::options options;
@@ -137,6 +795,14 @@ PYBIND11_MODULE(linalg, m) {
     m.def("pinv_array", &_pinv_array<int, std::complex<float>, float>,
         py::arg("AA").noconvert(), py::arg("m"), py::arg("n"), py::arg("TransA"));
     m.def("pinv_array", &_pinv_array<int, std::complex<double>, double>,
+        py::arg("AA").noconvert(), py::arg("m"), py::arg("n"), py::arg("TransA"));
+    m.def("pinv_array", &_pinv_array<int64_t, float, float>,
+        py::arg("AA").noconvert(), py::arg("m"), py::arg("n"), py::arg("TransA"));
+    m.def("pinv_array", &_pinv_array<int64_t, double, double>,
+        py::arg("AA").noconvert(), py::arg("m"), py::arg("n"), py::arg("TransA"));
+    m.def("pinv_array", &_pinv_array<int64_t, std::complex<float>, float>,
+        py::arg("AA").noconvert(), py::arg("m"), py::arg("n"), py::arg("TransA"));
+    m.def("pinv_array", &_pinv_array<int64_t, std::complex<double>, double>,
         py::arg("AA").noconvert(), py::arg("m"), py::arg("n"), py::arg("TransA"),
 R"pbdoc(
 Replace each block of A with a Moore-Penrose pseudoinverse of that block.
@@ -187,6 +853,12 @@ Examples
     m.def("csc_scale_columns", &_csc_scale_columns<int, float>,
         py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert());
     m.def("csc_scale_columns", &_csc_scale_columns<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert());
+    m.def("csc_scale_columns", &_csc_scale_columns<int64_t, int64_t>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert());
+    m.def("csc_scale_columns", &_csc_scale_columns<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert());
+    m.def("csc_scale_columns", &_csc_scale_columns<int64_t, double>,
         py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(),
 R"pbdoc(
 Scale the columns of a CSC matrix *in place*
@@ -201,6 +873,12 @@ https://github.com/scipy/scipy/blob/master/scipy/sparse/sparsetools/csr.h)pbdoc"
     m.def("csc_scale_rows", &_csc_scale_rows<int, float>,
         py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert());
     m.def("csc_scale_rows", &_csc_scale_rows<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert());
+    m.def("csc_scale_rows", &_csc_scale_rows<int64_t, int64_t>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert());
+    m.def("csc_scale_rows", &_csc_scale_rows<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert());
+    m.def("csc_scale_rows", &_csc_scale_rows<int64_t, double>,
         py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(),
 R"pbdoc(
 Scale the rows of a CSC matrix *in place*
@@ -210,5 +888,673 @@ Scale the rows of a CSC matrix *in place*
 See:
 https://github.com/scipy/scipy/blob/master/scipy/sparse/sparsetools/csr.h)pbdoc");
 
+    m.def("csr_matvec", &_csr_matvec<int, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_matvec", &_csr_matvec<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_matvec", &_csr_matvec<int, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_matvec", &_csr_matvec<int, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_matvec", &_csr_matvec<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_matvec", &_csr_matvec<int64_t, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_matvec", &_csr_matvec<int64_t, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_matvec", &_csr_matvec<int64_t, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Compute Y += A*X for CSR matrix A and dense vectors X,Y
+
+Parameters
+----------
+n_row : {int}
+     number of rows in A
+n_col : {int}
+     number of columns in A
+Ap : {int array}
+     CSR row pointer
+Aj : {int array}
+     CSR column indices
+Ax : {float|complex array}
+     CSR data array
+Xx : {float|complex array}
+     input vector, length n_col, or k vectors stored row-wise as
+     an (n_col, k) array in C order
+Yx : {float|complex array}
+     output vector, length n_row, or an (n_row, k) array in C order
+k : {int}
+     number of vectors, i.e., columns of Xx and Yx
+num_threads : {int}
+     number of OpenMP threads, rows are split among the threads in
+     contiguous ranges with about the same number of nonzeros
+
+Return
+------
+Yx is modified in place, Yx += A*Xx
+
+Notes
+-----
+No temporaries are created, so the product can be accumulated
+directly into a preallocated vector.
+
+See:
+https://github.com/scipy/scipy/blob/master/scipy/sparse/sparsetools/csr.h)pbdoc");
+
+    m.def("csc_matvec", &_csc_matvec<int, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"));
+    m.def("csc_matvec", &_csc_matvec<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"));
+    m.def("csc_matvec", &_csc_matvec<int, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"));
+    m.def("csc_matvec", &_csc_matvec<int, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"));
+    m.def("csc_matvec", &_csc_matvec<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"));
+    m.def("csc_matvec", &_csc_matvec<int64_t, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"));
+    m.def("csc_matvec", &_csc_matvec<int64_t, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"));
+    m.def("csc_matvec", &_csc_matvec<int64_t, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"),
+R"pbdoc(
+Compute Y += A*X for CSC matrix A and dense vectors X,Y
+
+Parameters
+----------
+n_row : {int}
+     number of rows in A
+n_col : {int}
+     number of columns in A
+Ap : {int array}
+     CSC column pointer
+Ai : {int array}
+     CSC row indices
+Ax : {float|complex array}
+     CSC data array
+Xx : {float|complex array}
+     input vector, length n_col, or k vectors stored row-wise as
+     an (n_col, k) array in C order
+Yx : {float|complex array}
+     output vector, length n_row, or an (n_row, k) array in C order
+k : {int}
+     number of vectors, i.e., columns of Xx and Yx
+
+Return
+------
+Yx is modified in place, Yx += A*Xx)pbdoc");
+
+    m.def("csr_residual", &_csr_residual<int, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual", &_csr_residual<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual", &_csr_residual<int, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual", &_csr_residual<int, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual", &_csr_residual<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual", &_csr_residual<int64_t, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual", &_csr_residual<int64_t, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual", &_csr_residual<int64_t, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Compute the residual r = b - A*x for CSR matrix A
+
+Parameters
+----------
+n_row : {int}
+     number of rows in A
+n_col : {int}
+     number of columns in A
+Ap : {int array}
+     CSR row pointer
+Aj : {int array}
+     CSR column indices
+Ax : {float|complex array}
+     CSR data array
+x : {float|complex array}
+     approximate solution, length n_col, or k solutions stored
+     row-wise as an (n_col, k) array in C order
+b : {float|complex array}
+     right hand side, length n_row, or an (n_row, k) array in C order
+r : {float|complex array}
+     residual, same shape as b
+k : {int}
+     number of vectors, i.e., columns of x, b and r
+num_threads : {int}
+     number of OpenMP threads, rows are split among the threads in
+     contiguous ranges with about the same number of nonzeros
+
+Return
+------
+r is overwritten with b - A*x)pbdoc");
+
+    m.def("bsr_matvec", &_bsr_matvec<int, float>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_matvec", &_bsr_matvec<int, double>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_matvec", &_bsr_matvec<int, std::complex<float>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_matvec", &_bsr_matvec<int, std::complex<double>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_matvec", &_bsr_matvec<int64_t, float>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_matvec", &_bsr_matvec<int64_t, double>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_matvec", &_bsr_matvec<int64_t, std::complex<float>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_matvec", &_bsr_matvec<int64_t, std::complex<double>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Xx").noconvert(), py::arg("Yx").noconvert(), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Compute Y += A*X for BSR matrix A and dense vectors X,Y
+
+Parameters
+----------
+n_brow : {int}
+     number of block rows in A
+n_bcol : {int}
+     number of block columns in A
+R : {int}
+     rows per block
+C : {int}
+     columns per block
+Ap : {int array}
+     BSR row pointer
+Aj : {int array}
+     BSR column indices
+Ax : {float|complex array}
+     BSR data array, blocks stored in row major order
+Xx : {float|complex array}
+     input vector, length C*n_bcol, or k vectors stored row-wise as
+     a (C*n_bcol, k) array in C order
+Yx : {float|complex array}
+     output vector, length R*n_brow, or an (R*n_brow, k) array in C order
+k : {int}
+     number of vectors, i.e., columns of Xx and Yx
+num_threads : {int}
+     number of OpenMP threads, rows are split among the threads in
+     contiguous ranges with about the same number of nonzeros
+
+Return
+------
+Yx is modified in place, Yx += A*Xx)pbdoc");
+
+    m.def("bsr_residual", &_bsr_residual<int, float>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual", &_bsr_residual<int, double>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual", &_bsr_residual<int, std::complex<float>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual", &_bsr_residual<int, std::complex<double>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual", &_bsr_residual<int64_t, float>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual", &_bsr_residual<int64_t, double>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual", &_bsr_residual<int64_t, std::complex<float>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual", &_bsr_residual<int64_t, std::complex<double>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("R"), py::arg("C"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Compute the residual r = b - A*x for BSR matrix A
+
+Parameters
+----------
+n_brow : {int}
+     number of block rows in A
+n_bcol : {int}
+     number of block columns in A
+R : {int}
+     rows per block
+C : {int}
+     columns per block
+Ap : {int array}
+     BSR row pointer
+Aj : {int array}
+     BSR column indices
+Ax : {float|complex array}
+     BSR data array, blocks stored in row major order
+x : {float|complex array}
+     approximate solution, length C*n_bcol, or k solutions stored
+     row-wise as a (C*n_bcol, k) array in C order
+b : {float|complex array}
+     right hand side, length R*n_brow, or an (R*n_brow, k) array in
+     C order
+r : {float|complex array}
+     residual, same shape as b
+k : {int}
+     number of vectors, i.e., columns of x, b and r
+num_threads : {int}
+     number of OpenMP threads, rows are split among the threads in
+     contiguous ranges with about the same number of nonzeros
+
+Return
+------
+r is overwritten with b - A*x)pbdoc");
+
+    m.def("csr_residual_restrict", &_csr_residual_restrict<int, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("csr_residual_restrict", &_csr_residual_restrict<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("csr_residual_restrict", &_csr_residual_restrict<int, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("csr_residual_restrict", &_csr_residual_restrict<int, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("csr_residual_restrict", &_csr_residual_restrict<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("csr_residual_restrict", &_csr_residual_restrict<int64_t, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("csr_residual_restrict", &_csr_residual_restrict<int64_t, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("csr_residual_restrict", &_csr_residual_restrict<int64_t, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"),
+R"pbdoc(
+Compute the restricted residual y += R*(b - A*x) for CSR matrix A
+
+Fused kernel: the residual is formed one row at a time and immediately
+scattered into y through T = R.T, so A and T are read in a single pass
+and the fine level residual is never stored.  The kernel is serial.  If
+the rows of R have sorted column indices, the result is bitwise equal to
+that of csr_residual_restrict_gather.
+
+Parameters
+----------
+n_row : {int}
+     number of rows in A
+n_col : {int}
+     number of columns in A
+Ap : {int array}
+     CSR row pointer of A
+Aj : {int array}
+     CSR column indices of A
+Ax : {float|complex array}
+     CSR data array of A
+x : {float|complex array}
+     approximate solution, length n_col, or k solutions stored
+     row-wise as an (n_col, k) array in C order
+b : {float|complex array}
+     right hand side, length n_row, or an (n_row, k) array in C order
+Tp : {int array}
+     CSR row pointer of T = R.T, an n_row x n_coarse matrix
+Tj : {int array}
+     CSR column indices of T
+Tx : {float|complex array}
+     CSR data array of T
+y : {float|complex array}
+     coarse right hand side, length n_coarse, or an (n_coarse, k)
+     array in C order
+k : {int}
+     number of vectors, i.e., columns of x, b and y
+
+Return
+------
+y is modified in place, y += R*(b - A*x))pbdoc");
+
+    m.def("bsr_residual_restrict", &_bsr_residual_restrict<int, float>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("bsr_residual_restrict", &_bsr_residual_restrict<int, double>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("bsr_residual_restrict", &_bsr_residual_restrict<int, std::complex<float>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("bsr_residual_restrict", &_bsr_residual_restrict<int, std::complex<double>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("bsr_residual_restrict", &_bsr_residual_restrict<int64_t, float>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("bsr_residual_restrict", &_bsr_residual_restrict<int64_t, double>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("bsr_residual_restrict", &_bsr_residual_restrict<int64_t, std::complex<float>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"));
+    m.def("bsr_residual_restrict", &_bsr_residual_restrict<int64_t, std::complex<double>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("Tx").noconvert(), py::arg("y").noconvert(), py::arg("k"),
+R"pbdoc(
+Compute the restricted residual y += R*(b - A*x) for BSR matrix A
+
+As csr_residual_restrict, for block rows.  The residual is formed one
+block row at a time and scattered into y through T = R.T, whose blocks
+have as many rows as the blocks of A.
+
+Parameters
+----------
+n_brow : {int}
+     number of block rows in A
+n_bcol : {int}
+     number of block columns in A
+RA : {int}
+     rows per block of A
+CA : {int}
+     columns per block of A
+D : {int}
+     columns per block of T, whose blocks are RA x D
+Ap : {int array}
+     BSR row pointer of A
+Aj : {int array}
+     BSR column indices of A
+Ax : {float|complex array}
+     BSR data array of A, blocks stored in row major order
+x : {float|complex array}
+     approximate solution, length CA*n_bcol, or k solutions stored
+     row-wise as a (CA*n_bcol, k) array in C order
+b : {float|complex array}
+     right hand side, length RA*n_brow, or an (RA*n_brow, k) array in
+     C order
+Tp : {int array}
+     BSR row pointer of T = R.T
+Tj : {int array}
+     BSR column indices of T
+Tx : {float|complex array}
+     BSR data array of T, blocks stored in row major order
+y : {float|complex array}
+     coarse right hand side, or k of them stored row-wise
+k : {int}
+     number of vectors, i.e., columns of x, b and y
+
+Return
+------
+y is modified in place, y += R*(b - A*x))pbdoc");
+
+    m.def("csr_residual_restrict_gather", &_csr_residual_restrict_gather<int, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("n_coarse"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual_restrict_gather", &_csr_residual_restrict_gather<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("n_coarse"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual_restrict_gather", &_csr_residual_restrict_gather<int, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("n_coarse"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual_restrict_gather", &_csr_residual_restrict_gather<int, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("n_coarse"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual_restrict_gather", &_csr_residual_restrict_gather<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("n_coarse"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual_restrict_gather", &_csr_residual_restrict_gather<int64_t, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("n_coarse"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual_restrict_gather", &_csr_residual_restrict_gather<int64_t, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("n_coarse"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("csr_residual_restrict_gather", &_csr_residual_restrict_gather<int64_t, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("n_coarse"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Compute the restricted residual y += R*(b - A*x) for CSR matrices A, R
+
+Two-pass kernel, not fused: the residual r = b - A*x is written to a
+work array and read again through the rows of R.  Within one parallel
+region, the rows of r are split over the threads, and after a barrier
+the rows of y, each of which is gathered through the corresponding row
+of R.  No transpose of R is needed, and the result does not depend on
+the number of threads.  Use csr_residual_restrict if R.T is at hand.
+
+Parameters
+----------
+n_row : {int}
+     number of rows in A
+n_col : {int}
+     number of columns in A
+n_coarse : {int}
+     number of rows in R
+Ap : {int array}
+     CSR row pointer of A
+Aj : {int array}
+     CSR column indices of A
+Ax : {float|complex array}
+     CSR data array of A
+x : {float|complex array}
+     approximate solution, length n_col, or k solutions stored
+     row-wise as an (n_col, k) array in C order
+b : {float|complex array}
+     right hand side, length n_row, or an (n_row, k) array in C order
+Rp : {int array}
+     CSR row pointer of R, an n_coarse x n_row matrix
+Rj : {int array}
+     CSR column indices of R
+Rx : {float|complex array}
+     CSR data array of R
+r : {float|complex array}
+     work array for the residual, same size as b
+y : {float|complex array}
+     coarse right hand side, length n_coarse, or an (n_coarse, k)
+     array in C order
+k : {int}
+     number of vectors, i.e., columns of x, b, r and y
+num_threads : {int}
+     number of OpenMP threads, see csr_matvec
+
+Return
+------
+y is modified in place, y += R*(b - A*x), and r holds b - A*x)pbdoc");
+
+    m.def("bsr_residual_restrict_gather", &_bsr_residual_restrict_gather<int, float>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("n_coarse"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual_restrict_gather", &_bsr_residual_restrict_gather<int, double>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("n_coarse"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual_restrict_gather", &_bsr_residual_restrict_gather<int, std::complex<float>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("n_coarse"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual_restrict_gather", &_bsr_residual_restrict_gather<int, std::complex<double>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("n_coarse"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual_restrict_gather", &_bsr_residual_restrict_gather<int64_t, float>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("n_coarse"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual_restrict_gather", &_bsr_residual_restrict_gather<int64_t, double>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("n_coarse"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual_restrict_gather", &_bsr_residual_restrict_gather<int64_t, std::complex<float>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("n_coarse"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_residual_restrict_gather", &_bsr_residual_restrict_gather<int64_t, std::complex<double>>,
+        py::arg("n_brow"), py::arg("n_bcol"), py::arg("n_coarse"), py::arg("RA"), py::arg("CA"), py::arg("D"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Compute the restricted residual y += R*(b - A*x) for BSR matrices A, R
+
+As csr_residual_restrict_gather, for block rows, and also not fused.
+The blocks of R have as many columns as the blocks of A have rows.  A
+CSR matrix is passed as a BSR matrix with 1 x 1 blocks, but if both A
+and R have 1 x 1 blocks, csr_residual_restrict_gather is faster.
+
+Parameters
+----------
+n_brow : {int}
+     number of block rows in A
+n_bcol : {int}
+     number of block columns in A
+n_coarse : {int}
+     number of block rows in R
+RA : {int}
+     rows per block of A
+CA : {int}
+     columns per block of A
+D : {int}
+     rows per block of R, whose blocks are D x RA
+Ap : {int array}
+     BSR row pointer of A
+Aj : {int array}
+     BSR column indices of A
+Ax : {float|complex array}
+     BSR data array of A, blocks stored in row major order
+x : {float|complex array}
+     approximate solution, length CA*n_bcol, or k solutions stored
+     row-wise as a (CA*n_bcol, k) array in C order
+b : {float|complex array}
+     right hand side, length RA*n_brow, or an (RA*n_brow, k) array in
+     C order
+Rp : {int array}
+     BSR row pointer of R
+Rj : {int array}
+     BSR column indices of R
+Rx : {float|complex array}
+     BSR data array of R, blocks stored in row major order
+r : {float|complex array}
+     work array for the residual, same size as b
+y : {float|complex array}
+     coarse right hand side, length D*n_coarse, or k of them stored
+     row-wise
+k : {int}
+     number of vectors, i.e., columns of x, b, r and y
+num_threads : {int}
+     number of OpenMP threads, see csr_matvec
+
+Return
+------
+y is modified in place, y += R*(b - A*x), and r holds b - A*x)pbdoc");
+
+    m.def("rap_symbolic_pass1", &_rap_symbolic_pass1<int>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Cp").noconvert(), py::arg("num_threads"));
+    m.def("rap_symbolic_pass1", &_rap_symbolic_pass1<int64_t>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Cp").noconvert(), py::arg("num_threads"),
+R"pbdoc(
+Count the nonzeros (blocks) per row of the Galerkin product C = R*A*P
+
+Only the sparsity patterns of R, A and P are used, the product R*A is
+never formed.  The pattern of C can be computed once and reused by
+bsr_rap_numeric and bsr_ptap_numeric for operators with new values.
+
+Parameters
+----------
+n_row : {int}
+     number of (block) rows in R and C
+n_col : {int}
+     number of (block) columns in P and C
+Rp, Rj : {int array}
+     CSR (or BSR) row pointer and column indices of R
+Ap, Aj : {int array}
+     CSR (or BSR) row pointer and column indices of A
+Pp, Pj : {int array}
+     CSR (or BSR) row pointer and column indices of P
+Cp : {int array}
+     row pointer of C, length n_row + 1
+num_threads : {int}
+     number of OpenMP threads
+
+Return
+------
+Cp is modified in place, the row pointer of C
+
+Notes
+-----
+For R = P^T, pass the pattern of P^T for Rp, Rj.)pbdoc");
+
+    m.def("rap_symbolic_pass2", &_rap_symbolic_pass2<int>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("num_threads"));
+    m.def("rap_symbolic_pass2", &_rap_symbolic_pass2<int64_t>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("num_threads"),
+R"pbdoc(
+Column indices of the Galerkin product C = R*A*P
+
+Parameters
+----------
+n_row, n_col, Rp, Rj, Ap, Aj, Pp, Pj : see rap_symbolic_pass1
+Cp : {int array}
+     row pointer of C from rap_symbolic_pass1
+Cj : {int array}
+     column indices of C, length Cp[n_row]
+num_threads : {int}
+     number of OpenMP threads
+
+Return
+------
+Cj is modified in place, the column indices of C sorted in each row)pbdoc");
+
+    m.def("bsr_rap_numeric", &_bsr_rap_numeric<int, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("RB"), py::arg("AB"), py::arg("PB"), py::arg("num_threads"));
+    m.def("bsr_rap_numeric", &_bsr_rap_numeric<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("RB"), py::arg("AB"), py::arg("PB"), py::arg("num_threads"));
+    m.def("bsr_rap_numeric", &_bsr_rap_numeric<int, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("RB"), py::arg("AB"), py::arg("PB"), py::arg("num_threads"));
+    m.def("bsr_rap_numeric", &_bsr_rap_numeric<int, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("RB"), py::arg("AB"), py::arg("PB"), py::arg("num_threads"));
+    m.def("bsr_rap_numeric", &_bsr_rap_numeric<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("RB"), py::arg("AB"), py::arg("PB"), py::arg("num_threads"));
+    m.def("bsr_rap_numeric", &_bsr_rap_numeric<int64_t, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("RB"), py::arg("AB"), py::arg("PB"), py::arg("num_threads"));
+    m.def("bsr_rap_numeric", &_bsr_rap_numeric<int64_t, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("RB"), py::arg("AB"), py::arg("PB"), py::arg("num_threads"));
+    m.def("bsr_rap_numeric", &_bsr_rap_numeric<int64_t, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Rp").noconvert(), py::arg("Rj").noconvert(), py::arg("Rx").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("RB"), py::arg("AB"), py::arg("PB"), py::arg("num_threads"),
+R"pbdoc(
+Compute the values of the Galerkin product C = R*A*P on a given pattern
+
+The rows of C are computed one at a time.  For each block R_ik and
+A_kl, the product R_ik*A_kl is formed in a small buffer and multiplied
+by the blocks of row l of P, so that R*A is never stored.
+
+Parameters
+----------
+n_row : {int}
+     number of block rows in R and C
+n_col : {int}
+     number of block columns in P and C
+Rp, Rj, Rx : {int|float|complex array}
+     BSR representation of R with (RB x AB) blocks
+Ap, Aj, Ax : {int|float|complex array}
+     BSR representation of A with (AB x AB) blocks
+Pp, Pj, Px : {int|float|complex array}
+     BSR representation of P with (AB x PB) blocks
+Cp, Cj : {int array}
+     pattern of C from rap_symbolic_pass1 and rap_symbolic_pass2
+Cx : {float|complex array}
+     values of C with (RB x PB) blocks
+RB, AB, PB : {int}
+     block sizes, 1 for CSR matrices
+num_threads : {int}
+     number of OpenMP threads
+
+Return
+------
+The number of blocks of R*A*P outside the pattern of C, which are
+dropped.  Cx is overwritten with the values of R*A*P.
+
+Notes
+-----
+The pattern of C should contain the pattern of R*A*P.  Each row of C is
+computed by a single thread, so that the result is identical for any
+number of threads.)pbdoc");
+
+    m.def("bsr_ptap_numeric", &_bsr_ptap_numeric<int, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("AB"), py::arg("PB"), py::arg("hermitian"));
+    m.def("bsr_ptap_numeric", &_bsr_ptap_numeric<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("AB"), py::arg("PB"), py::arg("hermitian"));
+    m.def("bsr_ptap_numeric", &_bsr_ptap_numeric<int, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("AB"), py::arg("PB"), py::arg("hermitian"));
+    m.def("bsr_ptap_numeric", &_bsr_ptap_numeric<int, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("AB"), py::arg("PB"), py::arg("hermitian"));
+    m.def("bsr_ptap_numeric", &_bsr_ptap_numeric<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("AB"), py::arg("PB"), py::arg("hermitian"));
+    m.def("bsr_ptap_numeric", &_bsr_ptap_numeric<int64_t, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("AB"), py::arg("PB"), py::arg("hermitian"));
+    m.def("bsr_ptap_numeric", &_bsr_ptap_numeric<int64_t, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("AB"), py::arg("PB"), py::arg("hermitian"));
+    m.def("bsr_ptap_numeric", &_bsr_ptap_numeric<int64_t, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Pp").noconvert(), py::arg("Pj").noconvert(), py::arg("Px").noconvert(), py::arg("Cp").noconvert(), py::arg("Cj").noconvert(), py::arg("Cx").noconvert(), py::arg("AB"), py::arg("PB"), py::arg("hermitian"),
+R"pbdoc(
+Compute the values of the Galerkin product C = P^T*A*P (or P^H*A*P) on
+a given pattern, without forming R = P^T
+
+For each block row k of A, the row k of A*P is accumulated in a
+sparse buffer and then scattered to the rows of C given by the
+columns of row k of P.
+
+Parameters
+----------
+n_row : {int}
+     number of block rows in A and P
+n_col : {int}
+     number of block columns in P, i.e., block rows of C
+Ap, Aj, Ax : {int|float|complex array}
+     BSR representation of A with (AB x AB) blocks
+Pp, Pj, Px : {int|float|complex array}
+     BSR representation of P with (AB x PB) blocks
+Cp, Cj : {int array}
+     pattern of C from rap_symbolic_pass1 and rap_symbolic_pass2, with
+     column indices sorted in each row
+Cx : {float|complex array}
+     values of C with (PB x PB) blocks
+AB, PB : {int}
+     block sizes, 1 for CSR matrices
+hermitian : {int}
+     if nonzero, compute P^H*A*P, otherwise P^T*A*P
+
+Return
+------
+The number of blocks of P^T*A*P outside the pattern of C, which are
+dropped.  Cx is overwritten with the values of P^T*A*P or P^H*A*P.
+
+Notes
+-----
+The scatter to the rows of C is serial.)pbdoc");
+
 }
 
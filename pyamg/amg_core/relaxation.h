@@ -20,11 +20,17 @@
  *      Ap[]       - CSR row pointer
  *      Aj[]       - CSR index array
  *      Ax[]       - CSR data array
- *      x[]        - approximate solution
- *      b[]        - right hand side
+ *      x[]        - approximate solution(s)
+ *      b[]        - right hand side(s)
  *      row_start  - beginning of the sweep
  *      row_stop   - end of the sweep (i.e. one past the last unknown)
  *      row_step   - stride used during the sweep (may be negative)
+ *      k          - number of right-hand sides, the columns of x and b
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order, in which case all k columns are
+ *      swept in a single pass over A.
  *
  *  Returns:
  *      Nothing, x will be modified in place
@@ -38,26 +44,57 @@ void gauss_seidel(const I Ap[], const int Ap_size,
                   const T  b[], const int  b_size,
                   const I row_start,
                   const I row_stop,
-                  const I row_step)
+                  const I row_step,
+                  const I k)
 {
+    if (k == 1) {
+        for(I i = row_start; i != row_stop; i += row_step) {
+            I start = Ap[i];
+            I end   = Ap[i+1];
+            T rsum = 0;
+            T diag = 0;
+
+            for(I jj = start; jj < end; jj++){
+                I j = Aj[jj];
+                if (i == j)
+                    diag  = Ax[jj];
+                else
+                    rsum += Ax[jj]*x[j];
+            }
+
+            if (diag != (F) 0.0){
+                x[i] = (b[i] - rsum)/diag;
+            }
+        }
+        return;
+    }
+
+    // Sweep all k right-hand sides in one pass over A
+    T *rsum = new T[k];
     for(I i = row_start; i != row_stop; i += row_step) {
         I start = Ap[i];
         I end   = Ap[i+1];
-        T rsum = 0;
         T diag = 0;
+        std::fill(rsum, rsum + k, (T) 0.0);
 
         for(I jj = start; jj < end; jj++){
             I j = Aj[jj];
             if (i == j)
                 diag  = Ax[jj];
-            else
-                rsum += Ax[jj]*x[j];
+            else {
+                const T a = Ax[jj];
+                const T * xj = x + j*k;
+                for(I c = 0; c < k; c++)
+                    rsum[c] += a*xj[c];
+            }
         }
 
         if (diag != (F) 0.0){
-            x[i] = (b[i] - rsum)/diag;
+            for(I c = 0; c < k; c++)
+                x[i*k + c] = (b[i*k + c] - rsum[c])/diag;
         }
     }
+    delete[] rsum;
 }
 
 
@@ -74,12 +111,18 @@ void gauss_seidel(const I Ap[], const int Ap_size,
  *      Ap[]       - BSR row pointer
  *      Aj[]       - BSR index array
  *      Ax[]       - BSR data array
- *      x[]        - approximate solution
- *      b[]        - right hand side
+ *      x[]        - approximate solution(s)
+ *      b[]        - right hand side(s)
  *      row_start  - beginning of the sweep (block row index)
  *      row_stop   - end of the sweep (i.e. one past the last unknown)
  *      row_step   - stride used during the sweep (may be negative)
  *      blocksize  - BSR blocksize (blocks must be square)
+ *      k          - number of right-hand sides, the columns of x and b
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order, in which case all k columns are
+ *      swept in a single pass over A.
  *
  *  Returns:
  *      Nothing, x will be modified in place
@@ -94,12 +137,12 @@ void bsr_gauss_seidel(const I Ap[], const int Ap_size,
                       const I row_start,
                       const I row_stop,
                       const I row_step,
-                      const I blocksize)
+                      const I blocksize,
+                      const I k)
 {
-    I B2 = blocksize*blocksize;
-    T *rsum = new T[blocksize];
-    T *Axloc = new T[blocksize];
-    //T zero = 0.0;
+    const I B2 = blocksize*blocksize;
+    const I Bk = blocksize*k;
+    T *rsum = new T[Bk];
 
     // Determine if this is a forward, or backward sweep
     I step, step_start, step_end;
@@ -119,53 +162,56 @@ void bsr_gauss_seidel(const I Ap[], const int Ap_size,
         I end   = Ap[i+1];
         I diag_ptr = -1;
 
-
         // initialize rsum to b, then later subtract A*x
-        for(I k = 0; k < blocksize; k++) {
-            rsum[k] = b[i*blocksize+k]; }
+        std::copy(&(b[i*Bk]), &(b[(i+1)*Bk]), rsum);
 
         // loop over row i
         for(I jj = start; jj < end; jj++){
             // extract column entry
             I j = Aj[jj];
-            // absolute column entry for the start of this block
-            I col = j*blocksize;
 
             if (i == j){    //point to where in Ax the diagonal block starts
                 diag_ptr = jj*B2; }
             else {
-                // do a dense multiply of this block times x and accumulate in rsum
-                gemm(&(Ax[jj*B2]),  blocksize, blocksize, 'F',
-                     &(x[col]),     blocksize,   1,       'F',
-                     &(Axloc[0]),   blocksize,   1,       'F',
-                     'T');
+                // do a dense multiply of this block times x and subtract from rsum
+                const T * Ablock = &(Ax[jj*B2]);
+                const T * xj = &(x[j*Bk]);
                 for(I m = 0; m < blocksize; m++) {
-                    rsum[m] -= Axloc[m]; }
+                    for(I n = 0; n < blocksize; n++) {
+                        const T a = Ablock[m*blocksize + n];
+                        for(I c = 0; c < k; c++) {
+                            rsum[m*k + c] -= a*xj[n*k + c]; }
+                    }
+                }
             }
         }
 
         // Carry out point-wise GS over the diagonal block,
         // all the other blocks have been factored into rsum.
         if (diag_ptr != -1) {
-            for(I k = step_start; k != step_end; k+=step){
+            for(I m = step_start; m != step_end; m+=step){
                 T diag = 1.0;
-                for(I kk = step_start; kk != step_end; kk+=step){
-                    if(k == kk){
+                for(I n = step_start; n != step_end; n+=step){
+                    const T a = Ax[m*blocksize + n + diag_ptr];
+                    if(m == n){
                         // diagonal entry
-                        diag = Ax[k*blocksize + kk + diag_ptr]; }
+                        diag = a; }
                     else{
                         // off-diag entry
-                        rsum[k] -= Ax[k*blocksize + kk + diag_ptr]*x[i*blocksize+kk]; }
+                        for(I c = 0; c < k; c++) {
+                            rsum[m*k + c] -= a*x[i*Bk + n*k + c]; }
+                    }
                 }
                 if (diag != (F) 0.0){
-                    x[i*blocksize+k] = rsum[k]/diag; }
+                    for(I c = 0; c < k; c++) {
+                        x[i*Bk + m*k + c] = rsum[m*k + c]/diag; }
+                }
             }
         }
 
     } // end outer-most for loop
 
     delete[] rsum;
-    delete[] Axloc;
 }// end function
 
 
@@ -182,13 +228,24 @@ void bsr_gauss_seidel(const I Ap[], const int Ap_size,
  *      Ap[]       - CSR row pointer
  *      Aj[]       - CSR index array
  *      Ax[]       - CSR data array
- *      x[]        - approximate solution
- *      b[]        - right hand side
+ *      x[]        - approximate solution(s)
+ *      b[]        - right hand side(s)
  *      temp[]     - temporary vector the same size as x
  *      row_start  - beginning of the sweep
  *      row_stop   - end of the sweep (i.e. one past the last unknown)
  *      row_step   - stride used during the sweep (may be negative)
  *      omega      - damping parameter
+ *      k          - number of right-hand sides, the columns of x and b
+ *      num_threads - number of OpenMP threads used for the sweep
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order, in which case all k columns are
+ *      swept in a single pass over A.
+ *
+ *      Each row is updated independently and in the same way for any
+ *      num_threads, so the result is bitwise identical to a serial
+ *      sweep.  Without OpenMP, the sweep is serial.
  *
  *  Returns:
  *      Nothing, x will be modified in place
@@ -204,32 +261,79 @@ void jacobi(const I Ap[], const int Ap_size,
             const I row_start,
             const I row_stop,
             const I row_step,
-            const T omega[], const int omega_size)
+            const T omega[], const int omega_size,
+            const I k,
+            const I num_threads)
 {
+    const I n_sweep = (row_stop - row_start)/row_step;
     T one = 1.0;
     T omega2 = omega[0];
 
-    for(I i = row_start; i != row_stop; i += row_step) {
-        temp[i] = x[i];
+    // Every row update only reads temp, so the rows are split among
+    // the threads.  Each row is computed exactly as in the serial
+    // loop, so the result does not depend on num_threads.
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I t = 0; t < n_sweep; t++) {
+        I i = row_start + t*row_step;
+        std::copy(&(x[i*k]), &(x[(i+1)*k]), &(temp[i*k]));
     }
 
-    for(I i = row_start; i != row_stop; i += row_step) {
-        I start = Ap[i];
-        I end   = Ap[i+1];
-        T rsum = 0;
-        T diag = 0;
+    if (k == 1) {
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+        for(I t = 0; t < n_sweep; t++) {
+            I i = row_start + t*row_step;
+            I start = Ap[i];
+            I end   = Ap[i+1];
+            T rsum = 0;
+            T diag = 0;
 
-        for(I jj = start; jj < end; jj++){
-            I j = Aj[jj];
-            if (i == j)
-                diag  = Ax[jj];
-            else
-                rsum += Ax[jj]*temp[j];
+            for(I jj = start; jj < end; jj++){
+                I j = Aj[jj];
+                if (i == j)
+                    diag  = Ax[jj];
+                else
+                    rsum += Ax[jj]*temp[j];
+            }
+
+            if (diag != (F) 0.0){
+                x[i] = (one - omega2) * temp[i] + omega2 * ((b[i] - rsum)/diag);
+            }
         }
+        return;
+    }
 
-        if (diag != (F) 0.0){
-            x[i] = (one - omega2) * temp[i] + omega2 * ((b[i] - rsum)/diag);
+    // Sweep all k right-hand sides in one pass over A
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        T *rsum = new T[k];
+
+        #pragma omp for schedule(static)
+        for(I t = 0; t < n_sweep; t++) {
+            I i = row_start + t*row_step;
+            I start = Ap[i];
+            I end   = Ap[i+1];
+            T diag = 0;
+            std::fill(rsum, rsum + k, (T) 0.0);
+
+            for(I jj = start; jj < end; jj++){
+                I j = Aj[jj];
+                if (i == j)
+                    diag  = Ax[jj];
+                else {
+                    const T a = Ax[jj];
+                    const T * tj = temp + j*k;
+                    for(I c = 0; c < k; c++)
+                        rsum[c] += a*tj[c];
+                }
+            }
+
+            if (diag != (F) 0.0){
+                for(I c = 0; c < k; c++)
+                    x[i*k + c] = (one - omega2) * temp[i*k + c] + omega2 * ((b[i*k + c] - rsum[c])/diag);
+            }
         }
+
+        delete[] rsum;
     }
 }
 
@@ -246,14 +350,25 @@ void jacobi(const I Ap[], const int Ap_size,
  *      Ap[]       - BSR row pointer
  *      Aj[]       - BSR index array
  *      Ax[]       - BSR data array
- *      x[]        - approximate solution
- *      b[]        - right hand side
+ *      x[]        - approximate solution(s)
+ *      b[]        - right hand side(s)
  *      temp[]     - temporary vector the same size as x
  *      row_start  - beginning of the sweep (block row index)
  *      row_stop   - end of the sweep (i.e. one past the last unknown)
  *      row_step   - stride used during the sweep (may be negative)
  *      blocksize  - BSR blocksize (blocks must be square)
  *      omega      - damping parameter
+ *      k          - number of right-hand sides, the columns of x and b
+ *      num_threads - number of OpenMP threads used for the sweep
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order, in which case all k columns are
+ *      swept in a single pass over A.
+ *
+ *      Each row is updated independently and in the same way for any
+ *      num_threads, so the result is bitwise identical to a serial
+ *      sweep.  Without OpenMP, the sweep is serial.
  *
  *  Returns:
  *      Nothing, x will be modified in place
@@ -270,12 +385,14 @@ void bsr_jacobi(const I Ap[], const int Ap_size,
                 const I row_stop,
                 const I row_step,
                 const I blocksize,
-                const T omega[], const int omega_size)
+                const T omega[], const int omega_size,
+                const I k,
+                const I num_threads)
 {
-    I B2 = blocksize*blocksize;
-    T *rsum = new T[blocksize];
-    T *Axloc = new T[blocksize];
-    //T zero = 0.0;
+    const I n_brow = Ap_size - 1;
+    const I B2 = blocksize*blocksize;
+    const I Bk = blocksize*k;
+    const I n_sweep = (row_stop - row_start)/row_step;
     T one = 1.0;
     T omega2 = omega[0];
 
@@ -293,63 +410,76 @@ void bsr_jacobi(const I Ap[], const int Ap_size,
     }
 
     // copy x to temp
-    for(I i = 0; i < abs(row_stop-row_start)*blocksize; i += step) {
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_brow*Bk; i++) {
         temp[i] = x[i];
     }
 
-    for(I i = row_start; i != row_stop; i += row_step) {
-        I start = Ap[i];
-        I end   = Ap[i+1];
-        I diag_ptr = -1;
-
+    // Block rows are split among the threads, see jacobi
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        T *rsum = new T[Bk];
 
-        // initialize rsum to b, then later subtract A*x
-        for(I k = 0; k < blocksize; k++) {
-            rsum[k] = b[i*blocksize+k]; }
+        #pragma omp for schedule(static)
+        for(I t = 0; t < n_sweep; t++) {
+            I i = row_start + t*row_step;
+            I start = Ap[i];
+            I end   = Ap[i+1];
+            I diag_ptr = -1;
 
-        // loop over row i
-        for(I jj = start; jj < end; jj++){
-            // extract column entry
-            I j = Aj[jj];
-            // absolute column entry for the start of this block
-            I col = j*blocksize;
+            // initialize rsum to b, then later subtract A*x
+            std::copy(&(b[i*Bk]), &(b[(i+1)*Bk]), rsum);
 
-            if (i == j){    //point to where in Ax the diagonal block starts
-                diag_ptr = jj*B2; }
-            else {
-                // do a dense multiply of this block times x and accumulate in rsum
-                gemm(&(Ax[jj*B2]),  blocksize, blocksize, 'F',
-                     &(temp[col]),  blocksize,   1,       'F',
-                     &(Axloc[0]),   blocksize,   1,       'F',
-                     'T');
-                for(I m = 0; m < blocksize; m++) {
-                    rsum[m] -= Axloc[m]; }
+            // loop over row i
+            for(I jj = start; jj < end; jj++){
+                // extract column entry
+                I j = Aj[jj];
+
+                if (i == j){    //point to where in Ax the diagonal block starts
+                    diag_ptr = jj*B2; }
+                else {
+                    // do a dense multiply of this block times x and subtract from rsum
+                    const T * Ablock = &(Ax[jj*B2]);
+                    const T * tj = &(temp[j*Bk]);
+                    for(I m = 0; m < blocksize; m++) {
+                        for(I n = 0; n < blocksize; n++) {
+                            const T a = Ablock[m*blocksize + n];
+                            for(I c = 0; c < k; c++) {
+                                rsum[m*k + c] -= a*tj[n*k + c]; }
+                        }
+                    }
+                }
             }
-        }
 
-        // Carry out point-wise jacobi over the diagonal block,
-        // all the other blocks have been factored into rsum.
-        if (diag_ptr != -1) {
-            for(I k = step_start; k != step_end; k+=step){
-                T diag = 1.0;
-                for(I kk = step_start; kk != step_end; kk+=step){
-                    if(k == kk){
-                        // diagonal entry
-                        diag = Ax[k*blocksize + kk + diag_ptr]; }
-                    else{
-                        // off-diag entry
-                        rsum[k] -= Ax[k*blocksize + kk + diag_ptr]*temp[i*blocksize+kk]; }
+            // Carry out point-wise jacobi over the diagonal block,
+            // all the other blocks have been factored into rsum.
+            if (diag_ptr != -1) {
+                for(I m = step_start; m != step_end; m+=step){
+                    T diag = 1.0;
+                    for(I n = step_start; n != step_end; n+=step){
+                        const T a = Ax[m*blocksize + n + diag_ptr];
+                        if(m == n){
+                            // diagonal entry
+                            diag = a; }
+                        else{
+                            // off-diag entry
+                            for(I c = 0; c < k; c++) {
+                                rsum[m*k + c] -= a*temp[i*Bk + n*k + c]; }
+                        }
+                    }
+                    if (diag != (F) 0.0){
+                        for(I c = 0; c < k; c++) {
+                            I ii = i*Bk + m*k + c;
+                            x[ii] = (one - omega2) * temp[ii] + omega2 * rsum[m*k + c]/diag; }
+                    }
                 }
-                if (diag != (F) 0.0){
-                    x[i*blocksize+k] = (one - omega2) * temp[i*blocksize+k] + omega2 * rsum[k]/diag; }
             }
-        }
 
-    } // end outer-most for loop
+        } // end outer-most for loop
 
-    delete[] rsum;
-    delete[] Axloc;
-}// end function
+        delete[] rsum;
+    }
+}// end function// end function
 
 
 
@@ -417,6 +547,227 @@ void gauss_seidel_indexed(const I Ap[], const int Ap_size,
   }
 }
 
+/*
+ *  Perform one iteration of multicolor Gauss-Seidel relaxation on the
+ *  linear system Ax = b, where A is stored in CSR format and x and b
+ *  are column vectors.
+ *
+ *  The rows are grouped by color, so that rows of the same color are
+ *  not coupled in A.  The colors are swept through according to the
+ *  slice defined by color_start, color_stop, and color_step, and the
+ *  rows within one color are relaxed in parallel.  A forward sweep is
+ *  implemented with color_start = 0, color_stop = num_colors, and
+ *  color_step = 1, a backward sweep with color_start = num_colors - 1,
+ *  color_stop = -1, and color_step = -1.
+ *
+ *  Parameters
+ *      Ap[]        - CSR row pointer
+ *      Aj[]        - CSR index array
+ *      Ax[]        - CSR data array
+ *      x[]         - approximate solution(s)
+ *      b[]         - right hand side(s)
+ *      Id[]        - rows ordered by color
+ *      Cp[]        - color pointer, the rows of color c are
+ *                    Id[Cp[c]], ..., Id[Cp[c+1]-1]
+ *      color_start - first color of the sweep
+ *      color_stop  - end of the sweep (i.e. one past the last color)
+ *      color_step  - stride used during the sweep (may be negative)
+ *      k          - number of right-hand sides, the columns of x and b
+ *      num_threads - number of OpenMP threads used for each color
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order, in which case all k columns are
+ *      swept in a single pass over A.
+ *
+ *      Rows of the same color only read values of x from other colors,
+ *      so the result is bitwise identical for any num_threads.
+ *
+ *  Returns:
+ *      Nothing, x will be modified in place
+ *
+ */
+template<class I, class T, class F>
+void multicolor_gauss_seidel(const I Ap[], const int Ap_size,
+                             const I Aj[], const int Aj_size,
+                             const T Ax[], const int Ax_size,
+                                   T  x[], const int  x_size,
+                             const T  b[], const int  b_size,
+                             const I Id[], const int Id_size,
+                             const I Cp[], const int Cp_size,
+                             const I color_start,
+                             const I color_stop,
+                             const I color_step,
+                             const I k,
+                             const I num_threads)
+{
+    for(I color = color_start; color != color_stop; color += color_step) {
+        const I first = Cp[color];
+        const I last  = Cp[color+1];
+
+        #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+        {
+            T *rsum = new T[k];
+
+            #pragma omp for schedule(static)
+            for(I ii = first; ii < last; ii++) {
+                const I i = Id[ii];
+                T diag = 0;
+                std::fill(rsum, rsum + k, (T) 0.0);
+
+                for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                    const I j = Aj[jj];
+                    if (i == j)
+                        diag  = Ax[jj];
+                    else {
+                        const T a = Ax[jj];
+                        const T * xj = x + j*k;
+                        for(I c = 0; c < k; c++)
+                            rsum[c] += a*xj[c];
+                    }
+                }
+
+                if (diag != (F) 0.0){
+                    for(I c = 0; c < k; c++)
+                        x[i*k + c] = (b[i*k + c] - rsum[c])/diag;
+                }
+            }
+
+            delete[] rsum;
+        }
+    }
+}
+
+
+/*
+ *  Perform one iteration of multicolor Gauss-Seidel relaxation on the
+ *  linear system Ax = b, where A is stored in Block CSR format and x
+ *  and b are column vectors.  The block rows are colored, and each
+ *  block row applies point-wise relaxation over its diagonal block as
+ *  in bsr_gauss_seidel.
+ *
+ *  Refer to multicolor_gauss_seidel for additional information
+ *  regarding Id, Cp, color_start, color_stop, and color_step.
+ *
+ *  Parameters
+ *      Ap[]        - BSR row pointer
+ *      Aj[]        - BSR index array
+ *      Ax[]        - BSR data array
+ *      x[]         - approximate solution(s)
+ *      b[]         - right hand side(s)
+ *      Id[]        - block rows ordered by color
+ *      Cp[]        - color pointer
+ *      color_start - first color of the sweep
+ *      color_stop  - end of the sweep (i.e. one past the last color)
+ *      color_step  - stride used during the sweep (may be negative)
+ *      blocksize   - BSR blocksize (blocks must be square)
+ *      k          - number of right-hand sides, the columns of x and b
+ *      num_threads - number of OpenMP threads used for each color
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order, in which case all k columns are
+ *      swept in a single pass over A.
+ *
+ *      The diagonal blocks are swept forward for color_step > 0 and
+ *      backward otherwise.  The result is bitwise identical for any
+ *      num_threads.
+ *
+ *  Returns:
+ *      Nothing, x will be modified in place
+ *
+ */
+template<class I, class T, class F>
+void bsr_multicolor_gauss_seidel(const I Ap[], const int Ap_size,
+                                 const I Aj[], const int Aj_size,
+                                 const T Ax[], const int Ax_size,
+                                       T  x[], const int  x_size,
+                                 const T  b[], const int  b_size,
+                                 const I Id[], const int Id_size,
+                                 const I Cp[], const int Cp_size,
+                                 const I color_start,
+                                 const I color_stop,
+                                 const I color_step,
+                                 const I blocksize,
+                                 const I k,
+                                 const I num_threads)
+{
+    const I B2 = blocksize*blocksize;
+    const I Bk = blocksize*k;
+
+    // Determine if this is a forward, or backward sweep
+    I step, step_start, step_end;
+    if (color_step < 0){
+        step = -1;
+        step_start = blocksize-1;
+        step_end = -1;
+    }
+    else{
+        step = 1;
+        step_start = 0;
+        step_end = blocksize;
+    }
+
+    for(I color = color_start; color != color_stop; color += color_step) {
+        const I first = Cp[color];
+        const I last  = Cp[color+1];
+
+        #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+        {
+            T *rsum = new T[Bk];
+
+            #pragma omp for schedule(static)
+            for(I ii = first; ii < last; ii++) {
+                const I i = Id[ii];
+                I diag_ptr = -1;
+
+                // initialize rsum to b, then later subtract A*x
+                std::copy(&(b[i*Bk]), &(b[(i+1)*Bk]), rsum);
+
+                for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                    const I j = Aj[jj];
+
+                    if (i == j){
+                        diag_ptr = jj*B2; }
+                    else {
+                        const T * Ablock = &(Ax[jj*B2]);
+                        const T * xj = &(x[j*Bk]);
+                        for(I m = 0; m < blocksize; m++) {
+                            for(I n = 0; n < blocksize; n++) {
+                                const T a = Ablock[m*blocksize + n];
+                                for(I c = 0; c < k; c++) {
+                                    rsum[m*k + c] -= a*xj[n*k + c]; }
+                            }
+                        }
+                    }
+                }
+
+                // point-wise GS over the diagonal block
+                if (diag_ptr != -1) {
+                    for(I m = step_start; m != step_end; m+=step){
+                        T diag = 1.0;
+                        for(I n = step_start; n != step_end; n+=step){
+                            const T a = Ax[m*blocksize + n + diag_ptr];
+                            if(m == n){
+                                diag = a; }
+                            else{
+                                for(I c = 0; c < k; c++) {
+                                    rsum[m*k + c] -= a*x[i*Bk + n*k + c]; }
+                            }
+                        }
+                        if (diag != (F) 0.0){
+                            for(I c = 0; c < k; c++) {
+                                x[i*Bk + m*k + c] = rsum[m*k + c]/diag; }
+                        }
+                    }
+                }
+            }
+
+            delete[] rsum;
+        }
+    }
+}
+
 /*
  * Perform NE Jacobi on the linear system A x = b
  * This effectively carries out weighted-Jacobi on A A^T x = A^T b
@@ -635,8 +986,8 @@ void gauss_seidel_nr(const I Ap[], const int Ap_size,
  *      Ap[]       - BSR row pointer
  *      Aj[]       - BSR index array
  *      Ax[]       - BSR data array, blocks assumed square
- *      x[]        - approximate solution
- *      b[]        - right hand side
+ *      x[]        - approximate solution(s)
+ *      b[]        - right hand side(s)
  *      Tx[]       - Inverse of each diagonal block of A stored
  *                   as a (n/blocksize, blocksize, blocksize) array
  *      temp[]     - temporary vector the same size as x
@@ -645,6 +996,17 @@ void gauss_seidel_nr(const I Ap[], const int Ap_size,
  *      row_step   - stride used during the sweep (may be negative)
  *      omega      - damping parameter
  *      blocksize  - dimension of sqare blocks in BSR matrix A
+ *      k          - number of right-hand sides, the columns of x and b
+ *      num_threads - number of OpenMP threads used for the sweep
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order, in which case all k columns are
+ *      swept in a single pass over A.
+ *
+ *      Each row is updated independently and in the same way for any
+ *      num_threads, so the result is bitwise identical to a serial
+ *      sweep.  Without OpenMP, the sweep is serial.
  *
  *  Returns:
  *      Nothing, x will be modified in place
@@ -662,63 +1024,76 @@ void block_jacobi(const I Ap[], const int Ap_size,
                   const I row_stop,
                   const I row_step,
                   const T omega[], const int omega_size,
-                  const I blocksize)
+                  const I blocksize,
+                  const I k,
+                  const I num_threads)
 {
     // Rename
     const T * Dinv = Tx;
 
+    const I Bk = blocksize*k;
+    const I n_sweep = (row_stop - row_start)/row_step;
     T one = 1.0;
-    T zero = 0.0;
     T omega2 = omega[0];
-    T *rsum = new T[blocksize];
-    T *v = new T[blocksize];
     I blocksize_sq = blocksize*blocksize;
 
     // Copy x to temp vector
-    for(I i = row_start*blocksize; i != row_stop*blocksize; i += row_step*blocksize) {
-        std::copy(&(x[i]), &(x[i+blocksize]), &(temp[i]));
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I t = 0; t < n_sweep; t++) {
+        I i = row_start + t*row_step;
+        std::copy(&(x[i*Bk]), &(x[(i+1)*Bk]), &(temp[i*Bk]));
     }
 
-    // Begin block Jacobi sweep
-    for(I i = row_start; i != row_stop; i += row_step) {
-        I start = Ap[i];
-        I end   = Ap[i+1];
-        std::fill(&(rsum[0]), &(rsum[blocksize]), zero);
-
-        // Carry out a block dot product between block row i and x
-        for(I jj = start; jj < end; jj++){
-            I j = Aj[jj];
-            if (i == j) {
-                //diagonal, do nothing
-                continue;
-            }
-            else {
-                gemm(&(Ax[jj*blocksize_sq]), blocksize, blocksize, 'F',
-                     &(temp[j*blocksize]),   blocksize, 1,         'F',
-                     &(v[0]),                blocksize, 1,         'F',
-                     'T');
-                for(I k = 0; k < blocksize; k++) {
-                    rsum[k] += v[k]; }
+    // Begin block Jacobi sweep, block rows are split among the threads
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        T *rsum = new T[Bk];
+        T *v = new T[Bk];
+
+        #pragma omp for schedule(static)
+        for(I t = 0; t < n_sweep; t++) {
+            I i = row_start + t*row_step;
+            I start = Ap[i];
+            I end   = Ap[i+1];
+            I iBk = i*Bk;
+
+            // rsum = b[i] - sum_{j != i} A[i,j] temp[j]
+            std::copy(&(b[iBk]), &(b[iBk + Bk]), rsum);
+            for(I jj = start; jj < end; jj++){
+                I j = Aj[jj];
+                if (i == j) {
+                    //diagonal, do nothing
+                    continue;
+                }
+                const T * Ablock = &(Ax[jj*blocksize_sq]);
+                const T * tj = &(temp[j*Bk]);
+                for(I m = 0; m < blocksize; m++) {
+                    for(I n = 0; n < blocksize; n++) {
+                        const T a = Ablock[m*blocksize + n];
+                        for(I c = 0; c < k; c++) {
+                            rsum[m*k + c] -= a*tj[n*k + c]; }
+                    }
+                }
             }
-        }
 
-        // x[i*blocksize:(i+1)*blocksize] = (one - omega2) * temp[i*blocksize:(i+1)*blocksize] + omega2 *
-        //          (Dinv[i*blocksize_sq : (i+1)*blocksize_sq]*(b[i*blocksize:(i+1)*blocksize] - rsum[0:blocksize]));
-        I iblocksize = i*blocksize;
-        for(I k = 0; k < blocksize; k++) {
-            rsum[k] = b[iblocksize + k] - rsum[k]; }
+            // v = Dinv[i]*rsum
+            const T * Dblock = &(Dinv[i*blocksize_sq]);
+            std::fill(v, v + Bk, (T) 0.0);
+            for(I m = 0; m < blocksize; m++) {
+                for(I n = 0; n < blocksize; n++) {
+                    const T d = Dblock[m*blocksize + n];
+                    for(I c = 0; c < k; c++) {
+                        v[m*k + c] += d*rsum[n*k + c]; }
+                }
+            }
 
-        gemm(&(Dinv[i*blocksize_sq]), blocksize, blocksize, 'F',
-             &(rsum[0]),              blocksize, 1,         'F',
-             &(v[0]),                 blocksize, 1,         'F',
-             'T');
+            for(I m = 0; m < Bk; m++) {
+                x[iBk + m] = (one - omega2)*temp[iBk + m] + omega2*v[m]; }
+        }
 
-        for(I k = 0; k < blocksize; k++) {
-            x[iblocksize + k] = (one - omega2)*temp[iblocksize + k] + omega2*v[k]; }
+        delete[] v;
+        delete[] rsum;
     }
-
-    delete[] v;
-    delete[] rsum;
 }
 
 /*
@@ -733,14 +1108,20 @@ void block_jacobi(const I Ap[], const int Ap_size,
  *      Ap[]       - BSR row pointer
  *      Aj[]       - BSR index array
  *      Ax[]       - BSR data array, blocks assumed square
- *      x[]        - approximate solution
- *      b[]        - right hand side
+ *      x[]        - approximate solution(s)
+ *      b[]        - right hand side(s)
  *      Tx[]       - Inverse of each diagonal block of A stored
  *                   as a (n/blocksize, blocksize, blocksize) array
  *      row_start  - beginning of the sweep
  *      row_stop   - end of the sweep (i.e. one past the last unknown)
  *      row_step   - stride used during the sweep (may be negative)
  *      blocksize  - dimension of square blocks in BSR matrix A
+ *      k          - number of right-hand sides, the columns of x and b
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order, in which case all k columns are
+ *      swept in a single pass over A.
  *
  *  Returns:
  *      Nothing, x will be modified in place
@@ -756,51 +1137,53 @@ void block_gauss_seidel(const I Ap[], const int Ap_size,
                         const I row_start,
                         const I row_stop,
                         const I row_step,
-                        const I blocksize)
+                        const I blocksize,
+                        const I k)
 {
     // Rename
     const T * Dinv = Tx;
 
-    T zero = 0.0;
-    T *rsum = new T[blocksize];
-    T *v = new T[blocksize];
+    const I Bk = blocksize*k;
+    T *rsum = new T[Bk];
     I blocksize_sq = blocksize*blocksize;
 
     // Begin block Gauss-Seidel sweep
     for(I i = row_start; i != row_stop; i += row_step) {
         I start = Ap[i];
         I end   = Ap[i+1];
-        std::fill(&(rsum[0]), &(rsum[blocksize]), zero);
+        I iBk = i*Bk;
 
-        // Carry out a block dot product between block row i and x
+        // rsum = b[i] - sum_{j != i} A[i,j] x[j]
+        std::copy(&(b[iBk]), &(b[iBk + Bk]), rsum);
         for(I jj = start; jj < end; jj++){
             I j = Aj[jj];
             if (i == j) {
                 //diagonal, do nothing
                 continue;
             }
-            else {
-                gemm(&(Ax[jj*blocksize_sq]), blocksize, blocksize, 'F',
-                     &(x[j*blocksize]),      blocksize, 1,         'F',
-                     &(v[0]),                blocksize, 1,         'F',
-                     'T');
-                for(I k = 0; k < blocksize; k++) {
-                    rsum[k] += v[k]; }
+            const T * Ablock = &(Ax[jj*blocksize_sq]);
+            const T * xj = &(x[j*Bk]);
+            for(I m = 0; m < blocksize; m++) {
+                for(I n = 0; n < blocksize; n++) {
+                    const T a = Ablock[m*blocksize + n];
+                    for(I c = 0; c < k; c++) {
+                        rsum[m*k + c] -= a*xj[n*k + c]; }
+                }
             }
         }
 
-        // x[i*blocksize:(i+1)*blocksize] = (Dinv[i*blocksize_sq : (i+1)*blocksize_sq]*(b[i*blocksize:(i+1)*blocksize] - rsum[0:blocksize]));
-        I iblocksize = i*blocksize;
-        for(I k = 0; k < blocksize; k++) {
-            rsum[k] = b[iblocksize + k] - rsum[k]; }
-
-        gemm(&(Dinv[i*blocksize_sq]), blocksize, blocksize, 'F',
-             &(rsum[0]),              blocksize, 1,         'F',
-             &(x[iblocksize]),        blocksize, 1,         'F',
-             'T');
+        // x[i] = Dinv[i]*rsum
+        const T * Dblock = &(Dinv[i*blocksize_sq]);
+        std::fill(&(x[iBk]), &(x[iBk + Bk]), (T) 0.0);
+        for(I m = 0; m < blocksize; m++) {
+            for(I n = 0; n < blocksize; n++) {
+                const T d = Dblock[m*blocksize + n];
+                for(I c = 0; c < k; c++) {
+                    x[iBk + m*k + c] += d*rsum[n*k + c]; }
+            }
+        }
     }
 
-    delete[] v;
     delete[] rsum;
 }
 
@@ -943,7 +1326,6 @@ void overlapping_schwarz_csr(const I Ap[], const int Ap_size,
                                    I row_stop,
                                    I row_step)
 {
-
     //T zero = 0.0;
     T *rsum = new T[nrows];
     T *Dinv_rsum = new T[nrows];
@@ -977,8 +1359,8 @@ void overlapping_schwarz_csr(const I Ap[], const int Ap_size,
 
         // Multiply block residual with block inverse of A
         gemm(&(Tx[Tp[domptr]]), size_domain, size_domain, 'F',
-             &(rsum[0]),      size_domain,   1,         'F',
-             &(Dinv_rsum[0]), size_domain,   1,         'F',
+             &(rsum[0]),      size_domain,   (I) 1,     'F',
+             &(Dinv_rsum[0]), size_domain,   (I) 1,     'F',
              'F');
 
         // Add to x
@@ -1002,4 +1384,569 @@ void overlapping_schwarz_csr(const I Ap[], const int Ap_size,
 }
 
 
+/*
+ *  Apply one Chebyshev polynomial smoother to the linear system
+ *  Ax = b, where A is stored in CSR format, i.e., perform degree
+ *  steps of the (diagonally preconditioned) Chebyshev iteration
+ *
+ *      x <- x + p(D^-1 A) D^-1 (b - Ax),
+ *
+ *  where the error polynomial 1 - t p(t) of degree 'degree' has
+ *  minimal magnitude on [lower, upper].  The steps use the
+ *  three-term recurrence of the Chebyshev polynomials, so that no
+ *  powers of A and no polynomial coefficients are formed.
+ *
+ *  Parameters
+ *      Ap[]       - CSR row pointer
+ *      Aj[]       - CSR index array
+ *      Ax[]       - CSR data array
+ *      x[]        - approximate solution(s)
+ *      b[]        - right hand side(s)
+ *      Dinv[]     - diagonal scaling D^-1 (length n_row), e.g.,
+ *                   ones or the inverse of the diagonal of A
+ *      r[]        - temporary vector the same size as x (residual)
+ *      d[]        - temporary vector the same size as x (update)
+ *      lower      - lower bound of the interval of the spectrum of
+ *                   D^-1 A that is damped
+ *      upper      - upper bound of the interval, an upper bound of
+ *                   the spectrum of D^-1 A
+ *      degree     - degree of the polynomial, i.e., the number of
+ *                   products with A
+ *      k          - number of right-hand sides, the columns of x and b
+ *      num_threads - number of OpenMP threads used for the products
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order.
+ *
+ *      Each step updates the rows independently, so the result is
+ *      bitwise identical for any num_threads.
+ *
+ *  Returns:
+ *      Nothing, x will be modified in place
+ *
+ */
+// r = b - A*x for k right-hand sides stored row-wise, r and b may alias
+template<class I, class T>
+void chebyshev_residual(const I Ap[], const I Aj[], const T Ax[],
+                        const T x[], const T b[], T r[],
+                        const I n_row, const I k, const I num_threads)
+{
+    if (k == 1) {
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+        for(I i = 0; i < n_row; i++){
+            T sum = b[i];
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++)
+                sum -= Ax[jj]*x[Aj[jj]];
+            r[i] = sum;
+        }
+        return;
+    }
+
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        T *sum = new T[k];
+
+        #pragma omp for schedule(static)
+        for(I i = 0; i < n_row; i++){
+            std::copy(b + i*k, b + (i+1)*k, sum);
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const T a = Ax[jj];
+                const T * xj = x + Aj[jj]*k;
+                for(I c = 0; c < k; c++)
+                    sum[c] -= a*xj[c];
+            }
+            std::copy(sum, sum + k, r + i*k);
+        }
+
+        delete[] sum;
+    }
+}
+
+
+template<class I, class T, class F>
+void chebyshev(const I Ap[], const int Ap_size,
+               const I Aj[], const int Aj_size,
+               const T Ax[], const int Ax_size,
+                     T  x[], const int  x_size,
+               const T  b[], const int  b_size,
+               const T Dinv[], const int Dinv_size,
+                     T  r[], const int  r_size,
+                     T  d[], const int  d_size,
+               const F lower,
+               const F upper,
+               const I degree,
+               const I k,
+               const I num_threads)
+{
+    const I n_row = Ap_size - 1;
+
+    const F theta = (upper + lower) / 2;
+    const F delta = (upper - lower) / 2;
+    const F sigma = theta / delta;
+    F rho = 1 / sigma;
+
+    // r = b - A*x
+    chebyshev_residual(Ap, Aj, Ax, x, b, r, n_row, k, num_threads);
+
+    // d = D^-1 r / theta,  x += d
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_row; i++){
+        const T s = Dinv[i] / theta;
+        for(I c = 0; c < k; c++){
+            d[i*k + c] = s*r[i*k + c];
+            x[i*k + c] += d[i*k + c];
+        }
+    }
+
+    for(I step = 1; step < degree; step++){
+        const F rho_new = 1 / (2*sigma - rho);
+        const F alpha = rho_new * rho;
+        const F beta = 2 * rho_new / delta;
+        rho = rho_new;
+
+        // r -= A*d
+        chebyshev_residual(Ap, Aj, Ax, d, r, r, n_row, k, num_threads);
+
+        // d = alpha*d + beta*D^-1 r,  x += d
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+        for(I i = 0; i < n_row; i++){
+            const T s = beta*Dinv[i];
+            for(I c = 0; c < k; c++){
+                d[i*k + c] = alpha*d[i*k + c] + s*r[i*k + c];
+                x[i*k + c] += d[i*k + c];
+            }
+        }
+    }
+}
+
+
+/*
+ *  Perform one iteration of l1-Jacobi relaxation on the linear
+ *  system Ax = b, where A is stored in BSR format (CSR is the case
+ *  blocksize = 1).  Each row i is updated with
+ *
+ *      x_i <- x_i + omega (b - A x)_i / (a_ii + sum_{j != i} |a_ij|),
+ *
+ *  i.e., the diagonal is augmented by the l1 norm of the off-diagonal
+ *  part of the row.  For A symmetric positive definite the iteration
+ *  converges for omega = 1 without any estimate of the spectral
+ *  radius of D^-1 A.
+ *
+ *  Parameters
+ *      Ap[]       - BSR row pointer
+ *      Aj[]       - BSR index array
+ *      Ax[]       - BSR data array, blocks stored in row-major order
+ *      x[]        - approximate solution(s)
+ *      b[]        - right hand side(s)
+ *      temp[]     - temporary vector the same size as x
+ *      blocksize  - BSR blocksize (blocks must be square)
+ *      omega      - damping parameter
+ *      k          - number of right-hand sides, the columns of x and b
+ *      num_threads - number of OpenMP threads
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order.
+ *
+ *      Every row update only reads temp, so the result is bitwise
+ *      identical for any num_threads.
+ *
+ *  Returns:
+ *      Nothing, x will be modified in place
+ *
+ */
+template<class I, class T, class F>
+void l1_jacobi(const I Ap[], const int Ap_size,
+               const I Aj[], const int Aj_size,
+               const T Ax[], const int Ax_size,
+                     T  x[], const int  x_size,
+               const T  b[], const int  b_size,
+                     T temp[], const int temp_size,
+               const I blocksize,
+               const T omega[], const int omega_size,
+               const I k,
+               const I num_threads)
+{
+    const I n_brow = Ap_size - 1;
+    const I n_row = n_brow*blocksize;
+    const I B2 = blocksize*blocksize;
+    const T omega2 = omega[0];
+
+    std::copy(x, x + n_row*k, temp);
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_brow; i++){
+        for(I m = 0; m < blocksize; m++){
+            const I row = i*blocksize + m;
+
+            for(I c = 0; c < k; c++){
+                T rsum = b[row*k + c];
+                T diag = 0;
+                F l1 = 0;
+
+                for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                    const T * block_row = Ax + jj*B2 + m*blocksize;
+                    const I col0 = Aj[jj]*blocksize;
+                    for(I n = 0; n < blocksize; n++){
+                        const T a = block_row[n];
+                        rsum -= a*temp[(col0 + n)*k + c];
+                        if (col0 + n == row)
+                            diag = a;
+                        else
+                            l1 += mynorm(a);
+                    }
+                }
+
+                const T d = diag + l1;
+                if (d != (F) 0.0)
+                    x[row*k + c] = temp[row*k + c] + omega2*rsum/d;
+            }
+        }
+    }
+}
+
+
+/*
+ *  Perform one iteration of hybrid l1-Gauss-Seidel relaxation on the
+ *  linear system Ax = b, where A is stored in BSR format (CSR is the
+ *  case blocksize = 1).  The block rows are split into n_parts
+ *  contiguous partitions.  Within a partition the rows are swept
+ *  Gauss-Seidel style, while the couplings to other partitions use
+ *  the values of x from the start of the iteration and are moved to
+ *  the diagonal in the l1 sense, i.e., row i is updated with
+ *
+ *      x_i <- x_i + (b - A x)_i / (a_ii + sum_{j not in part(i)} |a_ij|).
+ *
+ *  For A symmetric positive definite the iteration converges for any
+ *  number of partitions.  With n_parts = 1 this is Gauss-Seidel.
+ *
+ *  Parameters
+ *      Ap[]       - BSR row pointer
+ *      Aj[]       - BSR index array
+ *      Ax[]       - BSR data array, blocks stored in row-major order
+ *      x[]        - approximate solution
+ *      b[]        - right hand side
+ *      temp[]     - temporary vector the same size as x
+ *      row_step   - 1 for a forward sweep, -1 for a backward sweep
+ *                   within each partition
+ *      n_parts    - number of partitions
+ *      blocksize  - BSR blocksize (blocks must be square)
+ *      num_threads - number of OpenMP threads
+ *
+ *  Notes:
+ *      The partitions are processed concurrently, and each partition
+ *      only writes its own rows of x, so for a fixed n_parts the
+ *      result is bitwise identical for any num_threads.
+ *
+ *  Returns:
+ *      Nothing, x will be modified in place
+ *
+ */
+template<class I, class T, class F>
+void l1_gauss_seidel(const I Ap[], const int Ap_size,
+                     const I Aj[], const int Aj_size,
+                     const T Ax[], const int Ax_size,
+                           T  x[], const int  x_size,
+                     const T  b[], const int  b_size,
+                           T temp[], const int temp_size,
+                     const I row_step,
+                     const I n_parts,
+                     const I blocksize,
+                     const I num_threads)
+{
+    const I n_brow = Ap_size - 1;
+    const I B2 = blocksize*blocksize;
+
+    std::copy(x, x + x_size, temp);
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I p = 0; p < n_parts; p++){
+        const I lo = (I) (((long long) n_brow * p) / n_parts);
+        const I hi = (I) (((long long) n_brow * (p + 1)) / n_parts);
+        const I n_sweep = (hi - lo)*blocksize;
+
+        for(I t = 0; t < n_sweep; t++){
+            const I row = (row_step > 0) ? lo*blocksize + t : hi*blocksize - 1 - t;
+            const I i = row / blocksize;
+            const I m = row - i*blocksize;
+
+            T rsum = b[row];
+            T diag = 0;
+            F l1 = 0;
+
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const I j = Aj[jj];
+                const T * block_row = Ax + jj*B2 + m*blocksize;
+                const I col0 = j*blocksize;
+                if (lo <= j && j < hi){
+                    for(I n = 0; n < blocksize; n++){
+                        rsum -= block_row[n]*x[col0 + n];
+                        if (col0 + n == row)
+                            diag = block_row[n];
+                    }
+                }
+                else{
+                    for(I n = 0; n < blocksize; n++){
+                        rsum -= block_row[n]*temp[col0 + n];
+                        l1 += mynorm(block_row[n]);
+                    }
+                }
+            }
+
+            const T d = diag + l1;
+            if (d != (F) 0.0)
+                x[row] += rsum/d;
+        }
+    }
+}
+
+
+/*
+ *  Compute the ILU(0) factorization of a matrix A stored in CSR format,
+ *  i.e., A ~ LU, where L is unit lower triangular and U is upper
+ *  triangular and L + U has the sparsity pattern of A.  The factors are
+ *  computed in place: on input LUx[] holds the values of A, on output
+ *  the strictly lower part holds L and the upper part holds U.
+ *
+ *  Parameters
+ *      Ap[]       - CSR row pointer
+ *      Aj[]       - CSR index array, sorted in each row
+ *      LUx[]      - CSR data array of A on input, of L and U on output
+ *      diag[]     - position of the diagonal entry of each row in Aj
+ *
+ *  Notes:
+ *      Every row must hold its diagonal entry.  Elimination with a zero
+ *      pivot is skipped, so that the caller can detect it from the
+ *      diagonal of U.
+ *
+ *  Returns:
+ *      Nothing, LUx will be modified in place
+ *
+ */
+template<class I, class T, class F>
+void ilu0(const I Ap[], const int Ap_size,
+          const I Aj[], const int Aj_size,
+                T LUx[], const int LUx_size,
+          const I diag[], const int diag_size)
+{
+    const I n_row = Ap_size - 1;
+    std::vector<I> position(n_row, -1);
+
+    for(I i = 0; i < n_row; i++){
+        for(I jj = Ap[i]; jj < Ap[i+1]; jj++)
+            position[Aj[jj]] = jj;
+
+        // IKJ variant: eliminate the entries left of the diagonal in order
+        for(I kk = Ap[i]; kk < diag[i]; kk++){
+            const I k = Aj[kk];
+            const T pivot = LUx[diag[k]];
+            if (pivot == (F) 0.0)
+                continue;
+
+            const T mult = LUx[kk] / pivot;
+            LUx[kk] = mult;
+            for(I jj = diag[k] + 1; jj < Ap[k+1]; jj++){
+                const I p = position[Aj[jj]];
+                if (p >= 0)
+                    LUx[p] -= mult*LUx[jj];
+            }
+        }
+
+        for(I jj = Ap[i]; jj < Ap[i+1]; jj++)
+            position[Aj[jj]] = -1;
+    }
+}
+
+
+/*
+ *  Compute the level schedule of the triangular solves with the lower
+ *  and upper part of a matrix stored in CSR format.  Rows in the same
+ *  level do not depend on each other and are solved concurrently.
+ *
+ *  Parameters
+ *      Ap[]       - CSR row pointer
+ *      Aj[]       - CSR index array, sorted in each row
+ *      diag[]     - position of the diagonal entry of each row in Aj
+ *      L_level[]  - level of each row in the forward solve (output)
+ *      U_level[]  - level of each row in the backward solve (output)
+ *
+ *  Returns:
+ *      Nothing, L_level and U_level will be modified in place
+ *
+ */
+template<class I>
+void triangular_levels(const I Ap[], const int Ap_size,
+                       const I Aj[], const int Aj_size,
+                       const I diag[], const int diag_size,
+                             I L_level[], const int L_level_size,
+                             I U_level[], const int U_level_size)
+{
+    const I n_row = Ap_size - 1;
+
+    for(I i = 0; i < n_row; i++){
+        I level = 0;
+        for(I jj = Ap[i]; jj < diag[i]; jj++)
+            level = std::max(level, L_level[Aj[jj]] + 1);
+        L_level[i] = level;
+    }
+
+    for(I i = n_row - 1; i >= 0; i--){
+        I level = 0;
+        for(I jj = diag[i] + 1; jj < Ap[i+1]; jj++)
+            level = std::max(level, U_level[Aj[jj]] + 1);
+        U_level[i] = level;
+    }
+}
+
+
+/*
+ *  Apply one step of incomplete LU relaxation to the linear system
+ *  Ax = b, where A is stored in CSR format, i.e.,
+ *
+ *      x <- x + omega (LU)^-1 (b - Ax),
+ *
+ *  where L and U are stored in the pattern of A, e.g., from ilu0.
+ *
+ *  The triangular solves are either exact, with the rows of each level
+ *  of the level schedule solved concurrently, or approximate, with a
+ *  fixed number of Jacobi sweeps on each triangular system.
+ *
+ *  Parameters
+ *      Ap[]       - CSR row pointer
+ *      Aj[]       - CSR index array, sorted in each row
+ *      Ax[]       - CSR data array of A
+ *      LUx[]      - CSR data array of L (strictly lower) and U (upper)
+ *      diag[]     - position of the diagonal entry of each row in Aj
+ *      x[]        - approximate solution(s)
+ *      b[]        - right hand side(s)
+ *      r[]        - temporary vector the same size as x
+ *      y[]        - temporary vector the same size as x
+ *      L_rows[]   - rows ordered by level of the forward solve
+ *      L_ptr[]    - pointer in L_rows to the first row of each level
+ *      U_rows[]   - rows ordered by level of the backward solve
+ *      U_ptr[]    - pointer in U_rows to the first row of each level
+ *      sweeps     - 0 for exact triangular solves, otherwise the
+ *                   number of Jacobi sweeps on each triangular system
+ *      omega      - damping parameter
+ *      k          - number of right-hand sides, the columns of x and b
+ *      num_threads - number of OpenMP threads
+ *
+ *  Notes:
+ *      x and b may hold k right-hand sides stored row-wise, i.e., an
+ *      (n, k) array in C order.
+ *
+ *      Each row is computed exactly as in the serial loop, so the
+ *      result is bitwise identical for any num_threads.
+ *
+ *  Returns:
+ *      Nothing, x will be modified in place
+ *
+ */
+template<class I, class T, class F>
+void ilu_relax(const I Ap[], const int Ap_size,
+               const I Aj[], const int Aj_size,
+               const T Ax[], const int Ax_size,
+               const T LUx[], const int LUx_size,
+               const I diag[], const int diag_size,
+                     T  x[], const int  x_size,
+               const T  b[], const int  b_size,
+                     T  r[], const int  r_size,
+                     T  y[], const int  y_size,
+               const I L_rows[], const int L_rows_size,
+               const I L_ptr[], const int L_ptr_size,
+               const I U_rows[], const int U_rows_size,
+               const I U_ptr[], const int U_ptr_size,
+               const I sweeps,
+               const T omega[], const int omega_size,
+               const I k,
+               const I num_threads)
+{
+    const I n_row = Ap_size - 1;
+    const T omega2 = omega[0];
+
+    // r = b - A*x
+    chebyshev_residual(Ap, Aj, Ax, x, b, r, n_row, k, num_threads);
+
+    if (sweeps == 0) {
+        // forward solve L r = r, one level at a time
+        for(I level = 0; level < L_ptr_size - 1; level++){
+            #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+            for(I t = L_ptr[level]; t < L_ptr[level+1]; t++){
+                const I i = L_rows[t];
+                for(I c = 0; c < k; c++){
+                    T sum = r[i*k + c];
+                    for(I jj = Ap[i]; jj < diag[i]; jj++)
+                        sum -= LUx[jj]*r[Aj[jj]*k + c];
+                    r[i*k + c] = sum;
+                }
+            }
+        }
+
+        // backward solve U r = r, one level at a time
+        for(I level = 0; level < U_ptr_size - 1; level++){
+            #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+            for(I t = U_ptr[level]; t < U_ptr[level+1]; t++){
+                const I i = U_rows[t];
+                for(I c = 0; c < k; c++){
+                    T sum = r[i*k + c];
+                    for(I jj = diag[i] + 1; jj < Ap[i+1]; jj++)
+                        sum -= LUx[jj]*r[Aj[jj]*k + c];
+                    r[i*k + c] = sum / LUx[diag[i]];
+                }
+            }
+        }
+
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+        for(I i = 0; i < n_row; i++){
+            for(I c = 0; c < k; c++)
+                x[i*k + c] += omega2*r[i*k + c];
+        }
+        return;
+    }
+
+    std::vector<T> z(n_row*k);
+
+    // Jacobi sweeps on L y = r, starting from y = r
+    std::copy(r, r + n_row*k, y);
+    for(I sweep = 0; sweep < sweeps; sweep++){
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+        for(I i = 0; i < n_row; i++){
+            for(I c = 0; c < k; c++){
+                T sum = r[i*k + c];
+                for(I jj = Ap[i]; jj < diag[i]; jj++)
+                    sum -= LUx[jj]*y[Aj[jj]*k + c];
+                z[i*k + c] = sum;
+            }
+        }
+        std::copy(z.begin(), z.end(), y);
+    }
+
+    // Jacobi sweeps on U r = y, starting from r = D_U^-1 y
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_row; i++){
+        for(I c = 0; c < k; c++)
+            r[i*k + c] = y[i*k + c] / LUx[diag[i]];
+    }
+    for(I sweep = 0; sweep < sweeps; sweep++){
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+        for(I i = 0; i < n_row; i++){
+            for(I c = 0; c < k; c++){
+                T sum = y[i*k + c];
+                for(I jj = diag[i] + 1; jj < Ap[i+1]; jj++)
+                    sum -= LUx[jj]*r[Aj[jj]*k + c];
+                z[i*k + c] = sum / LUx[diag[i]];
+            }
+        }
+        std::copy(z.begin(), z.end(), r);
+    }
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_row; i++){
+        for(I c = 0; c < k; c++)
+            x[i*k + c] += omega2*r[i*k + c];
+    }
+}
+
+
 #endif
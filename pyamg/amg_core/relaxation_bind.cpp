@@ -17,7 +17,8 @@ void _gauss_seidel(
        py::array_t<T> & b,
         const I row_start,
          const I row_stop,
-         const I row_step
+         const I row_step,
+                const I k
                    )
 {
     auto py_Ap = Ap.unchecked();
@@ -39,7 +40,8 @@ void _gauss_seidel(
                        _b, b.shape(0),
                 row_start,
                  row_stop,
-                 row_step
+                 row_step,
+                        k
                                  );
 }
 
@@ -53,7 +55,8 @@ void _bsr_gauss_seidel(
         const I row_start,
          const I row_stop,
          const I row_step,
-        const I blocksize
+        const I blocksize,
+                const I k
                        )
 {
     auto py_Ap = Ap.unchecked();
@@ -76,7 +79,8 @@ void _bsr_gauss_seidel(
                 row_start,
                  row_stop,
                  row_step,
-                blocksize
+                blocksize,
+                        k
                                      );
 }
 
@@ -91,7 +95,9 @@ void _jacobi(
         const I row_start,
          const I row_stop,
          const I row_step,
-   py::array_t<T> & omega
+   py::array_t<T> & omega,
+                const I k,
+      const I num_threads
              )
 {
     auto py_Ap = Ap.unchecked();
@@ -119,7 +125,9 @@ void _jacobi(
                 row_start,
                  row_stop,
                  row_step,
-                   _omega, omega.shape(0)
+                   _omega, omega.shape(0),
+                        k,
+              num_threads
                            );
 }
 
@@ -135,7 +143,9 @@ void _bsr_jacobi(
          const I row_stop,
          const I row_step,
         const I blocksize,
-   py::array_t<T> & omega
+   py::array_t<T> & omega,
+                const I k,
+      const I num_threads
                  )
 {
     auto py_Ap = Ap.unchecked();
@@ -164,7 +174,9 @@ void _bsr_jacobi(
                  row_stop,
                  row_step,
                 blocksize,
-                   _omega, omega.shape(0)
+                   _omega, omega.shape(0),
+                        k,
+              num_threads
                                );
 }
 
@@ -207,6 +219,102 @@ void _gauss_seidel_indexed(
                                          );
 }
 
+template<class I, class T, class F>
+void _multicolor_gauss_seidel(
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+      py::array_t<I> & Id,
+      py::array_t<I> & Cp,
+      const I color_start,
+       const I color_stop,
+       const I color_step,
+                const I k,
+      const I num_threads
+                              )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.mutable_unchecked();
+    auto py_b = b.unchecked();
+    auto py_Id = Id.unchecked();
+    auto py_Cp = Cp.unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    T *_x = py_x.mutable_data();
+    const T *_b = py_b.data();
+    const I *_Id = py_Id.data();
+    const I *_Cp = py_Cp.data();
+
+    return multicolor_gauss_seidel<I, T, F>(
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                      _Id, Id.shape(0),
+                      _Cp, Cp.shape(0),
+              color_start,
+               color_stop,
+               color_step,
+                        k,
+              num_threads
+                                            );
+}
+
+template<class I, class T, class F>
+void _bsr_multicolor_gauss_seidel(
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+      py::array_t<I> & Id,
+      py::array_t<I> & Cp,
+      const I color_start,
+       const I color_stop,
+       const I color_step,
+        const I blocksize,
+                const I k,
+      const I num_threads
+                                  )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.mutable_unchecked();
+    auto py_b = b.unchecked();
+    auto py_Id = Id.unchecked();
+    auto py_Cp = Cp.unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    T *_x = py_x.mutable_data();
+    const T *_b = py_b.data();
+    const I *_Id = py_Id.data();
+    const I *_Cp = py_Cp.data();
+
+    return bsr_multicolor_gauss_seidel<I, T, F>(
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                      _Id, Id.shape(0),
+                      _Cp, Cp.shape(0),
+              color_start,
+               color_stop,
+               color_step,
+                blocksize,
+                        k,
+              num_threads
+                                                );
+}
+
 template<class I, class T, class F>
 void _jacobi_ne(
       py::array_t<I> & Ap,
@@ -349,7 +457,9 @@ void _block_jacobi(
          const I row_stop,
          const I row_step,
    py::array_t<T> & omega,
-        const I blocksize
+        const I blocksize,
+                const I k,
+      const I num_threads
                    )
 {
     auto py_Ap = Ap.unchecked();
@@ -381,7 +491,9 @@ void _block_jacobi(
                  row_stop,
                  row_step,
                    _omega, omega.shape(0),
-                blocksize
+                blocksize,
+                        k,
+              num_threads
                                  );
 }
 
@@ -396,7 +508,8 @@ void _block_gauss_seidel(
         const I row_start,
          const I row_stop,
          const I row_step,
-        const I blocksize
+        const I blocksize,
+                const I k
                          )
 {
     auto py_Ap = Ap.unchecked();
@@ -422,7 +535,8 @@ void _block_gauss_seidel(
                 row_start,
                  row_stop,
                  row_step,
-                blocksize
+                blocksize,
+                        k
                                        );
 }
 
@@ -522,6 +636,266 @@ void _overlapping_schwarz_csr(
                                             );
 }
 
+template<class I, class T, class F>
+void _chebyshev(
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+    py::array_t<T> & Dinv,
+       py::array_t<T> & r,
+       py::array_t<T> & d,
+            const F lower,
+            const F upper,
+           const I degree,
+                const I k,
+      const I num_threads
+                )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.mutable_unchecked();
+    auto py_b = b.unchecked();
+    auto py_Dinv = Dinv.unchecked();
+    auto py_r = r.mutable_unchecked();
+    auto py_d = d.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    T *_x = py_x.mutable_data();
+    const T *_b = py_b.data();
+    const T *_Dinv = py_Dinv.data();
+    T *_r = py_r.mutable_data();
+    T *_d = py_d.mutable_data();
+
+    return chebyshev<I, T, F>(
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                    _Dinv, Dinv.shape(0),
+                       _r, r.shape(0),
+                       _d, d.shape(0),
+                    lower,
+                    upper,
+                   degree,
+                        k,
+              num_threads
+                              );
+}
+
+template<class I, class T, class F>
+void _l1_jacobi(
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+    py::array_t<T> & temp,
+        const I blocksize,
+   py::array_t<T> & omega,
+                const I k,
+      const I num_threads
+                )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.mutable_unchecked();
+    auto py_b = b.unchecked();
+    auto py_temp = temp.mutable_unchecked();
+    auto py_omega = omega.unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    T *_x = py_x.mutable_data();
+    const T *_b = py_b.data();
+    T *_temp = py_temp.mutable_data();
+    const T *_omega = py_omega.data();
+
+    return l1_jacobi<I, T, F>(
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                    _temp, temp.shape(0),
+                blocksize,
+                   _omega, omega.shape(0),
+                        k,
+              num_threads
+                              );
+}
+
+template<class I, class T, class F>
+void _l1_gauss_seidel(
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+    py::array_t<T> & temp,
+         const I row_step,
+          const I n_parts,
+        const I blocksize,
+      const I num_threads
+                      )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_x = x.mutable_unchecked();
+    auto py_b = b.unchecked();
+    auto py_temp = temp.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    T *_x = py_x.mutable_data();
+    const T *_b = py_b.data();
+    T *_temp = py_temp.mutable_data();
+
+    return l1_gauss_seidel<I, T, F>(
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                    _temp, temp.shape(0),
+                 row_step,
+                  n_parts,
+                blocksize,
+              num_threads
+                                    );
+}
+
+template<class I, class T, class F>
+void _ilu0(
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+     py::array_t<T> & LUx,
+    py::array_t<I> & diag
+           )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_LUx = LUx.mutable_unchecked();
+    auto py_diag = diag.unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    T *_LUx = py_LUx.mutable_data();
+    const I *_diag = py_diag.data();
+
+    return ilu0<I, T, F>(
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                     _LUx, LUx.shape(0),
+                    _diag, diag.shape(0)
+                         );
+}
+
+template<class I>
+void _triangular_levels(
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+    py::array_t<I> & diag,
+ py::array_t<I> & L_level,
+ py::array_t<I> & U_level
+                        )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_diag = diag.unchecked();
+    auto py_L_level = L_level.mutable_unchecked();
+    auto py_U_level = U_level.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const I *_diag = py_diag.data();
+    I *_L_level = py_L_level.mutable_data();
+    I *_U_level = py_U_level.mutable_data();
+
+    return triangular_levels<I>(
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                    _diag, diag.shape(0),
+                 _L_level, L_level.shape(0),
+                 _U_level, U_level.shape(0)
+                                );
+}
+
+template<class I, class T, class F>
+void _ilu_relax(
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+     py::array_t<T> & LUx,
+    py::array_t<I> & diag,
+       py::array_t<T> & x,
+       py::array_t<T> & b,
+       py::array_t<T> & r,
+       py::array_t<T> & y,
+  py::array_t<I> & L_rows,
+   py::array_t<I> & L_ptr,
+  py::array_t<I> & U_rows,
+   py::array_t<I> & U_ptr,
+           const I sweeps,
+   py::array_t<T> & omega,
+                const I k,
+      const I num_threads
+                )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_LUx = LUx.unchecked();
+    auto py_diag = diag.unchecked();
+    auto py_x = x.mutable_unchecked();
+    auto py_b = b.unchecked();
+    auto py_r = r.mutable_unchecked();
+    auto py_y = y.mutable_unchecked();
+    auto py_L_rows = L_rows.unchecked();
+    auto py_L_ptr = L_ptr.unchecked();
+    auto py_U_rows = U_rows.unchecked();
+    auto py_U_ptr = U_ptr.unchecked();
+    auto py_omega = omega.unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const T *_LUx = py_LUx.data();
+    const I *_diag = py_diag.data();
+    T *_x = py_x.mutable_data();
+    const T *_b = py_b.data();
+    T *_r = py_r.mutable_data();
+    T *_y = py_y.mutable_data();
+    const I *_L_rows = py_L_rows.data();
+    const I *_L_ptr = py_L_ptr.data();
+    const I *_U_rows = py_U_rows.data();
+    const I *_U_ptr = py_U_ptr.data();
+    const T *_omega = py_omega.data();
+
+    return ilu_relax<I, T, F>(
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                     _LUx, LUx.shape(0),
+                    _diag, diag.shape(0),
+                       _x, x.shape(0),
+                       _b, b.shape(0),
+                       _r, r.shape(0),
+                       _y, y.shape(0),
+                  _L_rows, L_rows.shape(0),
+                   _L_ptr, L_ptr.shape(0),
+                  _U_rows, U_rows.shape(0),
+                   _U_ptr, U_ptr.shape(0),
+                   sweeps,
+                   _omega, omega.shape(0),
+                        k,
+              num_threads
+                              );
+}
+
 PYBIND11_MODULE(relaxation, m) {
     m.doc() = R"pbdoc(
     Pybind11 bindings for relaxation.h
@@ -533,6 +907,8 @@ PYBIND11_MODULE(relaxation, m) {
     jacobi
     bsr_jacobi
     gauss_seidel_indexed
+    multicolor_gauss_seidel
+    bsr_multicolor_gauss_seidel
     jacobi_ne
     gauss_seidel_ne
     gauss_seidel_nr
@@ -540,19 +916,33 @@ PYBIND11_MODULE(relaxation, m) {
     block_gauss_seidel
     extract_subblocks
     overlapping_schwarz_csr
+    chebyshev
+    l1_jacobi
+    l1_gauss_seidel
+    ilu0
+    triangular_levels
+    ilu_relax
     )pbdoc";
 
     py::options options;
     options.disable_function_signatures();
 
     m.def("gauss_seidel", &_gauss_seidel<int, float, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("k"));
     m.def("gauss_seidel", &_gauss_seidel<int, double, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("k"));
     m.def("gauss_seidel", &_gauss_seidel<int, std::complex<float>, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("k"));
     m.def("gauss_seidel", &_gauss_seidel<int, std::complex<double>, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"),
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("k"));
+    m.def("gauss_seidel", &_gauss_seidel<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("k"));
+    m.def("gauss_seidel", &_gauss_seidel<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("k"));
+    m.def("gauss_seidel", &_gauss_seidel<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("k"));
+    m.def("gauss_seidel", &_gauss_seidel<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("k"),
 R"pbdoc(
 Perform one iteration of Gauss-Seidel relaxation on the linear
  system Ax = b, where A is stored in CSR format and x and b
@@ -570,23 +960,37 @@ Perform one iteration of Gauss-Seidel relaxation on the linear
      Ap[]       - CSR row pointer
      Aj[]       - CSR index array
      Ax[]       - CSR data array
-     x[]        - approximate solution
-     b[]        - right hand side
+     x[]        - approximate solution(s)
+     b[]        - right hand side(s)
      row_start  - beginning of the sweep
      row_stop   - end of the sweep (i.e. one past the last unknown)
      row_step   - stride used during the sweep (may be negative)
+     k          - number of right-hand sides, the columns of x and b
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order, in which case all k columns are
+     swept in a single pass over A.
 
  Returns:
      Nothing, x will be modified in place)pbdoc");
 
     m.def("bsr_gauss_seidel", &_bsr_gauss_seidel<int, float, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
     m.def("bsr_gauss_seidel", &_bsr_gauss_seidel<int, double, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
     m.def("bsr_gauss_seidel", &_bsr_gauss_seidel<int, std::complex<float>, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
     m.def("bsr_gauss_seidel", &_bsr_gauss_seidel<int, std::complex<double>, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"),
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
+    m.def("bsr_gauss_seidel", &_bsr_gauss_seidel<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
+    m.def("bsr_gauss_seidel", &_bsr_gauss_seidel<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
+    m.def("bsr_gauss_seidel", &_bsr_gauss_seidel<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
+    m.def("bsr_gauss_seidel", &_bsr_gauss_seidel<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"),
 R"pbdoc(
 Perform one iteration of Gauss-Seidel relaxation on the linear
  system Ax = b, where A is stored in Block CSR format and x and b
@@ -600,24 +1004,38 @@ Perform one iteration of Gauss-Seidel relaxation on the linear
      Ap[]       - BSR row pointer
      Aj[]       - BSR index array
      Ax[]       - BSR data array
-     x[]        - approximate solution
-     b[]        - right hand side
+     x[]        - approximate solution(s)
+     b[]        - right hand side(s)
      row_start  - beginning of the sweep (block row index)
      row_stop   - end of the sweep (i.e. one past the last unknown)
      row_step   - stride used during the sweep (may be negative)
      blocksize  - BSR blocksize (blocks must be square)
+     k          - number of right-hand sides, the columns of x and b
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order, in which case all k columns are
+     swept in a single pass over A.
 
  Returns:
      Nothing, x will be modified in place)pbdoc");
 
     m.def("jacobi", &_jacobi<int, float, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert());
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
     m.def("jacobi", &_jacobi<int, double, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert());
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
     m.def("jacobi", &_jacobi<int, std::complex<float>, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert());
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
     m.def("jacobi", &_jacobi<int, std::complex<double>, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(),
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("jacobi", &_jacobi<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("jacobi", &_jacobi<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("jacobi", &_jacobi<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("jacobi", &_jacobi<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"),
 R"pbdoc(
 Perform one iteration of Jacobi relaxation on the linear
  system Ax = b, where A is stored in CSR format and x and b
@@ -631,25 +1049,44 @@ Perform one iteration of Jacobi relaxation on the linear
      Ap[]       - CSR row pointer
      Aj[]       - CSR index array
      Ax[]       - CSR data array
-     x[]        - approximate solution
-     b[]        - right hand side
+     x[]        - approximate solution(s)
+     b[]        - right hand side(s)
      temp[]     - temporary vector the same size as x
      row_start  - beginning of the sweep
      row_stop   - end of the sweep (i.e. one past the last unknown)
      row_step   - stride used during the sweep (may be negative)
      omega      - damping parameter
+     k          - number of right-hand sides, the columns of x and b
+     num_threads - number of OpenMP threads used for the sweep
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order, in which case all k columns are
+     swept in a single pass over A.
+
+     Each row is updated independently and in the same way for any
+     num_threads, so the result is bitwise identical to a serial
+     sweep.  Without OpenMP, the sweep is serial.
 
  Returns:
      Nothing, x will be modified in place)pbdoc");
 
     m.def("bsr_jacobi", &_bsr_jacobi<int, float, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert());
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
     m.def("bsr_jacobi", &_bsr_jacobi<int, double, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert());
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
     m.def("bsr_jacobi", &_bsr_jacobi<int, std::complex<float>, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert());
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
     m.def("bsr_jacobi", &_bsr_jacobi<int, std::complex<double>, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert(),
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_jacobi", &_bsr_jacobi<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_jacobi", &_bsr_jacobi<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_jacobi", &_bsr_jacobi<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_jacobi", &_bsr_jacobi<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"),
 R"pbdoc(
 Perform one iteration of Jacobi relaxation on the linear
  system Ax = b, where A is stored in Block CSR format and x and b
@@ -663,14 +1100,25 @@ Perform one iteration of Jacobi relaxation on the linear
      Ap[]       - BSR row pointer
      Aj[]       - BSR index array
      Ax[]       - BSR data array
-     x[]        - approximate solution
-     b[]        - right hand side
+     x[]        - approximate solution(s)
+     b[]        - right hand side(s)
      temp[]     - temporary vector the same size as x
      row_start  - beginning of the sweep (block row index)
      row_stop   - end of the sweep (i.e. one past the last unknown)
      row_step   - stride used during the sweep (may be negative)
      blocksize  - BSR blocksize (blocks must be square)
      omega      - damping parameter
+     k          - number of right-hand sides, the columns of x and b
+     num_threads - number of OpenMP threads used for the sweep
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order, in which case all k columns are
+     swept in a single pass over A.
+
+     Each row is updated independently and in the same way for any
+     num_threads, so the result is bitwise identical to a serial
+     sweep.  Without OpenMP, the sweep is serial.
 
  Returns:
      Nothing, x will be modified in place)pbdoc");
@@ -682,6 +1130,14 @@ Perform one iteration of Jacobi relaxation on the linear
     m.def("gauss_seidel_indexed", &_gauss_seidel_indexed<int, std::complex<float>, float>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
     m.def("gauss_seidel_indexed", &_gauss_seidel_indexed<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+    m.def("gauss_seidel_indexed", &_gauss_seidel_indexed<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+    m.def("gauss_seidel_indexed", &_gauss_seidel_indexed<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+    m.def("gauss_seidel_indexed", &_gauss_seidel_indexed<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+    m.def("gauss_seidel_indexed", &_gauss_seidel_indexed<int64_t, std::complex<double>, double>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"),
 R"pbdoc(
 Perform one iteration of Gauss-Seidel relaxation on the linear
@@ -709,6 +1165,114 @@ Perform one iteration of Gauss-Seidel relaxation on the linear
      row_stop   - end of the sweep (in array Id)
      row_step   - stride used during the sweep (may be negative)
 
+ Returns:
+     Nothing, x will be modified in place)pbdoc");
+
+    m.def("multicolor_gauss_seidel", &_multicolor_gauss_seidel<int, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("k"), py::arg("num_threads"));
+    m.def("multicolor_gauss_seidel", &_multicolor_gauss_seidel<int, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("k"), py::arg("num_threads"));
+    m.def("multicolor_gauss_seidel", &_multicolor_gauss_seidel<int, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("k"), py::arg("num_threads"));
+    m.def("multicolor_gauss_seidel", &_multicolor_gauss_seidel<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("k"), py::arg("num_threads"));
+    m.def("multicolor_gauss_seidel", &_multicolor_gauss_seidel<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("k"), py::arg("num_threads"));
+    m.def("multicolor_gauss_seidel", &_multicolor_gauss_seidel<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("k"), py::arg("num_threads"));
+    m.def("multicolor_gauss_seidel", &_multicolor_gauss_seidel<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("k"), py::arg("num_threads"));
+    m.def("multicolor_gauss_seidel", &_multicolor_gauss_seidel<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Perform one iteration of multicolor Gauss-Seidel relaxation on the
+ linear system Ax = b, where A is stored in CSR format and x and b
+ are column vectors.
+
+ The rows are grouped by color, so that rows of the same color are
+ not coupled in A.  The colors are swept through according to the
+ slice defined by color_start, color_stop, and color_step, and the
+ rows within one color are relaxed in parallel.  A forward sweep is
+ implemented with color_start = 0, color_stop = num_colors, and
+ color_step = 1, a backward sweep with color_start = num_colors - 1,
+ color_stop = -1, and color_step = -1.
+
+ Parameters
+     Ap[]        - CSR row pointer
+     Aj[]        - CSR index array
+     Ax[]        - CSR data array
+     x[]         - approximate solution(s)
+     b[]         - right hand side(s)
+     Id[]        - rows ordered by color
+     Cp[]        - color pointer, the rows of color c are
+                   Id[Cp[c]], ..., Id[Cp[c+1]-1]
+     color_start - first color of the sweep
+     color_stop  - end of the sweep (i.e. one past the last color)
+     color_step  - stride used during the sweep (may be negative)
+     k          - number of right-hand sides, the columns of x and b
+     num_threads - number of OpenMP threads used for each color
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order, in which case all k columns are
+     swept in a single pass over A.
+
+     Rows of the same color only read values of x from other colors,
+     so the result is bitwise identical for any num_threads.
+
+ Returns:
+     Nothing, x will be modified in place)pbdoc");
+
+    m.def("bsr_multicolor_gauss_seidel", &_bsr_multicolor_gauss_seidel<int, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_multicolor_gauss_seidel", &_bsr_multicolor_gauss_seidel<int, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_multicolor_gauss_seidel", &_bsr_multicolor_gauss_seidel<int, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_multicolor_gauss_seidel", &_bsr_multicolor_gauss_seidel<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_multicolor_gauss_seidel", &_bsr_multicolor_gauss_seidel<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_multicolor_gauss_seidel", &_bsr_multicolor_gauss_seidel<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_multicolor_gauss_seidel", &_bsr_multicolor_gauss_seidel<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("bsr_multicolor_gauss_seidel", &_bsr_multicolor_gauss_seidel<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Id").noconvert(), py::arg("Cp").noconvert(), py::arg("color_start"), py::arg("color_stop"), py::arg("color_step"), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Perform one iteration of multicolor Gauss-Seidel relaxation on the
+ linear system Ax = b, where A is stored in Block CSR format and x
+ and b are column vectors.  The block rows are colored, and each
+ block row applies point-wise relaxation over its diagonal block as
+ in bsr_gauss_seidel.
+
+ Refer to multicolor_gauss_seidel for additional information
+ regarding Id, Cp, color_start, color_stop, and color_step.
+
+ Parameters
+     Ap[]        - BSR row pointer
+     Aj[]        - BSR index array
+     Ax[]        - BSR data array
+     x[]         - approximate solution(s)
+     b[]         - right hand side(s)
+     Id[]        - block rows ordered by color
+     Cp[]        - color pointer
+     color_start - first color of the sweep
+     color_stop  - end of the sweep (i.e. one past the last color)
+     color_step  - stride used during the sweep (may be negative)
+     blocksize   - BSR blocksize (blocks must be square)
+     k          - number of right-hand sides, the columns of x and b
+     num_threads - number of OpenMP threads used for each color
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order, in which case all k columns are
+     swept in a single pass over A.
+
+     The diagonal blocks are swept forward for color_step > 0 and
+     backward otherwise.  The result is bitwise identical for any
+     num_threads.
+
  Returns:
      Nothing, x will be modified in place)pbdoc");
 
@@ -719,6 +1283,14 @@ Perform one iteration of Gauss-Seidel relaxation on the linear
     m.def("jacobi_ne", &_jacobi_ne<int, std::complex<float>, float>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert());
     m.def("jacobi_ne", &_jacobi_ne<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert());
+    m.def("jacobi_ne", &_jacobi_ne<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert());
+    m.def("jacobi_ne", &_jacobi_ne<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert());
+    m.def("jacobi_ne", &_jacobi_ne<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert());
+    m.def("jacobi_ne", &_jacobi_ne<int64_t, std::complex<double>, double>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(),
 R"pbdoc(
 Perform NE Jacobi on the linear system A x = b
@@ -764,6 +1336,14 @@ Primary calling routine is jacobi_ne in relaxation.py)pbdoc");
     m.def("gauss_seidel_ne", &_gauss_seidel_ne<int, std::complex<float>, float>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("Tx").noconvert(), py::arg("omega"));
     m.def("gauss_seidel_ne", &_gauss_seidel_ne<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("Tx").noconvert(), py::arg("omega"));
+    m.def("gauss_seidel_ne", &_gauss_seidel_ne<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("Tx").noconvert(), py::arg("omega"));
+    m.def("gauss_seidel_ne", &_gauss_seidel_ne<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("Tx").noconvert(), py::arg("omega"));
+    m.def("gauss_seidel_ne", &_gauss_seidel_ne<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("Tx").noconvert(), py::arg("omega"));
+    m.def("gauss_seidel_ne", &_gauss_seidel_ne<int64_t, std::complex<double>, double>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("Tx").noconvert(), py::arg("omega"),
 R"pbdoc(
 Perform NE Gauss-Seidel on the linear system A x = b
@@ -804,6 +1384,14 @@ Primary calling routine is gass_seidel_ne in relaxation.py)pbdoc");
     m.def("gauss_seidel_nr", &_gauss_seidel_nr<int, std::complex<float>, float>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("z").noconvert(), py::arg("col_start"), py::arg("col_stop"), py::arg("col_step"), py::arg("Tx").noconvert(), py::arg("omega"));
     m.def("gauss_seidel_nr", &_gauss_seidel_nr<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("z").noconvert(), py::arg("col_start"), py::arg("col_stop"), py::arg("col_step"), py::arg("Tx").noconvert(), py::arg("omega"));
+    m.def("gauss_seidel_nr", &_gauss_seidel_nr<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("z").noconvert(), py::arg("col_start"), py::arg("col_stop"), py::arg("col_step"), py::arg("Tx").noconvert(), py::arg("omega"));
+    m.def("gauss_seidel_nr", &_gauss_seidel_nr<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("z").noconvert(), py::arg("col_start"), py::arg("col_stop"), py::arg("col_step"), py::arg("Tx").noconvert(), py::arg("omega"));
+    m.def("gauss_seidel_nr", &_gauss_seidel_nr<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("z").noconvert(), py::arg("col_start"), py::arg("col_stop"), py::arg("col_step"), py::arg("Tx").noconvert(), py::arg("omega"));
+    m.def("gauss_seidel_nr", &_gauss_seidel_nr<int64_t, std::complex<double>, double>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("z").noconvert(), py::arg("col_start"), py::arg("col_stop"), py::arg("col_step"), py::arg("Tx").noconvert(), py::arg("omega"),
 R"pbdoc(
 Perform NR Gauss-Seidel on the linear system A x = b
@@ -838,13 +1426,21 @@ Notes
 Primary calling routine is gauss_seidel_nr in relaxation.py)pbdoc");
 
     m.def("block_jacobi", &_block_jacobi<int, float, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
     m.def("block_jacobi", &_block_jacobi<int, double, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
     m.def("block_jacobi", &_block_jacobi<int, std::complex<float>, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
     m.def("block_jacobi", &_block_jacobi<int, std::complex<double>, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"),
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("block_jacobi", &_block_jacobi<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("block_jacobi", &_block_jacobi<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("block_jacobi", &_block_jacobi<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"));
+    m.def("block_jacobi", &_block_jacobi<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("temp").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("omega").noconvert(), py::arg("blocksize"), py::arg("k"), py::arg("num_threads"),
 R"pbdoc(
 Perform one iteration of block Jacobi relaxation on the linear
  system Ax = b, where A is stored in BSR format and x and b
@@ -858,8 +1454,8 @@ Perform one iteration of block Jacobi relaxation on the linear
      Ap[]       - BSR row pointer
      Aj[]       - BSR index array
      Ax[]       - BSR data array, blocks assumed square
-     x[]        - approximate solution
-     b[]        - right hand side
+     x[]        - approximate solution(s)
+     b[]        - right hand side(s)
      Tx[]       - Inverse of each diagonal block of A stored
                   as a (n/blocksize, blocksize, blocksize) array
      temp[]     - temporary vector the same size as x
@@ -868,18 +1464,37 @@ Perform one iteration of block Jacobi relaxation on the linear
      row_step   - stride used during the sweep (may be negative)
      omega      - damping parameter
      blocksize  - dimension of sqare blocks in BSR matrix A
+     k          - number of right-hand sides, the columns of x and b
+     num_threads - number of OpenMP threads used for the sweep
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order, in which case all k columns are
+     swept in a single pass over A.
+
+     Each row is updated independently and in the same way for any
+     num_threads, so the result is bitwise identical to a serial
+     sweep.  Without OpenMP, the sweep is serial.
 
  Returns:
      Nothing, x will be modified in place)pbdoc");
 
     m.def("block_gauss_seidel", &_block_gauss_seidel<int, float, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
     m.def("block_gauss_seidel", &_block_gauss_seidel<int, double, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
     m.def("block_gauss_seidel", &_block_gauss_seidel<int, std::complex<float>, float>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"));
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
     m.def("block_gauss_seidel", &_block_gauss_seidel<int, std::complex<double>, double>,
-        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"),
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
+    m.def("block_gauss_seidel", &_block_gauss_seidel<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
+    m.def("block_gauss_seidel", &_block_gauss_seidel<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
+    m.def("block_gauss_seidel", &_block_gauss_seidel<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"));
+    m.def("block_gauss_seidel", &_block_gauss_seidel<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"), py::arg("blocksize"), py::arg("k"),
 R"pbdoc(
 Perform one iteration of block Gauss-Seidel relaxation on
  the linear system Ax = b, where A is stored in BSR format
@@ -892,14 +1507,20 @@ Perform one iteration of block Gauss-Seidel relaxation on
      Ap[]       - BSR row pointer
      Aj[]       - BSR index array
      Ax[]       - BSR data array, blocks assumed square
-     x[]        - approximate solution
-     b[]        - right hand side
+     x[]        - approximate solution(s)
+     b[]        - right hand side(s)
      Tx[]       - Inverse of each diagonal block of A stored
                   as a (n/blocksize, blocksize, blocksize) array
      row_start  - beginning of the sweep
      row_stop   - end of the sweep (i.e. one past the last unknown)
      row_step   - stride used during the sweep (may be negative)
      blocksize  - dimension of square blocks in BSR matrix A
+     k          - number of right-hand sides, the columns of x and b
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order, in which case all k columns are
+     swept in a single pass over A.
 
  Returns:
      Nothing, x will be modified in place)pbdoc");
@@ -911,6 +1532,14 @@ Perform one iteration of block Gauss-Seidel relaxation on
     m.def("extract_subblocks", &_extract_subblocks<int, std::complex<float>, float>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"));
     m.def("extract_subblocks", &_extract_subblocks<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"));
+    m.def("extract_subblocks", &_extract_subblocks<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"));
+    m.def("extract_subblocks", &_extract_subblocks<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"));
+    m.def("extract_subblocks", &_extract_subblocks<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"));
+    m.def("extract_subblocks", &_extract_subblocks<int64_t, std::complex<double>, double>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"),
 R"pbdoc(
 Extract diagonal blocks from A and insert into a linear array.
@@ -942,6 +1571,14 @@ Extract diagonal blocks from A and insert into a linear array.
     m.def("overlapping_schwarz_csr", &_overlapping_schwarz_csr<int, std::complex<float>, float>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
     m.def("overlapping_schwarz_csr", &_overlapping_schwarz_csr<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+    m.def("overlapping_schwarz_csr", &_overlapping_schwarz_csr<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+    m.def("overlapping_schwarz_csr", &_overlapping_schwarz_csr<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+    m.def("overlapping_schwarz_csr", &_overlapping_schwarz_csr<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"));
+    m.def("overlapping_schwarz_csr", &_overlapping_schwarz_csr<int64_t, std::complex<double>, double>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Tx").noconvert(), py::arg("Tp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sp").noconvert(), py::arg("nsdomains"), py::arg("nrows"), py::arg("row_start"), py::arg("row_stop"), py::arg("row_step"),
 R"pbdoc(
 Perform one iteration of an overlapping Schwarz relaxation on
@@ -972,6 +1609,240 @@ Perform one iteration of an overlapping Schwarz relaxation on
      row_step       --- {...computation...}
 
 
+ Returns:
+     Nothing, x will be modified in place)pbdoc");
+
+    m.def("chebyshev", &_chebyshev<int, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Dinv").noconvert(), py::arg("r").noconvert(), py::arg("d").noconvert(), py::arg("lower"), py::arg("upper"), py::arg("degree"), py::arg("k"), py::arg("num_threads"));
+    m.def("chebyshev", &_chebyshev<int, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Dinv").noconvert(), py::arg("r").noconvert(), py::arg("d").noconvert(), py::arg("lower"), py::arg("upper"), py::arg("degree"), py::arg("k"), py::arg("num_threads"));
+    m.def("chebyshev", &_chebyshev<int, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Dinv").noconvert(), py::arg("r").noconvert(), py::arg("d").noconvert(), py::arg("lower"), py::arg("upper"), py::arg("degree"), py::arg("k"), py::arg("num_threads"));
+    m.def("chebyshev", &_chebyshev<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Dinv").noconvert(), py::arg("r").noconvert(), py::arg("d").noconvert(), py::arg("lower"), py::arg("upper"), py::arg("degree"), py::arg("k"), py::arg("num_threads"));
+    m.def("chebyshev", &_chebyshev<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Dinv").noconvert(), py::arg("r").noconvert(), py::arg("d").noconvert(), py::arg("lower"), py::arg("upper"), py::arg("degree"), py::arg("k"), py::arg("num_threads"));
+    m.def("chebyshev", &_chebyshev<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Dinv").noconvert(), py::arg("r").noconvert(), py::arg("d").noconvert(), py::arg("lower"), py::arg("upper"), py::arg("degree"), py::arg("k"), py::arg("num_threads"));
+    m.def("chebyshev", &_chebyshev<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Dinv").noconvert(), py::arg("r").noconvert(), py::arg("d").noconvert(), py::arg("lower"), py::arg("upper"), py::arg("degree"), py::arg("k"), py::arg("num_threads"));
+    m.def("chebyshev", &_chebyshev<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("Dinv").noconvert(), py::arg("r").noconvert(), py::arg("d").noconvert(), py::arg("lower"), py::arg("upper"), py::arg("degree"), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+)pbdoc");
+
+    m.def("l1_jacobi", &_l1_jacobi<int, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("l1_jacobi", &_l1_jacobi<int, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("l1_jacobi", &_l1_jacobi<int, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("l1_jacobi", &_l1_jacobi<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("l1_jacobi", &_l1_jacobi<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("l1_jacobi", &_l1_jacobi<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("l1_jacobi", &_l1_jacobi<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("l1_jacobi", &_l1_jacobi<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("blocksize"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Perform one iteration of l1-Jacobi relaxation on the linear
+ system Ax = b, where A is stored in BSR format (CSR is the case
+ blocksize = 1).  Each row i is updated with
+
+     x_i <- x_i + omega (b - A x)_i / (a_ii + sum_{j != i} |a_ij|),
+
+ i.e., the diagonal is augmented by the l1 norm of the off-diagonal
+ part of the row.  For A symmetric positive definite the iteration
+ converges for omega = 1 without any estimate of the spectral
+ radius of D^-1 A.
+
+ Parameters
+     Ap[]       - BSR row pointer
+     Aj[]       - BSR index array
+     Ax[]       - BSR data array, blocks stored in row-major order
+     x[]        - approximate solution(s)
+     b[]        - right hand side(s)
+     temp[]     - temporary vector the same size as x
+     blocksize  - BSR blocksize (blocks must be square)
+     omega      - damping parameter
+     k          - number of right-hand sides, the columns of x and b
+     num_threads - number of OpenMP threads
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order.
+
+     Every row update only reads temp, so the result is bitwise
+     identical for any num_threads.
+
+ Returns:
+     Nothing, x will be modified in place)pbdoc");
+
+    m.def("l1_gauss_seidel", &_l1_gauss_seidel<int, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_step"), py::arg("n_parts"), py::arg("blocksize"), py::arg("num_threads"));
+    m.def("l1_gauss_seidel", &_l1_gauss_seidel<int, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_step"), py::arg("n_parts"), py::arg("blocksize"), py::arg("num_threads"));
+    m.def("l1_gauss_seidel", &_l1_gauss_seidel<int, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_step"), py::arg("n_parts"), py::arg("blocksize"), py::arg("num_threads"));
+    m.def("l1_gauss_seidel", &_l1_gauss_seidel<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_step"), py::arg("n_parts"), py::arg("blocksize"), py::arg("num_threads"));
+    m.def("l1_gauss_seidel", &_l1_gauss_seidel<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_step"), py::arg("n_parts"), py::arg("blocksize"), py::arg("num_threads"));
+    m.def("l1_gauss_seidel", &_l1_gauss_seidel<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_step"), py::arg("n_parts"), py::arg("blocksize"), py::arg("num_threads"));
+    m.def("l1_gauss_seidel", &_l1_gauss_seidel<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_step"), py::arg("n_parts"), py::arg("blocksize"), py::arg("num_threads"));
+    m.def("l1_gauss_seidel", &_l1_gauss_seidel<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("temp").noconvert(), py::arg("row_step"), py::arg("n_parts"), py::arg("blocksize"), py::arg("num_threads"),
+R"pbdoc(
+Perform one iteration of hybrid l1-Gauss-Seidel relaxation on the
+ linear system Ax = b, where A is stored in BSR format (CSR is the
+ case blocksize = 1).  The block rows are split into n_parts
+ contiguous partitions.  Within a partition the rows are swept
+ Gauss-Seidel style, while the couplings to other partitions use
+ the values of x from the start of the iteration and are moved to
+ the diagonal in the l1 sense, i.e., row i is updated with
+
+     x_i <- x_i + (b - A x)_i / (a_ii + sum_{j not in part(i)} |a_ij|).
+
+ For A symmetric positive definite the iteration converges for any
+ number of partitions.  With n_parts = 1 this is Gauss-Seidel.
+
+ Parameters
+     Ap[]       - BSR row pointer
+     Aj[]       - BSR index array
+     Ax[]       - BSR data array, blocks stored in row-major order
+     x[]        - approximate solution
+     b[]        - right hand side
+     temp[]     - temporary vector the same size as x
+     row_step   - 1 for a forward sweep, -1 for a backward sweep
+                  within each partition
+     n_parts    - number of partitions
+     blocksize  - BSR blocksize (blocks must be square)
+     num_threads - number of OpenMP threads
+
+ Notes:
+     The partitions are processed concurrently, and each partition
+     only writes its own rows of x, so for a fixed n_parts the
+     result is bitwise identical for any num_threads.
+
+ Returns:
+     Nothing, x will be modified in place)pbdoc");
+
+    m.def("ilu0", &_ilu0<int, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert());
+    m.def("ilu0", &_ilu0<int, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert());
+    m.def("ilu0", &_ilu0<int, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert());
+    m.def("ilu0", &_ilu0<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert());
+    m.def("ilu0", &_ilu0<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert());
+    m.def("ilu0", &_ilu0<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert());
+    m.def("ilu0", &_ilu0<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert());
+    m.def("ilu0", &_ilu0<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert(),
+R"pbdoc(
+Compute the ILU(0) factorization of a matrix A stored in CSR format,
+ i.e., A ~ LU, where L is unit lower triangular and U is upper
+ triangular and L + U has the sparsity pattern of A.  The factors are
+ computed in place: on input LUx[] holds the values of A, on output
+ the strictly lower part holds L and the upper part holds U.
+
+ Parameters
+     Ap[]       - CSR row pointer
+     Aj[]       - CSR index array, sorted in each row
+     LUx[]      - CSR data array of A on input, of L and U on output
+     diag[]     - position of the diagonal entry of each row in Aj
+
+ Notes:
+     Every row must hold its diagonal entry.  Elimination with a zero
+     pivot is skipped, so that the caller can detect it from the
+     diagonal of U.
+
+ Returns:
+     Nothing, LUx will be modified in place)pbdoc");
+
+    m.def("triangular_levels", &_triangular_levels<int>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("diag").noconvert(), py::arg("L_level").noconvert(), py::arg("U_level").noconvert());
+    m.def("triangular_levels", &_triangular_levels<int64_t>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("diag").noconvert(), py::arg("L_level").noconvert(), py::arg("U_level").noconvert(),
+R"pbdoc(
+Compute the level schedule of the triangular solves with the lower
+ and upper part of a matrix stored in CSR format.  Rows in the same
+ level do not depend on each other and are solved concurrently.
+
+ Parameters
+     Ap[]       - CSR row pointer
+     Aj[]       - CSR index array, sorted in each row
+     diag[]     - position of the diagonal entry of each row in Aj
+     L_level[]  - level of each row in the forward solve (output)
+     U_level[]  - level of each row in the backward solve (output)
+
+ Returns:
+     Nothing, L_level and U_level will be modified in place)pbdoc");
+
+    m.def("ilu_relax", &_ilu_relax<int, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("L_rows").noconvert(), py::arg("L_ptr").noconvert(), py::arg("U_rows").noconvert(), py::arg("U_ptr").noconvert(), py::arg("sweeps"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("ilu_relax", &_ilu_relax<int, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("L_rows").noconvert(), py::arg("L_ptr").noconvert(), py::arg("U_rows").noconvert(), py::arg("U_ptr").noconvert(), py::arg("sweeps"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("ilu_relax", &_ilu_relax<int, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("L_rows").noconvert(), py::arg("L_ptr").noconvert(), py::arg("U_rows").noconvert(), py::arg("U_ptr").noconvert(), py::arg("sweeps"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("ilu_relax", &_ilu_relax<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("L_rows").noconvert(), py::arg("L_ptr").noconvert(), py::arg("U_rows").noconvert(), py::arg("U_ptr").noconvert(), py::arg("sweeps"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("ilu_relax", &_ilu_relax<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("L_rows").noconvert(), py::arg("L_ptr").noconvert(), py::arg("U_rows").noconvert(), py::arg("U_ptr").noconvert(), py::arg("sweeps"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("ilu_relax", &_ilu_relax<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("L_rows").noconvert(), py::arg("L_ptr").noconvert(), py::arg("U_rows").noconvert(), py::arg("U_ptr").noconvert(), py::arg("sweeps"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("ilu_relax", &_ilu_relax<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("L_rows").noconvert(), py::arg("L_ptr").noconvert(), py::arg("U_rows").noconvert(), py::arg("U_ptr").noconvert(), py::arg("sweeps"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"));
+    m.def("ilu_relax", &_ilu_relax<int64_t, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("LUx").noconvert(), py::arg("diag").noconvert(), py::arg("x").noconvert(), py::arg("b").noconvert(), py::arg("r").noconvert(), py::arg("y").noconvert(), py::arg("L_rows").noconvert(), py::arg("L_ptr").noconvert(), py::arg("U_rows").noconvert(), py::arg("U_ptr").noconvert(), py::arg("sweeps"), py::arg("omega").noconvert(), py::arg("k"), py::arg("num_threads"),
+R"pbdoc(
+Apply one step of incomplete LU relaxation to the linear system
+ Ax = b, where A is stored in CSR format, i.e.,
+
+     x <- x + omega (LU)^-1 (b - Ax),
+
+ where L and U are stored in the pattern of A, e.g., from ilu0.
+
+ The triangular solves are either exact, with the rows of each level
+ of the level schedule solved concurrently, or approximate, with a
+ fixed number of Jacobi sweeps on each triangular system.
+
+ Parameters
+     Ap[]       - CSR row pointer
+     Aj[]       - CSR index array, sorted in each row
+     Ax[]       - CSR data array of A
+     LUx[]      - CSR data array of L (strictly lower) and U (upper)
+     diag[]     - position of the diagonal entry of each row in Aj
+     x[]        - approximate solution(s)
+     b[]        - right hand side(s)
+     r[]        - temporary vector the same size as x
+     y[]        - temporary vector the same size as x
+     L_rows[]   - rows ordered by level of the forward solve
+     L_ptr[]    - pointer in L_rows to the first row of each level
+     U_rows[]   - rows ordered by level of the backward solve
+     U_ptr[]    - pointer in U_rows to the first row of each level
+     sweeps     - 0 for exact triangular solves, otherwise the
+                  number of Jacobi sweeps on each triangular system
+     omega      - damping parameter
+     k          - number of right-hand sides, the columns of x and b
+     num_threads - number of OpenMP threads
+
+ Notes:
+     x and b may hold k right-hand sides stored row-wise, i.e., an
+     (n, k) array in C order.
+
+     Each row is computed exactly as in the serial loop, so the
+     result is bitwise identical for any num_threads.
+
  Returns:
      Nothing, x will be modified in place)pbdoc");
 
@@ -8,6 +8,7 @@
 #include <cassert>
 #include <limits>
 #include <algorithm>
+#include <functional>
 
 #include "linalg.h"
 #include "graph.h"
@@ -450,6 +451,228 @@ void rs_cf_splitting_pass2(const I n_nodes,
 }
 
 
+/*
+ *  Compute a PMIS splitting (Parallel Modified Independent Set)
+ *
+ *  Each node i has the weight |S^T_i| + r[i], the number of nodes that
+ *  strongly depend on i plus a random number in [0, 1).  Nodes on which no
+ *  other node depends become F-nodes.  Then, in every round, each
+ *  undecided node whose weight is larger than that of all undecided
+ *  nodes in S_i and S^T_i becomes a C-node, and every undecided node
+ *  that strongly depends on a new C-node becomes an F-node.
+ *
+ *  Every round only reads the splitting of the previous round, so the
+ *  splitting does not depend on num_threads.
+ *
+ *  Parameters
+ *      n_nodes     - number of rows in A (number of vertices)
+ *      Sp[]        - CSR row pointer (strength matrix)
+ *      Sj[]        - CSR index array
+ *      Tp[]        - CSR row pointer (transpose of the strength matrix)
+ *      Tj[]        - CSR index array
+ *      r[]         - random numbers in [0, 1)
+ *      splitting   - C/F splitting, only the nodes marked U_NODE (2)
+ *                    on entry are decided, the others are kept
+ *      num_threads - number of OpenMP threads
+ *
+ *  Returns
+ *      the number of rounds
+ *
+ *  References
+ *      Hans De Sterck, Ulrike M Yang, and Jeffrey J Heys
+ *      "Reducing complexity in parallel algebraic multigrid preconditioners"
+ *      SIAM Journal on Matrix Analysis and Applications 2006; 27:1019-1039.
+ *
+ */
+template<class I, class R>
+I pmis_splitting(const I n_nodes,
+                 const I Sp[], const int Sp_size,
+                 const I Sj[], const int Sj_size,
+                 const I Tp[], const int Tp_size,
+                 const I Tj[], const int Tj_size,
+                 const R  r[], const int  r_size,
+                       I splitting[], const int splitting_size,
+                 const I num_threads)
+{
+    std::vector<R> weight(n_nodes);
+    std::vector<char> next(n_nodes);
+
+    I num_undecided = 0;
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static) reduction(+:num_undecided)
+    for(I i = 0; i < n_nodes; i++){
+        I lambda = 0;
+        for(I jj = Tp[i]; jj < Tp[i+1]; jj++){
+            if(Tj[jj] != i)
+                lambda++;
+        }
+        weight[i] = lambda + r[i];
+
+        // nodes that do not influence any other node are F-nodes
+        if(splitting[i] == U_NODE){
+            if(lambda == 0)
+                splitting[i] = F_NODE;
+            else
+                num_undecided++;
+        }
+    }
+
+    I num_rounds = 0;
+    while(num_undecided > 0){
+        num_rounds++;
+
+        // undecided nodes that are heavier than all undecided neighbors
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+        for(I i = 0; i < n_nodes; i++){
+            next[i] = (char) splitting[i];
+            if(splitting[i] != U_NODE)
+                continue;
+
+            const R wi = weight[i];
+            bool heaviest = true;
+            for(I jj = Sp[i]; jj < Sp[i+1] && heaviest; jj++){
+                const I j = Sj[jj];
+                if(j != i && splitting[j] == U_NODE)
+                    heaviest = (weight[j] < wi) || (weight[j] == wi && j < i);
+            }
+            for(I jj = Tp[i]; jj < Tp[i+1] && heaviest; jj++){
+                const I j = Tj[jj];
+                if(j != i && splitting[j] == U_NODE)
+                    heaviest = (weight[j] < wi) || (weight[j] == wi && j < i);
+            }
+            if(heaviest)
+                next[i] = C_NODE;
+        }
+
+        // undecided nodes that strongly depend on a new C-node
+        num_undecided = 0;
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static) reduction(+:num_undecided)
+        for(I i = 0; i < n_nodes; i++){
+            if(next[i] != U_NODE){
+                splitting[i] = next[i];
+                continue;
+            }
+
+            bool depends = false;
+            for(I jj = Sp[i]; jj < Sp[i+1] && !depends; jj++){
+                depends = (next[Sj[jj]] == C_NODE);
+            }
+            if(depends)
+                splitting[i] = F_NODE;
+            else
+                num_undecided++;
+        }
+    }
+
+    return num_rounds;
+}
+
+
+/*
+ *  Compute a Ruge-Stuben splitting (first pass only) independently on
+ *  blocks of consecutive rows, for use in HMIS
+ *
+ *  The rows are split into blocks of rows_per_block rows and
+ *  rs_cf_splitting is applied to each block, ignoring the strong
+ *  connections between blocks.  The blocks are distributed over the
+ *  threads, so the splitting depends on rows_per_block but not on
+ *  num_threads.  Upon return, F-nodes that do not strongly depend on a
+ *  C-node, but do strongly depend on some other node, are marked as
+ *  undecided (U_NODE), so that they can be decided by pmis_splitting.
+ *
+ *  Parameters
+ *      n_nodes        - number of rows in A (number of vertices)
+ *      Sp[]           - CSR row pointer (strength matrix)
+ *      Sj[]           - CSR index array
+ *      splitting      - array to store the C/F splitting
+ *      rows_per_block - number of rows split together
+ *      num_threads    - number of OpenMP threads
+ *
+ *  References
+ *      Hans De Sterck, Ulrike M Yang, and Jeffrey J Heys
+ *      "Reducing complexity in parallel algebraic multigrid preconditioners"
+ *      SIAM Journal on Matrix Analysis and Applications 2006; 27:1019-1039.
+ *
+ */
+template<class I>
+void rs_cf_splitting_blocks(const I n_nodes,
+                            const I Sp[], const int Sp_size,
+                            const I Sj[], const int Sj_size,
+                                  I splitting[], const int splitting_size,
+                            const I rows_per_block,
+                            const I num_threads)
+{
+    const I block_size = std::max(rows_per_block, (I) 1);
+    const I num_blocks = (n_nodes + block_size - 1) / block_size;
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(dynamic)
+    for(I b = 0; b < num_blocks; b++){
+        const I begin = b*block_size;
+        const I end   = std::min(begin + block_size, n_nodes);
+        const I n     = end - begin;
+
+        // strong connections within the block, in local numbering
+        std::vector<I> Bp(n + 1, 0);
+        std::vector<I> Bj;
+        Bj.reserve(Sp[end] - Sp[begin]);
+        for(I i = begin; i < end; i++){
+            for(I jj = Sp[i]; jj < Sp[i+1]; jj++){
+                const I j = Sj[jj];
+                if(j >= begin && j < end && j != i)
+                    Bj.push_back(j - begin);
+            }
+            Bp[i - begin + 1] = Bj.size();
+        }
+        const I nnz = Bj.size();
+
+        // transpose
+        std::vector<I> Btp(n + 1, 0);
+        std::vector<I> Btj(nnz);
+        for(I k = 0; k < nnz; k++){
+            Btp[Bj[k] + 1]++;
+        }
+        for(I i = 0; i < n; i++){
+            Btp[i+1] += Btp[i];
+        }
+        std::vector<I> pos(Btp.begin(), Btp.end() - 1);
+        for(I i = 0; i < n; i++){
+            for(I jj = Bp[i]; jj < Bp[i+1]; jj++){
+                Btj[pos[Bj[jj]]++] = i;
+            }
+        }
+
+        std::vector<I> influence(n, 0);
+        rs_cf_splitting(n,
+                        &Bp[0], n + 1, nnz > 0 ? &Bj[0] : NULL, nnz,
+                        &Btp[0], n + 1, nnz > 0 ? &Btj[0] : NULL, nnz,
+                        &influence[0], n,
+                        splitting + begin, n);
+    }
+
+    // F-nodes without a strong C-node are decided again
+    std::vector<char> undecided(n_nodes, 0);
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_nodes; i++){
+        if(splitting[i] != F_NODE)
+            continue;
+        bool has_neighbors = false;
+        bool has_C = false;
+        for(I jj = Sp[i]; jj < Sp[i+1] && !has_C; jj++){
+            const I j = Sj[jj];
+            if(j != i){
+                has_neighbors = true;
+                has_C = (splitting[j] == C_NODE);
+            }
+        }
+        undecided[i] = has_neighbors && !has_C;
+    }
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_nodes; i++){
+        if(undecided[i])
+            splitting[i] = U_NODE;
+    }
+}
+
 /*
  *  Compute a CLJP splitting
  *
@@ -480,7 +703,7 @@ void cljp_naive_splitting(const I n,
   int ncolors;
   I unassigned = n;
   I nD;
-  int nnz = Sp[n];
+  I nnz = Sp[n];
 
   // initialize vectors
   // complexity = 5n
@@ -491,7 +714,7 @@ void cljp_naive_splitting(const I n,
   std::vector<I> D(n,0);      // marked nodes  in the ind set
   std::vector<I> Dlist(n,0);      // marked nodes  in the ind set
   std::fill(splitting, splitting + n, U_NODE);
-  int * c_dep_cache = new int[n];
+  I * c_dep_cache = new I[n];
   std::fill_n(c_dep_cache, n, -1);
 
   // INITIALIZE WEIGHTS
@@ -749,6 +972,537 @@ void rs_direct_interpolation_pass2(const I n_nodes,
 }
 
 
+/*
+ *  Truncate one row of an interpolation operator
+ *
+ *  Entries with |x[k]| < trunc_factor * max|x| are dropped, and if
+ *  max_elements > 0, only the max_elements largest entries (in magnitude)
+ *  are kept.  The kept entries are scaled so that the row sum does not
+ *  change.  Dropped entries are set to zero.
+ *
+ *  Parameters
+ *      x[]          - entries of the row
+ *      n            - number of entries in the row
+ *      trunc_factor - relative drop tolerance
+ *      max_elements - maximum number of entries, no limit if <= 0
+ *      work         - work array
+ */
+template<class I, class T>
+void truncate_interpolation_row(T x[], const I n,
+                                const T trunc_factor,
+                                const I max_elements,
+                                std::vector<T>& work)
+{
+    if(n == 0 || (trunc_factor <= 0 && (max_elements <= 0 || n <= max_elements)))
+        return;
+
+    T sum_all = 0;
+    T max_abs = 0;
+    for(I k = 0; k < n; k++){
+        sum_all += x[k];
+        max_abs = std::max(max_abs, (T) std::abs(x[k]));
+    }
+
+    T threshold = trunc_factor * max_abs;
+    if(max_elements > 0 && n > max_elements){
+        work.resize(n);
+        for(I k = 0; k < n; k++){
+            work[k] = std::abs(x[k]);
+        }
+        std::nth_element(work.begin(), work.begin() + (max_elements - 1), work.end(), std::greater<T>());
+        threshold = std::max(threshold, work[max_elements - 1]);
+    }
+
+    // keep the entries above the threshold, then the ties up to max_elements
+    I num_kept = 0;
+    for(I k = 0; k < n; k++){
+        if(std::abs(x[k]) > threshold)
+            num_kept++;
+    }
+    T sum_kept = 0;
+    for(I k = 0; k < n; k++){
+        const T abs_x = std::abs(x[k]);
+        if(abs_x > threshold){
+            sum_kept += x[k];
+        } else if(abs_x == threshold && (max_elements <= 0 || num_kept < max_elements)){
+            sum_kept += x[k];
+            num_kept++;
+        } else {
+            x[k] = 0;
+        }
+    }
+
+    if(sum_kept != 0){
+        const T scale = sum_all / sum_kept;
+        for(I k = 0; k < n; k++){
+            x[k] *= scale;
+        }
+    }
+}
+
+
+/*
+ *   Produce a classical AMG prolongator using "Extended+i Interpolation"
+ *
+ *   Each F-node i interpolates from the interpolatory set C^_i, which
+ *   consists of its strong C-neighbors and the strong C-neighbors of its
+ *   strong F-neighbors, so the interpolation reaches distance two.
+ *   The connection a_ij to a strong F-neighbor j is distributed over the
+ *   connections of j to C^_i and to i itself (the "+i"), using only the
+ *   entries of row j whose sign is opposite to that of a_jj.  Weak
+ *   connections to nodes outside of C^_i are lumped into the diagonal.
+ *
+ *   The first pass uses the strength of connection matrix 'S'
+ *   and C/F splitting to compute the row pointer for the prolongator.
+ *
+ *   The second pass fills in the nonzero entries of the prolongator,
+ *   optionally truncating each row (see truncate_interpolation_row).
+ *   Dropped entries are stored as explicit zeros.
+ *
+ *   Both passes split the rows among num_threads threads.  The rows are
+ *   computed independently, so the result does not depend on num_threads.
+ *
+ *   Parameters
+ *      n_nodes      - number of rows in A
+ *      Ap, Aj, Ax   - CSR representation of A
+ *      Sp, Sj       - CSR representation of the strength matrix S
+ *      splitting    - C/F splitting
+ *      Bp, Bj, Bx   - CSR representation of the prolongator
+ *      trunc_factor - relative drop tolerance for the rows of P
+ *      max_elements - maximum number of entries in each row of P (<= 0 for
+ *                     no limit)
+ *      num_threads  - number of OpenMP threads
+ *
+ *   Reference:
+ *      H. De Sterck, R. D. Falgout, J. W. Nolting and U. M. Yang,
+ *      "Distance-two interpolation for parallel algebraic multigrid",
+ *      Numerical Linear Algebra with Applications 2008; 15:115-139.
+ *
+ */
+template<class I>
+void rs_extended_plusi_interpolation_pass1(const I n_nodes,
+                                           const I Sp[], const int Sp_size,
+                                           const I Sj[], const int Sj_size,
+                                           const I splitting[], const int splitting_size,
+                                                 I Bp[], const int Bp_size,
+                                           const I num_threads)
+{
+    Bp[0] = 0;
+
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        std::vector<I> marker(n_nodes, -1);
+
+        #pragma omp for schedule(static)
+        for(I i = 0; i < n_nodes; i++){
+            if(splitting[i] == C_NODE){
+                Bp[i+1] = 1;
+                continue;
+            }
+
+            I nnz = 0;
+            for(I jj = Sp[i]; jj < Sp[i+1]; jj++){
+                const I j = Sj[jj];
+                if(j == i)
+                    continue;
+                if(splitting[j] == C_NODE){
+                    if(marker[j] != i){
+                        marker[j] = i;
+                        nnz++;
+                    }
+                } else {
+                    for(I kk = Sp[j]; kk < Sp[j+1]; kk++){
+                        const I k = Sj[kk];
+                        if(splitting[k] == C_NODE && marker[k] != i){
+                            marker[k] = i;
+                            nnz++;
+                        }
+                    }
+                }
+            }
+            Bp[i+1] = nnz;
+        }
+    }
+
+    for(I i = 0; i < n_nodes; i++){
+        Bp[i+1] += Bp[i];
+    }
+}
+
+
+template<class I, class T>
+void rs_extended_plusi_interpolation_pass2(const I n_nodes,
+                                           const I Ap[], const int Ap_size,
+                                           const I Aj[], const int Aj_size,
+                                           const T Ax[], const int Ax_size,
+                                           const I Sp[], const int Sp_size,
+                                           const I Sj[], const int Sj_size,
+                                           const I splitting[], const int splitting_size,
+                                           const I Bp[], const int Bp_size,
+                                                 I Bj[], const int Bj_size,
+                                                 T Bx[], const int Bx_size,
+                                           const T trunc_factor,
+                                           const I max_elements,
+                                           const I num_threads)
+{
+    std::vector<T> diagonal(n_nodes, 0);
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_nodes; i++){
+        for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+            if(Aj[jj] == i)
+                diagonal[i] += Ax[jj];
+        }
+    }
+
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        // position[k] >= Bp[i] iff k is in C^_i, the rows of a thread are
+        // visited in increasing order
+        std::vector<I> position(n_nodes, -1);
+        std::vector<I> strong(n_nodes, -1);
+        std::vector<T> work;
+
+        #pragma omp for schedule(static)
+        for(I i = 0; i < n_nodes; i++){
+            const I row_start = Bp[i];
+
+            if(splitting[i] == C_NODE){
+                Bj[row_start] = i;
+                Bx[row_start] = 1;
+                continue;
+            }
+
+            // interpolatory set C^_i
+            I nnz = row_start;
+            for(I jj = Sp[i]; jj < Sp[i+1]; jj++){
+                const I j = Sj[jj];
+                if(j == i)
+                    continue;
+                strong[j] = i;
+                if(splitting[j] == C_NODE){
+                    if(position[j] < row_start){
+                        position[j] = nnz;
+                        Bj[nnz] = j;
+                        Bx[nnz] = 0;
+                        nnz++;
+                    }
+                } else {
+                    for(I kk = Sp[j]; kk < Sp[j+1]; kk++){
+                        const I k = Sj[kk];
+                        if(splitting[k] == C_NODE && position[k] < row_start){
+                            position[k] = nnz;
+                            Bj[nnz] = k;
+                            Bx[nnz] = 0;
+                            nnz++;
+                        }
+                    }
+                }
+            }
+
+            T diag = 0;
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const I j = Aj[jj];
+                const T a_ij = Ax[jj];
+
+                if(j == i){
+                    diag += a_ij;
+                }
+                else if(position[j] >= row_start){
+                    // j is in C^_i
+                    Bx[position[j]] += a_ij;
+                }
+                else if(strong[j] == i && splitting[j] != C_NODE){
+                    // distribute a_ij over the connections of j to C^_i + {i}
+                    const T sgn = (diagonal[j] < 0) ? -1 : 1;
+                    T sum = 0;
+                    for(I kk = Ap[j]; kk < Ap[j+1]; kk++){
+                        const I k = Aj[kk];
+                        if((k == i || position[k] >= row_start) && sgn*Ax[kk] < 0)
+                            sum += Ax[kk];
+                    }
+
+                    if(sum != 0){
+                        const T distribute = a_ij / sum;
+                        for(I kk = Ap[j]; kk < Ap[j+1]; kk++){
+                            const I k = Aj[kk];
+                            if(sgn*Ax[kk] >= 0)
+                                continue;
+                            if(k == i)
+                                diag += distribute * Ax[kk];
+                            else if(position[k] >= row_start)
+                                Bx[position[k]] += distribute * Ax[kk];
+                        }
+                    } else {
+                        diag += a_ij;
+                    }
+                }
+                else {
+                    // weak connection outside of C^_i
+                    diag += a_ij;
+                }
+            }
+
+            if(diag != 0){
+                for(I kk = row_start; kk < nnz; kk++){
+                    Bx[kk] = -Bx[kk] / diag;
+                }
+            }
+
+            truncate_interpolation_row(Bx + row_start, nnz - row_start,
+                                       trunc_factor, max_elements, work);
+        }
+    }
+
+    std::vector<I> map(n_nodes);
+    for(I i = 0, sum = 0; i < n_nodes; i++){
+        map[i]  = sum;
+        sum    += splitting[i];
+    }
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I k = 0; k < Bp[n_nodes]; k++){
+        Bj[k] = map[Bj[k]];
+    }
+}
+
+/*
+ *  Truncate the rows of an interpolation operator in CSR format
+ *
+ *  Each row is truncated with truncate_interpolation_row.  Dropped entries
+ *  are set to zero and are not removed from the sparsity pattern.
+ *
+ *  Parameters
+ *      n_rows       - number of rows
+ *      Bp, Bx       - row pointer and entries of the operator
+ *      trunc_factor - relative drop tolerance
+ *      max_elements - maximum number of entries per row, no limit if <= 0
+ *      num_threads  - number of OpenMP threads
+ */
+template<class I, class T>
+void truncate_interpolation_rows(const I n_rows,
+                                 const I Bp[], const int Bp_size,
+                                       T Bx[], const int Bx_size,
+                                 const T trunc_factor,
+                                 const I max_elements,
+                                 const I num_threads)
+{
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        std::vector<T> work;
+
+        #pragma omp for schedule(static)
+        for(I i = 0; i < n_rows; i++){
+            truncate_interpolation_row(Bx + Bp[i], Bp[i+1] - Bp[i],
+                                       trunc_factor, max_elements, work);
+        }
+    }
+}
+
+
+/*
+ *  Assign the nodes to the passes of multipass interpolation
+ *
+ *  C-nodes belong to pass 0, and an F-node belongs to pass k if it has a
+ *  strong connection to a node of pass k-1, but to none of an earlier pass.
+ *  F-nodes without a strong path to a C-node are not assigned (pass -1).
+ *
+ *  Parameters
+ *      n_nodes     - number of nodes
+ *      Sp, Sj      - CSR pattern of the strength matrix S
+ *      splitting   - C/F splitting
+ *      pass        - (output) pass of each node
+ *      num_threads - number of OpenMP threads
+ *
+ *  Returns
+ *      number of passes, excluding pass 0
+ */
+template<class I>
+I rs_multipass_passes(const I n_nodes,
+                      const I Sp[], const int Sp_size,
+                      const I Sj[], const int Sj_size,
+                      const I splitting[], const int splitting_size,
+                            I pass[], const int pass_size,
+                      const I num_threads)
+{
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_nodes; i++){
+        pass[i] = (splitting[i] == C_NODE) ? 0 : -1;
+    }
+
+    I k = 0;
+    I num_assigned = 1;
+    while(num_assigned > 0){
+        k++;
+        num_assigned = 0;
+
+        // nodes assigned in this sweep get pass k and do not count as
+        // earlier passes, so the result does not depend on the order
+        #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static) reduction(+:num_assigned)
+        for(I i = 0; i < n_nodes; i++){
+            if(pass[i] != -1)
+                continue;
+            for(I jj = Sp[i]; jj < Sp[i+1]; jj++){
+                const I j = Sj[jj];
+                if(j != i && pass[j] != -1 && pass[j] < k){
+                    pass[i] = k;
+                    num_assigned++;
+                    break;
+                }
+            }
+        }
+    }
+
+    return k - 1;
+}
+
+
+/*
+ *  Compute the weights of one pass of multipass interpolation
+ *
+ *  An F-node i of pass k interpolates from the set N_i of its strong
+ *  neighbors of earlier passes,
+ *
+ *      e_i = - sum_{j in N_i} w_ij e_j,
+ *
+ *  with the weights of direct interpolation, i.e., the negative (positive)
+ *  entries a_ij, j in N_i, are scaled by the sum of all negative (positive)
+ *  off-diagonal entries of row i over their sum on N_i.  The interpolation
+ *  of pass k is then the product of W with the interpolation of the earlier
+ *  passes.
+ *
+ *  The first pass uses the strength of connection matrix 'S' to compute
+ *  the row pointer of W, the second pass fills in the entries.  W is an
+ *  n_nodes x n_nodes matrix and only the rows of pass k are nonzero.
+ *
+ *  Parameters
+ *      n_nodes     - number of rows in A
+ *      Ap, Aj, Ax  - CSR representation of A
+ *      Sp, Sj      - CSR pattern of the strength matrix S
+ *      pass        - passes, see rs_multipass_passes
+ *      k           - current pass
+ *      Wp, Wj, Wx  - CSR representation of W
+ *      num_threads - number of OpenMP threads
+ *
+ *  Reference:
+ *      K. Stueben, "Algebraic multigrid (AMG): an introduction with
+ *      applications", in: U. Trottenberg, C. W. Oosterlee and A. Schueller,
+ *      "Multigrid", Academic Press, 2001, Appendix A.
+ */
+template<class I>
+void rs_multipass_interpolation_pass1(const I n_nodes,
+                                      const I Sp[], const int Sp_size,
+                                      const I Sj[], const int Sj_size,
+                                      const I pass[], const int pass_size,
+                                      const I k,
+                                            I Wp[], const int Wp_size,
+                                      const I num_threads)
+{
+    Wp[0] = 0;
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_nodes; i++){
+        I nnz = 0;
+        if(pass[i] == k){
+            for(I jj = Sp[i]; jj < Sp[i+1]; jj++){
+                const I j = Sj[jj];
+                if(j != i && pass[j] != -1 && pass[j] < k)
+                    nnz++;
+            }
+        }
+        Wp[i+1] = nnz;
+    }
+
+    for(I i = 0; i < n_nodes; i++){
+        Wp[i+1] += Wp[i];
+    }
+}
+
+
+template<class I, class T>
+void rs_multipass_interpolation_pass2(const I n_nodes,
+                                      const I Ap[], const int Ap_size,
+                                      const I Aj[], const int Aj_size,
+                                      const T Ax[], const int Ax_size,
+                                      const I Sp[], const int Sp_size,
+                                      const I Sj[], const int Sj_size,
+                                      const I pass[], const int pass_size,
+                                      const I k,
+                                      const I Wp[], const int Wp_size,
+                                            I Wj[], const int Wj_size,
+                                            T Wx[], const int Wx_size,
+                                      const I num_threads)
+{
+    #pragma omp parallel num_threads(num_threads) if(num_threads > 1)
+    {
+        // position[j] >= Wp[i] iff j is in N_i
+        std::vector<I> position(n_nodes, -1);
+
+        #pragma omp for schedule(static)
+        for(I i = 0; i < n_nodes; i++){
+            if(pass[i] != k)
+                continue;
+
+            const I row_start = Wp[i];
+            I nnz = row_start;
+            for(I jj = Sp[i]; jj < Sp[i+1]; jj++){
+                const I j = Sj[jj];
+                if(j != i && pass[j] != -1 && pass[j] < k && position[j] < row_start){
+                    position[j] = nnz;
+                    Wj[nnz] = j;
+                    Wx[nnz] = 0;
+                    nnz++;
+                }
+            }
+
+            T sum_strong_pos = 0, sum_strong_neg = 0;
+            T sum_all_pos = 0, sum_all_neg = 0;
+            T diag = 0;
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const I j = Aj[jj];
+                const T a_ij = Ax[jj];
+                if(j == i){
+                    diag += a_ij;
+                    continue;
+                }
+                if(a_ij < 0)
+                    sum_all_neg += a_ij;
+                else
+                    sum_all_pos += a_ij;
+                if(position[j] >= row_start){
+                    Wx[position[j]] += a_ij;
+                    if(a_ij < 0)
+                        sum_strong_neg += a_ij;
+                    else
+                        sum_strong_pos += a_ij;
+                }
+            }
+
+            T alpha = (sum_strong_neg != 0) ? sum_all_neg / sum_strong_neg : 0;
+            T beta  = (sum_strong_pos != 0) ? sum_all_pos / sum_strong_pos : 0;
+
+            if(sum_strong_pos == 0)
+                diag += sum_all_pos;
+
+            const T neg_coeff = (diag != 0) ? -alpha/diag : 0;
+            const T pos_coeff = (diag != 0) ? -beta/diag : 0;
+
+            for(I kk = row_start; kk < nnz; kk++){
+                if(Wx[kk] < 0)
+                    Wx[kk] *= neg_coeff;
+                else
+                    Wx[kk] *= pos_coeff;
+            }
+
+            // pad the rows whose strong connections are not in A
+            for(; nnz < Wp[i+1]; nnz++){
+                Wj[nnz] = i;
+                Wx[nnz] = 0;
+            }
+        }
+    }
+}
+
 
 
 template<class I, class T>
@@ -167,6 +167,70 @@ py::array_t<I> & splitting
                                     );
 }
 
+template<class I, class R>
+I _pmis_splitting(
+          const I n_nodes,
+      py::array_t<I> & Sp,
+      py::array_t<I> & Sj,
+      py::array_t<I> & Tp,
+      py::array_t<I> & Tj,
+       py::array_t<R> & r,
+py::array_t<I> & splitting,
+      const I num_threads
+                  )
+{
+    auto py_Sp = Sp.unchecked();
+    auto py_Sj = Sj.unchecked();
+    auto py_Tp = Tp.unchecked();
+    auto py_Tj = Tj.unchecked();
+    auto py_r = r.unchecked();
+    auto py_splitting = splitting.mutable_unchecked();
+    const I *_Sp = py_Sp.data();
+    const I *_Sj = py_Sj.data();
+    const I *_Tp = py_Tp.data();
+    const I *_Tj = py_Tj.data();
+    const R *_r = py_r.data();
+    I *_splitting = py_splitting.mutable_data();
+
+    return pmis_splitting<I, R>(
+                  n_nodes,
+                      _Sp, Sp.shape(0),
+                      _Sj, Sj.shape(0),
+                      _Tp, Tp.shape(0),
+                      _Tj, Tj.shape(0),
+                       _r, r.shape(0),
+               _splitting, splitting.shape(0),
+              num_threads
+                                );
+}
+
+template<class I>
+void _rs_cf_splitting_blocks(
+          const I n_nodes,
+      py::array_t<I> & Sp,
+      py::array_t<I> & Sj,
+py::array_t<I> & splitting,
+   const I rows_per_block,
+      const I num_threads
+                             )
+{
+    auto py_Sp = Sp.unchecked();
+    auto py_Sj = Sj.unchecked();
+    auto py_splitting = splitting.mutable_unchecked();
+    const I *_Sp = py_Sp.data();
+    const I *_Sj = py_Sj.data();
+    I *_splitting = py_splitting.mutable_data();
+
+    return rs_cf_splitting_blocks<I>(
+                  n_nodes,
+                      _Sp, Sp.shape(0),
+                      _Sj, Sj.shape(0),
+               _splitting, splitting.shape(0),
+           rows_per_block,
+              num_threads
+                                     );
+}
+
 template<class I>
 void _cljp_naive_splitting(
                 const I n,
@@ -278,6 +342,224 @@ py::array_t<I> & splitting,
                                                );
 }
 
+template<class I>
+void _rs_extended_plusi_interpolation_pass1(
+          const I n_nodes,
+      py::array_t<I> & Sp,
+      py::array_t<I> & Sj,
+py::array_t<I> & splitting,
+      py::array_t<I> & Bp,
+      const I num_threads
+                                            )
+{
+    auto py_Sp = Sp.unchecked();
+    auto py_Sj = Sj.unchecked();
+    auto py_splitting = splitting.unchecked();
+    auto py_Bp = Bp.mutable_unchecked();
+    const I *_Sp = py_Sp.data();
+    const I *_Sj = py_Sj.data();
+    const I *_splitting = py_splitting.data();
+    I *_Bp = py_Bp.mutable_data();
+
+    return rs_extended_plusi_interpolation_pass1<I>(
+                  n_nodes,
+                      _Sp, Sp.shape(0),
+                      _Sj, Sj.shape(0),
+               _splitting, splitting.shape(0),
+                      _Bp, Bp.shape(0),
+              num_threads
+                                                    );
+}
+
+template<class I, class T>
+void _rs_extended_plusi_interpolation_pass2(
+          const I n_nodes,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+      py::array_t<I> & Sp,
+      py::array_t<I> & Sj,
+py::array_t<I> & splitting,
+      py::array_t<I> & Bp,
+      py::array_t<I> & Bj,
+      py::array_t<T> & Bx,
+     const T trunc_factor,
+     const I max_elements,
+      const I num_threads
+                                            )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_Sp = Sp.unchecked();
+    auto py_Sj = Sj.unchecked();
+    auto py_splitting = splitting.unchecked();
+    auto py_Bp = Bp.unchecked();
+    auto py_Bj = Bj.mutable_unchecked();
+    auto py_Bx = Bx.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const I *_Sp = py_Sp.data();
+    const I *_Sj = py_Sj.data();
+    const I *_splitting = py_splitting.data();
+    const I *_Bp = py_Bp.data();
+    I *_Bj = py_Bj.mutable_data();
+    T *_Bx = py_Bx.mutable_data();
+
+    return rs_extended_plusi_interpolation_pass2<I, T>(
+                  n_nodes,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                      _Sp, Sp.shape(0),
+                      _Sj, Sj.shape(0),
+               _splitting, splitting.shape(0),
+                      _Bp, Bp.shape(0),
+                      _Bj, Bj.shape(0),
+                      _Bx, Bx.shape(0),
+             trunc_factor,
+             max_elements,
+              num_threads
+                                                       );
+}
+
+template<class I, class T>
+void _truncate_interpolation_rows(
+           const I n_rows,
+      py::array_t<I> & Bp,
+      py::array_t<T> & Bx,
+     const T trunc_factor,
+     const I max_elements,
+      const I num_threads
+                                  )
+{
+    auto py_Bp = Bp.unchecked();
+    auto py_Bx = Bx.mutable_unchecked();
+    const I *_Bp = py_Bp.data();
+    T *_Bx = py_Bx.mutable_data();
+
+    return truncate_interpolation_rows<I, T>(
+                   n_rows,
+                      _Bp, Bp.shape(0),
+                      _Bx, Bx.shape(0),
+             trunc_factor,
+             max_elements,
+              num_threads
+                                             );
+}
+
+template<class I>
+I _rs_multipass_passes(
+          const I n_nodes,
+      py::array_t<I> & Sp,
+      py::array_t<I> & Sj,
+py::array_t<I> & splitting,
+    py::array_t<I> & pass,
+      const I num_threads
+                       )
+{
+    auto py_Sp = Sp.unchecked();
+    auto py_Sj = Sj.unchecked();
+    auto py_splitting = splitting.unchecked();
+    auto py_pass = pass.mutable_unchecked();
+    const I *_Sp = py_Sp.data();
+    const I *_Sj = py_Sj.data();
+    const I *_splitting = py_splitting.data();
+    I *_pass = py_pass.mutable_data();
+
+    return rs_multipass_passes<I>(
+                  n_nodes,
+                      _Sp, Sp.shape(0),
+                      _Sj, Sj.shape(0),
+               _splitting, splitting.shape(0),
+                    _pass, pass.shape(0),
+              num_threads
+                                  );
+}
+
+template<class I>
+void _rs_multipass_interpolation_pass1(
+          const I n_nodes,
+      py::array_t<I> & Sp,
+      py::array_t<I> & Sj,
+    py::array_t<I> & pass,
+                const I k,
+      py::array_t<I> & Wp,
+      const I num_threads
+                                       )
+{
+    auto py_Sp = Sp.unchecked();
+    auto py_Sj = Sj.unchecked();
+    auto py_pass = pass.unchecked();
+    auto py_Wp = Wp.mutable_unchecked();
+    const I *_Sp = py_Sp.data();
+    const I *_Sj = py_Sj.data();
+    const I *_pass = py_pass.data();
+    I *_Wp = py_Wp.mutable_data();
+
+    return rs_multipass_interpolation_pass1<I>(
+                  n_nodes,
+                      _Sp, Sp.shape(0),
+                      _Sj, Sj.shape(0),
+                    _pass, pass.shape(0),
+                        k,
+                      _Wp, Wp.shape(0),
+              num_threads
+                                               );
+}
+
+template<class I, class T>
+void _rs_multipass_interpolation_pass2(
+          const I n_nodes,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+      py::array_t<T> & Ax,
+      py::array_t<I> & Sp,
+      py::array_t<I> & Sj,
+    py::array_t<I> & pass,
+                const I k,
+      py::array_t<I> & Wp,
+      py::array_t<I> & Wj,
+      py::array_t<T> & Wx,
+      const I num_threads
+                                       )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_Ax = Ax.unchecked();
+    auto py_Sp = Sp.unchecked();
+    auto py_Sj = Sj.unchecked();
+    auto py_pass = pass.unchecked();
+    auto py_Wp = Wp.unchecked();
+    auto py_Wj = Wj.mutable_unchecked();
+    auto py_Wx = Wx.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    const T *_Ax = py_Ax.data();
+    const I *_Sp = py_Sp.data();
+    const I *_Sj = py_Sj.data();
+    const I *_pass = py_pass.data();
+    const I *_Wp = py_Wp.data();
+    I *_Wj = py_Wj.mutable_data();
+    T *_Wx = py_Wx.mutable_data();
+
+    return rs_multipass_interpolation_pass2<I, T>(
+                  n_nodes,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                      _Ax, Ax.shape(0),
+                      _Sp, Sp.shape(0),
+                      _Sj, Sj.shape(0),
+                    _pass, pass.shape(0),
+                        k,
+                      _Wp, Wp.shape(0),
+                      _Wj, Wj.shape(0),
+                      _Wx, Wx.shape(0),
+              num_threads
+                                                  );
+}
+
 template<class I, class T>
 void _cr_helper(
 py::array_t<I> & A_rowptr,
@@ -328,9 +610,17 @@ PYBIND11_MODULE(ruge_stuben, m) {
     maximum_row_value
     rs_cf_splitting
     rs_cf_splitting_pass2
+    pmis_splitting
+    rs_cf_splitting_blocks
     cljp_naive_splitting
     rs_direct_interpolation_pass1
     rs_direct_interpolation_pass2
+    rs_extended_plusi_interpolation_pass1
+    rs_extended_plusi_interpolation_pass2
+    truncate_interpolation_rows
+    rs_multipass_passes
+    rs_multipass_interpolation_pass1
+    rs_multipass_interpolation_pass2
     cr_helper
     )pbdoc";
 
@@ -344,6 +634,14 @@ PYBIND11_MODULE(ruge_stuben, m) {
     m.def("classical_strength_of_connection_abs", &_classical_strength_of_connection_abs<int, std::complex<float>, float>,
         py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
     m.def("classical_strength_of_connection_abs", &_classical_strength_of_connection_abs<int, std::complex<double>, double>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("classical_strength_of_connection_abs", &_classical_strength_of_connection_abs<int64_t, float, float>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("classical_strength_of_connection_abs", &_classical_strength_of_connection_abs<int64_t, double, double>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("classical_strength_of_connection_abs", &_classical_strength_of_connection_abs<int64_t, std::complex<float>, float>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("classical_strength_of_connection_abs", &_classical_strength_of_connection_abs<int64_t, std::complex<double>, double>,
         py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(),
 R"pbdoc(
 Compute a strength of connection matrix using the classical strength
@@ -377,6 +675,10 @@ Otherwise, the connection is weak.
     m.def("classical_strength_of_connection_min", &_classical_strength_of_connection_min<int, float>,
         py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
     m.def("classical_strength_of_connection_min", &_classical_strength_of_connection_min<int, double>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("classical_strength_of_connection_min", &_classical_strength_of_connection_min<int64_t, float>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("classical_strength_of_connection_min", &_classical_strength_of_connection_min<int64_t, double>,
         py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(),
 R"pbdoc(
 )pbdoc");
@@ -388,6 +690,14 @@ R"pbdoc(
     m.def("maximum_row_value", &_maximum_row_value<int, std::complex<float>, float>,
         py::arg("n_row"), py::arg("x").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert());
     m.def("maximum_row_value", &_maximum_row_value<int, std::complex<double>, double>,
+        py::arg("n_row"), py::arg("x").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert());
+    m.def("maximum_row_value", &_maximum_row_value<int64_t, float, float>,
+        py::arg("n_row"), py::arg("x").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert());
+    m.def("maximum_row_value", &_maximum_row_value<int64_t, double, double>,
+        py::arg("n_row"), py::arg("x").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert());
+    m.def("maximum_row_value", &_maximum_row_value<int64_t, std::complex<float>, float>,
+        py::arg("n_row"), py::arg("x").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert());
+    m.def("maximum_row_value", &_maximum_row_value<int64_t, std::complex<double>, double>,
         py::arg("n_row"), py::arg("x").noconvert(), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(),
 R"pbdoc(
 Compute the maximum in magnitude row value for a CSR matrix
@@ -403,6 +713,8 @@ Compute the maximum in magnitude row value for a CSR matrix
      Nothing, x[i] will hold row i's maximum magnitude entry)pbdoc");
 
     m.def("rs_cf_splitting", &_rs_cf_splitting<int>,
+        py::arg("n_nodes"), py::arg("C_rowptr").noconvert(), py::arg("C_colinds").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("influence").noconvert(), py::arg("splitting").noconvert());
+    m.def("rs_cf_splitting", &_rs_cf_splitting<int64_t>,
         py::arg("n_nodes"), py::arg("C_rowptr").noconvert(), py::arg("C_colinds").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("influence").noconvert(), py::arg("splitting").noconvert(),
 R"pbdoc(
 Compute a C/F (coarse-fine( splitting using the classical coarse grid
@@ -425,16 +737,91 @@ Notes:
   The splitting array must be preallocated)pbdoc");
 
     m.def("rs_cf_splitting_pass2", &_rs_cf_splitting_pass2<int>,
+        py::arg("n_nodes"), py::arg("C_rowptr").noconvert(), py::arg("C_colinds").noconvert(), py::arg("splitting").noconvert());
+    m.def("rs_cf_splitting_pass2", &_rs_cf_splitting_pass2<int64_t>,
         py::arg("n_nodes"), py::arg("C_rowptr").noconvert(), py::arg("C_colinds").noconvert(), py::arg("splitting").noconvert(),
 R"pbdoc(
 )pbdoc");
 
+    m.def("pmis_splitting", &_pmis_splitting<int, float>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("r").noconvert(), py::arg("splitting").noconvert(), py::arg("num_threads"));
+    m.def("pmis_splitting", &_pmis_splitting<int, double>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("r").noconvert(), py::arg("splitting").noconvert(), py::arg("num_threads"));
+    m.def("pmis_splitting", &_pmis_splitting<int64_t, float>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("r").noconvert(), py::arg("splitting").noconvert(), py::arg("num_threads"));
+    m.def("pmis_splitting", &_pmis_splitting<int64_t, double>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("r").noconvert(), py::arg("splitting").noconvert(), py::arg("num_threads"),
+R"pbdoc(
+Compute a PMIS splitting (Parallel Modified Independent Set)
+
+ Each node i has the weight |S^T_i| + r[i], the number of nodes that
+ strongly depend on i plus a random number in [0, 1).  Nodes on which no
+ other node depends become F-nodes.  Then, in every round, each
+ undecided node whose weight is larger than that of all undecided
+ nodes in S_i and S^T_i becomes a C-node, and every undecided node
+ that strongly depends on a new C-node becomes an F-node.
+
+ Every round only reads the splitting of the previous round, so the
+ splitting does not depend on num_threads.
+
+ Parameters
+     n_nodes     - number of rows in A (number of vertices)
+     Sp[]        - CSR row pointer (strength matrix)
+     Sj[]        - CSR index array
+     Tp[]        - CSR row pointer (transpose of the strength matrix)
+     Tj[]        - CSR index array
+     r[]         - random numbers in [0, 1)
+     splitting   - C/F splitting, only the nodes marked U_NODE (2)
+                   on entry are decided, the others are kept
+     num_threads - number of OpenMP threads
+
+ Returns
+     the number of rounds
+
+ References
+     Hans De Sterck, Ulrike M Yang, and Jeffrey J Heys
+     "Reducing complexity in parallel algebraic multigrid preconditioners"
+     SIAM Journal on Matrix Analysis and Applications 2006; 27:1019-1039.)pbdoc");
+
+    m.def("rs_cf_splitting_blocks", &_rs_cf_splitting_blocks<int>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("rows_per_block"), py::arg("num_threads"));
+    m.def("rs_cf_splitting_blocks", &_rs_cf_splitting_blocks<int64_t>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("rows_per_block"), py::arg("num_threads"),
+R"pbdoc(
+Compute a Ruge-Stuben splitting (first pass only) independently on
+ blocks of consecutive rows, for use in HMIS
+
+ The rows are split into blocks of rows_per_block rows and
+ rs_cf_splitting is applied to each block, ignoring the strong
+ connections between blocks.  The blocks are distributed over the
+ threads, so the splitting depends on rows_per_block but not on
+ num_threads.  Upon return, F-nodes that do not strongly depend on a
+ C-node, but do strongly depend on some other node, are marked as
+ undecided (U_NODE), so that they can be decided by pmis_splitting.
+
+ Parameters
+     n_nodes        - number of rows in A (number of vertices)
+     Sp[]           - CSR row pointer (strength matrix)
+     Sj[]           - CSR index array
+     splitting      - array to store the C/F splitting
+     rows_per_block - number of rows split together
+     num_threads    - number of OpenMP threads
+
+ References
+     Hans De Sterck, Ulrike M Yang, and Jeffrey J Heys
+     "Reducing complexity in parallel algebraic multigrid preconditioners"
+     SIAM Journal on Matrix Analysis and Applications 2006; 27:1019-1039.)pbdoc");
+
     m.def("cljp_naive_splitting", &_cljp_naive_splitting<int>,
+        py::arg("n"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("splitting").noconvert(), py::arg("colorflag"));
+    m.def("cljp_naive_splitting", &_cljp_naive_splitting<int64_t>,
         py::arg("n"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Tp").noconvert(), py::arg("Tj").noconvert(), py::arg("splitting").noconvert(), py::arg("colorflag"),
 R"pbdoc(
 )pbdoc");
 
     m.def("rs_direct_interpolation_pass1", &_rs_direct_interpolation_pass1<int>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert());
+    m.def("rs_direct_interpolation_pass1", &_rs_direct_interpolation_pass1<int64_t>,
         py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(),
 R"pbdoc(
 Produce the Ruge-Stuben prolongator using "Direct Interpolation"
@@ -451,13 +838,162 @@ Produce the Ruge-Stuben prolongator using "Direct Interpolation"
     m.def("rs_direct_interpolation_pass2", &_rs_direct_interpolation_pass2<int, float>,
         py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert());
     m.def("rs_direct_interpolation_pass2", &_rs_direct_interpolation_pass2<int, double>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert());
+    m.def("rs_direct_interpolation_pass2", &_rs_direct_interpolation_pass2<int64_t, float>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert());
+    m.def("rs_direct_interpolation_pass2", &_rs_direct_interpolation_pass2<int64_t, double>,
         py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(),
 R"pbdoc(
+)pbdoc");
+
+    m.def("rs_extended_plusi_interpolation_pass1", &_rs_extended_plusi_interpolation_pass1<int>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("num_threads"));
+    m.def("rs_extended_plusi_interpolation_pass1", &_rs_extended_plusi_interpolation_pass1<int64_t>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("num_threads"),
+R"pbdoc(
+Produce a classical AMG prolongator using "Extended+i Interpolation"
+
+  Each F-node i interpolates from the interpolatory set C^_i, which
+  consists of its strong C-neighbors and the strong C-neighbors of its
+  strong F-neighbors, so the interpolation reaches distance two.
+  The connection a_ij to a strong F-neighbor j is distributed over the
+  connections of j to C^_i and to i itself (the "+i"), using only the
+  entries of row j whose sign is opposite to that of a_jj.  Weak
+  connections to nodes outside of C^_i are lumped into the diagonal.
+
+  The first pass uses the strength of connection matrix 'S'
+  and C/F splitting to compute the row pointer for the prolongator.
+
+  The second pass fills in the nonzero entries of the prolongator,
+  optionally truncating each row (see truncate_interpolation_row).
+  Dropped entries are stored as explicit zeros.
+
+  Both passes split the rows among num_threads threads.  The rows are
+  computed independently, so the result does not depend on num_threads.
+
+  Parameters
+     n_nodes      - number of rows in A
+     Ap, Aj, Ax   - CSR representation of A
+     Sp, Sj       - CSR representation of the strength matrix S
+     splitting    - C/F splitting
+     Bp, Bj, Bx   - CSR representation of the prolongator
+     trunc_factor - relative drop tolerance for the rows of P
+     max_elements - maximum number of entries in each row of P (<= 0 for
+                    no limit)
+     num_threads  - number of OpenMP threads
+
+  Reference:
+     H. De Sterck, R. D. Falgout, J. W. Nolting and U. M. Yang,
+     "Distance-two interpolation for parallel algebraic multigrid",
+     Numerical Linear Algebra with Applications 2008; 15:115-139.)pbdoc");
+
+    m.def("rs_extended_plusi_interpolation_pass2", &_rs_extended_plusi_interpolation_pass2<int, float>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("trunc_factor"), py::arg("max_elements"), py::arg("num_threads"));
+    m.def("rs_extended_plusi_interpolation_pass2", &_rs_extended_plusi_interpolation_pass2<int, double>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("trunc_factor"), py::arg("max_elements"), py::arg("num_threads"));
+    m.def("rs_extended_plusi_interpolation_pass2", &_rs_extended_plusi_interpolation_pass2<int64_t, float>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("trunc_factor"), py::arg("max_elements"), py::arg("num_threads"));
+    m.def("rs_extended_plusi_interpolation_pass2", &_rs_extended_plusi_interpolation_pass2<int64_t, double>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("trunc_factor"), py::arg("max_elements"), py::arg("num_threads"),
+R"pbdoc(
+)pbdoc");
+
+    m.def("truncate_interpolation_rows", &_truncate_interpolation_rows<int, float>,
+        py::arg("n_rows"), py::arg("Bp").noconvert(), py::arg("Bx").noconvert(), py::arg("trunc_factor"), py::arg("max_elements"), py::arg("num_threads"));
+    m.def("truncate_interpolation_rows", &_truncate_interpolation_rows<int, double>,
+        py::arg("n_rows"), py::arg("Bp").noconvert(), py::arg("Bx").noconvert(), py::arg("trunc_factor"), py::arg("max_elements"), py::arg("num_threads"));
+    m.def("truncate_interpolation_rows", &_truncate_interpolation_rows<int64_t, float>,
+        py::arg("n_rows"), py::arg("Bp").noconvert(), py::arg("Bx").noconvert(), py::arg("trunc_factor"), py::arg("max_elements"), py::arg("num_threads"));
+    m.def("truncate_interpolation_rows", &_truncate_interpolation_rows<int64_t, double>,
+        py::arg("n_rows"), py::arg("Bp").noconvert(), py::arg("Bx").noconvert(), py::arg("trunc_factor"), py::arg("max_elements"), py::arg("num_threads"),
+R"pbdoc(
+Truncate the rows of an interpolation operator in CSR format
+
+ Each row is truncated with truncate_interpolation_row.  Dropped entries
+ are set to zero and are not removed from the sparsity pattern.
+
+ Parameters
+     n_rows       - number of rows
+     Bp, Bx       - row pointer and entries of the operator
+     trunc_factor - relative drop tolerance
+     max_elements - maximum number of entries per row, no limit if <= 0
+     num_threads  - number of OpenMP threads)pbdoc");
+
+    m.def("rs_multipass_passes", &_rs_multipass_passes<int>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("pass").noconvert(), py::arg("num_threads"));
+    m.def("rs_multipass_passes", &_rs_multipass_passes<int64_t>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("splitting").noconvert(), py::arg("pass").noconvert(), py::arg("num_threads"),
+R"pbdoc(
+Assign the nodes to the passes of multipass interpolation
+
+ C-nodes belong to pass 0, and an F-node belongs to pass k if it has a
+ strong connection to a node of pass k-1, but to none of an earlier pass.
+ F-nodes without a strong path to a C-node are not assigned (pass -1).
+
+ Parameters
+     n_nodes     - number of nodes
+     Sp, Sj      - CSR pattern of the strength matrix S
+     splitting   - C/F splitting
+     pass        - (output) pass of each node
+     num_threads - number of OpenMP threads
+
+ Returns
+     number of passes, excluding pass 0)pbdoc");
+
+    m.def("rs_multipass_interpolation_pass1", &_rs_multipass_interpolation_pass1<int>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("pass").noconvert(), py::arg("k"), py::arg("Wp").noconvert(), py::arg("num_threads"));
+    m.def("rs_multipass_interpolation_pass1", &_rs_multipass_interpolation_pass1<int64_t>,
+        py::arg("n_nodes"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("pass").noconvert(), py::arg("k"), py::arg("Wp").noconvert(), py::arg("num_threads"),
+R"pbdoc(
+Compute the weights of one pass of multipass interpolation
+
+ An F-node i of pass k interpolates from the set N_i of its strong
+ neighbors of earlier passes,
+
+     e_i = - sum_{j in N_i} w_ij e_j,
+
+ with the weights of direct interpolation, i.e., the negative (positive)
+ entries a_ij, j in N_i, are scaled by the sum of all negative (positive)
+ off-diagonal entries of row i over their sum on N_i.  The interpolation
+ of pass k is then the product of W with the interpolation of the earlier
+ passes.
+
+ The first pass uses the strength of connection matrix 'S' to compute
+ the row pointer of W, the second pass fills in the entries.  W is an
+ n_nodes x n_nodes matrix and only the rows of pass k are nonzero.
+
+ Parameters
+     n_nodes     - number of rows in A
+     Ap, Aj, Ax  - CSR representation of A
+     Sp, Sj      - CSR pattern of the strength matrix S
+     pass        - passes, see rs_multipass_passes
+     k           - current pass
+     Wp, Wj, Wx  - CSR representation of W
+     num_threads - number of OpenMP threads
+
+ Reference:
+     K. Stueben, "Algebraic multigrid (AMG): an introduction with
+     applications", in: U. Trottenberg, C. W. Oosterlee and A. Schueller,
+     "Multigrid", Academic Press, 2001, Appendix A.)pbdoc");
+
+    m.def("rs_multipass_interpolation_pass2", &_rs_multipass_interpolation_pass2<int, float>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("pass").noconvert(), py::arg("k"), py::arg("Wp").noconvert(), py::arg("Wj").noconvert(), py::arg("Wx").noconvert(), py::arg("num_threads"));
+    m.def("rs_multipass_interpolation_pass2", &_rs_multipass_interpolation_pass2<int, double>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("pass").noconvert(), py::arg("k"), py::arg("Wp").noconvert(), py::arg("Wj").noconvert(), py::arg("Wx").noconvert(), py::arg("num_threads"));
+    m.def("rs_multipass_interpolation_pass2", &_rs_multipass_interpolation_pass2<int64_t, float>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("pass").noconvert(), py::arg("k"), py::arg("Wp").noconvert(), py::arg("Wj").noconvert(), py::arg("Wx").noconvert(), py::arg("num_threads"));
+    m.def("rs_multipass_interpolation_pass2", &_rs_multipass_interpolation_pass2<int64_t, double>,
+        py::arg("n_nodes"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("pass").noconvert(), py::arg("k"), py::arg("Wp").noconvert(), py::arg("Wj").noconvert(), py::arg("Wx").noconvert(), py::arg("num_threads"),
+R"pbdoc(
 )pbdoc");
 
     m.def("cr_helper", &_cr_helper<int, float>,
         py::arg("A_rowptr").noconvert(), py::arg("A_colinds").noconvert(), py::arg("B").noconvert(), py::arg("e").noconvert(), py::arg("indices").noconvert(), py::arg("splitting").noconvert(), py::arg("gamma").noconvert(), py::arg("thetacs"));
     m.def("cr_helper", &_cr_helper<int, double>,
+        py::arg("A_rowptr").noconvert(), py::arg("A_colinds").noconvert(), py::arg("B").noconvert(), py::arg("e").noconvert(), py::arg("indices").noconvert(), py::arg("splitting").noconvert(), py::arg("gamma").noconvert(), py::arg("thetacs"));
+    m.def("cr_helper", &_cr_helper<int64_t, float>,
+        py::arg("A_rowptr").noconvert(), py::arg("A_colinds").noconvert(), py::arg("B").noconvert(), py::arg("e").noconvert(), py::arg("indices").noconvert(), py::arg("splitting").noconvert(), py::arg("gamma").noconvert(), py::arg("thetacs"));
+    m.def("cr_helper", &_cr_helper<int64_t, double>,
         py::arg("A_rowptr").noconvert(), py::arg("A_colinds").noconvert(), py::arg("B").noconvert(), py::arg("e").noconvert(), py::arg("indices").noconvert(), py::arg("splitting").noconvert(), py::arg("gamma").noconvert(), py::arg("thetacs"),
 R"pbdoc(
 Helper function for compatible relaxation to perform steps 3.1d - 3.1f
@@ -98,38 +98,43 @@ void symmetric_strength_of_connection(const I n_row,
 
 
 /*
- * Compute aggregates for a matrix A stored in CSR format
+ * Compute aggregates for the rows begin <= i < end of a matrix A stored
+ * in CSR format, ignoring all connections to other rows
+ *
+ * This is the kernel of standard_aggregation: on the whole range of rows
+ * it is standard_aggregation, and parallel_standard_aggregation applies it
+ * to blocks of rows.
  *
  * Parameters:
- *   n_row         - number of rows in A
+ *   begin         - first row of the range
+ *   end           - one past the last row of the range
  *   Ap[n_row + 1] - CSR row pointer
  *   Aj[nnz]       - CSR column indices
- *    x[n_row]     - aggregate numbers for each node
- *    y[n_row]     - will hold Cpts upon return
+ *    x[n_row]     - aggregate numbers (local to the range) for each node
+ *                   in the range
+ *    y[]          - will hold the Cpts of the range upon return
  *
  * Returns:
- *  The number of aggregates (== max(x[:]) + 1 )
- *
- * Notes:
- *    It is assumed that A is symmetric.
- *    A may contain diagonal entries (self loops)
- *    Unaggregated nodes are marked with a -1
+ *  The number of aggregates in the range
  *
  */
 template <class I>
-I standard_aggregation(const I n_row,
-                       const I Ap[], const int Ap_size,
-                       const I Aj[], const int Aj_size,
-                             I  x[], const int  x_size,
-                             I  y[], const int  y_size)
+I standard_aggregation_rows(const I begin,
+                            const I end,
+                            const I Ap[],
+                            const I Aj[],
+                                  I  x[],
+                                  I  y[])
 {
+    const I n_range = end - begin;
+
     // Bj[n] == -1 means i-th node has not been aggregated
-    std::fill(x, x + n_row, 0);
+    std::fill(x + begin, x + end, 0);
 
     I next_aggregate = 1; // number of aggregates + 1
 
     //Pass #1
-    for(I i = 0; i < n_row; i++){
+    for(I i = begin; i < end; i++){
         if(x[i]){ continue; } //already marked
 
         const I row_start = Ap[i];
@@ -140,7 +145,7 @@ I standard_aggregation(const I n_row,
         bool has_neighbors            = false;
         for(I jj = row_start; jj < row_end; jj++){
             const I j = Aj[jj];
-            if( i != j ){
+            if( i != j && j >= begin && j < end ){
                 has_neighbors = true;
                 if( x[j] ){
                     has_aggregated_neighbors = true;
@@ -151,14 +156,17 @@ I standard_aggregation(const I n_row,
 
         if(!has_neighbors){
             //isolated node, do not aggregate
-            x[i] = -n_row;
+            x[i] = -n_range;
         }
         else if (!has_aggregated_neighbors){
             //Make an aggregate out of this node and its neighbors
             x[i] = next_aggregate;
             y[next_aggregate-1] = i;              //y stores a list of the Cpts
             for(I jj = row_start; jj < row_end; jj++){
-                x[Aj[jj]] = next_aggregate;
+                const I j = Aj[jj];
+                if( j >= begin && j < end ){
+                    x[j] = next_aggregate;
+                }
             }
             next_aggregate++;
         }
@@ -166,11 +174,12 @@ I standard_aggregation(const I n_row,
 
     //Pass #2
     // Add unaggregated nodes to any neighboring aggregate
-    for(I i = 0; i < n_row; i++){
+    for(I i = begin; i < end; i++){
         if(x[i]){ continue; } //already marked
 
         for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
             const I j = Aj[jj];
+            if( j < begin || j >= end ){ continue; }
 
             const I xj = x[j];
             if(xj > 0){
@@ -183,14 +192,14 @@ I standard_aggregation(const I n_row,
     next_aggregate--;
 
     //Pass #3
-    for(I i = 0; i < n_row; i++){
+    for(I i = begin; i < end; i++){
         const I xi = x[i];
 
         if(xi != 0){
             // node i has been aggregated
             if(xi > 0)
                 x[i] = xi - 1;
-            else if(xi == -n_row)
+            else if(xi == -n_range)
                 x[i] = -1;
             else
                 x[i] = -xi - 1;
@@ -207,7 +216,7 @@ I standard_aggregation(const I n_row,
         for(I jj = row_start; jj < row_end; jj++){
             const I j = Aj[jj];
 
-            if(x[j] == 0){ //unmarked neighbors
+            if(j >= begin && j < end && x[j] == 0){ //unmarked neighbors
                 x[j] = next_aggregate;
             }
         }
@@ -219,6 +228,144 @@ I standard_aggregation(const I n_row,
 }
 
 
+/*
+ * Compute aggregates for a matrix A stored in CSR format
+ *
+ * Parameters:
+ *   n_row         - number of rows in A
+ *   Ap[n_row + 1] - CSR row pointer
+ *   Aj[nnz]       - CSR column indices
+ *    x[n_row]     - aggregate numbers for each node
+ *    y[n_row]     - will hold Cpts upon return
+ *
+ * Returns:
+ *  The number of aggregates (== max(x[:]) + 1 )
+ *
+ * Notes:
+ *    It is assumed that A is symmetric.
+ *    A may contain diagonal entries (self loops)
+ *    Unaggregated nodes are marked with a -1
+ *
+ */
+template <class I>
+I standard_aggregation(const I n_row,
+                       const I Ap[], const int Ap_size,
+                       const I Aj[], const int Aj_size,
+                             I  x[], const int  x_size,
+                             I  y[], const int  y_size)
+{
+    return standard_aggregation_rows((I) 0, n_row, Ap, Aj, x, y);
+}
+
+
+/*
+ * Compute aggregates for a matrix A stored in CSR format in parallel
+ *
+ * The rows are split into consecutive blocks of rows_per_block rows and
+ * each block is aggregated as in standard_aggregation, ignoring the
+ * connections between blocks (decoupled aggregation).  The blocks are
+ * distributed over the threads, so the aggregates depend on
+ * rows_per_block but not on num_threads.  If n_row <= rows_per_block the
+ * result is that of standard_aggregation.
+ *
+ * Parameters:
+ *   n_row          - number of rows in A
+ *   Ap[n_row + 1]  - CSR row pointer
+ *   Aj[nnz]        - CSR column indices
+ *    x[n_row]      - aggregate numbers for each node
+ *    y[n_row]      - will hold Cpts upon return
+ *   rows_per_block - number of rows aggregated together
+ *   num_threads    - number of OpenMP threads
+ *
+ * Returns:
+ *  The number of aggregates (== max(x[:]) + 1 )
+ *
+ * Notes:
+ *    It is assumed that A is symmetric.
+ *    A may contain diagonal entries (self loops)
+ *    Unaggregated nodes are marked with a -1
+ *    A node that only has neighbors in other blocks is added to a
+ *    neighboring aggregate afterwards.
+ *
+ */
+template <class I>
+I parallel_standard_aggregation(const I n_row,
+                                const I Ap[], const int Ap_size,
+                                const I Aj[], const int Aj_size,
+                                      I  x[], const int  x_size,
+                                      I  y[], const int  y_size,
+                                const I rows_per_block,
+                                const I num_threads)
+{
+    const I block_size = std::max(rows_per_block, (I) 1);
+    const I num_blocks = (n_row + block_size - 1) / block_size;
+
+    // aggregate each block, the Cpts of block b are stored from y[b*block_size]
+    std::vector<I> offsets(num_blocks + 1, 0);
+
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(dynamic)
+    for(I b = 0; b < num_blocks; b++){
+        const I begin = b*block_size;
+        const I end   = std::min(begin + block_size, n_row);
+        offsets[b+1] = standard_aggregation_rows(begin, end, Ap, Aj, x, y + begin);
+    }
+
+    for(I b = 0; b < num_blocks; b++){
+        offsets[b+1] += offsets[b];
+    }
+
+    // gather the Cpts, offsets[b] <= b*block_size so this is done in order
+    for(I b = 1; b < num_blocks; b++){
+        const I * y_block = y + b*block_size;
+        std::copy(y_block, y_block + (offsets[b+1] - offsets[b]), y + offsets[b]);
+    }
+
+    // number the aggregates globally
+    #pragma omp parallel for num_threads(num_threads) if(num_threads > 1) schedule(static)
+    for(I i = 0; i < n_row; i++){
+        if(x[i] != -1)
+            x[i] += offsets[i/block_size];
+    }
+
+    I next_aggregate = offsets[num_blocks];
+
+    // Nodes that are only connected to other blocks are added to a
+    // neighboring aggregate, or start a new one as in standard_aggregation
+    if(num_blocks > 1){
+        for(I i = 0; i < n_row; i++){
+            if(x[i] != -1){ continue; }
+
+            I xi = -1;
+            bool has_neighbors = false;
+            for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                const I j = Aj[jj];
+                if(i != j){
+                    has_neighbors = true;
+                    if(x[j] != -1){
+                        xi = x[j];
+                        break;
+                    }
+                }
+            }
+
+            if(xi != -1){
+                x[i] = xi;
+            }
+            else if(has_neighbors){
+                x[i] = next_aggregate;
+                y[next_aggregate] = i;              //y stores a list of the Cpts
+                for(I jj = Ap[i]; jj < Ap[i+1]; jj++){
+                    x[Aj[jj]] = next_aggregate;
+                }
+                next_aggregate++;
+            }
+        }
+    }
+
+    return next_aggregate; //number of aggregates
+}
+
+
 
 /*
  * Compute aggregates for a matrix A stored in CSR format
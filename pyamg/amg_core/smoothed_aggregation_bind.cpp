@@ -72,6 +72,37 @@ I _standard_aggregation(
                                     );
 }
 
+template <class I>
+I _parallel_standard_aggregation(
+            const I n_row,
+      py::array_t<I> & Ap,
+      py::array_t<I> & Aj,
+       py::array_t<I> & x,
+       py::array_t<I> & y,
+   const I rows_per_block,
+      const I num_threads
+                                 )
+{
+    auto py_Ap = Ap.unchecked();
+    auto py_Aj = Aj.unchecked();
+    auto py_x = x.mutable_unchecked();
+    auto py_y = y.mutable_unchecked();
+    const I *_Ap = py_Ap.data();
+    const I *_Aj = py_Aj.data();
+    I *_x = py_x.mutable_data();
+    I *_y = py_y.mutable_data();
+
+    return parallel_standard_aggregation <I>(
+                    n_row,
+                      _Ap, Ap.shape(0),
+                      _Aj, Aj.shape(0),
+                       _x, x.shape(0),
+                       _y, y.shape(0),
+           rows_per_block,
+              num_threads
+                                             );
+}
+
 template <class I>
 I _naive_aggregation(
             const I n_row,
@@ -339,6 +370,7 @@ PYBIND11_MODULE(smoothed_aggregation, m) {
     -------
     symmetric_strength_of_connection
     standard_aggregation
+    parallel_standard_aggregation
     naive_aggregation
     fit_candidates_real
     fit_candidates_complex
@@ -358,6 +390,14 @@ PYBIND11_MODULE(smoothed_aggregation, m) {
     m.def("symmetric_strength_of_connection", &_symmetric_strength_of_connection<int, std::complex<float>, float>,
         py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
     m.def("symmetric_strength_of_connection", &_symmetric_strength_of_connection<int, std::complex<double>, double>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("symmetric_strength_of_connection", &_symmetric_strength_of_connection<int64_t, float, float>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("symmetric_strength_of_connection", &_symmetric_strength_of_connection<int64_t, double, double>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("symmetric_strength_of_connection", &_symmetric_strength_of_connection<int64_t, std::complex<float>, float>,
+        py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("symmetric_strength_of_connection", &_symmetric_strength_of_connection<int64_t, std::complex<double>, double>,
         py::arg("n_row"), py::arg("theta"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(),
 R"pbdoc(
 Compute a strength of connection matrix using the standard symmetric
@@ -390,6 +430,8 @@ Compute a strength of connection matrix using the standard symmetric
      storage for S as is used by A.)pbdoc");
 
     m.def("standard_aggregation", &_standard_aggregation<int>,
+        py::arg("n_row"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("y").noconvert());
+    m.def("standard_aggregation", &_standard_aggregation<int64_t>,
         py::arg("n_row"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("y").noconvert(),
 R"pbdoc(
 Compute aggregates for a matrix A stored in CSR format
@@ -409,7 +451,42 @@ Notes:
    A may contain diagonal entries (self loops)
    Unaggregated nodes are marked with a -1)pbdoc");
 
+    m.def("parallel_standard_aggregation", &_parallel_standard_aggregation<int>,
+        py::arg("n_row"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("rows_per_block"), py::arg("num_threads"));
+    m.def("parallel_standard_aggregation", &_parallel_standard_aggregation<int64_t>,
+        py::arg("n_row"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("rows_per_block"), py::arg("num_threads"),
+R"pbdoc(
+Compute aggregates for a matrix A stored in CSR format in parallel
+
+The rows are split into consecutive blocks of rows_per_block rows and
+each block is aggregated as in standard_aggregation, ignoring the
+connections between blocks (decoupled aggregation).  The blocks are
+distributed over the threads, so the aggregates depend on
+rows_per_block but not on num_threads.  If n_row <= rows_per_block the
+result is that of standard_aggregation.
+
+Parameters:
+  n_row          - number of rows in A
+  Ap[n_row + 1]  - CSR row pointer
+  Aj[nnz]        - CSR column indices
+   x[n_row]      - aggregate numbers for each node
+   y[n_row]      - will hold Cpts upon return
+  rows_per_block - number of rows aggregated together
+  num_threads    - number of OpenMP threads
+
+Returns:
+ The number of aggregates (== max(x[:]) + 1 )
+
+Notes:
+   It is assumed that A is symmetric.
+   A may contain diagonal entries (self loops)
+   Unaggregated nodes are marked with a -1
+   A node that only has neighbors in other blocks is added to a
+   neighboring aggregate afterwards.)pbdoc");
+
     m.def("naive_aggregation", &_naive_aggregation<int>,
+        py::arg("n_row"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("y").noconvert());
+    m.def("naive_aggregation", &_naive_aggregation<int64_t>,
         py::arg("n_row"), py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("x").noconvert(), py::arg("y").noconvert(),
 R"pbdoc(
 Compute aggregates for a matrix A stored in CSR format
@@ -433,6 +510,10 @@ in possibly much higher complexities.)pbdoc");
     m.def("fit_candidates", &_fit_candidates_real<int, float>,
         py::arg("n_row"), py::arg("n_col"), py::arg("K1"), py::arg("K2"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("B").noconvert(), py::arg("R").noconvert(), py::arg("tol"));
     m.def("fit_candidates", &_fit_candidates_real<int, double>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("K1"), py::arg("K2"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("B").noconvert(), py::arg("R").noconvert(), py::arg("tol"));
+    m.def("fit_candidates", &_fit_candidates_real<int64_t, float>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("K1"), py::arg("K2"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("B").noconvert(), py::arg("R").noconvert(), py::arg("tol"));
+    m.def("fit_candidates", &_fit_candidates_real<int64_t, double>,
         py::arg("n_row"), py::arg("n_col"), py::arg("K1"), py::arg("K2"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("B").noconvert(), py::arg("R").noconvert(), py::arg("tol"),
 R"pbdoc(
 )pbdoc");
@@ -440,6 +521,10 @@ R"pbdoc(
     m.def("fit_candidates", &_fit_candidates_complex<int, float, std::complex<float>>,
         py::arg("n_row"), py::arg("n_col"), py::arg("K1"), py::arg("K2"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("B").noconvert(), py::arg("R").noconvert(), py::arg("tol"));
     m.def("fit_candidates", &_fit_candidates_complex<int, double, std::complex<double>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("K1"), py::arg("K2"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("B").noconvert(), py::arg("R").noconvert(), py::arg("tol"));
+    m.def("fit_candidates", &_fit_candidates_complex<int64_t, float, std::complex<float>>,
+        py::arg("n_row"), py::arg("n_col"), py::arg("K1"), py::arg("K2"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("B").noconvert(), py::arg("R").noconvert(), py::arg("tol"));
+    m.def("fit_candidates", &_fit_candidates_complex<int64_t, double, std::complex<double>>,
         py::arg("n_row"), py::arg("n_col"), py::arg("K1"), py::arg("K2"), py::arg("Ap").noconvert(), py::arg("Ai").noconvert(), py::arg("Ax").noconvert(), py::arg("B").noconvert(), py::arg("R").noconvert(), py::arg("tol"),
 R"pbdoc(
 )pbdoc");
@@ -451,6 +536,14 @@ R"pbdoc(
     m.def("satisfy_constraints_helper", &_satisfy_constraints_helper<int, std::complex<float>, float>,
         py::arg("RowsPerBlock"), py::arg("ColsPerBlock"), py::arg("num_block_rows"), py::arg("NullDim"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("z").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
     m.def("satisfy_constraints_helper", &_satisfy_constraints_helper<int, std::complex<double>, double>,
+        py::arg("RowsPerBlock"), py::arg("ColsPerBlock"), py::arg("num_block_rows"), py::arg("NullDim"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("z").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("satisfy_constraints_helper", &_satisfy_constraints_helper<int64_t, float, float>,
+        py::arg("RowsPerBlock"), py::arg("ColsPerBlock"), py::arg("num_block_rows"), py::arg("NullDim"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("z").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("satisfy_constraints_helper", &_satisfy_constraints_helper<int64_t, double, double>,
+        py::arg("RowsPerBlock"), py::arg("ColsPerBlock"), py::arg("num_block_rows"), py::arg("NullDim"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("z").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("satisfy_constraints_helper", &_satisfy_constraints_helper<int64_t, std::complex<float>, float>,
+        py::arg("RowsPerBlock"), py::arg("ColsPerBlock"), py::arg("num_block_rows"), py::arg("NullDim"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("z").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("satisfy_constraints_helper", &_satisfy_constraints_helper<int64_t, std::complex<double>, double>,
         py::arg("RowsPerBlock"), py::arg("ColsPerBlock"), py::arg("num_block_rows"), py::arg("NullDim"), py::arg("x").noconvert(), py::arg("y").noconvert(), py::arg("z").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(),
 R"pbdoc(
 )pbdoc");
@@ -462,6 +555,14 @@ R"pbdoc(
     m.def("calc_BtB", &_calc_BtB<int, std::complex<float>, float>,
         py::arg("NullDim"), py::arg("Nnodes"), py::arg("ColsPerBlock"), py::arg("b").noconvert(), py::arg("BsqCols"), py::arg("x").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert());
     m.def("calc_BtB", &_calc_BtB<int, std::complex<double>, double>,
+        py::arg("NullDim"), py::arg("Nnodes"), py::arg("ColsPerBlock"), py::arg("b").noconvert(), py::arg("BsqCols"), py::arg("x").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert());
+    m.def("calc_BtB", &_calc_BtB<int64_t, float, float>,
+        py::arg("NullDim"), py::arg("Nnodes"), py::arg("ColsPerBlock"), py::arg("b").noconvert(), py::arg("BsqCols"), py::arg("x").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert());
+    m.def("calc_BtB", &_calc_BtB<int64_t, double, double>,
+        py::arg("NullDim"), py::arg("Nnodes"), py::arg("ColsPerBlock"), py::arg("b").noconvert(), py::arg("BsqCols"), py::arg("x").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert());
+    m.def("calc_BtB", &_calc_BtB<int64_t, std::complex<float>, float>,
+        py::arg("NullDim"), py::arg("Nnodes"), py::arg("ColsPerBlock"), py::arg("b").noconvert(), py::arg("BsqCols"), py::arg("x").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert());
+    m.def("calc_BtB", &_calc_BtB<int64_t, std::complex<double>, double>,
         py::arg("NullDim"), py::arg("Nnodes"), py::arg("ColsPerBlock"), py::arg("b").noconvert(), py::arg("BsqCols"), py::arg("x").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(),
 R"pbdoc(
 Helper routine for energy_prolongation_smoother
@@ -516,6 +617,14 @@ Principle calling routine is energy_prolongation_smoother(...) in smooth.py.)pbd
     m.def("incomplete_mat_mult_bsr", &_incomplete_mat_mult_bsr<int, std::complex<float>, float>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("n_brow"), py::arg("n_bcol"), py::arg("brow_A"), py::arg("bcol_A"), py::arg("bcol_B"));
     m.def("incomplete_mat_mult_bsr", &_incomplete_mat_mult_bsr<int, std::complex<double>, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("n_brow"), py::arg("n_bcol"), py::arg("brow_A"), py::arg("bcol_A"), py::arg("bcol_B"));
+    m.def("incomplete_mat_mult_bsr", &_incomplete_mat_mult_bsr<int64_t, float, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("n_brow"), py::arg("n_bcol"), py::arg("brow_A"), py::arg("bcol_A"), py::arg("bcol_B"));
+    m.def("incomplete_mat_mult_bsr", &_incomplete_mat_mult_bsr<int64_t, double, double>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("n_brow"), py::arg("n_bcol"), py::arg("brow_A"), py::arg("bcol_A"), py::arg("bcol_B"));
+    m.def("incomplete_mat_mult_bsr", &_incomplete_mat_mult_bsr<int64_t, std::complex<float>, float>,
+        py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("n_brow"), py::arg("n_bcol"), py::arg("brow_A"), py::arg("bcol_A"), py::arg("bcol_B"));
+    m.def("incomplete_mat_mult_bsr", &_incomplete_mat_mult_bsr<int64_t, std::complex<double>, double>,
         py::arg("Ap").noconvert(), py::arg("Aj").noconvert(), py::arg("Ax").noconvert(), py::arg("Bp").noconvert(), py::arg("Bj").noconvert(), py::arg("Bx").noconvert(), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(), py::arg("n_brow"), py::arg("n_bcol"), py::arg("brow_A"), py::arg("bcol_A"), py::arg("bcol_B"),
 R"pbdoc(
 Calculate A*B = S, but only at the pre-existing sparsity
@@ -583,6 +692,14 @@ routine below, except when S has far few nonzeros than A or B.)pbdoc");
     m.def("truncate_rows_csr", &_truncate_rows_csr<int, std::complex<float>, float>,
         py::arg("n_row"), py::arg("k"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
     m.def("truncate_rows_csr", &_truncate_rows_csr<int, std::complex<double>, double>,
+        py::arg("n_row"), py::arg("k"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("truncate_rows_csr", &_truncate_rows_csr<int64_t, float, float>,
+        py::arg("n_row"), py::arg("k"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("truncate_rows_csr", &_truncate_rows_csr<int64_t, double, double>,
+        py::arg("n_row"), py::arg("k"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("truncate_rows_csr", &_truncate_rows_csr<int64_t, std::complex<float>, float>,
+        py::arg("n_row"), py::arg("k"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert());
+    m.def("truncate_rows_csr", &_truncate_rows_csr<int64_t, std::complex<double>, double>,
         py::arg("n_row"), py::arg("k"), py::arg("Sp").noconvert(), py::arg("Sj").noconvert(), py::arg("Sx").noconvert(),
 R"pbdoc(
 Truncate the entries in A, such that only the largest (in magnitude)
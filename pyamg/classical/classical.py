@@ -5,14 +5,17 @@ from __future__ import absolute_import
 from warnings import warn
 from scipy.sparse import csr_matrix, isspmatrix_csr, SparseEfficiencyWarning
 
-from pyamg.multilevel import multilevel_solver
+from pyamg.multilevel import multilevel_solver, _make_profile, _make_timer,\
+    _galerkin_flops, _levelize_sparsify, _sparsify_level, _coarsest_level
 from pyamg.relaxation.smoothing import change_smoothers
+from pyamg.util.utils import levelize_strength_or_aggregation
 from pyamg.strength import classical_strength_of_connection, \
     symmetric_strength_of_connection, evolution_strength_of_connection,\
     distance_strength_of_connection, energy_based_strength_of_connection,\
     algebraic_distance, affinity_distance
 
-from .interpolate import direct_interpolation
+from .interpolate import direct_interpolation, extended_plusi_interpolation,\
+    multipass_interpolation
 from . import split
 from .cr import CR
 
@@ -21,10 +24,11 @@ __all__ = ['ruge_stuben_solver']
 
 def ruge_stuben_solver(A,
                        strength=('classical', {'theta': 0.25}),
-                       CF='RS',
+                       CF='RS', interpolation=None,
                        presmoother=('gauss_seidel', {'sweep': 'symmetric'}),
                        postsmoother=('gauss_seidel', {'sweep': 'symmetric'}),
-                       max_levels=10, max_coarse=10, keep=False, **kwargs):
+                       max_levels=10, max_coarse=10, keep=False,
+                       sparsify=None, **kwargs):
     """Create a multilevel solver using Classical AMG (Ruge-Stuben AMG).
 
     Parameters
@@ -36,9 +40,27 @@ def ruge_stuben_solver(A,
         of the linear system.  Method-specific parameters may be passed in
         using a tuple, e.g. strength=('symmetric',{'theta' : 0.25 }). If
         strength=None, all nonzero entries of the matrix are considered strong.
-    CF : string
+    CF : string, tuple or list
         Method used for coarse grid selection (C/F splitting)
-        Supported methods are RS, PMIS, PMISc, CLJP, CLJPc, and CR.
+        Supported methods are RS, PMIS, HMIS, PMISc, CLJP, CLJPc, CR and
+        aggressive.  Method-specific parameters may be passed in using a
+        tuple, e.g. CF=('aggressive', {'CF': 'PMIS', 'npaths': 2}).  A list
+        gives the method level by level, and the last entry is used on the
+        remaining levels, e.g. CF=['aggressive', 'PMIS'] coarsens
+        aggressively on the first level only.
+    interpolation : string, tuple, list or None
+        Method used to construct the prolongator, one of ['direct',
+        'extended_plusi', 'multipass'].  Method-specific parameters may be
+        passed in using a tuple, e.g.
+        interpolation=('extended_plusi', {'max_elements': 4}), and a list
+        gives the method level by level, as for CF.  Direct interpolation
+        only uses the strong C-neighbors of each F-point and suits the RS
+        splitting, extended+i interpolation reaches distance two and is
+        recommended with PMIS and HMIS, and multipass interpolation is
+        required by aggressive coarsening.  The default, None, selects
+        multipass interpolation on the aggressive levels and direct
+        interpolation on the other levels.  See classical.interpolate for
+        the truncation options.
     presmoother : string or dict
         Method used for presmoothing at each level.  Method-specific parameters
         may be passed in using a tuple, e.g.
@@ -47,12 +69,35 @@ def ruge_stuben_solver(A,
         Postsmoothing method with the same usage as presmoother
     max_levels: integer
         Maximum number of levels to be used in the multilevel solver.
-    max_coarse: integer
-        Maximum number of variables permitted on the coarse grid.
+    max_coarse: integer, 'auto'
+        Maximum number of variables permitted on the coarse grid.  If 'auto',
+        then coarsening stops at the level where the estimated cost of a
+        V-cycle, i.e., the smoothing on the finer levels plus one solve with
+        coarse_solver, is lowest, see
+        multilevel_solver.coarse_solve_complexity.
     keep: bool
         Flag to indicate keeping extra operators in the hierarchy for
         diagnostics.  For example, if True, then strength of connection (C) and
-        tentative prolongation (T) are kept.
+        tentative prolongation (T) are kept.  The strength of connection and
+        the C/F splitting are required by multilevel_solver.update with
+        reuse='aggregation'.
+    sparsify : None, dict or list
+        Truncation of P and sparsification of the coarse operator on each
+        level (a list gives the option level by level, and the last entry is
+        used on the remaining levels).  The dict may contain 'trunc_factor'
+        and 'max_elements', see pyamg.util.utils.truncate_interpolation,
+        'theta', see pyamg.util.utils.sparsify_operator, and 'target', a
+        target operator complexity, for which the thresholds are increased
+        automatically, e.g. sparsify={'target': 1.6}.  The row sums of P
+        and of the coarse operators are preserved.  Unlike the truncation
+        options of the interpolation, the truncation is applied to the
+        complete P.
+    profile : {False, True, multilevel_profile}
+        If True, then the phases of the setup and of the cycle are timed on
+        each level and stored in ml.profile, see multilevel_profile.
+    precision : {'full', 'mixed'}
+        If 'mixed', then P, R and the coarse operators are rounded to single
+        precision after the setup, see multilevel_solver.
 
     Returns
     -------
@@ -70,7 +115,7 @@ def ruge_stuben_solver(A,
     -----
     "coarse_solver" is an optional argument and is the solver used at the
     coarsest grid.  The default is a pseudo-inverse.  Most simply,
-    coarse_solver can be one of ['splu', 'lu', 'cholesky, 'pinv',
+    coarse_solver can be one of ['splu', 'direct', 'lu', 'cholesky, 'pinv',
     'gauss_seidel', ... ].  Additionally, coarse_solver may be a tuple
     (fn, args), where fn is a string such as ['splu', 'lu', ...] or a callable
     function, and args is a dictionary of arguments to be passed to fn.
@@ -106,28 +151,66 @@ def ruge_stuben_solver(A,
 
     levels[-1].A = A
 
-    while len(levels) < max_levels and levels[-1].A.shape[0] > max_coarse:
-        extend_hierarchy(levels, strength, CF, keep)
+    max_levels, max_coarse, CF =\
+        levelize_strength_or_aggregation(CF, max_levels, max_coarse)
+    if interpolation is None:
+        interpolation = ['multipass' if _unpack_arg(fn)[0] == 'aggressive'
+                         else 'direct' for fn in CF]
+    max_levels, max_coarse, interpolation =\
+        levelize_strength_or_aggregation(interpolation, max_levels,
+                                         max_coarse)
 
-    ml = multilevel_solver(levels, **kwargs)
+    sparsify = _levelize_sparsify(sparsify, max_levels)
+
+    profile = _make_profile(kwargs.pop('profile', None))
+
+    coarsest = _coarsest_level(max_coarse,
+                               kwargs.get('coarse_solver', 'pinv2'))
+    while len(levels) < max_levels and \
+            coarsest.coarsen_further(levels):
+        extend_hierarchy(levels, strength, CF[len(levels)-1], keep,
+                         profile=profile,
+                         interpolation=interpolation[len(levels)-1],
+                         sparsify=sparsify[len(levels)-1])
+    levels = coarsest.select(levels)
+
+    ml = multilevel_solver(levels, profile=profile, **kwargs)
     change_smoothers(ml, presmoother, postsmoother)
     return ml
 
 
 # internal function
-def extend_hierarchy(levels, strength, CF, keep):
-    """Extend the multigrid hierarchy."""
-    def unpack_arg(v):
-        if isinstance(v, tuple):
-            return v[0], v[1]
-        else:
-            return v, {}
+def _unpack_arg(v):
+    if isinstance(v, tuple):
+        return v[0], v[1]
+    else:
+        return v, {}
+
+
+# internal function
+def compute_interpolation(A, C, splitting, interpolation):
+    """Construct the prolongator with the given interpolation method."""
+    fn, kwargs = _unpack_arg(interpolation)
+    if fn == 'direct':
+        return direct_interpolation(A, C, splitting, **kwargs)
+    elif fn == 'extended_plusi':
+        return extended_plusi_interpolation(A, C, splitting, **kwargs)
+    elif fn == 'multipass':
+        return multipass_interpolation(A, C, splitting, **kwargs)
+    else:
+        raise ValueError('unknown interpolation method (%s)' % str(fn))
 
+
+# internal function
+def extend_hierarchy(levels, strength, CF, keep, profile=None,
+                     interpolation='direct', sparsify=None):
+    """Extend the multigrid hierarchy."""
+    timer = _make_timer(profile, 'setup', len(levels) - 1)
     A = levels[-1].A
 
     # Compute the strength-of-connection matrix C, where larger
     # C[i,j] denote stronger couplings between i and j.
-    fn, kwargs = unpack_arg(strength)
+    fn, kwargs = _unpack_arg(strength)
     if fn == 'symmetric':
         C = symmetric_strength_of_connection(A, **kwargs)
     elif fn == 'classical':
@@ -147,13 +230,18 @@ def extend_hierarchy(levels, strength, CF, keep):
     else:
         raise ValueError('unrecognized strength of connection method: %s' %
                          str(fn))
+    timer.lap('strength', A)
 
     # Generate the C/F splitting
-    fn, kwargs = unpack_arg(CF)
+    fn, kwargs = _unpack_arg(CF)
     if fn == 'RS':
         splitting = split.RS(C, **kwargs)
     elif fn == 'PMIS':
         splitting = split.PMIS(C, **kwargs)
+    elif fn == 'HMIS':
+        splitting = split.HMIS(C, **kwargs)
+    elif fn == 'aggressive':
+        splitting = split.aggressive(C, **kwargs)
     elif fn == 'PMISc':
         splitting = split.PMISc(C, **kwargs)
     elif fn == 'CLJP':
@@ -164,25 +252,30 @@ def extend_hierarchy(levels, strength, CF, keep):
         splitting = CR(C, **kwargs)
     else:
         raise ValueError('unknown C/F splitting method (%s)' % CF)
+    timer.lap('splitting', C)
 
     # Generate the interpolation matrix that maps from the coarse-grid to the
     # fine-grid
-    P = direct_interpolation(A, C, splitting)
+    P = compute_interpolation(A, C, splitting, interpolation)
 
-    # Generate the restriction matrix that maps from the fine-grid to the
-    # coarse-grid
-    R = P.T.tocsr()
+    timer.lap('interpolation', A, C)
 
     # Store relevant information for this level
     if keep:
         levels[-1].C = C                  # strength of connection matrix
         levels[-1].splitting = splitting  # C/F splitting
+        levels[-1].interpolation = interpolation  # interpolation method
+
+    # Truncate P and form the next level through the Galerkin product,
+    # possibly sparsified.  The restriction R = P.T is formed afterwards.
+    P, R, A, settings = _sparsify_level(levels, P, None, sparsify)
+    if settings:
+        levels[-1].sparsify = settings
 
     levels[-1].P = P                  # prolongation operator
     levels[-1].R = R                  # restriction operator
 
     levels.append(multilevel_solver.level())
-
-    # Form next level through Galerkin product
-    A = R * A * P
     levels[-1].A = A
+    timer.lap('galerkin', levels[-2].A, P, R,
+              flops=_galerkin_flops(levels[-2].A, P, R))
@@ -4,8 +4,10 @@
 import numpy as np
 from scipy.sparse import csr_matrix, isspmatrix_csr
 from pyamg import amg_core
+from pyamg.util.utils import _common_index_type, get_num_threads
 
-__all__ = ['direct_interpolation']
+__all__ = ['direct_interpolation', 'extended_plusi_interpolation',
+           'multipass_interpolation']
 
 
 def direct_interpolation(A, C, splitting):
@@ -55,6 +57,8 @@ def direct_interpolation(A, C, splitting):
     C.data[:] = 1.0
     C = C.multiply(A)
 
+    A, C = _common_index_type(A, C)
+    splitting = np.asarray(splitting, dtype=A.indptr.dtype)
     Pp = np.empty_like(A.indptr)
 
     amg_core.rs_direct_interpolation_pass1(A.shape[0],
@@ -71,3 +75,215 @@ def direct_interpolation(A, C, splitting):
                                            Pp, Pj, Px)
 
     return csr_matrix((Px, Pj, Pp))
+
+
+def extended_plusi_interpolation(A, C, splitting, trunc_factor=0.0,
+                                 max_elements=0, num_threads=None):
+    """Create prolongator using extended+i interpolation.
+
+    Each F-point interpolates from its strong C-neighbors and from the strong
+    C-neighbors of its strong F-neighbors, i.e., the interpolation reaches
+    distance two.  Unlike direct interpolation, the result remains accurate
+    for the sparse coarse grids of PMIS and HMIS.
+
+    Parameters
+    ----------
+    A : csr_matrix
+        NxN matrix in CSR format
+    C : csr_matrix
+        Strength-of-Connection matrix
+    splitting : array
+        C/F splitting stored in an array of length N
+    trunc_factor : float
+        Drop the entries of a row of P that are smaller in magnitude than
+        trunc_factor times the largest entry of the row.  The remaining
+        entries are scaled to preserve the row sum.
+    max_elements : int
+        Keep at most max_elements entries in each row of P (the largest in
+        magnitude), the remaining entries are scaled to preserve the row sum.
+        If max_elements <= 0, then the rows are not limited.
+    num_threads : int
+        Number of threads used to compute the rows of P, see
+        pyamg.util.utils.get_num_threads.  The result does not depend on
+        num_threads.
+
+    Returns
+    -------
+    P : csr_matrix
+        Prolongator using extended+i interpolation
+
+    Notes
+    -----
+    Truncation reduces the number of nonzeros of P and, consequently, the
+    operator complexity of the hierarchy.  Typical choices are
+    trunc_factor=0.2 or max_elements=4.
+
+    References
+    ----------
+    .. [1] De Sterck, H., Falgout, R. D., Nolting, J. W. and Yang, U. M.,
+       "Distance-two interpolation for parallel algebraic multigrid",
+       Numerical Linear Algebra with Applications, 15 (2008), pp. 115--139.
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.classical import extended_plusi_interpolation
+    >>> import numpy as np
+    >>> A = poisson((5,),format='csr')
+    >>> splitting = np.array([1,0,1,0,1], dtype='intc')
+    >>> P = extended_plusi_interpolation(A, A, splitting)
+    >>> print(P.toarray())
+    [[1.  0.  0. ]
+     [0.5 0.5 0. ]
+     [0.  1.  0. ]
+     [0.  0.5 0.5]
+     [0.  0.  1. ]]
+
+    """
+    if not isspmatrix_csr(A):
+        raise TypeError('expected csr_matrix for A')
+
+    if not isspmatrix_csr(C):
+        raise TypeError('expected csr_matrix for C')
+
+    if trunc_factor < 0 or trunc_factor > 1:
+        raise ValueError('trunc_factor must be in [0, 1]')
+
+    A, C = _common_index_type(A, C)
+    splitting = np.asarray(splitting, dtype=A.indptr.dtype)
+    num_threads = get_num_threads(num_threads)
+    Pp = np.empty_like(A.indptr)
+
+    amg_core.rs_extended_plusi_interpolation_pass1(A.shape[0],
+                                                   C.indptr, C.indices,
+                                                   splitting, Pp, num_threads)
+
+    nnz = Pp[-1]
+    Pj = np.empty(nnz, dtype=Pp.dtype)
+    Px = np.empty(nnz, dtype=A.dtype)
+
+    amg_core.rs_extended_plusi_interpolation_pass2(A.shape[0],
+                                                   A.indptr, A.indices, A.data,
+                                                   C.indptr, C.indices,
+                                                   splitting,
+                                                   Pp, Pj, Px,
+                                                   trunc_factor, max_elements,
+                                                   num_threads)
+
+    P = csr_matrix((Px, Pj, Pp), shape=(A.shape[0], int(splitting.sum())))
+    if trunc_factor > 0 or max_elements > 0:
+        P.eliminate_zeros()
+    P.sort_indices()
+    return P
+
+
+def multipass_interpolation(A, C, splitting, trunc_factor=0.0,
+                            max_elements=0, num_threads=None):
+    """Create prolongator using multipass interpolation.
+
+    The C-points are injected, and the F-points with a strong C-neighbor are
+    interpolated with direct interpolation (the first pass).  In each
+    following pass, the F-points with a strong connection to an F-point of
+    an earlier pass interpolate through the interpolation of those points.
+    Multipass interpolation suits aggressive coarsening, where F-points may
+    be far from the closest C-point.
+
+    Parameters
+    ----------
+    A : csr_matrix
+        NxN matrix in CSR format
+    C : csr_matrix
+        Strength-of-Connection matrix
+    splitting : array
+        C/F splitting stored in an array of length N
+    trunc_factor : float
+        Drop the entries of a row of P that are smaller in magnitude than
+        trunc_factor times the largest entry of the row, after each pass.
+        The remaining entries are scaled to preserve the row sum.
+    max_elements : int
+        Keep at most max_elements entries in each row of P after each pass.
+        If max_elements <= 0, then the rows are not limited.
+    num_threads : int
+        Number of threads, see pyamg.util.utils.get_num_threads.  The result
+        does not depend on num_threads.
+
+    Returns
+    -------
+    P : csr_matrix
+        Prolongator using multipass interpolation
+
+    References
+    ----------
+    .. [1] Stuben K.,
+       "Algebraic multigrid (AMG): an introduction with applications",
+       In Multigrid, Trottenberg U, Oosterlee CW, Schuller A (eds.),
+       Academic Press: San Diego, 2001; Appendix A.
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.classical import multipass_interpolation
+    >>> import numpy as np
+    >>> A = poisson((5,),format='csr')
+    >>> splitting = np.array([1,0,0,0,1], dtype='intc')
+    >>> P = multipass_interpolation(A, A, splitting)
+    >>> print(P.toarray())
+    [[1.  0. ]
+     [1.  0. ]
+     [0.5 0.5]
+     [0.  1. ]
+     [0.  1. ]]
+
+    """
+    if not isspmatrix_csr(A):
+        raise TypeError('expected csr_matrix for A')
+
+    if not isspmatrix_csr(C):
+        raise TypeError('expected csr_matrix for C')
+
+    if trunc_factor < 0 or trunc_factor > 1:
+        raise ValueError('trunc_factor must be in [0, 1]')
+
+    A, C = _common_index_type(A, C)
+    splitting = np.asarray(splitting, dtype=A.indptr.dtype)
+    num_threads = get_num_threads(num_threads)
+    n = A.shape[0]
+
+    passes = np.empty(n, dtype=A.indptr.dtype)
+    num_passes = amg_core.rs_multipass_passes(n, C.indptr, C.indices,
+                                              splitting, passes, num_threads)
+
+    # inject the C-points
+    Pp = np.zeros_like(A.indptr)
+    np.cumsum(splitting, out=Pp[1:])
+    P = csr_matrix((np.ones(Pp[-1], dtype=A.dtype),
+                    np.arange(Pp[-1], dtype=Pp.dtype), Pp),
+                   shape=(n, Pp[-1]))
+
+    for k in range(1, num_passes + 1):
+        Wp = np.empty_like(A.indptr)
+        amg_core.rs_multipass_interpolation_pass1(n, C.indptr, C.indices,
+                                                  passes, k, Wp, num_threads)
+
+        nnz = Wp[-1]
+        Wj = np.empty(nnz, dtype=Wp.dtype)
+        Wx = np.empty(nnz, dtype=A.dtype)
+        amg_core.rs_multipass_interpolation_pass2(n,
+                                                  A.indptr, A.indices, A.data,
+                                                  C.indptr, C.indices,
+                                                  passes, k, Wp, Wj, Wx,
+                                                  num_threads)
+
+        # the rows of W are nonzero on pass k and refer to earlier passes
+        W = csr_matrix((Wx, Wj, Wp), shape=(n, n))
+        P = P + W * P
+
+        if trunc_factor > 0 or max_elements > 0:
+            P.sort_indices()
+            amg_core.truncate_interpolation_rows(n, P.indptr, P.data,
+                                                 trunc_factor, max_elements,
+                                                 num_threads)
+            P.eliminate_zeros()
+
+    P.sort_indices()
+    return P
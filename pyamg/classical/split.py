@@ -31,6 +31,18 @@ PMIS: Parallel Modified Independent Set
     - Uses method similar to Luby's Maximal Independent Set algorithm.
     - See References [1] and [3]
 
+HMIS: Hybrid Modified Independent Set
+    - Ruge-Stuben on blocks of rows, PMIS across the blocks.
+    - Operator complexity between RS and PMIS, better convergence than PMIS.
+    - See References [3]
+
+Aggressive coarsening
+    - Applies RS, PMIS or HMIS twice, the second time to the C-nodes with
+      the strong connections along paths of length two.
+    - Much lower operator complexity, requires long-range (multipass)
+      interpolation.
+    - See References [3] and [5]
+
 PMISc: Parallel Modified Independent Set in Color
     - Fast construction with low operator complexity.
     - Better scalability than PMIS on structured meshes.
@@ -60,6 +72,8 @@ from coloring.
     ========  ========  ========  ==========
        RS        no        no      moderate
       PMIS      yes        no      very low
+      HMIS      yes        no        low
+   aggressive   yes        no        low
       PMISc     yes       yes        low
       CLJP      yes        no      moderate
       CLJPc     yes       yes      moderate
@@ -87,6 +101,11 @@ References
     Frontiers in Applied Mathematics, vol. 3.
     SIAM: Philadelphia, PA, 1987; 73-130.
 
+..  [5] Stuben K.
+    "Algebraic multigrid (AMG): an introduction with applications"
+    In Multigrid, Trottenberg U, Oosterlee CW, Schuller A (eds.),
+    Academic Press: San Diego, 2001; Appendix A.
+
 """
 import numpy as np
 import scipy as sp
@@ -94,9 +113,11 @@ from scipy.sparse import csr_matrix, isspmatrix_csr
 
 from pyamg.graph import vertex_coloring
 from pyamg import amg_core
-from pyamg.util.utils import remove_diagonal
+from pyamg.util.utils import remove_diagonal, _common_index_type, \
+    get_num_threads
 
-__all__ = ['RS', 'PMIS', 'PMISc', 'CLJP', 'CLJPc', 'MIS']
+__all__ = ['RS', 'PMIS', 'HMIS', 'aggressive', 'PMISc', 'CLJP', 'CLJPc',
+           'MIS']
 
 
 def RS(S, second_pass=False):
@@ -140,8 +161,9 @@ def RS(S, second_pass=False):
     S = remove_diagonal(S)
 
     T = S.T.tocsr()  # transpose S for efficient column access
-    splitting = np.empty(S.shape[0], dtype='intc')
-    influence = np.zeros((S.shape[0],), dtype='intc')
+    S, T = _common_index_type(S, T)
+    splitting = np.empty(S.shape[0], dtype=S.indptr.dtype)
+    influence = np.zeros((S.shape[0],), dtype=S.indptr.dtype)
 
     amg_core.rs_cf_splitting(S.shape[0],
                              S.indptr, S.indices,
@@ -155,7 +177,7 @@ def RS(S, second_pass=False):
     return splitting
 
 
-def PMIS(S):
+def PMIS(S, num_threads=None):
     """C/F splitting using the Parallel Modified Independent Set method.
 
     Parameters
@@ -163,6 +185,9 @@ def PMIS(S):
     S : csr_matrix
         Strength of connection matrix indicating the strength between nodes i
         and j (S_ij)
+    num_threads : int
+        Number of threads, see pyamg.util.utils.get_num_threads.  For a
+        given random seed, the splitting does not depend on num_threads.
 
     Returns
     -------
@@ -178,7 +203,7 @@ def PMIS(S):
 
     See Also
     --------
-    MIS
+    amg_core.pmis_splitting
 
     References
     ----------
@@ -187,9 +212,167 @@ def PMIS(S):
        SIAM Journal on Matrix Analysis and Applications 2006; 27:1019-1039.
 
     """
+    if not isspmatrix_csr(S):
+        raise TypeError('expected csr_matrix')
     S = remove_diagonal(S)
-    weights, G, S, T = preprocess(S)
-    return MIS(G, weights)
+
+    T = S.T.tocsr()  # transpose S for efficient column access
+    S, T = _common_index_type(S, T)
+    splitting = np.empty(S.shape[0], dtype=S.indptr.dtype)
+    splitting[:] = 2  # undecided
+
+    amg_core.pmis_splitting(S.shape[0],
+                            S.indptr, S.indices,
+                            T.indptr, T.indices,
+                            np.random.rand(S.shape[0]),
+                            splitting,
+                            get_num_threads(num_threads))
+
+    return splitting
+
+
+def HMIS(S, rows_per_block=65536, num_threads=None):
+    """C/F splitting using the Hybrid Modified Independent Set method.
+
+    The rows of S are split into consecutive blocks, and the first pass of
+    Ruge-Stuben coarsening is applied to each block, ignoring the strong
+    connections between blocks.  F-nodes left without a strong C-node are
+    then decided with PMIS, keeping the C-nodes from the first pass.
+
+    Parameters
+    ----------
+    S : csr_matrix
+        Strength of connection matrix indicating the strength between nodes i
+        and j (S_ij)
+    rows_per_block : int
+        Number of consecutive rows split together with Ruge-Stuben
+    num_threads : int
+        Number of threads, see pyamg.util.utils.get_num_threads.  For a
+        given random seed, the splitting does not depend on num_threads.
+
+    Returns
+    -------
+    splitting : ndarray
+        Array of length of S of ones (coarse) and zeros (fine)
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.classical import HMIS
+    >>> S = poisson((7,), format='csr') # 1D mesh with 7 vertices
+    >>> splitting = HMIS(S)
+
+    See Also
+    --------
+    amg_core.rs_cf_splitting_blocks, amg_core.pmis_splitting
+
+    References
+    ----------
+    .. [6] Hans De Sterck, Ulrike M Yang, and Jeffrey J Heys
+       "Reducing complexity in parallel algebraic multigrid preconditioners"
+       SIAM Journal on Matrix Analysis and Applications 2006; 27:1019-1039.
+
+    """
+    if not isspmatrix_csr(S):
+        raise TypeError('expected csr_matrix')
+    S = remove_diagonal(S)
+
+    T = S.T.tocsr()  # transpose S for efficient column access
+    S, T = _common_index_type(S, T)
+    splitting = np.empty(S.shape[0], dtype=S.indptr.dtype)
+    num_threads = get_num_threads(num_threads)
+
+    amg_core.rs_cf_splitting_blocks(S.shape[0],
+                                    S.indptr, S.indices,
+                                    splitting,
+                                    rows_per_block,
+                                    num_threads)
+    amg_core.pmis_splitting(S.shape[0],
+                            S.indptr, S.indices,
+                            T.indptr, T.indices,
+                            np.random.rand(S.shape[0]),
+                            splitting,
+                            num_threads)
+
+    return splitting
+
+
+def aggressive(S, CF='PMIS', npaths=1, **kwargs):
+    """C/F splitting using aggressive coarsening.
+
+    The splitting method CF is applied to S, and then again to the C-nodes,
+    where a C-node strongly depends on another C-node if they are connected
+    by at least npaths strong paths of length one or two.  Only the C-nodes
+    of the second splitting are kept, so the F-nodes may be at distance two
+    or more from the closest C-node.
+
+    Parameters
+    ----------
+    S : csr_matrix
+        Strength of connection matrix indicating the strength between nodes i
+        and j (S_ij)
+    CF : {'RS', 'PMIS', 'HMIS'}
+        Splitting applied on both passes
+    npaths : int
+        Minimum number of strong paths of length at most two between two
+        C-nodes of the first pass.  npaths=1 is the A1 and npaths=2 the A2
+        coarsening of Stuben, the latter is less aggressive.
+    kwargs : dict
+        Parameters passed to CF
+
+    Returns
+    -------
+    splitting : ndarray
+        Array of length of S of ones (coarse) and zeros (fine)
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.classical import aggressive
+    >>> S = poisson((7,), format='csr') # 1D mesh with 7 vertices
+    >>> splitting = aggressive(S, CF='RS')
+
+    Notes
+    -----
+    The F-nodes far from C-nodes are not interpolated by direct
+    interpolation, use multipass interpolation instead, see
+    classical.interpolate.multipass_interpolation.
+
+    References
+    ----------
+    .. [8] Stuben K.
+       "Algebraic multigrid (AMG): an introduction with applications"
+       In Multigrid, Trottenberg U, Oosterlee CW, Schuller A (eds.),
+       Academic Press: San Diego, 2001; Appendix A.
+
+    """
+    methods = {'RS': RS, 'PMIS': PMIS, 'HMIS': HMIS}
+    if CF not in methods:
+        raise ValueError('unknown C/F splitting method for aggressive '
+                         'coarsening (%s)' % str(CF))
+    if not isspmatrix_csr(S):
+        raise TypeError('expected csr_matrix')
+
+    splitting = methods[CF](S, **kwargs)
+    Cpts = np.where(splitting == 1)[0]
+    if len(Cpts) < 2:
+        return splitting
+
+    # count the strong paths of length one and two between the C-nodes
+    B = remove_diagonal(S)
+    B.data[:] = 1.0
+    BC = B[Cpts, :]
+    S2 = BC[:, Cpts] + BC * B[:, Cpts]
+    S2 = remove_diagonal(S2.tocsr())
+    S2.data[S2.data < npaths] = 0.0
+    S2.eliminate_zeros()
+
+    # C-nodes without strong paths to other C-nodes stay C-nodes, since
+    # they could not be interpolated
+    splitting2 = methods[CF](S2, **kwargs)
+    splitting2[np.diff(S2.indptr) == 0] = 1
+    splitting[Cpts] = splitting2
+    return splitting
 
 
 def PMISc(S, method='JP'):
@@ -280,7 +463,8 @@ def CLJP(S, color=False):
         colorid = 1
 
     T = S.T.tocsr()  # transpose S for efficient column access
-    splitting = np.empty(S.shape[0], dtype='intc')
+    S, T = _common_index_type(S, T)
+    splitting = np.empty(S.shape[0], dtype=S.indptr.dtype)
 
     amg_core.cljp_naive_splitting(S.shape[0],
                                   S.indptr, S.indices,
@@ -365,7 +549,7 @@ def MIS(G, weights, maxiter=None):
         raise TypeError('expected csr_matrix')
     G = remove_diagonal(G)
 
-    mis = np.empty(G.shape[0], dtype='intc')
+    mis = np.empty(G.shape[0], dtype=G.indptr.dtype)
     mis[:] = -1
 
     fn = amg_core.maximal_independent_set_parallel
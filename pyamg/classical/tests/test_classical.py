@@ -8,7 +8,8 @@ from pyamg.strength import classical_strength_of_connection
 
 from pyamg.classical import split
 from pyamg.classical.classical import ruge_stuben_solver
-from pyamg.classical.interpolate import direct_interpolation
+from pyamg.classical.interpolate import direct_interpolation, \
+    extended_plusi_interpolation, multipass_interpolation
 
 from numpy.testing import TestCase, assert_equal, assert_almost_equal
 
@@ -75,6 +76,62 @@ class TestRugeStubenFunctions(TestCase):
             # Y = (S*S.T) - X
             # assert(Y.nnz == 0 or Y.data.min() > 0)
 
+    def test_pmis_splitting(self):
+        for A in self.cases:
+            S = classical_strength_of_connection(A, 0.0)
+
+            for method in [split.PMIS, split.HMIS]:
+                np.random.seed(0)
+                splitting = method(S)
+
+                assert(splitting.min() >= 0)     # could be all 1s
+                assert_equal(splitting.max(), 1)
+
+                # the splitting for a given seed does not depend on the
+                # number of threads
+                for num_threads in [2, 3]:
+                    np.random.seed(0)
+                    assert_equal(method(S, num_threads=num_threads),
+                                 splitting)
+
+                T = S.copy()
+                T.data[:] = 1
+
+                # check that all F-nodes are strongly connected to a C-node
+                assert((splitting + T*splitting).min() > 0)
+
+            # HMIS on blocks of a few rows
+            np.random.seed(0)
+            splitting = split.HMIS(S, rows_per_block=3)
+            np.random.seed(0)
+            assert_equal(split.HMIS(S, rows_per_block=3, num_threads=2),
+                         splitting)
+            assert((splitting + T*splitting).min() > 0)
+
+    def test_aggressive_splitting(self):
+        for A in self.cases:
+            S = classical_strength_of_connection(A, 0.0)
+
+            for CF in ['RS', 'PMIS', 'HMIS']:
+                np.random.seed(0)
+                first = getattr(split, CF)(S)
+                np.random.seed(0)
+                splitting = split.aggressive(S, CF=CF)
+
+                # the C-nodes are a subset of the first splitting
+                assert(splitting.min() >= 0)
+                assert_equal(splitting.max(), 1)
+                assert((first - splitting).min() >= 0)
+
+                # every F-node of the first pass has a strong path of length
+                # at most two to a C-node
+                T = S.copy()
+                T.data[:] = 1
+                reach = splitting + T*splitting + T*(T*splitting)
+                assert((reach + (1 - first)).min() > 0)
+
+        self.assertRaises(ValueError, split.aggressive, S, CF='CLJP')
+
     def test_cljp_splitting(self):
         for A in self.cases:
             S = classical_strength_of_connection(A, 0.0)
@@ -114,6 +171,82 @@ class TestRugeStubenFunctions(TestCase):
 
             assert_almost_equal(result.toarray(), expected.toarray())
 
+    def test_extended_plusi_interpolation(self):
+        for A in self.cases:
+            S = classical_strength_of_connection(A, 0.0)
+            np.random.seed(0)
+            splitting = split.PMIS(S)
+            Cpts = np.where(splitting == 1)[0]
+
+            P = extended_plusi_interpolation(A, S, splitting)
+            assert_equal(P.shape, (A.shape[0], len(Cpts)))
+
+            # C-points are injected
+            assert_almost_equal(P[Cpts].toarray(), np.eye(len(Cpts)))
+
+            # the rows do not depend on the number of threads
+            P2 = extended_plusi_interpolation(A, S, splitting, num_threads=2)
+            assert_equal(P2.indptr, P.indptr)
+            assert_equal(P2.indices, P.indices)
+            assert_almost_equal(P2.data, P.data)
+
+            # truncation preserves the row sums
+            rowsum = np.ravel(P.sum(axis=1))
+            for kwargs in [{'trunc_factor': 0.3}, {'max_elements': 2}]:
+                Pt = extended_plusi_interpolation(A, S, splitting, **kwargs)
+                assert(Pt.nnz <= P.nnz)
+                assert_almost_equal(np.ravel(Pt.sum(axis=1)), rowsum)
+            assert(np.diff(Pt.indptr).max() <= 2)
+
+        # interior rows of the Poisson operator interpolate constants exactly
+        A = poisson((10, 10), format='csr')
+        S = classical_strength_of_connection(A, 0.25)
+        np.random.seed(0)
+        splitting = split.PMIS(S)
+        P = extended_plusi_interpolation(A, S, splitting)
+        interior = np.ravel(A.sum(axis=1)) == 0
+        assert_almost_equal(np.ravel(P.sum(axis=1))[interior], 1.0)
+
+    def test_multipass_interpolation(self):
+        for A in self.cases:
+            S = classical_strength_of_connection(A, 0.0)
+            np.random.seed(0)
+            splitting = split.aggressive(S, CF='PMIS')
+            Cpts = np.where(splitting == 1)[0]
+
+            P = multipass_interpolation(A, S, splitting)
+            assert_equal(P.shape, (A.shape[0], len(Cpts)))
+            assert_almost_equal(P[Cpts].toarray(), np.eye(len(Cpts)))
+
+            # on C-points and first pass rows, multipass interpolation is
+            # direct interpolation
+            if A.shape[0] > 5 and (np.abs(A - A.T) > 0).nnz == 0:
+                direct = direct_interpolation(A, S, splitting)
+                T = S.copy()
+                T.data[:] = 1
+                first = np.where(T * splitting > 0)[0]
+                assert_almost_equal(P[first].toarray(),
+                                    direct[first].toarray())
+
+            P2 = multipass_interpolation(A, S, splitting, num_threads=2)
+            assert_equal(P2.indices, P.indices)
+            assert_almost_equal(P2.data, P.data)
+
+            Pt = multipass_interpolation(A, S, splitting, max_elements=2)
+            assert(np.diff(Pt.indptr).max() <= 2)
+            assert_almost_equal(np.ravel(Pt.sum(axis=1)),
+                                np.ravel(P.sum(axis=1)))
+
+        # constants are interpolated exactly for a zero row sum operator
+        A = poisson((20, 20), format='csr')
+        A = (A - sp.sparse.diags(np.ravel(A.sum(axis=1)))).tocsr()
+        S = classical_strength_of_connection(A, 0.25)
+        for CF in ['RS', 'PMIS']:
+            np.random.seed(0)
+            splitting = split.aggressive(S, CF=CF)
+            P = multipass_interpolation(A, S, splitting)
+            assert_almost_equal(P * np.ones(P.shape[1]), 1.0)
+
 
 class TestSolverPerformance(TestCase):
     def test_poisson(self):
@@ -142,6 +275,67 @@ class TestSolverPerformance(TestCase):
 
             assert(avg_convergence_ratio < 0.20)
 
+    def test_interpolation(self):
+        # distance-two interpolation restores the convergence on the sparse
+        # coarse grids of PMIS
+        A = poisson((100, 100), format='csr')
+        np.random.seed(0)
+        b = np.random.rand(A.shape[0])
+
+        for interpolation in ['extended_plusi',
+                              ('extended_plusi', {'max_elements': 4})]:
+            np.random.seed(0)
+            ml = ruge_stuben_solver(A, CF='PMIS', max_coarse=50,
+                                    interpolation=interpolation)
+            res = []
+            ml.solve(b, maxiter=20, tol=1e-12, residuals=res)
+            avg_convergence_ratio = (res[-1]/res[0])**(1.0/len(res))
+            assert(avg_convergence_ratio < 0.35)
+
+        self.assertRaises(ValueError, ruge_stuben_solver, A,
+                          interpolation='standard')
+
+    def test_aggressive(self):
+        # aggressive coarsening on the first level lowers the operator
+        # complexity and still converges with multipass interpolation
+        A = poisson((20, 20, 20), format='csr')
+        np.random.seed(0)
+        b = np.random.rand(A.shape[0])
+
+        ml = ruge_stuben_solver(A, max_coarse=50)
+        for CF in [['aggressive', 'RS'], [('aggressive', {'CF': 'PMIS'}),
+                                          'HMIS']]:
+            np.random.seed(0)
+            ml_agg = ruge_stuben_solver(A, CF=CF, max_coarse=50)
+            assert(ml_agg.operator_complexity() <
+                   0.75 * ml.operator_complexity())
+            assert_equal(ml_agg.levels[0].P.shape[1] * 4 <
+                         ml.levels[0].P.shape[1], True)
+
+            res = []
+            ml_agg.solve(b, maxiter=50, tol=1e-8, residuals=res,
+                         accel='cg')
+            assert(res[-1] < 1e-8 * res[0])
+
+    def test_sparsify(self):
+        # truncation of P and sparsification of the coarse operators lower
+        # the operator complexity and the hierarchy still converges
+        A = poisson((20, 20, 20), format='csr')
+        np.random.seed(0)
+        b = np.random.rand(A.shape[0])
+
+        ml = ruge_stuben_solver(A, max_coarse=50)
+        for sparsify in [{'max_elements': 4, 'theta': 0.05},
+                         {'trunc_factor': 0.2, 'theta': 0.1},
+                         {'target': 2.0}]:
+            ml_sp = ruge_stuben_solver(A, max_coarse=50, sparsify=sparsify)
+            assert(ml_sp.operator_complexity() < ml.operator_complexity())
+            assert(ml_sp.levels[0].sparsify is not None)
+
+            res = []
+            ml_sp.solve(b, maxiter=50, tol=1e-8, residuals=res, accel='cg')
+            assert(res[-1] < 1e-8 * res[0])
+
     def test_matrix_formats(self):
         warnings.simplefilter('ignore', SparseEfficiencyWarning)
 
@@ -157,6 +351,27 @@ class TestSolverPerformance(TestCase):
             assert(np.abs(np.ravel(rs_old.levels[-1].A.toarray() - rs_new.levels[-1].A.toarray())).max() < 0.01)
             rs_old = rs_new
 
+    def test_index_types(self):
+        # int64 indices yield the same hierarchy as int indices
+        A = poisson((15, 15), format='csr')
+        A64 = A.copy()
+        A64.indptr = A64.indptr.astype(np.int64)
+        A64.indices = A64.indices.astype(np.int64)
+        b = np.arange(A.shape[0], dtype=float)
+
+        for CF in ['RS', 'PMIS', 'HMIS', 'CLJP', 'CR']:
+            np.random.seed(2002)
+            rs32 = ruge_stuben_solver(A, CF=CF, max_coarse=10, keep=True)
+            np.random.seed(2002)
+            rs64 = ruge_stuben_solver(A64, CF=CF, max_coarse=10, keep=True)
+            assert_equal(len(rs32.levels), len(rs64.levels))
+            for l32, l64 in zip(rs32.levels[:-1], rs64.levels[:-1]):
+                assert_equal(l32.splitting, l64.splitting)
+            assert_almost_equal(rs32.levels[-1].A.toarray(),
+                                rs64.levels[-1].A.toarray())
+            assert_almost_equal(rs32.solve(b, maxiter=5),
+                                rs64.solve(b, maxiter=5))
+
 
 #   reference implementations for unittests  #
 def reference_direct_interpolation(A, S, splitting):
@@ -7,6 +7,7 @@ import scipy as sp
 from scipy import sparse
 
 from . import amg_core
+from .util.utils import get_num_threads
 
 __all__ = ['maximal_independent_set', 'vertex_coloring', 'bellman_ford',
            'lloyd_cluster', 'connected_components']
@@ -59,7 +60,7 @@ def maximal_independent_set(G, algo='serial', k=None):
     G = asgraph(G)
     N = G.shape[0]
 
-    mis = np.empty(N, dtype='intc')
+    mis = np.empty(N, dtype=G.indptr.dtype)
     mis[:] = -1
 
     if k is None:
@@ -106,7 +107,7 @@ def vertex_coloring(G, method='MIS'):
     G = asgraph(G)
     N = G.shape[0]
 
-    coloring = np.empty(N, dtype='intc')
+    coloring = np.empty(N, dtype=G.indptr.dtype)
 
     if method == 'MIS':
         fn = amg_core.vertex_coloring_mis
@@ -149,13 +150,13 @@ def bellman_ford(G, seeds, maxiter=None):
         raise ValueError('Bellman-Ford algorithm only defined for real\
                           weights')
 
-    seeds = np.asarray(seeds, dtype='intc')
+    seeds = np.asarray(seeds, dtype=G.indptr.dtype)
 
     distances = np.empty(N, dtype=G.dtype)
     distances[:] = max_value(G.dtype)
     distances[seeds] = 0
 
-    nearest_seed = np.empty(N, dtype='intc')
+    nearest_seed = np.empty(N, dtype=G.indptr.dtype)
     nearest_seed[:] = -1
     nearest_seed[seeds] = seeds
 
@@ -174,7 +175,7 @@ def bellman_ford(G, seeds, maxiter=None):
     return (distances, nearest_seed)
 
 
-def lloyd_cluster(G, seeds, maxiter=10):
+def lloyd_cluster(G, seeds, maxiter=10, num_threads=None):
     """Perform Lloyd clustering on graph with weighted edges.
 
     Parameters
@@ -188,6 +189,11 @@ def lloyd_cluster(G, seeds, maxiter=10):
         and N-1 that will be used as the initial seeds for clustering.
     maxiter : int
         The maximum number of iterations to perform.
+    num_threads : int
+        Number of threads, see pyamg.util.utils.get_num_threads.  With more
+        than one thread, amg_core.lloyd_cluster_parallel is used, which may
+        assign a node that is equally far from two seeds to a different
+        cluster than the serial amg_core.lloyd_cluster.
 
     Returns
     -------
@@ -213,9 +219,9 @@ def lloyd_cluster(G, seeds, maxiter=10):
     # interpret seeds argument
     if np.isscalar(seeds):
         seeds = np.random.permutation(N)[:seeds]
-        seeds = seeds.astype('intc')
+        seeds = seeds.astype(G.indptr.dtype)
     else:
-        seeds = np.array(seeds, dtype='intc')
+        seeds = np.array(seeds, dtype=G.indptr.dtype)
 
     if len(seeds) < 1:
         raise ValueError('at least one seed is required')
@@ -225,14 +231,21 @@ def lloyd_cluster(G, seeds, maxiter=10):
     if seeds.max() >= N:
         raise ValueError('invalid seed index (%d)' % seeds.max())
 
-    clusters = np.empty(N, dtype='intc')
+    clusters = np.empty(N, dtype=G.indptr.dtype)
     distances = np.empty(N, dtype=G.dtype)
 
+    num_threads = get_num_threads(num_threads)
+
     for i in range(maxiter):
         last_seeds = seeds.copy()
 
-        amg_core.lloyd_cluster(N, G.indptr, G.indices, G.data,
-                               len(seeds), distances, clusters, seeds)
+        if num_threads > 1:
+            amg_core.lloyd_cluster_parallel(N, G.indptr, G.indices, G.data,
+                                            len(seeds), distances, clusters,
+                                            seeds, num_threads)
+        else:
+            amg_core.lloyd_cluster(N, G.indptr, G.indices, G.data,
+                                   len(seeds), distances, clusters, seeds)
 
         if (seeds == last_seeds).all():
             break
@@ -1,7 +1,7 @@
 import numpy as np
 from scipy.sparse import isspmatrix
 from scipy.sparse.sputils import upcast
-from scipy.sparse.linalg.isolve.utils import make_system
+from pyamg.krylov._utils import make_system
 from scipy.sparse.linalg.interface import aslinearoperator
 from warnings import warn
 from pyamg.util.linalg import norm
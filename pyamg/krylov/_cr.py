@@ -1,7 +1,7 @@
 from __future__ import print_function
 
 import numpy as np
-from scipy.sparse.linalg.isolve.utils import make_system
+from pyamg.krylov._utils import make_system
 from pyamg.util.linalg import norm
 from warnings import warn
 
@@ -1,6 +1,6 @@
 from warnings import warn
 import numpy as np
-from scipy.sparse.linalg.isolve.utils import make_system
+from pyamg.krylov._utils import make_system
 from scipy.sparse.sputils import upcast
 from pyamg.util.linalg import norm
 from pyamg import amg_core
@@ -1,6 +1,6 @@
 from __future__ import print_function
 import numpy as np
-from scipy.sparse.linalg.isolve.utils import make_system
+from pyamg.krylov._utils import make_system
 from scipy.sparse.sputils import upcast
 from warnings import warn
 from pyamg.util.linalg import norm
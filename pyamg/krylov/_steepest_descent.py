@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.sparse.linalg.isolve.utils import make_system
+from pyamg.krylov._utils import make_system
 from pyamg.util.linalg import norm
 from warnings import warn
 
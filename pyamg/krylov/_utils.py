@@ -0,0 +1,16 @@
+"""Helpers shared by the Krylov methods."""
+from scipy.sparse.linalg.isolve.utils import make_system as _make_system
+from pyamg.util.utils import threaded_operator
+
+__all__ = ['make_system']
+
+
+def make_system(A, M, x0, b):
+    """Make a linear system Ax=b, as scipy.sparse.linalg.isolve.make_system.
+
+    Products with CSR and BSR matrices A use the threaded amg_core kernels,
+    see pyamg.util.utils.threaded_operator.  The preconditioner M and the
+    other inputs are handled by scipy.
+
+    """
+    return _make_system(threaded_operator(A), M, x0, b)
@@ -1,13 +1,26 @@
 """Generic AMG solver."""
 
 
+import os
+import re
+import json
+import warnings
+from timeit import default_timer
 from warnings import warn
 
 import scipy as sp
+import scipy.sparse
 import numpy as np
 
+from pyamg import amg_core
+from pyamg.util.utils import get_num_threads, _has_kernel, _columns,\
+    _index_dtype, _galerkin_blocks, _matvec, _residual, galerkin_product,\
+    print_table, truncate_interpolation, sparsify_operator
+from pyamg.util.linalg import _transfer_spectral_radius
 
-__all__ = ['multilevel_solver', 'coarse_grid_solver']
+
+__all__ = ['multilevel_solver', 'multilevel_profile', 'coarse_grid_solver',
+           'load_hierarchy']
 
 
 class multilevel_solver:
@@ -26,6 +39,11 @@ class multilevel_solver:
         Array of level objects that contain A, R, and P.
     coarse_solver : string
         String passed to coarse_grid_solver indicating the solve type
+    profile : {multilevel_profile, None}
+        Timings of the setup and of the cycle on each level, if profiling
+        is enabled, see multilevel_profile.
+    precision : {'full', 'mixed'}
+        Precision of the cycle, see multilevel_solver.__init__
 
     Methods
     -------
@@ -37,8 +55,12 @@ class multilevel_solver:
         A measure of the rate of coarsening.
     operator_complexity()
         A measure of the size of the multigrid hierarchy.
+    save()
+        Save the hierarchy to disk, see load_hierarchy.
     solve()
         Iteratively solves a linear system for the right hand side.
+    update()
+        Recompute the hierarchy for a new matrix on the same coarsening.
 
     """
 
@@ -70,7 +92,8 @@ class multilevel_solver:
             """Level construct (empty)."""
             pass
 
-    def __init__(self, levels, coarse_solver='pinv2'):
+    def __init__(self, levels, coarse_solver='pinv2', profile=None,
+                 precision='full'):
         """Class constructor responsible for initializing the cycle and ensuring the list of levels is complete.
 
         Parameters
@@ -103,11 +126,36 @@ class multilevel_solver:
             * lu       : LU factorization
             * cholesky : Cholesky factorization
 
+        profile : {None, bool, multilevel_profile}
+            If True or a multilevel_profile, then the phases of every cycle
+            are timed on each level and recorded in self.profile.  The
+            solvers, e.g., smoothed_aggregation_solver, pass the profile of
+            the setup here.  Profiling can also be switched on or off later
+            by setting self.profile to a multilevel_profile or to None.
+        precision : {'full', 'mixed'}
+            If 'mixed', then P and R on all levels and A on the coarse levels
+            are stored in single precision (float32 or complex64), so that
+            smoothing on the coarse levels, the transfers and the coarse solve
+            run in single precision.  The matrix, the residual, and the
+            smoothing of the finest level, as well as any Krylov accelerator,
+            keep the precision of levels[0].A.  If 'full', all levels keep
+            their precision.
+
         Notes
         -----
         If not defined, the R attribute on each level is set to
         the transpose of P.
 
+        A mixed precision hierarchy moves about half the data through the
+        cycle.  The coarse-grid correction is only single precision
+        accurate, which is usually well below the reduction of the residual
+        by one cycle, so that the convergence factor is barely changed.  The
+        hierarchy is best built in double precision and then rounded.  As an
+        accelerator, 'cg', 'bicgstab' or the flexible 'fgmres' reach double
+        precision accuracy, while left-preconditioned 'gmres' may stagnate
+        near single precision, because the rounding makes the preconditioner
+        vary slightly between applications.
+
         Examples
         --------
         >>> # manual construction of a two-level AMG hierarchy
@@ -148,6 +196,10 @@ class multilevel_solver:
 
         """
         self.levels = levels
+        self.profile = _make_profile(profile)
+        if precision not in ['full', 'mixed']:
+            raise ValueError('expected \'full\' or \'mixed\' for precision')
+        self.precision = precision
 
         self.coarse_solver = coarse_grid_solver(coarse_solver)
 
@@ -155,6 +207,8 @@ class multilevel_solver:
             if not hasattr(level, 'R'):
                 level.R = level.P.H
 
+        self._set_precision()
+
     def __repr__(self):
         """Print basic statistics about the multigrid hierarchy."""
         output = 'multilevel_solver\n'
@@ -162,6 +216,8 @@ class multilevel_solver:
         output += 'Operator Complexity: %6.3f\n' % self.operator_complexity()
         output += 'Grid Complexity:     %6.3f\n' % self.grid_complexity()
         output += 'Coarse Solver:        %s\n' % self.coarse_solver.name()
+        if self.precision == 'mixed':
+            output += 'Precision:            mixed\n'
 
         total_nnz = sum([level.A.nnz for level in self.levels])
 
@@ -174,7 +230,7 @@ class multilevel_solver:
 
         return output
 
-    def cycle_complexity(self, cycle='V'):
+    def cycle_complexity(self, cycle='V', coarse_solve=False):
         """Cycle complexity of V, W, AMLI, and F(1,1) cycle with simple relaxation.
 
         Cycle complexity is an approximate measure of the number of
@@ -185,6 +241,10 @@ class multilevel_solver:
         ----------
         cycle : {'V','W','F','AMLI'}
             Type of multigrid cycle to perform in each iteration.
+        coarse_solve : bool
+            If True, then each coarse solve is counted by its estimated
+            cost, see coarse_solve_complexity, instead of by the number of
+            nonzeros of the matrix on the coarsest level.
 
         Returns
         -------
@@ -210,6 +270,9 @@ class multilevel_solver:
         cycle = str(cycle).upper()
 
         nnz = [level.A.nnz for level in self.levels]
+        nnz0 = nnz[0]
+        if coarse_solve:
+            nnz[-1] = _coarse_solve_cost(self.levels[-1].A, self.coarse_solver)
 
         def V(level):
             if len(self.levels) == 1:
@@ -244,7 +307,39 @@ class multilevel_solver:
         else:
             raise TypeError('Unrecognized cycle type (%s)' % cycle)
 
-        return float(flops) / float(nnz[0])
+        return float(flops) / float(nnz0)
+
+    def coarse_solve_complexity(self):
+        """Estimated cost of one coarse solve, relative to the finest level.
+
+        Defined as (W_solve + W_setup / 10) / F_0, where W_solve and W_setup
+        are the estimated multiply-adds of one application and of the setup
+        (factorization) of the coarse solver on the coarsest level, and F_0
+        is the number of nonzeros in the matrix on the finest level.
+
+        Notes
+        -----
+        Dense factorizations are counted by their operation counts, e.g.,
+        n^3/3 and n^2 for the setup and the application of 'lu', and 10 n^3
+        for the SVD of 'pinv2'.  Sparse LU factorizations ('splu' and
+        'direct' for sparse A) are counted by the nonzeros of their factors.
+        This is the estimate that max_coarse='auto' of the solvers minimizes
+        together with the smoothing on the finer levels.  It is included in
+        cycle_complexity with coarse_solve=True.
+
+        Examples
+        --------
+        >>> from pyamg import smoothed_aggregation_solver
+        >>> from pyamg.gallery import poisson
+        >>> A = poisson((100, 100), format='csr')
+        >>> ml = smoothed_aggregation_solver(A, max_coarse='auto',
+        ...                                  coarse_solver='splu')
+        >>> cc = ml.cycle_complexity(coarse_solve=True)
+        >>> cs = ml.coarse_solve_complexity()
+
+        """
+        return _coarse_solve_cost(self.levels[-1].A, self.coarse_solver) /\
+            float(self.levels[0].A.nnz)
 
     def operator_complexity(self):
         """Operator complexity of this multigrid hierarchy.
@@ -313,7 +408,13 @@ class multilevel_solver:
         def matvec(b):
             return self.solve(b, maxiter=1, cycle=cycle, tol=1e-12)
 
-        return LinearOperator(shape, matvec, dtype=dtype)
+        # A block of vectors is preconditioned with one cycle on all columns,
+        # except for AMLI, which falls back to LinearOperator's column loop
+        kwargs = {}
+        if str(cycle).upper() != 'AMLI':
+            kwargs['matmat'] = matvec
+
+        return LinearOperator(shape, matvec, dtype=dtype, **kwargs)
 
     def solve(self, b, x0=None, tol=1e-5, maxiter=100, cycle='V', accel=None,
               callback=None, residuals=None, return_residuals=False):
@@ -322,9 +423,9 @@ class multilevel_solver:
         Parameters
         ----------
         b : array
-            Right hand side.
+            Right hand side, or an (n,k) array of k right-hand sides.
         x0 : array
-            Initial guess.
+            Initial guess, same shape as b.
         tol : float
             Stopping criteria: relative residual r[k]/r[0] tolerance.
         maxiter : int
@@ -341,13 +442,25 @@ class multilevel_solver:
             User-defined function called after each iteration.  It is
             called as callback(xk) where xk is the k-th iterate vector.
         residuals : list
-            List to contain residual norms at each iteration.
+            List to contain residual norms at each iteration.  For a block
+            of right-hand sides, each entry is the array of column norms.
 
         Returns
         -------
         x : array
             Approximate solution to Ax=b
 
+        Notes
+        -----
+        The cycle reuses work vectors that are allocated on the levels during
+        the first solve, so a single hierarchy should not be used by
+        concurrent solves.
+
+        If b has k > 1 columns, all k systems are cycled together, so that
+        each pass of the smoothers and of the transfer operators handles every
+        column.  Cycling continues until every column satisfies the
+        tolerance.  Block solves are not supported with accel or AMLI cycles.
+
         See Also
         --------
         aspreconditioner
@@ -373,6 +486,12 @@ class multilevel_solver:
 
         cycle = str(cycle).upper()
 
+        # b holds a block of right-hand sides
+        block = np.ndim(b) == 2 and np.shape(b)[1] > 1
+        if block and (accel is not None or cycle == 'AMLI'):
+            raise ValueError('multiple right-hand sides are not supported '
+                             'with accel or AMLI cycles')
+
         # AMLI cycles require hermitian matrix
         if (cycle == 'AMLI') and hasattr(self.levels[0].A, 'symmetry'):
             if self.levels[0].A.symmetry != 'hermitian':
@@ -436,6 +555,10 @@ class multilevel_solver:
                 return accel(A, b, x0=x0, tol=tol, maxiter=maxiter, M=M,
                              callback=callback, **kwargs)[0]
 
+        elif block:
+            # Scale tol by the norm of each column of b
+            normb = np.linalg.norm(b, axis=0)
+            tol = tol * np.where(normb != 0, normb, 1)
         else:
             # Scale tol by normb
             # Don't scale tol earlier. The accel routine should also scale tol
@@ -457,23 +580,41 @@ class multilevel_solver:
         from pyamg.util.utils import to_type
         tp = upcast(b.dtype, x.dtype, self.levels[0].A.dtype)
         [b, x] = to_type(tp, [b, x])
-        b = np.ravel(b)
-        x = np.ravel(x)
+        if block:
+            b = np.ascontiguousarray(b)
+            x = np.ascontiguousarray(x).reshape(b.shape)
+            k = b.shape[1]
+
+            def resnorm(r):
+                return np.linalg.norm(r, axis=0)
+        else:
+            b = np.ravel(b)
+            x = np.ravel(x)
+            k = 1
+            resnorm = norm
 
         A = self.levels[0].A
 
-        residuals.append(residual_norm(A, x, b))
+        # Per-level work vectors are allocated once and reused by every cycle
+        self._allocate_work(tp, k)
+        r = self.levels[0].work_r
+
+        _residual(A, x, b, r)
+        residuals.append(resnorm(r))
 
         self.first_pass = True
 
-        while len(residuals) <= maxiter and residuals[-1] > tol:
+        while len(residuals) <= maxiter and np.any(residuals[-1] > tol):
             if len(self.levels) == 1:
                 # hierarchy has only 1 level
+                timer = _make_timer(self.profile, 'solve', 0)
                 x = self.coarse_solver(A, b)
+                timer.lap('coarse_solve', A, k=k)
             else:
                 self.__solve(0, x, b, cycle)
 
-            residuals.append(residual_norm(A, x, b))
+            _residual(A, x, b, r)
+            residuals.append(resnorm(r))
 
             self.first_pass = False
 
@@ -485,6 +626,263 @@ class multilevel_solver:
         else:
             return x
 
+    def update(self, A, reuse='interpolation'):
+        """Update the hierarchy for a new matrix with the same sparsity.
+
+        The coarsening of the hierarchy is kept and only the numerical
+        values are recomputed: the Galerkin products R*A*P on each level,
+        reusing their sparsity patterns if P and R are kept, the data of the
+        smoothers, e.g., diagonals, spectral radii and block inverses, and the
+        factorization of the coarse solver.
+
+        Parameters
+        ----------
+        A : {csr_matrix, bsr_matrix}
+            New matrix of the finest level, with the same shape and sparsity
+            pattern as levels[0].A
+        reuse : {'interpolation', 'aggregation'}
+            If 'interpolation', then P and R are kept on all levels.  If
+            'aggregation', then the aggregates (or the C/F splitting) are kept,
+            and P and R are recomputed with the new operators.
+
+        Returns
+        -------
+        Nothing, the hierarchy is updated in place.
+
+        Notes
+        -----
+        reuse='aggregation' requires the hierarchy to be built with keep=True,
+        so that the strength of connection (C) and the aggregation (AggOp) or
+        the C/F splitting are stored on the levels.  Strength of connection
+        and near null-space modes are not recomputed.
+
+        The smoothers are set up again with the arguments of the last call to
+        change_smoothers.  Spectral radius estimates, e.g., of the Jacobi
+        smoothers, are recomputed, starting from the eigenvectors estimated
+        for the old operators.
+
+        The truncation and sparsification settings chosen during the setup
+        (see the sparsify option of the solvers) are applied again with the
+        new operators; for sparsified coarse operators the pattern of R*A*P
+        is then computed from scratch.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from pyamg import smoothed_aggregation_solver
+        >>> from pyamg.gallery import poisson
+        >>> A = poisson((100, 100), format='csr')
+        >>> b = np.ones(A.shape[0])
+        >>> ml = smoothed_aggregation_solver(A, keep=True)
+        >>> x = ml.solve(b, tol=1e-8)
+        >>> ml.update(2.0 * A, reuse='aggregation')
+        >>> x = ml.solve(b, tol=1e-8)
+
+        """
+        if reuse not in ['interpolation', 'aggregation']:
+            raise ValueError('expected \'interpolation\' or \'aggregation\' '
+                             'for reuse')
+
+        A_old = self.levels[0].A
+        if A.shape != A_old.shape:
+            raise ValueError('expected matrix of shape %s' % str(A_old.shape))
+        if sp.sparse.isspmatrix_bsr(A_old):
+            A = A.tobsr(blocksize=A_old.blocksize)
+        else:
+            A = A.asformat(A_old.format)
+        A = A.asfptype()
+        if hasattr(A_old, 'symmetry') and not hasattr(A, 'symmetry'):
+            A.symmetry = A_old.symmetry
+
+        for n, level in enumerate(self.levels):
+            # spectral radius estimates for A start from those of the old A
+            _transfer_spectral_radius(level.A, A)
+            level.A = A
+            # copies of the old A made by the smoothers, see matrix_asformat,
+            # and the old R and P, see _restriction_transpose
+            for name in list(vars(level)):
+                if (name in ('Acsr', 'Acsc', 'AHcsr', 'R_is_PT') or
+                        name.startswith('Absr')):
+                    delattr(level, name)
+            if n == len(self.levels) - 1:
+                break
+
+            sparsify = getattr(level, 'sparsify', None) or {}
+            Bc = getattr(self.levels[n+1], 'B', None)
+            if reuse == 'aggregation':
+                level.P, level.R = _update_interpolation(level, A)
+                level.P, level.R = _truncate_transfer(
+                    A, level.P, level.R, sparsify, Bc,
+                    getattr(self.levels[n+1], 'BH', None))
+
+            # with P and R kept, the pattern of the coarse operator is too
+            symmetry = getattr(A, 'symmetry', None)
+            hermitian = (symmetry == 'hermitian')
+            try:
+                pattern = None
+                if reuse == 'interpolation':
+                    pattern = self.levels[n+1].A
+                A = galerkin_product(A, level.P, level.R, hermitian=hermitian,
+                                     pattern=pattern)
+            except ValueError:
+                A = galerkin_product(A, level.P, level.R, hermitian=hermitian)
+            level.R = _restriction(level.A, level.P, level.R)
+            A = _sparsify_coarse(A, sparsify)
+            if symmetry is not None:
+                A.symmetry = symmetry
+
+        self._set_precision()
+
+        # the symbolic analysis of the coarse solver is kept
+        self.coarse_solver.refactor()
+
+        if hasattr(self, 'smoother_config'):
+            from pyamg.relaxation.smoothing import change_smoothers
+            change_smoothers(self, **self.smoother_config)
+
+    def save(self, path):
+        """Save the multigrid hierarchy to a directory.
+
+        Parameters
+        ----------
+        path : string
+            Directory for the hierarchy, created if it does not exist
+
+        Returns
+        -------
+        Nothing, the hierarchy is written to path.
+
+        Notes
+        -----
+        Each array is written to its own uncompressed .npy file, so that
+        load_hierarchy can memory-map the operators.  The file
+        hierarchy.json lists the arrays of each level together with the
+        format version, the coarse solver and the smoother configuration.
+
+        Saved are A, P, R and, if present, B, BH, C, T, AggOp and splitting
+        of each level, the spectral radii stored with the operators, the
+        factorization of the 'pinv', 'pinv2', 'lu' and 'cholesky' coarse
+        solvers, and the arguments of the last call to change_smoothers.
+        Hierarchies built with keep=True also keep the root nodes and the
+        prolongation smoother, interpolation and sparsify settings of each
+        level, so that the loaded hierarchy supports update.
+        The smoothers are set up again by load_hierarchy.  Other coarse
+        solvers, e.g., 'splu', factor the coarse matrix again on first use.
+
+        Callable coarse solvers or smoother arguments other than strings,
+        numbers and arrays cannot be saved and raise ValueError.
+
+        Examples
+        --------
+        >>> import tempfile
+        >>> from pyamg import smoothed_aggregation_solver, load_hierarchy
+        >>> from pyamg.gallery import poisson
+        >>> A = poisson((100, 100), format='csr')
+        >>> ml = smoothed_aggregation_solver(A)
+        >>> path = tempfile.mkdtemp()
+        >>> ml.save(path)
+        >>> ml2 = load_hierarchy(path, mmap=True)
+
+        """
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        def store(name, array):
+            filename = name + '.npy'
+            np.save(os.path.join(path, filename), array, allow_pickle=False)
+            return filename
+
+        levels = []
+        for n, level in enumerate(self.levels):
+            entry = {}
+            for name in _saved_level_attributes + _saved_level_settings:
+                if hasattr(level, name):
+                    entry[name] = _encode(getattr(level, name),
+                                          'level%d_%s' % (n, name), store)
+            levels.append(entry)
+
+        solver = self.coarse_solver
+        if not hasattr(solver, 'method') or callable(solver.method):
+            raise ValueError('coarse solver %s cannot be saved' % solver)
+        coarse = {'method': solver.method,
+                  'kwargs': _encode(solver.kwargs, 'coarse_kwargs', store)}
+        factor = _coarse_factors.get(solver.method)
+        if factor is not None:
+            A = self.levels[-1].A
+            solver(A, np.zeros(A.shape[0], dtype=A.dtype))
+            if hasattr(solver, factor):
+                coarse['factor'] = _encode(getattr(solver, factor),
+                                           'coarse_' + factor, store)
+
+        smoothers = None
+        if hasattr(self, 'smoother_config'):
+            smoothers = {}
+            for name in ['presmoother', 'postsmoother']:
+                config = self.smoother_config[name]
+                if not isinstance(config, list):
+                    config = [config]
+                config = [_unpack_smoother(c) for c in config]
+                smoothers[name] = _encode(config, name, store)
+
+        manifest = {'format': 'pyamg.multilevel_solver',
+                    'version': HIERARCHY_VERSION,
+                    'levels': levels,
+                    'coarse_solver': coarse,
+                    'smoothers': smoothers,
+                    'precision': self.precision}
+
+        with open(os.path.join(path, 'hierarchy.json'), 'w') as f:
+            json.dump(manifest, f, indent=1)
+
+    def _set_precision(self):
+        """Round P, R and the coarse operators for precision='mixed'."""
+        if self.precision != 'mixed':
+            return
+        for n, level in enumerate(self.levels):
+            if n > 0:
+                level.A = _to_single_precision(level.A)
+            if n < len(self.levels) - 1:
+                level.P = _to_single_precision(level.P)
+                level.R = _to_single_precision(level.R)
+
+    def _allocate_work(self, dtype, k=1):
+        """Allocate the work vectors used by the multigrid cycle.
+
+        Each level receives a residual vector, work_r, and each coarse level
+        receives a right-hand side, work_b, and a solution, work_x.  The
+        vectors are kept on the levels, so that repeated solves with the same
+        hierarchy reuse them instead of allocating on every cycle.  The vectors
+        are only reallocated if the dtype or the hierarchy changes.  For a
+        mixed precision hierarchy, the vectors of the coarse levels are single
+        precision.
+
+        Parameters
+        ----------
+        dtype : dtype
+            Data type of the vectors in the cycle
+        k : int
+            Number of right-hand sides.  For k > 1, the work vectors are
+            C-contiguous (n,k) arrays.
+
+        """
+        dtype = np.dtype(dtype)
+        coarse_dtype = dtype
+        if self.precision == 'mixed':
+            coarse_dtype = _single_precision(dtype)
+        for n, level in enumerate(self.levels):
+            size = (level.A.shape[0],) if k == 1 else (level.A.shape[0], k)
+            if n == 0 or n < len(self.levels) - 1:
+                work = ['work_r']
+            else:
+                work = []
+            if n > 0:
+                work += ['work_b', 'work_x']
+            for name in work:
+                v = getattr(level, name, None)
+                tp = dtype if name == 'work_r' and n == 0 else coarse_dtype
+                if v is None or v.dtype != tp or v.shape != size:
+                    setattr(level, name, np.empty(size, dtype=tp))
+
     def __solve(self, lvl, x, b, cycle):
         """Multigrid cycling.
 
@@ -506,16 +904,22 @@ class multilevel_solver:
 
         """
         A = self.levels[lvl].A
+        k = 1 if b.ndim == 1 else b.shape[1]
+        timer = _make_timer(self.profile, 'solve', lvl)
 
         self.levels[lvl].presmoother(A, x, b)
+        timer.lap('presmooth', A, k=k)
 
-        residual = b - A * x
-
-        coarse_b = self.levels[lvl].R * residual
-        coarse_x = np.zeros_like(coarse_b)
+        coarse_b = self.levels[lvl + 1].work_b
+        coarse_b.fill(0)
+        _residual_restrict(self.levels[lvl], x, b, coarse_b)
+        coarse_x = self.levels[lvl + 1].work_x
+        coarse_x.fill(0)
+        timer.lap('restrict', A, self.levels[lvl].R, k=k)
 
         if lvl == len(self.levels) - 2:
             coarse_x[:] = self.coarse_solver(self.levels[-1].A, coarse_b)
+            timer.lap('coarse_solve', self.levels[-1].A, k=k, level=lvl + 1)
         else:
             if cycle == 'V':
                 self.__solve(lvl + 1, coarse_x, coarse_b, 'V')
@@ -557,9 +961,915 @@ class multilevel_solver:
             else:
                 raise TypeError('Unrecognized cycle type (%s)' % cycle)
 
-        x += self.levels[lvl].P * coarse_x   # coarse grid correction
+        # the coarser levels record their own phases
+        timer.restart()
+
+        _matvec(self.levels[lvl].P, coarse_x, x)   # coarse grid correction
+        timer.lap('interpolate', self.levels[lvl].P, k=k)
 
         self.levels[lvl].postsmoother(A, x, b)
+        timer.lap('postsmooth', A, k=k)
+
+
+class multilevel_profile:
+    """Timings and cost estimates of the phases of setup and solve.
+
+    For each level, the wall time, the number of calls, and an estimate of
+    the work of each phase of the setup (e.g., 'strength', 'aggregation',
+    'galerkin') and of the cycle (e.g., 'presmooth', 'restrict',
+    'coarse_solve') are accumulated.  Profiling is off by default; it is
+    enabled with profile=True in the solvers, e.g.,
+    smoothed_aggregation_solver, or in multilevel_solver.
+
+    Attributes
+    ----------
+    records : dict
+        Maps (stage, level, phase), where stage is 'setup' or 'solve', to a
+        dict with the keys 'time' (seconds), 'calls', 'nnz', 'flops' and
+        'bytes'.  nnz is the number of nonzeros of the operators of the phase,
+        flops and bytes are accumulated over the calls.
+
+    Notes
+    -----
+    flops are estimated as two per nonzero of each operator of the phase and
+    per vector, i.e., one sparse matrix-vector product, and bytes as the
+    storage of the operators.  Thus, a smoother with several sweeps counts as
+    one sweep.  The coarse solve on the coarsest level includes the
+    factorization of the coarse solver, which is computed on first use.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pyamg import smoothed_aggregation_solver
+    >>> from pyamg.gallery import poisson
+    >>> A = poisson((100, 100), format='csr')
+    >>> ml = smoothed_aggregation_solver(A, profile=True)
+    >>> x = ml.solve(np.ones(A.shape[0]), tol=1e-8)
+    >>> setup = ml.profile.table('setup')   # string to print
+    >>> t = ml.profile.records['solve', 0, 'presmooth']['time']
+
+    """
+
+    def __init__(self):
+        """Create an empty profile."""
+        self.records = {}
+
+    def add(self, stage, level, phase, time, nnz=0, flops=0, bytes=0):
+        """Record one call of a phase.
+
+        Parameters
+        ----------
+        stage : {'setup', 'solve'}
+            Stage of the phase
+        level : int
+            Level of the hierarchy
+        phase : string
+            Name of the phase, e.g., 'presmooth'
+        time : float
+            Wall time of the call in seconds
+        nnz, flops, bytes : int
+            Nonzeros of the operators, and estimated work and memory traffic
+            of the call
+
+        """
+        key = (stage, level, phase)
+        record = self.records.get(key)
+        if record is None:
+            record = {'time': 0.0, 'calls': 0, 'nnz': 0, 'flops': 0,
+                      'bytes': 0}
+            self.records[key] = record
+        record['time'] += time
+        record['calls'] += 1
+        record['nnz'] = nnz
+        record['flops'] += flops
+        record['bytes'] += bytes
+
+    def timer(self, stage, level):
+        """Return a timer that records the phases of one level."""
+        return _phase_timer(self, stage, level)
+
+    def reset(self, stage=None):
+        """Remove the records of a stage, or all records if stage is None."""
+        if stage is None:
+            self.records.clear()
+        else:
+            for key in [key for key in self.records if key[0] == stage]:
+                del self.records[key]
+
+    def total(self, stage, phase=None):
+        """Total time of a stage, or of one phase of the stage, in seconds."""
+        return sum([r['time'] for (s, lvl, ph), r in self.records.items()
+                    if s == stage and (phase is None or ph == phase)])
+
+    def table(self, stage=None):
+        """Tabulate the records by level and phase.
+
+        Parameters
+        ----------
+        stage : {None, 'setup', 'solve'}
+            Stage to tabulate, or both stages if None
+
+        Returns
+        -------
+        string representing the table, see pyamg.util.utils.print_table
+
+        """
+        if stage is None:
+            return ''.join([self.table(s) for s in ['setup', 'solve']])
+
+        rows = [['level', 'phase', 'calls', 'time [s]', '%', 'nnz',
+                 'MFLOP', 'MFLOP/s', 'MB']]
+        total = self.total(stage)
+        keys = [key for key in self.records if key[0] == stage]
+        # the phases of a level are kept in the order of the first call
+        for key in sorted(keys, key=lambda key: key[1]):
+            r = self.records[key]
+            rate = r['flops'] / r['time'] / 1e6 if r['time'] > 0 else 0.0
+            share = 100 * r['time'] / total if total > 0 else 0.0
+            rows.append(['%d' % key[1], key[2], '%d' % r['calls'],
+                         '%.4f' % r['time'], '%.1f' % share, '%d' % r['nnz'],
+                         '%.2f' % (r['flops'] / 1e6), '%.1f' % rate,
+                         '%.2f' % (r['bytes'] / 1e6)])
+        rows.append(['', 'total', '', '%.4f' % total, '', '', '', '', ''])
+
+        return print_table(rows, title=stage)
+
+    def __repr__(self):
+        """Print the records of setup and solve."""
+        return self.table()
+
+
+class _phase_timer:
+    """Record consecutive phases on one level of a multilevel_profile."""
+
+    def __init__(self, profile, stage, level):
+        self.profile = profile
+        self.stage = stage
+        self.level = level
+        self.start = default_timer()
+
+    def restart(self):
+        """Restart the clock, e.g., to exclude the work of other levels."""
+        self.start = default_timer()
+
+    def lap(self, phase, *operators, **kwargs):
+        """Record the time since the last lap as a phase.
+
+        The operators of the phase define nnz, and flops and bytes unless
+        these are given as keyword arguments.  The keyword k is the number
+        of vectors, and level overrides the level of the timer.
+
+        """
+        time = default_timer() - self.start
+        k = kwargs.get('k', 1)
+        nnz = sum([getattr(M, 'nnz', 0) for M in operators])
+        flops = kwargs.get('flops', 2 * nnz * k)
+        nbytes = kwargs.get('bytes', sum([_storage(M) for M in operators]))
+        self.profile.add(self.stage, kwargs.get('level', self.level), phase,
+                         time, nnz=nnz, flops=flops, bytes=nbytes)
+        self.start = default_timer()
+
+
+class _no_timer:
+    """Stand-in for _phase_timer if profiling is disabled."""
+
+    def restart(self):
+        pass
+
+    def lap(self, phase, *operators, **kwargs):
+        pass
+
+
+_NO_TIMER = _no_timer()
+
+
+def _make_profile(profile):
+    """Return a multilevel_profile for profile=True, or None if disabled."""
+    if profile is None or profile is False:
+        return None
+    if profile is True:
+        return multilevel_profile()
+    if isinstance(profile, multilevel_profile):
+        return profile
+    raise ValueError('expected a bool or a multilevel_profile for profile')
+
+
+def _make_timer(profile, stage, level):
+    """Return a timer of the profile, which does nothing if profile is None."""
+    if profile is None:
+        return _NO_TIMER
+    return profile.timer(stage, level)
+
+
+def _galerkin_flops(A, P, R):
+    """Estimate the flops of R*A*P from the average nonzeros per row."""
+    p = float(P.nnz) / max(P.shape[0], 1)       # nonzeros per row of P
+    ap = A.nnz * p / max(A.shape[0], 1)         # nonzeros per row of A*P
+    return int(2 * A.nnz * p + 2 * R.nnz * ap)
+
+
+# Settings tried in turn by _sparsify_level for a target operator complexity
+_SPARSIFY_SCHEDULE = [{'theta': 0.05},
+                      {'trunc_factor': 0.05, 'theta': 0.1},
+                      {'trunc_factor': 0.1, 'max_elements': 6, 'theta': 0.1},
+                      {'trunc_factor': 0.2, 'max_elements': 5, 'theta': 0.2},
+                      {'trunc_factor': 0.2, 'max_elements': 4, 'theta': 0.2}]
+
+
+def _levelize_sparsify(sparsify, max_levels):
+    """Return the sparsify option of each level, see _sparsify_level."""
+    if not isinstance(sparsify, list):
+        sparsify = [sparsify]
+    sparsify = list(sparsify)
+    sparsify.extend(sparsify[-1:] * (max_levels - len(sparsify)))
+    return sparsify
+
+
+def _truncate_transfer(A, P, R, sparsify, Bc=None, BHc=None):
+    """Truncate P, preserving P*Bc, and truncate R accordingly.
+
+    R is None for R = P.H or P.T, see _restriction, and stays None.
+    """
+    trunc_factor = sparsify.get('trunc_factor', 0.0)
+    max_elements = sparsify.get('max_elements', 0)
+    if trunc_factor == 0 and max_elements <= 0:
+        return P, R
+
+    P = truncate_interpolation(P, trunc_factor, max_elements, Bc)
+    if R is not None:
+        R = truncate_interpolation(R.H.asformat(P.format), trunc_factor,
+                                   max_elements, BHc).H
+    return P, R
+
+
+def _restriction(A, P, R):
+    """Return R, or R = P.H for Hermitian A and R = P.T otherwise."""
+    if R is not None:
+        return R
+    if getattr(A, 'symmetry', None) == 'hermitian':
+        return P.H.asformat(P.format)
+    return P.T.asformat(P.format)
+
+
+def _sparsify_coarse(Ac, sparsify):
+    """Drop the small entries of the coarse operator, preserving row sums."""
+    theta = sparsify.get('theta', 0.0)
+    if theta <= 0:
+        return Ac
+    return sparsify_operator(Ac, theta)
+
+
+def _sparsify_level(levels, P, R, sparsify, Bc=None, BHc=None):
+    """Truncate P and R of the last level and form the coarse operator.
+
+    If R is None, the coarse operator is computed as P.H*A*P (or P.T*A*P),
+    see galerkin_product, and R is formed afterwards, see _restriction.
+    sparsify is None or a dict with the optional entries trunc_factor and
+    max_elements, see truncate_interpolation, theta, see sparsify_operator,
+    and target.  For a target operator complexity, the settings of
+    _SPARSIFY_SCHEDULE, combined with the given ones, are tried in turn until
+    the operator complexity fits.  It is estimated from the levels so far,
+    assuming that the nonzeros of the remaining levels decrease geometrically
+    with the coarsening ratio (in rows) of this level.
+
+    Returns P, R, the coarse operator and the settings used, or None.
+    """
+    A = levels[-1].A
+    hermitian = getattr(A, 'symmetry', None) == 'hermitian'
+    if not sparsify:
+        Ac = galerkin_product(A, P, R, hermitian=hermitian)
+        return P, _restriction(A, P, R), Ac, None
+
+    sparsify = dict(sparsify)
+    target = sparsify.pop('target', None)
+    candidates = [sparsify]
+    if target is not None:
+        budget = target * levels[0].A.nnz - sum(lvl.A.nnz for lvl in levels)
+        for step in _SPARSIFY_SCHEDULE:
+            settings = dict(sparsify)
+            for key in ['trunc_factor', 'theta']:
+                settings[key] = max(sparsify.get(key, 0.0), step.get(key, 0.0))
+            max_elements = [m for m in [sparsify.get('max_elements', 0),
+                                        step.get('max_elements', 0)] if m > 0]
+            settings['max_elements'] = min(max_elements or [0])
+            candidates.append(settings)
+
+    for settings in candidates:
+        Pc, Rc = _truncate_transfer(A, P, R, settings, Bc, BHc)
+        Ac = _sparsify_coarse(galerkin_product(A, Pc, Rc,
+                                               hermitian=hermitian), settings)
+        if target is None:
+            break
+        ratio = float(Ac.shape[0]) / A.shape[0]
+        if ratio < 1 and Ac.nnz / (1.0 - ratio) <= budget:
+            break
+
+    return Pc, _restriction(A, Pc, Rc), Ac, settings
+
+
+# Number of cycles over which the setup of the coarse solver is amortized in
+# the cost estimates of the coarse solve
+_COARSE_SETUP_CYCLES = 10
+
+# Largest operator, in nonzeros, that is factored to estimate the cost of a
+# sparse LU coarse solve; larger operators are never chosen as coarsest level
+_MAX_SPARSE_ESTIMATE = 100000
+
+# Smallest coarsest level, in rows (nodes), for max_coarse='auto'
+_MIN_COARSE = 10
+
+
+def _coarse_solve_work(A, solver):
+    """Estimate the work of the setup and of one coarse solve.
+
+    The work is counted in multiply-adds, so that a product with A costs
+    A.nnz.  Dense factorizations are counted by their usual operation counts,
+    sparse LU factorizations by the nonzeros of the factors of A.  Krylov
+    coarse solvers are assumed to take 100 iterations.
+    """
+    if isinstance(solver, tuple):
+        method, kwargs = solver
+    else:
+        method = getattr(solver, 'method', solver)
+        kwargs = getattr(solver, 'kwargs', {})
+    n = float(A.shape[0])
+
+    if method == 'direct':
+        dense_size = kwargs.get('dense_size', 100)
+        dense_density = kwargs.get('dense_density', 0.1)
+        if n <= dense_size or A.nnz >= dense_density * n * n:
+            hermitian = getattr(A, 'symmetry', None) in ['hermitian',
+                                                         'symmetric']
+            method = 'cholesky' if hermitian else 'lu'
+        else:
+            method = 'splu'
+
+    if method in ['pinv', 'pinv2']:
+        return 10 * n**3, n**2
+    elif method == 'lu':
+        return n**3 / 3, n**2
+    elif method == 'cholesky':
+        return n**3 / 6, n**2
+    elif method == 'splu':
+        if A.nnz > _MAX_SPARSE_ESTIMATE:
+            return np.inf, np.inf
+        try:
+            LU = _sparse_lu(A)[1]
+        except RuntimeError:
+            return 10 * n**3, n**2
+        # right-looking elimination of column j updates a (column count of
+        # L) x (row count of U) block
+        L, U = LU.L.tocsc(), LU.U.tocsr()
+        setup = np.dot(np.diff(L.indptr) - 1, np.diff(U.indptr) - 1)
+        return float(setup), float(L.nnz + U.nnz)
+    elif method in ['bicg', 'bicgstab', 'cg', 'cgs', 'gmres', 'qmr',
+                    'minres']:
+        return 0.0, kwargs.get('maxiter', 100) * (A.nnz + 5 * n)
+    elif method in ['gauss_seidel', 'jacobi', 'block_gauss_seidel', 'schwarz',
+                    'block_jacobi', 'richardson', 'sor', 'chebyshev',
+                    'jacobi_ne', 'gauss_seidel_ne', 'gauss_seidel_nr',
+                    'multicolor_gauss_seidel', 'l1_jacobi',
+                    'l1_gauss_seidel', 'ilu0', 'ic0']:
+        sweeps = 2 if kwargs.get('sweep') == 'symmetric' else 1
+        return 0.0, kwargs.get('iterations', 10) * sweeps * float(A.nnz)
+    elif method is None:
+        return 0.0, 0.0
+    return 0.0, float(A.nnz)
+
+
+def _coarse_solve_cost(A, solver):
+    """Work of one coarse solve with A, including a share of its setup."""
+    setup, solve = _coarse_solve_work(A, solver)
+    return solve + setup / _COARSE_SETUP_CYCLES
+
+
+class _coarsest_level:
+    """Decide where coarsening stops, for an integer or 'auto' max_coarse.
+
+    For max_coarse='auto', coarsening continues while a coarse solve with the
+    last operator costs more than the work that another level adds to a
+    V-cycle on the last level, i.e., the pre- and post-smoothing and the
+    residual (3 A.nnz), and while more than _MIN_COARSE rows (nodes) remain.
+    It stops as soon as the estimated cost of a V-cycle, i.e., the smoothing,
+    residual and transfer work on the finer levels plus one coarse solve with
+    the last operator, starts rising.  select then cuts the hierarchy at the
+    level with the lowest estimate, i.e., drops at most the last level.
+    """
+
+    def __init__(self, max_coarse, coarse_solver):
+        self.max_coarse = max_coarse
+        self.coarse_solver = coarse_solver
+        self.costs = []
+
+    def cycle_cost(self, levels):
+        """Estimate the work of a V-cycle with levels[-1] as coarsest level."""
+        n = len(levels) - 1
+        if n == len(self.costs):
+            self.costs.append(_coarse_solve_cost(levels[n].A,
+                                                 self.coarse_solver))
+        work = 0
+        for level in levels[:-1]:
+            work += 3 * level.A.nnz + level.P.nnz + \
+                getattr(level, 'R', level.P).nnz
+        return work + self.costs[n]
+
+    def coarsen_further(self, levels, size=None):
+        """Return True if levels[-1].A is too large to be the coarsest."""
+        A = levels[-1].A
+        if size is None:
+            size = A.shape[0]
+        if self.max_coarse != 'auto':
+            return size > self.max_coarse
+
+        cost = self.cycle_cost(levels)
+        if len(levels) > 1 and cost > self.cycle_cost(levels[:-1]):
+            # the estimate started rising, levels[-2] is a cheaper coarsest
+            return False
+        return size > _MIN_COARSE and self.costs[-1] > 3 * A.nnz
+
+    def select(self, levels, store=None):
+        """Return the levels down to the cheapest coarsest level.
+
+        If the operators were moved to the directory store, see _store_level,
+        the files of the dropped levels are removed.
+        """
+        if self.max_coarse != 'auto' or len(levels) == 1:
+            return levels
+
+        cost = [self.cycle_cost(levels[:n+1]) for n in range(len(levels))]
+        k = int(np.argmin(cost))
+        if k == len(levels) - 1:
+            return levels
+
+        coarse = multilevel_solver.level()
+        for name in ['A', 'B', 'BH']:
+            if hasattr(levels[k], name):
+                setattr(coarse, name, getattr(levels[k], name))
+        if store is not None:
+            _remove_stored_levels(store, k, ['A', 'B', 'BH'])
+        return levels[:k] + [coarse]
+
+
+def _remove_stored_levels(path, k, keep):
+    """Remove the files written by _store_level for the levels after k.
+
+    The files of level k are removed, too, except those of the attributes in
+    keep, which remain memory-mapped by the coarsest level.
+    """
+    for filename in os.listdir(path):
+        match = re.match(r'level(\d+)_(.+)\.npy$', filename)
+        if match is None or int(match.group(1)) < k:
+            continue
+        name = match.group(2)
+        if int(match.group(1)) == k and \
+                any(name == a or name.startswith(a + '_') for a in keep):
+            continue
+        os.remove(os.path.join(path, filename))
+
+
+def _single_precision(dtype):
+    """Return float32 or complex64 for a floating point dtype."""
+    if np.dtype(dtype).kind == 'c':
+        return np.dtype(np.complex64)
+    return np.dtype(np.float32)
+
+
+def _to_single_precision(M):
+    """Return M rounded to single precision, keeping scalar attributes."""
+    dtype = _single_precision(M.dtype)
+    if M.dtype == dtype or not sp.sparse.isspmatrix(M):
+        return M
+    S = M.astype(dtype)
+    for name, value in M.__dict__.items():
+        if name not in S.__dict__ and (np.isscalar(value) or value is None):
+            setattr(S, name, value)
+    return S
+
+
+def _storage(M):
+    """Bytes of the data and index arrays of a sparse matrix."""
+    return sum([getattr(M, name).nbytes for name in ['data', 'indices',
+                                                     'indptr']
+                if hasattr(M, name)])
+
+
+def _restriction_transpose(level):
+    """Return level.P if level.R is its transpose, otherwise None.
+
+    This is the case for R = P.T, and for R = P.H with real P, see
+    _restriction.  The rows of R must have sorted indices, so that the
+    fused and the two-pass residual kernels add the same terms in the same
+    order.  The comparison is done once for the current R and P and kept on
+    the level.
+
+    """
+    R, P = level.R, getattr(level, 'P', None)
+    if P is None:
+        return None
+    checked = getattr(level, 'R_is_PT', None)
+    if checked is None or checked[0] is not R or checked[1] is not P:
+        transpose = R.format == P.format and R.dtype == P.dtype and\
+            R.shape == P.shape[::-1] and R.format in ('csr', 'bsr') and\
+            R.has_sorted_indices
+        if transpose and R.format == 'bsr':
+            transpose = R.blocksize == P.blocksize[::-1]
+        transpose = transpose and (R != P.T).nnz == 0
+        checked = (R, P, transpose)
+        level.R_is_PT = checked
+    return P if checked[2] else None
+
+
+def _residual_restrict(level, x, b, coarse_b):
+    """Accumulate coarse_b += R*(b - A*x) in place.
+
+    For CSR and BSR A and R, amg_core computes the restricted residual.
+    With one thread, and if R is the transpose of P, the fused kernel forms
+    the residual one row at a time and scatters it through the rows of P,
+    so the fine residual is never stored.  Otherwise, the two-pass kernel
+    computes the residual in the level's work_r vector and then gathers
+    each entry of coarse_b through a row of R, with both phases split by
+    rows over the threads.  Both kernels give the same result, and R.T is
+    never formed.  For other formats, the residual is computed with
+    _residual and then restricted with _matvec.
+
+    """
+    A, R, residual = level.A, level.R, level.work_r
+    kernel = R.dtype == A.dtype and A.format != 'csc' and\
+        _has_kernel(A, x) and _has_kernel(A, b) and\
+        _has_kernel(A, residual) and _has_kernel(R, coarse_b) and\
+        R.format != 'csc'
+    if kernel:
+        index_dtype = _index_dtype(A, R)
+        Ap, Aj, Ax, (RA, CA) = _galerkin_blocks(A, index_dtype)
+        Rp, Rj, Rx, (D, RB) = _galerkin_blocks(R, index_dtype)
+        kernel = (RB == RA)
+
+    if not kernel:
+        _residual(A, x, b, residual)
+        if residual.dtype != coarse_b.dtype:
+            # mixed precision: the residual is rounded before the transfer
+            residual = residual.astype(coarse_b.dtype)
+        _matvec(R, residual, coarse_b)
+        return
+
+    k, num_threads = _columns(x), get_num_threads()
+    P = _restriction_transpose(level) if num_threads == 1 else None
+    if P is not None:
+        index_dtype = _index_dtype(A, P)
+        Ap, Aj, Ax, _ = _galerkin_blocks(A, index_dtype)
+        Pp, Pj, Px, _ = _galerkin_blocks(P, index_dtype)
+        if RA == CA == D == 1:
+            amg_core.csr_residual_restrict(A.shape[0], A.shape[1],
+                                           Ap, Aj, Ax, np.ravel(x),
+                                           np.ravel(b), Pp, Pj, Px,
+                                           np.ravel(coarse_b), k)
+        else:
+            amg_core.bsr_residual_restrict(int(A.shape[0]/RA),
+                                           int(A.shape[1]/CA), RA, CA, D,
+                                           Ap, Aj, Ax, np.ravel(x),
+                                           np.ravel(b), Pp, Pj, Px,
+                                           np.ravel(coarse_b), k)
+    elif RA == CA == D == 1:
+        amg_core.csr_residual_restrict_gather(
+            A.shape[0], A.shape[1], R.shape[0], Ap, Aj, Ax, np.ravel(x),
+            np.ravel(b), Rp, Rj, Rx, np.ravel(residual), np.ravel(coarse_b),
+            k, num_threads)
+    else:
+        amg_core.bsr_residual_restrict_gather(
+            int(A.shape[0]/RA), int(A.shape[1]/CA), int(R.shape[0]/D),
+            RA, CA, D, Ap, Aj, Ax, np.ravel(x), np.ravel(b), Rp, Rj, Rx,
+            np.ravel(residual), np.ravel(coarse_b), k, num_threads)
+
+
+def _update_interpolation(level, A):
+    """Recompute P and R of level for the matrix A on the kept coarsening.
+
+    Dispatches on the data kept by the solver that built the level, i.e., the
+    C/F splitting for ruge_stuben_solver, the root nodes for rootnode_solver
+    and the aggregates for smoothed_aggregation_solver.  R is None if it is
+    the transpose of P, see _restriction.
+
+    """
+    if hasattr(level, 'splitting') and hasattr(level, 'C'):
+        from pyamg.classical.classical import compute_interpolation
+        P = compute_interpolation(A, level.C, level.splitting,
+                                  getattr(level, 'interpolation', 'direct'))
+        return P, None
+
+    if not (hasattr(level, 'AggOp') and hasattr(level, 'C') and
+            hasattr(level, 'smooth')):
+        raise ValueError('reuse=\'aggregation\' requires a hierarchy built '
+                         'with keep=True')
+
+    from pyamg.aggregation.tentative import fit_candidates
+    nonsymmetric = (A.symmetry == 'nonsymmetric')
+
+    if hasattr(level, 'P_I'):
+        # the coarse modes are injected, see rootnode.extend_hierarchy
+        from pyamg.aggregation.rootnode import smooth_tentative
+        from pyamg.util.utils import scale_T
+        Cpt_params = (True, {'Cpts': level.Cpts, 'Fpts': level.Fpts,
+                             'P_I': level.P_I, 'I_F': level.I_F,
+                             'I_C': level.I_C})
+        args = (level.T, level.C, level.P_I.T * level.B, level.B, Cpt_params,
+                level.smooth)
+        if nonsymmetric:
+            k = level.T.blocksize[1]
+            TH = fit_candidates(level.AggOp, level.BH[:, 0:k])[0]
+            TH = scale_T(TH, level.P_I, level.I_F)
+            args += (TH, level.P_I.T * level.BH, level.BH)
+        return smooth_tentative(A, *args)
+
+    # the near null-space modes of the level may have been improved after
+    # this level was set up, so the coarse modes are fitted again
+    from pyamg.aggregation.aggregation import smooth_tentative
+    T, B = fit_candidates(level.AggOp, level.B)
+    args = (T, level.C, B, level.smooth)
+    if nonsymmetric:
+        args += fit_candidates(level.AggOp, level.BH)
+    return smooth_tentative(A, *args)
+
+
+# Version of the format written by multilevel_solver.save
+HIERARCHY_VERSION = 1
+
+# Level attributes written by multilevel_solver.save
+_saved_level_attributes = ['A', 'P', 'R', 'B', 'BH', 'C', 'T', 'AggOp',
+                           'splitting', 'Cpts', 'Fpts', 'P_I', 'I_F', 'I_C']
+
+# Level settings kept for multilevel_solver.update, also written by save
+_saved_level_settings = ['smooth', 'interpolation', 'sparsify']
+
+# Attributes cached with the operators, e.g., by approximate_spectral_radius
+_saved_matrix_attributes = ['rho', 'rho_D_inv', 'rho_block_D_inv',
+                            'symmetry', 'block_D_inv']
+
+# Prefixes of the cached attributes with a suffix, e.g., rho_ilu0_inv_2
+# for the estimate with 2 sweeps of the triangular solves
+_saved_matrix_prefixes = ('rho_ilu0_inv', 'rho_ic0_inv')
+
+# Attribute holding the factorization of the direct coarse solvers
+_coarse_factors = {'pinv': 'P', 'pinv2': 'P', 'lu': 'LU', 'cholesky': 'L'}
+
+
+def _unpack_smoother(config):
+    """Return a smoother configuration as [method, kwargs]."""
+    if isinstance(config, tuple):
+        return [config[0], config[1]]
+    return [config, {}]
+
+
+def _encode(obj, name, store):
+    """Convert obj to JSON, writing arrays with store(name, array)."""
+    if sp.sparse.isspmatrix(obj):
+        if obj.format not in ('csr', 'csc', 'bsr'):
+            obj = obj.tocsr()
+        entry = {'sparse': obj.format, 'shape': list(obj.shape),
+                 'data': store(name + '_data', obj.data),
+                 'indices': store(name + '_indices', obj.indices),
+                 'indptr': store(name + '_indptr', obj.indptr)}
+        for attr in _matrix_attributes(vars(obj)):
+            entry[attr] = _encode(getattr(obj, attr), name + '_' + attr, store)
+        return entry
+    elif isinstance(obj, np.ndarray):
+        return {'array': store(name, obj)}
+    elif isinstance(obj, dict):
+        return {'dict': dict((str(key), _encode(value, name + '_' + str(key),
+                                                store))
+                             for key, value in obj.items())}
+    elif isinstance(obj, tuple):
+        return {'tuple': [_encode(value, name + '_' + str(i), store)
+                          for i, value in enumerate(obj)]}
+    elif isinstance(obj, list):
+        return {'list': [_encode(value, name + '_' + str(i), store)
+                         for i, value in enumerate(obj)]}
+    elif isinstance(obj, np.generic):
+        return _encode(obj.item(), name, store)
+    elif isinstance(obj, complex):
+        return {'complex': [obj.real, obj.imag]}
+    elif obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+
+    raise ValueError('%s of type %s cannot be saved' % (name, type(obj)))
+
+
+def _matrix_attributes(names):
+    """Return the names of the cached matrix attributes in names."""
+    return [name for name in sorted(names)
+            if name in _saved_matrix_attributes or
+            name.startswith(_saved_matrix_prefixes)]
+
+
+def _decode(obj, load):
+    """Invert _encode, reading arrays with load(filename)."""
+    if not isinstance(obj, dict):
+        return obj
+    elif 'sparse' in obj:
+        fmt = getattr(sp.sparse, obj['sparse'] + '_matrix')
+        M = fmt((load(obj['data']), load(obj['indices']),
+                 load(obj['indptr'])), shape=tuple(obj['shape']), copy=False)
+        for attr in _matrix_attributes(obj):
+            setattr(M, attr, _decode(obj[attr], load))
+        return M
+    elif 'array' in obj:
+        return load(obj['array'])
+    elif 'dict' in obj:
+        return dict((key, _decode(value, load))
+                    for key, value in obj['dict'].items())
+    elif 'list' in obj:
+        return [_decode(value, load) for value in obj['list']]
+    elif 'tuple' in obj:
+        return tuple(_decode(value, load) for value in obj['tuple'])
+    elif 'complex' in obj:
+        return complex(*obj['complex'])
+
+    raise ValueError('unrecognized entry in hierarchy file: %s' % obj)
+
+
+def _store_level(level, n, path, names=None):
+    """Move the operators of level n to memory-mapped files in path.
+
+    Each operator in names (default, those written by multilevel_solver.save)
+    is written to path and replaced by its read-only memory-mapped copy, so
+    that the operating system can evict its pages.  The files are named as
+    by multilevel_solver.save, but no hierarchy.json is written.
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    def store(name, array):
+        filename = name + '.npy'
+        np.save(os.path.join(path, filename), array, allow_pickle=False)
+        return filename
+
+    def load(filename):
+        return np.load(os.path.join(path, filename), mmap_mode='r',
+                       allow_pickle=False)
+
+    if names is None:
+        names = _saved_level_attributes
+    for name in names:
+        if hasattr(level, name):
+            entry = _encode(getattr(level, name), 'level%d_%s' % (n, name),
+                            store)
+            setattr(level, name, _decode(entry, load))
+
+
+def load_hierarchy(path, mmap=True):
+    """Load a multigrid hierarchy written by multilevel_solver.save.
+
+    Parameters
+    ----------
+    path : string
+        Directory passed to multilevel_solver.save
+    mmap : bool
+        If True, the arrays are memory-mapped read-only instead of read into
+        memory.  Processes that load the same hierarchy then share the pages
+        of the operators.
+
+    Returns
+    -------
+    ml : multilevel_solver
+        The saved hierarchy, with the coarse solver and the smoothers set up
+
+    Notes
+    -----
+    The operators of a memory-mapped hierarchy are read-only, so that
+    methods that modify the operators in place raise an error.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> import numpy as np
+    >>> from pyamg import smoothed_aggregation_solver, load_hierarchy
+    >>> from pyamg.gallery import poisson
+    >>> A = poisson((100, 100), format='csr')
+    >>> b = np.ones(A.shape[0])
+    >>> ml = smoothed_aggregation_solver(A)
+    >>> path = tempfile.mkdtemp()
+    >>> ml.save(path)
+    >>> ml2 = load_hierarchy(path, mmap=True)
+    >>> print(np.abs(ml2.solve(b) - ml.solve(b)).max())
+    0.0
+
+    """
+    with open(os.path.join(path, 'hierarchy.json'), 'r') as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != 'pyamg.multilevel_solver':
+        raise ValueError('%s does not contain a pyamg hierarchy' % path)
+    if manifest.get('version') != HIERARCHY_VERSION:
+        raise ValueError('unsupported hierarchy version %s, expected %d'
+                         % (manifest.get('version'), HIERARCHY_VERSION))
+
+    mmap_mode = 'r' if mmap else None
+
+    def load(filename):
+        return np.load(os.path.join(path, filename), mmap_mode=mmap_mode,
+                       allow_pickle=False)
+
+    levels = []
+    for entry in manifest['levels']:
+        level = multilevel_solver.level()
+        for name, value in entry.items():
+            setattr(level, name, _decode(value, load))
+        levels.append(level)
+
+    coarse = manifest['coarse_solver']
+    ml = multilevel_solver(levels, coarse_solver=(
+        coarse['method'], _decode(coarse['kwargs'], load)),
+        precision=manifest.get('precision', 'full'))
+    if 'factor' in coarse:
+        factor = _decode(coarse['factor'], load)
+        setattr(ml.coarse_solver, _coarse_factors[coarse['method']], factor)
+
+    smoothers = manifest['smoothers']
+    if smoothers is not None:
+        from pyamg.relaxation.smoothing import change_smoothers
+        config = {}
+        for name in ['presmoother', 'postsmoother']:
+            config[name] = [(method, kwargs) for method, kwargs
+                            in _decode(smoothers[name], load)]
+        change_smoothers(ml, presmoother=config['presmoother'],
+                         postsmoother=config['postsmoother'])
+
+    return ml
+
+
+def _sparse_lu(A, analysis=None, **kwargs):
+    """Sparse LU factorization of A, reusing a previous symbolic analysis.
+
+    Zero rows and columns, e.g., from multiple candidates in B, are removed
+    before the factorization.  The analysis holds the pattern of A, the
+    remaining rows and the column ordering of the first factorization.  If
+    the pattern of A is unchanged, the ordering is applied to A directly and
+    SuperLU skips its ordering step.
+
+    Returns a function that solves with A, the SuperLU object and the
+    analysis.
+    """
+    Acsc = A.tocsc()
+    Acsc.sort_indices()
+    if analysis is None or not (
+            np.array_equal(analysis['indptr'], Acsc.indptr) and
+            np.array_equal(analysis['indices'], Acsc.indices)):
+        # for multiple candidates in B, A will often have a couple zero
+        # rows/columns that must be removed
+        nonzero = Acsc.copy()
+        nonzero.eliminate_zeros()
+        keep = (np.diff(nonzero.indptr) != 0).nonzero()[0]
+        LU = sp.sparse.linalg.splu(Acsc[keep, :][:, keep].tocsc(), **kwargs)
+        cols = keep
+        analysis = {'indptr': Acsc.indptr.copy(),
+                    'indices': Acsc.indices.copy(),
+                    'keep': keep, 'order': np.argsort(LU.perm_c)}
+    else:
+        keep, order = analysis['keep'], analysis['order']
+        cols = keep[order]
+        kwargs = dict(kwargs, permc_spec='NATURAL')
+        LU = sp.sparse.linalg.splu(Acsc[keep, :][:, cols].tocsc(), **kwargs)
+
+    rows = analysis['keep']
+
+    def solve(b):
+        x = np.zeros(b.shape, dtype=np.result_type(LU.L.dtype, b.dtype))
+        x[cols] = LU.solve(np.asarray(b[rows]))
+        return x
+
+    return solve, LU, analysis
+
+
+def _direct_factor(A, analysis=None, dense_size=100, dense_density=0.1):
+    """Factor A for the 'direct' coarse solver, see coarse_grid_solver."""
+    n = A.shape[0]
+    if n <= dense_size or A.nnz >= dense_density * n * n:
+        Ad = A.toarray()
+        if np.allclose(Ad, Ad.conj().T):
+            try:
+                L = sp.linalg.cho_factor(Ad, check_finite=False)
+                return lambda b: sp.linalg.cho_solve(L, b), analysis
+            except np.linalg.LinAlgError:
+                pass
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', getattr(sp.linalg, 'LinAlgWarning',
+                                                    RuntimeWarning))
+            LU = sp.linalg.lu_factor(Ad, check_finite=False)
+        pivots = np.abs(np.diagonal(LU[0]))
+        if pivots.min() > n * np.finfo(pivots.dtype).eps * pivots.max():
+            return lambda b: sp.linalg.lu_solve(LU, b), analysis
+    else:
+        try:
+            solve, LU, analysis = _sparse_lu(A, analysis)
+            pivots = np.abs(LU.U.diagonal())
+            if pivots.min() > n * np.finfo(pivots.dtype).eps * pivots.max():
+                return solve, analysis
+        except RuntimeError:
+            pass
+        Ad = A.toarray()
+
+    # (numerically) singular A, e.g., from a pure Neumann problem
+    P = sp.linalg.pinv2(Ad)
+    return lambda b: np.dot(P, b), analysis
 
 
 def coarse_grid_solver(solver):
@@ -578,7 +1888,12 @@ def coarse_grid_solver(solver):
 
         The set of valid string arguments is:
             - Sparse direct methods:
-                + splu : sparse LU solver
+                + splu   : sparse LU solver
+                + direct : Cholesky or LU factorization, dense for small or
+                           dense A (of size at most dense_size=100 or with
+                           at least a fraction dense_density=0.1 of
+                           nonzeros) and sparse LU otherwise.  (Numerically)
+                           singular A fall back to pinv2.
             - Sparse iterative methods:
                 + the name of any method in scipy.sparse.linalg.isolve or
                   pyamg.krylov (e.g. 'cg').
@@ -596,6 +1911,16 @@ def coarse_grid_solver(solver):
     ptr : generic_solver
         A class for use as a standalone or coarse grids solver
 
+    Notes
+    -----
+    The direct methods factor A on the first call and reuse the factorization
+    in subsequent calls.  After A has changed, generic_solver.refactor()
+    discards the factorization.  For 'splu' and 'direct', the symbolic
+    analysis (the removal of zero rows and columns and the fill-reducing
+    column ordering) is kept and reused if the sparsity pattern of the new A
+    is the same, so that only the numerical factorization is recomputed.
+    multilevel_solver.update does so for the coarsest level.
+
     Examples
     --------
     >>> import numpy as np
@@ -606,6 +1931,10 @@ def coarse_grid_solver(solver):
     >>> b = A * np.ones(A.shape[0])
     >>> cgs = coarse_grid_solver('lu')
     >>> x = cgs(A, b)
+    >>> cgs = coarse_grid_solver('direct')
+    >>> x = cgs(A, b)
+    >>> cgs.refactor()
+    >>> x = cgs(2.0 * A, b)
 
     """
     def unpack_arg(v):
@@ -636,20 +1965,17 @@ def coarse_grid_solver(solver):
 
     elif solver == 'splu':
         def solve(self, A, b):
-            if not hasattr(self, 'LU'):
-                # for multiple candidates in B, A will often have a couple zero
-                # rows/columns that must be removed
-                Acsc = A.tocsc()
-                Acsc.eliminate_zeros()
-                diffptr = Acsc.indptr[:-1] - Acsc.indptr[1:]
-                nonzero_cols = (diffptr != 0).nonzero()[0]
-                Map = sp.sparse.eye(Acsc.shape[0], Acsc.shape[1], format='csc')
-                Map = Map[:, nonzero_cols]
-                Acsc = Map.T.tocsc() * Acsc * Map
-                self.LU = sp.sparse.linalg.splu(Acsc, **kwargs)
-                self.LU_Map = Map
-
-            return self.LU_Map * self.LU.solve(np.ravel(self.LU_Map.T * b))
+            if not hasattr(self, 'factor'):
+                self.factor, self.LU, self.analysis = _sparse_lu(
+                    A, getattr(self, 'analysis', None), **kwargs)
+            return self.factor(b)
+
+    elif solver == 'direct':
+        def solve(self, A, b):
+            if not hasattr(self, 'factor'):
+                self.factor, self.analysis = _direct_factor(
+                    A, getattr(self, 'analysis', None), **kwargs)
+            return self.factor(b)
 
     elif solver in ['bicg', 'bicgstab', 'cg', 'cgs', 'gmres', 'qmr', 'minres']:
         from pyamg import krylov
@@ -668,11 +1994,18 @@ def coarse_grid_solver(solver):
                 kwargs['tol'] = {0: feps * 1e3, 1: eps * 1e6,
                                  2: geps * 1e6}[_array_precision[A.dtype.char]]
 
+            if b.ndim == 2 and b.shape[1] > 1:
+                # Krylov methods solve one right-hand side at a time
+                return np.column_stack([np.ravel(fn(A, b[:, j], **kwargs)[0])
+                                        for j in range(b.shape[1])])
+
             return fn(A, b, **kwargs)[0]
 
     elif solver in ['gauss_seidel', 'jacobi', 'block_gauss_seidel', 'schwarz',
                     'block_jacobi', 'richardson', 'sor', 'chebyshev',
-                    'jacobi_ne', 'gauss_seidel_ne', 'gauss_seidel_nr']:
+                    'jacobi_ne', 'gauss_seidel_ne', 'gauss_seidel_nr',
+                    'multicolor_gauss_seidel', 'l1_jacobi',
+                    'l1_gauss_seidel', 'ilu0', 'ic0']:
 
         if 'iterations' not in kwargs:
             kwargs['iterations'] = 10
@@ -724,10 +2057,20 @@ def coarse_grid_solver(solver):
 
             return x.reshape(b.shape)
 
+        def refactor(self):
+            """Discard the factorization of A, e.g., after A has changed."""
+            for name in ['P', 'LU', 'L', 'factor']:
+                if hasattr(self, name):
+                    delattr(self, name)
+
         def __repr__(self):
             return 'coarse_grid_solver(' + repr(solver) + ')'
 
         def name(self):
             return repr(solver)
 
-    return generic_solver()
+    # keep the method and its arguments, e.g., for multilevel_solver.save
+    cgs = generic_solver()
+    cgs.method = solver
+    cgs.kwargs = kwargs
+    return cgs
@@ -6,14 +6,18 @@ from warnings import warn
 import numpy as np
 from scipy import sparse
 
-from pyamg.util.utils import type_prep, get_diagonal, get_block_diag
+from pyamg.util.utils import type_prep, get_diagonal, get_block_diag,\
+    get_num_threads, _has_kernel, _columns, _matvec
 from pyamg import amg_core
+from pyamg.graph import vertex_coloring
 from scipy.linalg import lapack as la
 
-__all__ = ['sor', 'gauss_seidel', 'jacobi', 'polynomial',
+__all__ = ['sor', 'gauss_seidel', 'jacobi', 'polynomial', 'chebyshev',
            'schwarz', 'schwarz_parameters',
            'jacobi_ne', 'gauss_seidel_ne', 'gauss_seidel_nr',
-           'gauss_seidel_indexed', 'block_jacobi', 'block_gauss_seidel']
+           'gauss_seidel_indexed', 'block_jacobi', 'block_gauss_seidel',
+           'multicolor_gauss_seidel', 'multicolor_parameters',
+           'l1_jacobi', 'l1_gauss_seidel', 'ilu0', 'ilu0_parameters']
 
 
 def make_system(A, x, b, formats=None):
@@ -24,9 +28,9 @@ def make_system(A, x, b, formats=None):
     A : sparse-matrix
         n x n system
     x : array
-        n-vector, initial guess
+        n-vector, initial guess, or n x k array of initial guesses
     b : array
-        n-vector, right-hand side
+        n-vector, right-hand side, or n x k array of right-hand sides
     formats: {'csr', 'csc', 'bsr', 'lil', 'dok',...}
         desired sparse matrix format
         default is no change to A's format
@@ -34,7 +38,8 @@ def make_system(A, x, b, formats=None):
     Returns
     -------
     (A,x,b), where A is in the desired sparse-matrix format
-    and x and b are "raveled", i.e. (n,) vectors.
+    and x and b are "raveled", i.e. (n,) vectors.  For a block
+    of k > 1 right-hand sides, x and b are C-contiguous (n,k) arrays.
 
     Notes
     -----
@@ -42,6 +47,9 @@ def make_system(A, x, b, formats=None):
     such as checking for compatible dimensions and checking
     for compatible type, i.e. float or complex.
 
+    The (n,k) block is stored row-wise, which is the layout expected by
+    the relaxation kernels in amg_core that sweep all k columns at once.
+
     Examples
     --------
     >>> from pyamg.relaxation.relaxation import make_system
@@ -85,23 +93,44 @@ def make_system(A, x, b, formats=None):
     if M != N:
         raise ValueError('expected square matrix')
 
-    if x.shape not in [(M,), (M, 1)]:
+    if x.ndim not in [1, 2] or x.shape[0] != M:
         raise ValueError('x has invalid dimensions')
-    if b.shape not in [(M,), (M, 1)]:
+    if b.ndim not in [1, 2] or b.shape[0] != M:
         raise ValueError('b has invalid dimensions')
 
+    k = 1 if x.ndim == 1 else x.shape[1]
+    if (b.ndim == 1 and k != 1) or (b.ndim == 2 and b.shape[1] != k):
+        raise ValueError('x and b have incompatible dimensions')
+
     if A.dtype != x.dtype or A.dtype != b.dtype:
         raise TypeError('arguments A, x, and b must have the same dtype')
 
     if not x.flags.carray:
         raise ValueError('x must be contiguous in memory')
 
-    x = np.ravel(x)
-    b = np.ravel(b)
+    if k == 1:
+        x = np.ravel(x)
+        b = np.ravel(b)
+    else:
+        b = np.ascontiguousarray(b)
 
     return A, x, b
 
 
+def _relax_columns(relax, A, x, b, **kwargs):
+    """Apply relax to each column of the (n,k) arrays x and b.
+
+    Used by the methods whose kernels do not sweep a block of
+    right-hand sides.  Each column is copied to contiguous storage,
+    relaxed with relax(A, xj, bj, **kwargs) and copied back.
+    """
+    xj = np.empty((x.shape[0],), dtype=x.dtype)
+    for j in range(x.shape[1]):
+        xj[:] = x[:, j]
+        relax(A, xj, np.ascontiguousarray(b[:, j]), **kwargs)
+        x[:, j] = xj
+
+
 def sor(A, x, b, omega, iterations=1, sweep='forward'):
     """Perform SOR iteration on the linear system Ax=b.
 
@@ -250,6 +279,13 @@ def schwarz(A, x, b, iterations=1, subdomain=None, subdomain_ptr=None,
         schwarz_parameters(A, subdomain, subdomain_ptr,
                            inv_subblock, inv_subblock_ptr)
 
+    if x.ndim > 1:
+        _relax_columns(schwarz, A, x, b, iterations=iterations,
+                       subdomain=subdomain, subdomain_ptr=subdomain_ptr,
+                       inv_subblock=inv_subblock,
+                       inv_subblock_ptr=inv_subblock_ptr, sweep=sweep)
+        return
+
     if sweep == 'forward':
         row_start, row_stop, row_step = 0, subdomain_ptr.shape[0]-1, 1
     elif sweep == 'backward':
@@ -332,9 +368,9 @@ def gauss_seidel(A, x, b, iterations=1, sweep='forward'):
         blocksize = R
 
     if sweep == 'forward':
-        row_start, row_stop, row_step = 0, int(len(x)/blocksize), 1
+        row_start, row_stop, row_step = 0, int(A.shape[0]/blocksize), 1
     elif sweep == 'backward':
-        row_start, row_stop, row_step = int(len(x)/blocksize)-1, -1, -1
+        row_start, row_stop, row_step = int(A.shape[0]/blocksize)-1, -1, -1
     elif sweep == 'symmetric':
         for iter in range(iterations):
             gauss_seidel(A, x, b, iterations=1, sweep='forward')
@@ -346,15 +382,136 @@ def gauss_seidel(A, x, b, iterations=1, sweep='forward'):
 
     if sparse.isspmatrix_csr(A):
         for iter in range(iterations):
-            amg_core.gauss_seidel(A.indptr, A.indices, A.data, x, b,
-                                  row_start, row_stop, row_step)
+            amg_core.gauss_seidel(A.indptr, A.indices, A.data,
+                                  np.ravel(x), np.ravel(b),
+                                  row_start, row_stop, row_step, _columns(x))
     else:
         for iter in range(iterations):
             amg_core.bsr_gauss_seidel(A.indptr, A.indices, np.ravel(A.data),
-                                      x, b, row_start, row_stop, row_step, R)
+                                      np.ravel(x), np.ravel(b),
+                                      row_start, row_stop, row_step, R,
+                                      _columns(x))
+
 
+def multicolor_gauss_seidel(A, x, b, iterations=1, sweep='forward',
+                            color_rows=None, color_ptr=None,
+                            num_threads=None):
+    """Perform multicolor Gauss-Seidel iteration on the linear system Ax=b.
 
-def jacobi(A, x, b, iterations=1, omega=1.0):
+    The rows (block rows for BSR) are grouped by color so that rows of the
+    same color are not coupled in A.  The colors are relaxed one after the
+    other, while the rows within a color are relaxed in parallel.
+
+    Parameters
+    ----------
+    A : csr_matrix, bsr_matrix
+        Sparse NxN matrix
+    x : ndarray
+        Approximate solution (length N)
+    b : ndarray
+        Right-hand side (length N)
+    iterations : int
+        Number of iterations to perform
+    sweep : {'forward','backward','symmetric'}
+        Direction of sweep through the colors
+    color_rows : int array
+        Rows (block rows for BSR) ordered by color
+    color_ptr : int array
+        Pointer in color_rows, such that
+        color_rows[color_ptr[c]:color_ptr[c+1]] contains the rows of color c
+    num_threads : int
+        Number of threads used within each color, see
+        pyamg.util.utils.get_num_threads.  The result does not depend on the
+        number of threads.
+
+    Returns
+    -------
+    Nothing, x will be modified in place.
+
+    Notes
+    -----
+    If color_rows or color_ptr is None, then the coloring is computed with
+    multicolor_parameters, which stores it with A for later calls.
+
+    The result depends on the coloring, i.e., it differs from gauss_seidel
+    which relaxes the rows in their natural order.
+
+    Examples
+    --------
+    >>> # Use multicolor Gauss-Seidel as a Stand-Alone Solver
+    >>> from pyamg.relaxation.relaxation import multicolor_gauss_seidel
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.util.linalg import norm
+    >>> import numpy as np
+    >>> A = poisson((10,10), format='csr')
+    >>> x0 = np.zeros((A.shape[0],1))
+    >>> b = np.ones((A.shape[0],1))
+    >>> multicolor_gauss_seidel(A, x0, b, iterations=10)
+    >>> print('%.4f' % norm(b-A*x0))
+    5.5555
+    >>> #
+    >>> # Use multicolor Gauss-Seidel as the Multigrid Smoother
+    >>> from pyamg import smoothed_aggregation_solver
+    >>> sa = smoothed_aggregation_solver(A, B=np.ones((A.shape[0],1)),
+    ...         coarse_solver='pinv2', max_coarse=50,
+    ...         presmoother=('multicolor_gauss_seidel', {'sweep':'symmetric'}),
+    ...         postsmoother=('multicolor_gauss_seidel',
+    ...                       {'sweep':'symmetric'}))
+    >>> x0=np.zeros((A.shape[0],1))
+    >>> residuals=[]
+    >>> x = sa.solve(b, x0=x0, tol=1e-8, residuals=residuals)
+
+    """
+    A, x, b = make_system(A, x, b, formats=['csr', 'bsr'])
+
+    if color_rows is None or color_ptr is None:
+        color_rows, color_ptr = multicolor_parameters(A)
+
+    num_colors = color_ptr.shape[0] - 1
+    num_threads = get_num_threads(num_threads)
+
+    if sweep == 'forward':
+        color_start, color_stop, color_step = 0, num_colors, 1
+    elif sweep == 'backward':
+        color_start, color_stop, color_step = num_colors-1, -1, -1
+    elif sweep == 'symmetric':
+        for iter in range(iterations):
+            multicolor_gauss_seidel(A, x, b, iterations=1, sweep='forward',
+                                    color_rows=color_rows,
+                                    color_ptr=color_ptr,
+                                    num_threads=num_threads)
+            multicolor_gauss_seidel(A, x, b, iterations=1, sweep='backward',
+                                    color_rows=color_rows,
+                                    color_ptr=color_ptr,
+                                    num_threads=num_threads)
+        return
+    else:
+        raise ValueError("valid sweep directions are 'forward',\
+                          'backward', and 'symmetric'")
+
+    if sparse.isspmatrix_csr(A):
+        for iter in range(iterations):
+            amg_core.multicolor_gauss_seidel(A.indptr, A.indices, A.data,
+                                             np.ravel(x), np.ravel(b),
+                                             color_rows, color_ptr,
+                                             color_start, color_stop,
+                                             color_step, _columns(x),
+                                             num_threads)
+    else:
+        R, C = A.blocksize
+        if R != C:
+            raise ValueError('BSR blocks must be square')
+        for iter in range(iterations):
+            amg_core.bsr_multicolor_gauss_seidel(A.indptr, A.indices,
+                                                 np.ravel(A.data),
+                                                 np.ravel(x), np.ravel(b),
+                                                 color_rows, color_ptr,
+                                                 color_start, color_stop,
+                                                 color_step, R, _columns(x),
+                                                 num_threads)
+
+
+def jacobi(A, x, b, iterations=1, omega=1.0, num_threads=None):
     """Perform Jacobi iteration on the linear system Ax=b.
 
     Parameters
@@ -369,6 +526,10 @@ def jacobi(A, x, b, iterations=1, omega=1.0):
         Number of iterations to perform
     omega : scalar
         Damping parameter
+    num_threads : int
+        Number of threads used by the sweep, see
+        pyamg.util.utils.get_num_threads.  The result does not depend on the
+        number of threads.
 
     Returns
     -------
@@ -408,14 +569,17 @@ def jacobi(A, x, b, iterations=1, omega=1.0):
         return
 
     temp = np.empty_like(x)
+    num_threads = get_num_threads(num_threads)
 
     # Create uniform type, convert possibly complex scalars to length 1 arrays
     [omega] = type_prep(A.dtype, [omega])
 
     if sparse.isspmatrix_csr(A):
         for iter in range(iterations):
-            amg_core.jacobi(A.indptr, A.indices, A.data, x, b, temp,
-                            row_start, row_stop, row_step, omega)
+            amg_core.jacobi(A.indptr, A.indices, A.data,
+                            np.ravel(x), np.ravel(b), np.ravel(temp),
+                            row_start, row_stop, row_step, omega,
+                            _columns(x), num_threads)
     else:
         R, C = A.blocksize
         if R != C:
@@ -424,11 +588,13 @@ def jacobi(A, x, b, iterations=1, omega=1.0):
         row_stop = int(row_stop / R)
         for iter in range(iterations):
             amg_core.bsr_jacobi(A.indptr, A.indices, np.ravel(A.data),
-                                x, b, temp, row_start, row_stop,
-                                row_step, R, omega)
+                                np.ravel(x), np.ravel(b), np.ravel(temp),
+                                row_start, row_stop, row_step, R, omega,
+                                _columns(x), num_threads)
 
 
-def block_jacobi(A, x, b, Dinv=None, blocksize=1, iterations=1, omega=1.0):
+def block_jacobi(A, x, b, Dinv=None, blocksize=1, iterations=1, omega=1.0,
+                 num_threads=None):
     """Perform block Jacobi iteration on the linear system Ax=b.
 
     Parameters
@@ -448,6 +614,10 @@ def block_jacobi(A, x, b, Dinv=None, blocksize=1, iterations=1, omega=1.0):
         Number of iterations to perform
     omega : scalar
         Damping parameter
+    num_threads : int
+        Number of threads used by the sweep, see
+        pyamg.util.utils.get_num_threads.  The result does not depend on the
+        number of threads.
 
     Returns
     -------
@@ -496,15 +666,17 @@ def block_jacobi(A, x, b, Dinv=None, blocksize=1, iterations=1, omega=1.0):
         return
 
     temp = np.empty_like(x)
+    num_threads = get_num_threads(num_threads)
 
     # Create uniform type, convert possibly complex scalars to length 1 arrays
     [omega] = type_prep(A.dtype, [omega])
 
     for iter in range(iterations):
         amg_core.block_jacobi(A.indptr, A.indices, np.ravel(A.data),
-                              x, b, np.ravel(Dinv), temp,
+                              np.ravel(x), np.ravel(b), np.ravel(Dinv),
+                              np.ravel(temp),
                               row_start, row_stop, row_step,
-                              omega, blocksize)
+                              omega, blocksize, _columns(x), num_threads)
 
 
 def block_gauss_seidel(A, x, b, iterations=1, sweep='forward', blocksize=1,
@@ -572,9 +744,9 @@ def block_gauss_seidel(A, x, b, iterations=1, sweep='forward', blocksize=1,
         raise ValueError('Dinv and blocksize are incompatible')
 
     if sweep == 'forward':
-        row_start, row_stop, row_step = 0, int(len(x)/blocksize), 1
+        row_start, row_stop, row_step = 0, int(A.shape[0]/blocksize), 1
     elif sweep == 'backward':
-        row_start, row_stop, row_step = int(len(x)/blocksize)-1, -1, -1
+        row_start, row_stop, row_step = int(A.shape[0]/blocksize)-1, -1, -1
     elif sweep == 'symmetric':
         for iter in range(iterations):
             block_gauss_seidel(A, x, b, iterations=1, sweep='forward',
@@ -588,11 +760,261 @@ def block_gauss_seidel(A, x, b, iterations=1, sweep='forward', blocksize=1,
 
     for iter in range(iterations):
         amg_core.block_gauss_seidel(A.indptr, A.indices, np.ravel(A.data),
-                                    x, b, np.ravel(Dinv),
-                                    row_start, row_stop, row_step, blocksize)
+                                    np.ravel(x), np.ravel(b), np.ravel(Dinv),
+                                    row_start, row_stop, row_step, blocksize,
+                                    _columns(x))
+
+
+def _square_blocksize(A):
+    """Return the blocksize of a CSR (1) or BSR matrix with square blocks."""
+    if sparse.isspmatrix_csr(A):
+        return 1
+    R, C = A.blocksize
+    if R != C:
+        raise ValueError('BSR blocks must be square')
+    return R
+
+
+def l1_jacobi(A, x, b, iterations=1, omega=1.0, num_threads=None):
+    """Perform l1-Jacobi iteration on the linear system Ax=b.
+
+    Parameters
+    ----------
+    A : csr_matrix, bsr_matrix
+        Sparse NxN matrix
+    x : ndarray
+        Approximate solution (length N)
+    b : ndarray
+        Right-hand side (length N)
+    iterations : int
+        Number of iterations to perform
+    omega : scalar
+        Damping parameter
+    num_threads : int
+        Number of threads used by the sweep, see
+        pyamg.util.utils.get_num_threads.  The result does not depend on the
+        number of threads.
+
+    Returns
+    -------
+    Nothing, x will be modified in place.
+
+    Notes
+    -----
+    Each iteration is x[:] = x + omega D_l1^-1 (b - A*x), where
+    D_l1 = diag(a_ii + sum_{j != i} |a_ij|).  For A symmetric positive
+    definite, A <= D_l1, so the iteration converges for omega = 1 without
+    an estimate of the spectral radius of D^-1 A.  A BSR matrix is relaxed
+    point-wise on its block storage.
+
+    References
+    ----------
+    .. [1] Baker, A. H., Falgout, R. D., Kolev, T. V., Yang, U. M.,
+       "Multigrid smoothers for ultraparallel computing",
+       SIAM J. Sci. Comput., 33(5), 2011.
+
+    Examples
+    --------
+    >>> from pyamg.relaxation.relaxation import l1_jacobi
+    >>> from pyamg.gallery import poisson
+    >>> import numpy as np
+    >>> A = poisson((10,10), format='csr')
+    >>> x0 = np.zeros((A.shape[0],1))
+    >>> b = np.ones((A.shape[0],1))
+    >>> l1_jacobi(A, x0, b, iterations=10)
+
+    """
+    A, x, b = make_system(A, x, b, formats=['csr', 'bsr'])
+    blocksize = _square_blocksize(A)
+
+    temp = np.empty_like(x)
+    num_threads = get_num_threads(num_threads)
+
+    # Create uniform type, convert possibly complex scalars to length 1 arrays
+    [omega] = type_prep(A.dtype, [omega])
+
+    for iter in range(iterations):
+        amg_core.l1_jacobi(A.indptr, A.indices, np.ravel(A.data),
+                           np.ravel(x), np.ravel(b), np.ravel(temp),
+                           blocksize, omega, _columns(x), num_threads)
+
+
+def l1_gauss_seidel(A, x, b, iterations=1, sweep='forward', partitions=None,
+                    rows_per_block=4096, num_threads=None):
+    """Perform hybrid l1-Gauss-Seidel iteration on the linear system Ax=b.
+
+    Parameters
+    ----------
+    A : csr_matrix, bsr_matrix
+        Sparse NxN matrix
+    x : ndarray
+        Approximate solution (length N)
+    b : ndarray
+        Right-hand side (length N)
+    iterations : int
+        Number of iterations to perform
+    sweep : {'forward','backward','symmetric'}
+        Direction of sweep within each partition
+    partitions : int
+        Number of contiguous row partitions that are relaxed concurrently.
+        If None, the rows are split into partitions of about rows_per_block
+        (block) rows.
+    rows_per_block : int
+        Size of the partitions, if partitions is None
+    num_threads : int
+        Number of threads, see pyamg.util.utils.get_num_threads.  The result
+        does not depend on the number of threads.
+
+    Returns
+    -------
+    Nothing, x will be modified in place.
+
+    Notes
+    -----
+    The rows (block rows for BSR) are split into contiguous partitions.
+    Each partition performs a Gauss-Seidel sweep over its own rows, while
+    the couplings to other partitions use the values of x from the start of
+    the sweep and are added to the diagonal in the l1 sense, i.e., row i is
+    divided by a_ii + sum_{j not in part(i)} |a_ij|.  For A symmetric
+    positive definite this converges for any number of partitions without
+    an estimate of the spectral radius, and with a single partition it is
+    Gauss-Seidel.
+
+    References
+    ----------
+    .. [1] Baker, A. H., Falgout, R. D., Kolev, T. V., Yang, U. M.,
+       "Multigrid smoothers for ultraparallel computing",
+       SIAM J. Sci. Comput., 33(5), 2011.
+
+    Examples
+    --------
+    >>> from pyamg.relaxation.relaxation import l1_gauss_seidel
+    >>> from pyamg.gallery import poisson
+    >>> import numpy as np
+    >>> A = poisson((10,10), format='csr')
+    >>> x0 = np.zeros((A.shape[0],1))
+    >>> b = np.ones((A.shape[0],1))
+    >>> l1_gauss_seidel(A, x0, b, iterations=10, partitions=4)
+
+    """
+    A, x, b = make_system(A, x, b, formats=['csr', 'bsr'])
+    blocksize = _square_blocksize(A)
+
+    if sweep == 'forward':
+        row_steps = [1]
+    elif sweep == 'backward':
+        row_steps = [-1]
+    elif sweep == 'symmetric':
+        row_steps = [1, -1]
+    else:
+        raise ValueError("valid sweep directions are 'forward',\
+                          'backward', and 'symmetric'")
+
+    num_threads = get_num_threads(num_threads)
+    n_brow = int(A.shape[0] / blocksize)
+    if partitions is None:
+        # a fixed size, so that the partitions do not depend on num_threads
+        partitions = -(-n_brow // int(rows_per_block))
+    partitions = max(1, min(int(partitions), n_brow))
+
+    if x.ndim == 2:
+        _relax_columns(l1_gauss_seidel, A, x, b, iterations=iterations,
+                       sweep=sweep, partitions=partitions,
+                       num_threads=num_threads)
+        return
+
+    temp = np.empty_like(x)
+
+    for iter in range(iterations):
+        for row_step in row_steps:
+            amg_core.l1_gauss_seidel(A.indptr, A.indices, np.ravel(A.data),
+                                     x, b, temp, row_step, partitions,
+                                     blocksize, num_threads)
 
 
-def polynomial(A, x, b, coefficients, iterations=1):
+def ilu0(A, x, b, iterations=1, omega=1.0, symmetric=False, sweeps=None,
+         num_threads=None):
+    """Perform incomplete LU relaxation, ILU(0) or IC(0), on Ax=b.
+
+    Parameters
+    ----------
+    A : csr_matrix, bsr_matrix
+        Sparse NxN matrix
+    x : ndarray
+        Approximate solution (length N)
+    b : ndarray
+        Right-hand side (length N)
+    iterations : int
+        Number of iterations to perform
+    omega : scalar
+        Damping parameter
+    symmetric : bool
+        If True, use the incomplete Cholesky factorization IC(0) of a
+        Hermitian A, otherwise the incomplete LU factorization ILU(0)
+    sweeps : int
+        If None, the triangular solves are exact and parallel by level
+        scheduling.  Otherwise, each triangular solve is approximated by
+        this number of Jacobi sweeps.
+    num_threads : int
+        Number of threads, see pyamg.util.utils.get_num_threads.  The
+        result does not depend on the number of threads.
+
+    Returns
+    -------
+    Nothing, x will be modified in place.
+
+    Notes
+    -----
+    Each iteration is x[:] = x + omega (LU)^-1 (b - A*x), see
+    ilu0_parameters for the factorization.  For matrices that are not
+    M-matrices, e.g., rotated anisotropic diffusion, the spectral radius
+    of (LU)^-1 A may exceed 2, so that omega = 1 diverges.  A BSR matrix
+    is factored point-wise through its CSR form, i.e., in the pattern of
+    its nonzero blocks.
+
+    The level-scheduled solves are sequential over the levels of the
+    triangular factors, e.g., about 2 sqrt(N) levels for a 2D Poisson
+    problem.  A few Jacobi sweeps (sweeps=2 or 3) expose more parallelism
+    at the price of inexact solves.
+
+    Examples
+    --------
+    >>> from pyamg.relaxation.relaxation import ilu0
+    >>> from pyamg.gallery import poisson
+    >>> import numpy as np
+    >>> A = poisson((10,10), format='csr')
+    >>> x0 = np.zeros((A.shape[0],1))
+    >>> b = np.ones((A.shape[0],1))
+    >>> ilu0(A, x0, b, iterations=10, symmetric=True)
+
+    """
+    A, x, b = make_system(A, x, b, formats=['csr'])
+    if not A.has_sorted_indices:
+        A = A.sorted_indices()
+
+    LUx, diag, L_rows, L_ptr, U_rows, U_ptr = \
+        ilu0_parameters(A, symmetric=symmetric)
+
+    if sweeps is None:
+        sweeps = 0
+    elif sweeps < 1:
+        raise ValueError('sweeps must be None or a positive integer')
+
+    r = np.empty_like(x)
+    y = np.empty_like(x)
+    num_threads = get_num_threads(num_threads)
+
+    # Create uniform type, convert possibly complex scalars to length 1 arrays
+    [omega] = type_prep(A.dtype, [omega])
+
+    for iter in range(iterations):
+        amg_core.ilu_relax(A.indptr, A.indices, A.data, LUx, diag,
+                           np.ravel(x), np.ravel(b), np.ravel(r), np.ravel(y),
+                           L_rows, L_ptr, U_rows, U_ptr, int(sweeps), omega,
+                           _columns(x), num_threads)
+
+
+def polynomial(A, x, b, coefficients, iterations=1, num_threads=None):
     """Apply a polynomial smoother to the system Ax=b.
 
     Parameters
@@ -607,6 +1029,10 @@ def polynomial(A, x, b, coefficients, iterations=1):
         Coefficients of the polynomial.  See Notes section for details.
     iterations : int
         Number of iterations to perform
+    num_threads : int
+        Number of threads used by the products with a CSR or BSR matrix A,
+        see pyamg.util.utils.get_num_threads.  The result does not depend on
+        the number of threads.
 
     Returns
     -------
@@ -654,22 +1080,106 @@ def polynomial(A, x, b, coefficients, iterations=1):
     """
     A, x, b = make_system(A, x, b, formats=None)
 
+    if _has_kernel(A, x):
+        num_threads = get_num_threads(num_threads)
+
+        def matvec(v):
+            Av = np.zeros_like(v)
+            _matvec(A, v, Av, num_threads)
+            return Av
+    else:
+        def matvec(v):
+            return A*v
+
     for i in range(iterations):
         from pyamg.util.linalg import norm
 
         if norm(x) == 0:
             residual = b
         else:
-            residual = (b - A*x)
+            residual = (b - matvec(x))
 
         h = coefficients[0]*residual
 
         for c in coefficients[1:]:
-            h = c*residual + A*h
+            h = c*residual + matvec(h)
 
         x += h
 
 
+def chebyshev(A, x, b, lower_bound, upper_bound, degree=3, Dinv=None,
+              iterations=1, num_threads=None):
+    """Apply a Chebyshev polynomial smoother to the system Ax=b.
+
+    Parameters
+    ----------
+    A : csr_matrix
+        Sparse NxN matrix
+    x : ndarray
+        Approximate solution (length N)
+    b : ndarray
+        Right-hand side (length N)
+    lower_bound, upper_bound : float
+        Interval of the spectrum of D^-1 A that is damped.  upper_bound
+        should bound the spectrum from above.
+    degree : int
+        Degree of the polynomial, i.e., the number of products with A in
+        each iteration
+    Dinv : array
+        Diagonal scaling D^-1 (length N), e.g., the inverse of the diagonal
+        of A.  If None, then D is the identity.
+    iterations : int
+        Number of iterations to perform
+    num_threads : int
+        Number of threads used by the products with A, see
+        pyamg.util.utils.get_num_threads.  The result does not depend on the
+        number of threads.
+
+    Returns
+    -------
+    Nothing, x will be modified in place.
+
+    Notes
+    -----
+    Each iteration performs degree steps of the Chebyshev iteration for
+    D^-1 A x = D^-1 b, i.e., x[:] = x + p(D^-1 A) D^-1 (b - A*x), where the
+    error polynomial 1 - t p(t) has minimal magnitude on [lower_bound,
+    upper_bound], see chebyshev_polynomial_coefficients.  The steps use the
+    three-term recurrence of the Chebyshev polynomials in a single call to
+    amg_core, with two work vectors and without forming the coefficients.
+
+    Examples
+    --------
+    >>> from pyamg.relaxation.relaxation import chebyshev
+    >>> from pyamg.util.linalg import approximate_spectral_radius
+    >>> from pyamg.gallery import poisson
+    >>> import numpy as np
+    >>> A = poisson((10,10), format='csr')
+    >>> x0 = np.zeros((A.shape[0],1))
+    >>> b = np.ones((A.shape[0],1))
+    >>> rho = approximate_spectral_radius(A)
+    >>> chebyshev(A, x0, b, rho/30.0, 1.1*rho, degree=3, iterations=10)
+
+    """
+    A, x, b = make_system(A, x, b, formats=['csr'])
+
+    if Dinv is None:
+        Dinv = np.ones(A.shape[0], dtype=A.dtype)
+    else:
+        Dinv = np.asarray(Dinv, dtype=A.dtype).ravel()
+
+    r = np.empty_like(x)
+    d = np.empty_like(x)
+    num_threads = get_num_threads(num_threads)
+
+    for iter in range(iterations):
+        amg_core.chebyshev(A.indptr, A.indices, A.data,
+                           np.ravel(x), np.ravel(b), Dinv,
+                           np.ravel(r), np.ravel(d),
+                           float(lower_bound), float(upper_bound), degree,
+                           _columns(x), num_threads)
+
+
 def gauss_seidel_indexed(A, x, b, indices, iterations=1, sweep='forward'):
     """Perform indexed Gauss-Seidel iteration on the linear system Ax=b.
 
@@ -715,7 +1225,12 @@ def gauss_seidel_indexed(A, x, b, indices, iterations=1, sweep='forward'):
     """
     A, x, b = make_system(A, x, b, formats=['csr'])
 
-    indices = np.asarray(indices, dtype='intc')
+    indices = np.asarray(indices, dtype=A.indptr.dtype)
+
+    if x.ndim > 1:
+        _relax_columns(gauss_seidel_indexed, A, x, b, indices=indices,
+                       iterations=iterations, sweep=sweep)
+        return
 
     # if indices.min() < 0:
     #     raise ValueError('row index (%d) is invalid' % indices.min())
@@ -743,7 +1258,7 @@ def gauss_seidel_indexed(A, x, b, indices, iterations=1, sweep='forward'):
                                       row_start, row_stop, row_step)
 
 
-def jacobi_ne(A, x, b, iterations=1, omega=1.0):
+def jacobi_ne(A, x, b, iterations=1, omega=1.0, num_threads=None, AH=None):
     """Perform Jacobi iterations on the linear system A A.H x = A.H b.
 
     Also known as Cimmino relaxation
@@ -760,6 +1275,13 @@ def jacobi_ne(A, x, b, iterations=1, omega=1.0):
         Number of iterations to perform
     omega : scalar
         Damping parameter
+    num_threads : int
+        Number of threads used by the sweep, see
+        pyamg.util.utils.get_num_threads.  The result does not depend on the
+        number of threads.
+    AH : csr_matrix
+        Conjugate transpose of A in CSR format, used by the threaded sweep.
+        If None, it is formed from A on each call.
 
     Returns
     -------
@@ -806,6 +1328,11 @@ def jacobi_ne(A, x, b, iterations=1, omega=1.0):
     """
     A, x, b = make_system(A, x, b, formats=['csr'])
 
+    if x.ndim > 1:
+        _relax_columns(jacobi_ne, A, x, b, iterations=iterations,
+                       omega=omega, num_threads=num_threads, AH=AH)
+        return
+
     sweep = slice(None)
     (row_start, row_stop, row_step) = sweep.indices(A.shape[0])
 
@@ -817,6 +1344,25 @@ def jacobi_ne(A, x, b, iterations=1, omega=1.0):
     # Create uniform type, convert possibly complex scalars to length 1 arrays
     [omega] = type_prep(A.dtype, [omega])
 
+    num_threads = get_num_threads(num_threads)
+    if num_threads > 1 and _has_kernel(A, x):
+        # The jacobi_ne kernel scatters omega*A.H*delta into temp.  In
+        # parallel, the same sums are gathered row by row from the CSR form
+        # of omega*A.H, which adds the terms in the same order.
+        if AH is None:
+            AH = A.conj().T.tocsr()
+        AH = sparse.csr_matrix((omega[0] * AH.data, AH.indices, AH.indptr),
+                               shape=AH.shape)
+        Ax = np.empty_like(x)
+        for i in range(iterations):
+            Ax.fill(0)
+            _matvec(A, x, Ax, num_threads)
+            delta = (np.ravel(b - Ax)*np.ravel(Dinv)).astype(A.dtype)
+            temp.fill(0)
+            _matvec(AH, delta, temp, num_threads)
+            x += temp
+        return
+
     for i in range(iterations):
         delta = (np.ravel(b - A*x)*np.ravel(Dinv)).astype(A.dtype)
         amg_core.jacobi_ne(A.indptr, A.indices, A.data,
@@ -893,6 +1439,11 @@ def gauss_seidel_ne(A, x, b, iterations=1, sweep='forward', omega=1.0,
     if Dinv is None:
         Dinv = np.ravel(get_diagonal(A, norm_eq=2, inv=True))
 
+    if x.ndim > 1:
+        _relax_columns(gauss_seidel_ne, A, x, b, iterations=iterations,
+                       sweep=sweep, omega=omega, Dinv=Dinv)
+        return
+
     if sweep == 'forward':
         row_start, row_stop, row_step = 0, len(x), 1
     elif sweep == 'backward':
@@ -978,6 +1529,11 @@ def gauss_seidel_nr(A, x, b, iterations=1, sweep='forward', omega=1.0,
     if Dinv is None:
         Dinv = np.ravel(get_diagonal(A, norm_eq=1, inv=True))
 
+    if x.ndim > 1:
+        _relax_columns(gauss_seidel_nr, A, x, b, iterations=iterations,
+                       sweep=sweep, omega=omega, Dinv=Dinv)
+        return
+
     if sweep == 'forward':
         col_start, col_stop, col_step = 0, len(x), 1
     elif sweep == 'backward':
@@ -1087,5 +1643,190 @@ def schwarz_parameters(A, subdomain=None, subdomain_ptr=None,
                             inv_subblock_ptr)
     return A.schwarz_parameters
 
+
+def ilu0_parameters(A, symmetric=False):
+    """Set incomplete LU relaxation parameters.
+
+    Helper function for setting up ILU(0) or IC(0) relaxation, see ilu0.
+    The factors are computed in the sparsity pattern of A, together with
+    the level schedule of the triangular solves.  The parameters are stored
+    with A, which avoids recomputing them, e.g., when setting up pre and
+    post smoothing.
+
+    Parameters
+    ----------
+    A : {csr_matrix, bsr_matrix}
+        Sparse NxN matrix with a nonzero diagonal.  For symmetric=True, A
+        must be Hermitian.
+    symmetric : bool
+        If True, compute IC(0), i.e., L D L^H, otherwise ILU(0), i.e., LU
+
+    Returns
+    -------
+    LUx : array
+        Values of L (strictly lower part, unit diagonal implied) and U
+        (upper part) in the CSR pattern of A with sorted indices
+    diag : int array
+        Position of the diagonal entry of each row
+    L_rows, L_ptr : int arrays
+        Rows ordered by level of the forward solve and the pointer to the
+        first row of each level
+    U_rows, U_ptr : int arrays
+        Same for the backward solve
+
+    Notes
+    -----
+    A.ilu0_parameters holds (symmetric, LUx, diag, L_rows, L_ptr, U_rows,
+    U_ptr).
+
+    If the factorization breaks down, i.e., a pivot is zero (or not
+    positive for IC(0)), then it is recomputed for A + alpha diag(A) with
+    alpha = 0.001, 0.002, 0.004, ... as in [1]_.
+
+    For IC(0), U is set to D L^H, so that the smoother is symmetric.  This
+    requires a structurally symmetric A.
+
+    References
+    ----------
+    .. [1] Manteuffel, T. A., "An incomplete factorization technique for
+       positive definite linear systems", Math. Comp., 34(150), 1980.
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.relaxation.relaxation import ilu0_parameters
+    >>> A = poisson((4,), format='csr')
+    >>> LUx, diag, L_rows, L_ptr, U_rows, U_ptr = ilu0_parameters(A)
+    >>> print(L_ptr)
+    [0 1 2 3 4]
+
+    """
+    # Check if A has pre-existing parameters
+    if hasattr(A, 'ilu0_parameters'):
+        if A.ilu0_parameters[0] == symmetric:
+            return A.ilu0_parameters[1:]
+
+    Acsr = A.tocsr()
+    if not Acsr.has_sorted_indices:
+        Acsr = Acsr.sorted_indices()
+    n = Acsr.shape[0]
+    index_type = Acsr.indptr.dtype
+
+    rows = np.repeat(np.arange(n, dtype=index_type), np.diff(Acsr.indptr))
+    diag = np.where(Acsr.indices == rows)[0].astype(index_type)
+    if diag.shape[0] != n:
+        raise ValueError('ILU(0) requires a nonzero diagonal')
+
+    if symmetric:
+        # position of the transposed entry, for U = D L^H
+        T = sparse.csr_matrix((np.arange(1, Acsr.nnz + 1, dtype=float),
+                               Acsr.indices, Acsr.indptr), shape=Acsr.shape)
+        T = T.T.tocsr()
+        T.sort_indices()
+        if T.nnz != Acsr.nnz or \
+           not np.array_equal(T.indices, Acsr.indices) or \
+           not np.array_equal(T.indptr, Acsr.indptr):
+            raise ValueError('IC(0) requires a structurally symmetric matrix')
+        transpose = T.data.astype(index_type) - 1
+        upper = np.where(Acsr.indices > rows)[0]
+
+    alpha = 0.0
+    for attempt in range(20):
+        LUx = Acsr.data.copy()
+        LUx[diag] *= 1.0 + alpha
+        amg_core.ilu0(Acsr.indptr, Acsr.indices, LUx, diag)
+        pivots = LUx[diag]
+        if symmetric:
+            LUx[upper] = pivots[rows[upper]] * np.conjugate(
+                LUx[transpose[upper]])
+            breakdown = np.any(np.real(pivots) <= 0)
+        else:
+            breakdown = np.any(pivots == 0)
+        if not breakdown and np.all(np.isfinite(LUx)):
+            break
+        alpha = 0.001 if alpha == 0.0 else 2 * alpha
+    else:
+        raise ValueError('incomplete factorization failed')
+
+    L_level = np.empty(n, dtype=index_type)
+    U_level = np.empty(n, dtype=index_type)
+    amg_core.triangular_levels(Acsr.indptr, Acsr.indices, diag,
+                               L_level, U_level)
+
+    parameters = [symmetric, LUx, diag]
+    for level in [L_level, U_level]:
+        n_levels = level.max() + 1 if level.size else 0
+        ptr = np.zeros(n_levels + 1, dtype=index_type)
+        ptr[1:] = np.cumsum(np.bincount(level))
+        parameters += [np.argsort(level, kind='mergesort').astype(index_type),
+                       ptr]
+
+    A.ilu0_parameters = tuple(parameters)
+    return A.ilu0_parameters[1:]
+
+
+def multicolor_parameters(A, method='MIS'):
+    """Set multicolor Gauss-Seidel parameters.
+
+    Helper function for setting up multicolor Gauss-Seidel relaxation.  The
+    rows of A (block rows for BSR) are colored with
+    pyamg.graph.vertex_coloring applied to the symmetrized sparsity pattern
+    of A, so that rows of the same color are not coupled.  The coloring is
+    stored with A, which avoids recomputing it, e.g., when setting up pre
+    and post smoothing.
+
+    Parameters
+    ----------
+    A : {csr_matrix, bsr_matrix}
+        Sparse NxN matrix
+    method : {'MIS', 'JP', 'LDF'}
+        Coloring algorithm, see pyamg.graph.vertex_coloring
+
+    Returns
+    -------
+    color_rows : int array
+        Rows (block rows for BSR) ordered by color
+    color_ptr : int array
+        Pointer in color_rows to the first row of each color
+
+    Notes
+    -----
+    A.multicolor_parameters holds (method, color_rows, color_ptr).
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.relaxation.relaxation import multicolor_parameters
+    >>> A = poisson((4,), format='csr')
+    >>> color_rows, color_ptr = multicolor_parameters(A)
+    >>> print(color_rows)
+    [0 2 1 3]
+    >>> print(color_ptr)
+    [0 2 4]
+
+    """
+    # Check if A has a pre-existing coloring
+    if hasattr(A, 'multicolor_parameters'):
+        if A.multicolor_parameters[0] == method:
+            return A.multicolor_parameters[1:]
+
+    if sparse.isspmatrix_bsr(A):
+        R, C = A.blocksize
+    else:
+        R, C = 1, 1
+    G = sparse.csr_matrix((np.ones(A.indices.shape[0]), A.indices, A.indptr),
+                          shape=(int(A.shape[0]/R), int(A.shape[1]/C)))
+    G = (G + G.T).tocsr()
+
+    coloring = vertex_coloring(G, method=method)
+    n_colors = coloring.max() + 1 if coloring.size else 0
+    color_ptr = np.zeros(n_colors + 1, dtype=A.indptr.dtype)
+    color_ptr[1:] = np.cumsum(np.bincount(coloring))
+    color_rows = np.argsort(coloring, kind='mergesort')
+    color_rows = color_rows.astype(A.indptr.dtype)
+
+    A.multicolor_parameters = (method, color_rows, color_ptr)
+    return A.multicolor_parameters[1:]
+
 # from pyamg.utils import dispatcher
 # dispatch = dispatcher( dict([ (fn,eval(fn)) for fn in __all__ ]) )
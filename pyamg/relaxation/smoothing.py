@@ -3,10 +3,12 @@ from __future__ import absolute_import
 
 import numpy as np
 import scipy.sparse as sparse
+from scipy.sparse.linalg import LinearOperator
 from . import relaxation
 from .chebyshev import chebyshev_polynomial_coefficients
-from pyamg.util.utils import scale_rows, get_block_diag, get_diagonal
-from pyamg.util.linalg import approximate_spectral_radius
+from pyamg.util.utils import get_block_diag, get_diagonal
+from pyamg.util.linalg import approximate_spectral_radius,\
+    cached_spectral_radius
 from pyamg.krylov import gmres, cgne, cgnr, cg
 
 __all__ = ['change_smoothers']
@@ -17,7 +19,7 @@ __all__ = ['change_smoothers']
 DEFAULT_SWEEP = 'forward'
 DEFAULT_NITER = 1
 SYMMETRIC_RELAXATION = ['jacobi', 'richardson', 'block_jacobi',
-                        'jacobi_ne', 'chebyshev', None]
+                        'jacobi_ne', 'chebyshev', 'l1_jacobi', 'ic0', None]
 
 
 def unpack_arg(v):
@@ -69,6 +71,8 @@ def change_smoothers(ml, presmoother, postsmoother):
     ml.level[i].postsmoother  <===  postsmoother[i]
     ml.symmetric_smoothing is marked True/False depending on whether
         the smoothing scheme is symmetric.
+    ml.smoother_config stores presmoother and postsmoother, e.g., for
+        multilevel_solver.save.
 
     Notes
     -----
@@ -76,7 +80,36 @@ def change_smoothers(ml, presmoother, postsmoother):
       methods is scaled by the spectral radius of the matrix on
       each level.  Therefore 'omega' should be in the interval (0,2).
     - Parameter 'withrho' (default: True) controls whether the omega is
-      rescaled by the spectral radius in jacobi, block_jacobi, and jacobi_ne
+      rescaled by the spectral radius in jacobi, block_jacobi, jacobi_ne,
+      ilu0 and ic0
+    - Parameter 'num_threads' sets the number of threads used by jacobi,
+      block_jacobi, jacobi_ne, richardson, chebyshev, l1_jacobi,
+      l1_gauss_seidel, ilu0, ic0 and multicolor_gauss_seidel.  The default is
+      given by pyamg.util.utils.get_num_threads, e.g., the environment
+      variable PYAMG_NUM_THREADS.  Results are bitwise identical for any
+      number of threads.
+    - Parameter 'diagonal' (default: False) of chebyshev applies the
+      polynomial to D^-1 A instead of A, with the bounds relative to the
+      spectral radius of D^-1 A.  For CSR and BSR matrices, chebyshev runs
+      all degree steps of its three-term recurrence in one amg_core call.
+    - The l1 smoothers, l1_jacobi and l1_gauss_seidel, add the l1 norm of
+      the off-diagonal (resp. off-partition) part of each row to the
+      diagonal.  They converge for symmetric positive definite A without a
+      spectral radius estimate, so their setup is free.  Parameter
+      'partitions' of l1_gauss_seidel sets the number of row partitions
+      swept concurrently.  By default, the partitions have about
+      'rows_per_block' (default: 4096) rows, independent of the number of
+      threads.  BSR matrices are relaxed point-wise on their block storage.
+    - The incomplete factorization smoothers, ilu0 and ic0, factor A in its
+      own sparsity pattern (of the nonzero blocks for BSR) once per level.
+      Parameter 'sweeps' (default: None) selects exact triangular solves,
+      parallel by level scheduling, or a fixed number of Jacobi sweeps on
+      each triangular system.  As for jacobi, 'omega' is scaled by the
+      spectral radius of (LU)^-1 A if 'withrho' (default: True) is set.
+      ic0 requires a Hermitian A and is symmetric.
+    - Parameter 'coloring' (default: 'MIS') of multicolor_gauss_seidel
+      selects the method of pyamg.graph.vertex_coloring.  The coloring is
+      computed once per level and stored with the level's matrix.
     - By initializing the smoothers after the hierarchy has been setup, allows
       for "algebraically" directed relaxation, such as strength_based_schwarz,
       which uses only the strong connections of a degree-of-freedom to define
@@ -84,9 +117,14 @@ def change_smoothers(ml, presmoother, postsmoother):
     - Available smoother methods::
 
         gauss_seidel
+        multicolor_gauss_seidel
         block_gauss_seidel
         jacobi
         block_jacobi
+        l1_jacobi
+        l1_gauss_seidel
+        ilu0
+        ic0
         richardson
         sor
         chebyshev
@@ -133,6 +171,8 @@ def change_smoothers(ml, presmoother, postsmoother):
 
     """
     ml.symmetric_smoothing = True
+    ml.smoother_config = {'presmoother': presmoother,
+                          'postsmoother': postsmoother}
 
     # interpret arguments into list
     if isinstance(presmoother, str) or isinstance(presmoother, tuple) or\
@@ -163,6 +203,7 @@ def change_smoothers(ml, presmoother, postsmoother):
             setup_presmoother = eval('setup_' + str(fn1))
         except NameError:
             raise NameError("invalid presmoother method: ", fn1)
+        setup_presmoother = _timed_setup(ml, setup_presmoother)
         ml.levels[i].presmoother = setup_presmoother(ml.levels[i], **kwargs1)
 
         # unpack postsmoother[i]
@@ -172,6 +213,7 @@ def change_smoothers(ml, presmoother, postsmoother):
             setup_postsmoother = eval('setup_' + str(fn2))
         except NameError:
             raise NameError("invalid postsmoother method: ", fn2)
+        setup_postsmoother = _timed_setup(ml, setup_postsmoother)
         ml.levels[i].postsmoother = setup_postsmoother(ml.levels[i], **kwargs2)
 
         # Check if symmetric smoothing scheme
@@ -215,6 +257,7 @@ def change_smoothers(ml, presmoother, postsmoother):
                 setup_postsmoother = eval('setup_' + str(fn2))
             except NameError:
                 raise NameError("invalid postsmoother method: ", fn2)
+            setup_postsmoother = _timed_setup(ml, setup_postsmoother)
             ml.levels[i].postsmoother =\
                 setup_postsmoother(ml.levels[i], **kwargs2)
 
@@ -255,6 +298,7 @@ def change_smoothers(ml, presmoother, postsmoother):
                 setup_presmoother = eval('setup_' + str(fn1))
             except NameError:
                 raise NameError("invalid presmoother method: ", fn1)
+            setup_presmoother = _timed_setup(ml, setup_presmoother)
             ml.levels[i].presmoother =\
                 setup_presmoother(ml.levels[i], **kwargs1)
 
@@ -298,6 +342,23 @@ def change_smoothers(ml, presmoother, postsmoother):
         ml.levels[i].postsmoother = setup_postsmoother(ml.levels[i], **kwargs2)
 
 
+def _timed_setup(ml, setup):
+    """Time the smoother setup on each level, if ml is profiled."""
+    if getattr(ml, 'profile', None) is None:
+        return setup
+
+    from pyamg.multilevel import _make_timer
+
+    def timed_setup(lvl, **kwargs):
+        n = [id(level) for level in ml.levels].index(id(lvl))
+        timer = _make_timer(ml.profile, 'setup', n)
+        smoother = setup(lvl, **kwargs)
+        timer.lap('smoother', lvl.A, flops=0)
+        return smoother
+
+    return timed_setup
+
+
 def rho_D_inv_A(A):
     """Return the (approx.) spectral radius of D^-1 * A.
 
@@ -309,6 +370,11 @@ def rho_D_inv_A(A):
     -------
     approximate spectral radius of diag(A)^{-1} A
 
+    Notes
+    -----
+    The estimate is cached with the values of A, see
+    pyamg.util.linalg.cached_spectral_radius.
+
     Examples
     --------
     >>> from pyamg.gallery import poisson
@@ -320,12 +386,15 @@ def rho_D_inv_A(A):
     1.0
 
     """
-    if not hasattr(A, 'rho_D_inv'):
+    def operator():
+        # D^-1 A is applied, not formed, to save a copy of A
         D_inv = get_diagonal(A, inv=True)
-        D_inv_A = scale_rows(A, D_inv, copy=True)
-        A.rho_D_inv = approximate_spectral_radius(D_inv_A)
 
-    return A.rho_D_inv
+        def matvec(x):
+            return D_inv*np.ravel(A*x)
+        return LinearOperator(A.shape, matvec, dtype=A.dtype)
+
+    return cached_spectral_radius(A, 'D_inv_A', operator)[0]
 
 
 def rho_block_D_inv_A(A, Dinv):
@@ -343,6 +412,11 @@ def rho_block_D_inv_A(A, Dinv):
     -------
     approximate spectral radius of (Dinv A)
 
+    Notes
+    -----
+    The estimate is cached with the values of A, see
+    pyamg.util.linalg.cached_spectral_radius.
+
     Examples
     --------
     >>> from pyamg.gallery import poisson
@@ -352,28 +426,71 @@ def rho_block_D_inv_A(A, Dinv):
     >>> Dinv = get_block_diag(A, blocksize=4, inv_flag=True)
 
     """
-    if not hasattr(A, 'rho_block_D_inv'):
-        from scipy.sparse.linalg import LinearOperator
-
-        blocksize = Dinv.shape[1]
-        if Dinv.shape[1] != Dinv.shape[2]:
-            raise ValueError('Dinv has incorrect dimensions')
-        elif Dinv.shape[0] != int(A.shape[0]/blocksize):
-            raise ValueError('Dinv and A have incompatible dimensions')
-
-        Dinv = sparse.bsr_matrix((Dinv,
-                                  np.arange(Dinv.shape[0]),
-                                  np.arange(Dinv.shape[0]+1)),
-                                 shape=A.shape)
+    blocksize = Dinv.shape[1]
+    if Dinv.shape[1] != Dinv.shape[2]:
+        raise ValueError('Dinv has incorrect dimensions')
+    elif Dinv.shape[0] != int(A.shape[0]/blocksize):
+        raise ValueError('Dinv and A have incompatible dimensions')
+
+    def operator():
+        D_inv = sparse.bsr_matrix((Dinv,
+                                   np.arange(Dinv.shape[0]),
+                                   np.arange(Dinv.shape[0]+1)),
+                                  shape=A.shape)
 
         # Don't explicitly form Dinv*A
         def matvec(x):
-            return Dinv*(A*x)
-        D_inv_A = LinearOperator(A.shape, matvec, dtype=A.dtype)
+            return D_inv*(A*x)
+        return LinearOperator(A.shape, matvec, dtype=A.dtype)
 
-        A.rho_block_D_inv = approximate_spectral_radius(D_inv_A)
+    return cached_spectral_radius(A, 'block_D_inv_A', operator)[0]
 
-    return A.rho_block_D_inv
+
+def rho_ilu0_inv_A(A, symmetric=False, sweeps=None):
+    """Return the (approx.) spectral radius of (LU)^-1 * A.
+
+    Parameters
+    ----------
+    A : csr_matrix
+        Sparse NxN matrix with sorted indices
+    symmetric, sweeps
+        Factorization and triangular solves, see relaxation.ilu0
+
+    Returns
+    -------
+    approximate spectral radius of (LU)^-1 A, for the ILU(0) or IC(0)
+    factors LU of A
+
+    Notes
+    -----
+    The estimate is stored with A, as A.rho_ilu0_inv or A.rho_ic0_inv, so
+    that pre and post smoothers share it, see
+    pyamg.util.linalg.cached_spectral_radius.
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.relaxation.smoothing import rho_ilu0_inv_A
+    >>> A = poisson((10,), format='csr')
+    >>> print(round(rho_ilu0_inv_A(A), 6))
+    1.0
+
+    """
+    def operator():
+        def matvec(x):
+            # (LU)^-1 A x = x - y, for y = x after relaxing A y = 0
+            x = np.ravel(x)
+            if np.iscomplexobj(x) and not np.iscomplexobj(A.data):
+                return matvec(x.real) + 1j*matvec(x.imag)
+            x = np.asarray(x, dtype=A.dtype)
+            y = x.copy()
+            relaxation.ilu0(A, y, np.zeros_like(y), symmetric=symmetric,
+                            sweeps=sweeps)
+            return x - y
+        return LinearOperator(A.shape, matvec, dtype=A.dtype)
+
+    return cached_spectral_radius(A, ('ilu0_inv_A', symmetric, sweeps),
+                                  operator)[0]
 
 
 def matrix_asformat(lvl, name, format, blocksize=None):
@@ -444,18 +561,52 @@ def matrix_asformat(lvl, name, format, blocksize=None):
 """
 
 
+def columnwise(smoother):
+    """Extend a single-vector smoother to an (n,k) block of right-hand sides.
+
+    The Krylov smoothers act on one vector at a time, so for a block x and
+    b of k > 1 columns, smoother is applied to each column in turn.
+    """
+    def block_smoother(A, x, b):
+        if x.ndim == 1 or x.shape[1] == 1:
+            smoother(A, x, b)
+        else:
+            for j in range(x.shape[1]):
+                xj = np.ascontiguousarray(x[:, j])
+                smoother(A, xj, np.ascontiguousarray(b[:, j]))
+                x[:, j] = xj
+    return block_smoother
+
+
 def setup_gauss_seidel(lvl, iterations=DEFAULT_NITER, sweep=DEFAULT_SWEEP):
     def smoother(A, x, b):
         relaxation.gauss_seidel(A, x, b, iterations=iterations, sweep=sweep)
     return smoother
 
 
-def setup_jacobi(lvl, iterations=DEFAULT_NITER, omega=1.0, withrho=True):
+def setup_multicolor_gauss_seidel(lvl, iterations=DEFAULT_NITER,
+                                  sweep=DEFAULT_SWEEP, coloring='MIS',
+                                  num_threads=None):
+    color_rows, color_ptr = relaxation.multicolor_parameters(lvl.A,
+                                                             method=coloring)
+
+    def smoother(A, x, b):
+        relaxation.multicolor_gauss_seidel(A, x, b, iterations=iterations,
+                                           sweep=sweep,
+                                           color_rows=color_rows,
+                                           color_ptr=color_ptr,
+                                           num_threads=num_threads)
+    return smoother
+
+
+def setup_jacobi(lvl, iterations=DEFAULT_NITER, omega=1.0, withrho=True,
+                 num_threads=None):
     if withrho:
         omega = omega/rho_D_inv_A(lvl.A)
 
     def smoother(A, x, b):
-        relaxation.jacobi(A, x, b, iterations=iterations, omega=omega)
+        relaxation.jacobi(A, x, b, iterations=iterations, omega=omega,
+                          num_threads=num_threads)
     return smoother
 
 
@@ -496,7 +647,7 @@ def setup_strength_based_schwarz(lvl, iterations=DEFAULT_NITER,
 
 
 def setup_block_jacobi(lvl, iterations=DEFAULT_NITER, omega=1.0, Dinv=None,
-                       blocksize=None, withrho=True):
+                       blocksize=None, withrho=True, num_threads=None):
     # Determine Blocksize
     if blocksize is None and Dinv is None:
         if sparse.isspmatrix_csr(lvl.A):
@@ -509,7 +660,7 @@ def setup_block_jacobi(lvl, iterations=DEFAULT_NITER, omega=1.0, Dinv=None,
     if blocksize == 1:
         # Block Jacobi is equivalent to normal Jacobi
         return setup_jacobi(lvl, iterations=iterations, omega=omega,
-                            withrho=withrho)
+                            withrho=withrho, num_threads=num_threads)
     else:
         # Use Block Jacobi
         if Dinv is None:
@@ -520,7 +671,8 @@ def setup_block_jacobi(lvl, iterations=DEFAULT_NITER, omega=1.0, Dinv=None,
         def smoother(A, x, b):
             relaxation.block_jacobi(A, x, b, iterations=iterations,
                                     omega=omega, Dinv=Dinv,
-                                    blocksize=blocksize)
+                                    blocksize=blocksize,
+                                    num_threads=num_threads)
         return smoother
 
 
@@ -552,12 +704,55 @@ def setup_block_gauss_seidel(lvl, iterations=DEFAULT_NITER,
         return smoother
 
 
-def setup_richardson(lvl, iterations=DEFAULT_NITER, omega=1.0):
+def setup_l1_jacobi(lvl, iterations=DEFAULT_NITER, omega=1.0,
+                    num_threads=None):
+    def smoother(A, x, b):
+        relaxation.l1_jacobi(A, x, b, iterations=iterations, omega=omega,
+                             num_threads=num_threads)
+    return smoother
+
+
+def setup_l1_gauss_seidel(lvl, iterations=DEFAULT_NITER, sweep=DEFAULT_SWEEP,
+                          partitions=None, rows_per_block=4096,
+                          num_threads=None):
+    def smoother(A, x, b):
+        relaxation.l1_gauss_seidel(A, x, b, iterations=iterations,
+                                   sweep=sweep, partitions=partitions,
+                                   rows_per_block=rows_per_block,
+                                   num_threads=num_threads)
+    return smoother
+
+
+def setup_ilu0(lvl, iterations=DEFAULT_NITER, omega=1.0, withrho=True,
+               sweeps=None, symmetric=False, num_threads=None):
+    matrix_asformat(lvl, 'A', 'csr')
+    lvl.Acsr.sort_indices()
+    relaxation.ilu0_parameters(lvl.Acsr, symmetric=symmetric)
+    if withrho:
+        omega = omega/rho_ilu0_inv_A(lvl.Acsr, symmetric=symmetric,
+                                     sweeps=sweeps)
+
+    def smoother(A, x, b):
+        relaxation.ilu0(lvl.Acsr, x, b, iterations=iterations, omega=omega,
+                        symmetric=symmetric, sweeps=sweeps,
+                        num_threads=num_threads)
+    return smoother
+
+
+def setup_ic0(lvl, iterations=DEFAULT_NITER, omega=1.0, withrho=True,
+              sweeps=None, num_threads=None):
+    return setup_ilu0(lvl, iterations=iterations, omega=omega,
+                      withrho=withrho, sweeps=sweeps, symmetric=True,
+                      num_threads=num_threads)
+
+
+def setup_richardson(lvl, iterations=DEFAULT_NITER, omega=1.0,
+                     num_threads=None):
     omega = omega/approximate_spectral_radius(lvl.A)
 
     def smoother(A, x, b):
         relaxation.polynomial(A, x, b, coefficients=[omega],
-                              iterations=iterations)
+                              iterations=iterations, num_threads=num_threads)
     return smoother
 
 
@@ -569,27 +764,52 @@ def setup_sor(lvl, omega=0.5, iterations=DEFAULT_NITER, sweep=DEFAULT_SWEEP):
 
 
 def setup_chebyshev(lvl, lower_bound=1.0/30.0, upper_bound=1.1, degree=3,
-                    iterations=DEFAULT_NITER):
-    rho = approximate_spectral_radius(lvl.A)
+                    iterations=DEFAULT_NITER, diagonal=False,
+                    num_threads=None):
+    if diagonal:
+        # the polynomial is in D^-1 A
+        rho = rho_D_inv_A(lvl.A)
+        Dinv = get_diagonal(lvl.A, inv=True)
+    else:
+        rho = approximate_spectral_radius(lvl.A)
+        Dinv = None
     a = rho * lower_bound
     b = rho * upper_bound
+
+    if lvl.A.format in ('csr', 'bsr'):
+        matrix_asformat(lvl, 'A', 'csr')
+
+        def smoother(A, x, b_):
+            relaxation.chebyshev(lvl.Acsr, x, b_, a, b, degree=degree,
+                                 Dinv=Dinv, iterations=iterations,
+                                 num_threads=num_threads)
+        return smoother
+
+    if diagonal:
+        raise TypeError('diagonal Chebyshev requires a CSR or BSR matrix')
+
     # drop the constant coefficient
     coefficients = -chebyshev_polynomial_coefficients(a, b, degree)[:-1]
 
     def smoother(A, x, b):
         relaxation.polynomial(A, x, b, coefficients=coefficients,
-                              iterations=iterations)
+                              iterations=iterations, num_threads=num_threads)
     return smoother
 
 
-def setup_jacobi_ne(lvl, iterations=DEFAULT_NITER, omega=1.0, withrho=True):
+def setup_jacobi_ne(lvl, iterations=DEFAULT_NITER, omega=1.0, withrho=True,
+                    num_threads=None):
     matrix_asformat(lvl, 'A', 'csr')
+    # the threaded sweep multiplies with A.H, keep a CSR copy of it
+    if not hasattr(lvl, 'AHcsr'):
+        lvl.AHcsr = lvl.Acsr.conj().T.tocsr()
     if withrho:
         omega = omega/rho_D_inv_A(lvl.Acsr)**2
 
     def smoother(A, x, b):
         relaxation.jacobi_ne(lvl.Acsr, x, b, iterations=iterations,
-                             omega=omega)
+                             omega=omega, num_threads=num_threads,
+                             AH=lvl.AHcsr)
     return smoother
 
 
@@ -628,14 +848,14 @@ def setup_gmres(lvl, tol=1e-12, maxiter=1, restrt=None, M=None, callback=None,
                 callback=callback,
                 residuals=residuals)[0]).reshape(
             x.shape)
-    return smoother
+    return columnwise(smoother)
 
 
 def setup_cg(lvl, tol=1e-12, maxiter=1, M=None, callback=None, residuals=None):
     def smoother(A, x, b):
         x[:] = (cg(A, b, x0=x, tol=tol, maxiter=maxiter, M=M,
                    callback=callback, residuals=residuals)[0]).reshape(x.shape)
-    return smoother
+    return columnwise(smoother)
 
 
 def setup_cgne(lvl, tol=1e-12, maxiter=1, M=None, callback=None,
@@ -652,7 +872,7 @@ def setup_cgne(lvl, tol=1e-12, maxiter=1, M=None, callback=None,
                 callback=callback,
                 residuals=residuals)[0]).reshape(
             x.shape)
-    return smoother
+    return columnwise(smoother)
 
 
 def setup_cgnr(lvl, tol=1e-12, maxiter=1, M=None, callback=None,
@@ -669,7 +889,7 @@ def setup_cgnr(lvl, tol=1e-12, maxiter=1, M=None, callback=None,
                 callback=callback,
                 residuals=residuals)[0]).reshape(
             x.shape)
-    return smoother
+    return columnwise(smoother)
 
 
 def setup_None(lvl):
@@ -7,10 +7,12 @@ from pyamg.gallery import poisson, sprand, elasticity
 from pyamg.relaxation.relaxation import gauss_seidel, jacobi,\
     block_jacobi, block_gauss_seidel, jacobi_ne, schwarz, sor,\
     gauss_seidel_indexed, polynomial, gauss_seidel_ne,\
-    gauss_seidel_nr
+    gauss_seidel_nr, multicolor_gauss_seidel, multicolor_parameters,\
+    chebyshev, l1_jacobi, l1_gauss_seidel, ilu0, ilu0_parameters
+from pyamg.relaxation.chebyshev import chebyshev_polynomial_coefficients
 from pyamg.util.utils import get_block_diag
 
-from numpy.testing import TestCase, assert_almost_equal
+from numpy.testing import TestCase, assert_almost_equal, assert_equal
 
 # Ignore efficiency warnings
 import warnings
@@ -39,6 +41,7 @@ class TestCommonRelaxation(TestCase):
         self.cases.append((sor, (0.5,), {}))
         self.cases.append((gauss_seidel_indexed, ([1, 0],), {}))
         self.cases.append((polynomial, ([0.6, 0.1],), {}))
+        self.cases.append((multicolor_gauss_seidel, (), {}))
 
     def test_single_precision(self):
 
@@ -108,8 +111,294 @@ class TestCommonRelaxation(TestCase):
 
             check_raises(ValueError, method, A, x, b, *args, **kwargs)
 
+    def test_multiple_rhs(self):
+        """a block of right-hand sides matches column-by-column relaxation"""
+        np.random.seed(0)
+        cases = self.cases + [(gauss_seidel_ne, (), {}),
+                              (gauss_seidel_nr, (), {})]
+
+        for method, args, kwargs in cases:
+            for sweep in [{}, {'sweep': 'symmetric'}]:
+                if sweep and method in [jacobi, block_jacobi, jacobi_ne,
+                                        polynomial]:
+                    continue
+                kwargs = dict(kwargs, **sweep)
+                A = poisson((10,), format='csr')
+                b = np.random.rand(A.shape[0], 3)
+                x = np.random.rand(A.shape[0], 3)
+                x_cols = x.copy()
+                method(A, x, b, *args, **kwargs)
+                for j in range(3):
+                    xj = x_cols[:, j].copy()
+                    method(A, xj, b[:, j].copy(), *args, **kwargs)
+                    assert_almost_equal(x[:, j], xj, decimal=12)
+
+        A = elasticity.linear_elasticity((4, 4), format='bsr')[0]
+        b = np.random.rand(A.shape[0], 3)
+        for method in [gauss_seidel, jacobi, block_jacobi,
+                       block_gauss_seidel, multicolor_gauss_seidel]:
+            kwargs = {}
+            if method in [block_jacobi, block_gauss_seidel]:
+                kwargs['blocksize'] = A.blocksize[0]
+            x = np.random.rand(A.shape[0], 3)
+            x_cols = x.copy()
+            method(A, x, b, iterations=2, **kwargs)
+            for j in range(3):
+                xj = x_cols[:, j].copy()
+                method(A, xj, b[:, j].copy(), iterations=2, **kwargs)
+                assert_almost_equal(x[:, j], xj, decimal=12)
+
+        # x and b must have the same number of columns
+        A = poisson((4,), format='csr')
+        check_raises(ValueError, gauss_seidel, A, np.zeros((4, 2)),
+                     np.ones((4, 3)))
+
 
 class TestRelaxation(TestCase):
+    def test_num_threads(self):
+        """threaded sweeps are bitwise identical to serial sweeps"""
+        np.random.seed(4004)
+        A = poisson((30, 30), format='csr')
+        Absr = elasticity.linear_elasticity((10, 10), format='bsr')[0]
+        Ac = A + 1j * sprand(A.shape[0], A.shape[1], 3.0 / A.shape[0])
+        Ac = (Ac + Ac.H).tocsr()
+
+        cases = [(jacobi, A, {'omega': 0.6}), (jacobi, Absr, {}),
+                 (block_jacobi, Absr, {'blocksize': 2}),
+                 (jacobi_ne, A, {'omega': 0.5}),
+                 (jacobi_ne, Ac, {'omega': 0.5}),
+                 (polynomial, A, {'coefficients': [-0.1, 0.5, 1.2]}),
+                 (polynomial, Absr, {'coefficients': [-0.1, 0.5, 1.2]}),
+                 (chebyshev, A, {'lower_bound': 0.2, 'upper_bound': 8.0}),
+                 (chebyshev, Ac, {'lower_bound': 0.2, 'upper_bound': 8.0,
+                                  'Dinv': 0.25 * np.ones(A.shape[0])}),
+                 (l1_jacobi, A, {'omega': 0.8}), (l1_jacobi, Absr, {}),
+                 (l1_jacobi, Ac, {}),
+                 (l1_gauss_seidel, A, {'partitions': 4}),
+                 (l1_gauss_seidel, Absr, {'partitions': 3,
+                                          'sweep': 'symmetric'}),
+                 (l1_gauss_seidel, Ac, {'partitions': 5,
+                                        'sweep': 'backward'}),
+                 (l1_gauss_seidel, A, {'rows_per_block': 100}),
+                 (ilu0, A, {}), (ilu0, Absr, {'symmetric': True}),
+                 (ilu0, Ac, {'symmetric': True, 'sweeps': 2})]
+
+        for method, A, kwargs in cases:
+            for k in [1, 3]:
+                shape = (A.shape[0],) if k == 1 else (A.shape[0], k)
+                b = np.random.rand(*shape).astype(A.dtype)
+                x0 = np.random.rand(*shape).astype(A.dtype)
+                x1 = x0.copy()
+                method(A, x1, b, iterations=2, num_threads=1, **kwargs)
+                for num_threads in [2, 3]:
+                    xt = x0.copy()
+                    method(A, xt, b, iterations=2, num_threads=num_threads,
+                           **kwargs)
+                    assert_equal(xt, x1)
+
+    def test_chebyshev(self):
+        """the recurrence gives the Chebyshev polynomial smoother"""
+        np.random.seed(4006)
+        A = poisson((10, 10), format='csr')
+        Ac = (A + 1j * 0.1 * A).tocsr()
+        E = elasticity.linear_elasticity((6, 6), format='bsr')[0]
+        for A in [A, Ac, E]:
+            Dinv = 1.0 / A.diagonal()
+            D = spdiags(Dinv, [0], A.shape[0], A.shape[0], format='csr')
+            for k in [1, 2]:
+                shape = (A.shape[0],) if k == 1 else (A.shape[0], k)
+                b = np.random.rand(*shape).astype(A.dtype)
+                x0 = np.random.rand(*shape).astype(A.dtype)
+                for degree in [1, 2, 4]:
+                    # x + p(D^-1 A) D^-1 (b - A x), twice, with the bounds
+                    # from Gershgorin's theorem
+                    rho = abs(D * A).sum(axis=1).max()
+                    coefficients = -chebyshev_polynomial_coefficients(
+                        rho / 30, 1.1 * rho, degree)[:-1]
+                    x = x0.copy()
+                    for i in range(2):
+                        h = coefficients[0] * (D * (b - A * x))
+                        for c in coefficients[1:]:
+                            h = c * (D * (b - A * x)) + D * (A * h)
+                        x = x + h
+                    xc = x0.copy()
+                    chebyshev(A, xc, b, rho / 30, 1.1 * rho, degree=degree,
+                              Dinv=Dinv, iterations=2)
+                    assert_almost_equal(xc, x)
+
+                    # without Dinv, the polynomial is in A
+                    rho = abs(A).sum(axis=1).max()
+                    coefficients = -chebyshev_polynomial_coefficients(
+                        rho / 30, 1.1 * rho, degree)[:-1]
+                    x = x0.copy()
+                    polynomial(A, x, b, coefficients, iterations=2)
+                    xc = x0.copy()
+                    chebyshev(A, xc, b, rho / 30, 1.1 * rho, degree=degree,
+                              iterations=2)
+                    assert_almost_equal(xc, x)
+
+    def test_l1_smoothers(self):
+        """compare to a dense implementation of the l1 smoothers"""
+        np.random.seed(4007)
+        A = poisson((8, 8), format='csr')
+        Ac = (A + 1j * 0.1 * A).tocsr()
+        E = elasticity.linear_elasticity((5, 5), format='bsr')[0]
+        for A in [A, Ac, E]:
+            n = A.shape[0]
+            blocksize = 1 if A.format == 'csr' else A.blocksize[0]
+            Ad = A.toarray()
+            b = np.random.rand(n).astype(A.dtype)
+            x0 = np.random.rand(n).astype(A.dtype)
+
+            # l1-Jacobi
+            l1 = abs(Ad).sum(axis=1) - abs(np.diag(Ad))
+            x = x0.copy()
+            for i in range(2):
+                x = x + 0.7 * (b - np.dot(Ad, x)) / (np.diag(Ad) + l1)
+            xl1 = x0.copy()
+            l1_jacobi(A, xl1, b, iterations=2, omega=0.7)
+            assert_almost_equal(xl1, x)
+
+            # hybrid l1-Gauss-Seidel, partitions by (block) rows
+            n_brow = int(n / blocksize)
+            for partitions in [1, 3]:
+                part = np.zeros(n, dtype=int)
+                for p in range(partitions):
+                    lo = n_brow * p // partitions
+                    hi = n_brow * (p + 1) // partitions
+                    part[lo*blocksize:hi*blocksize] = p
+                x = x0.copy()
+                for rows in [range(n), range(n - 1, -1, -1)]:
+                    xold = x.copy()
+                    for i in rows:
+                        inside = part == part[i]
+                        xi = np.where(inside, x, xold)
+                        l1 = abs(Ad[i, ~inside]).sum()
+                        x[i] += (b[i] - np.dot(Ad[i], xi)) / (Ad[i, i] + l1)
+                xl1 = x0.copy()
+                l1_gauss_seidel(A, xl1, b, sweep='symmetric',
+                                partitions=partitions)
+                assert_almost_equal(xl1, x)
+
+            # a single partition is Gauss-Seidel
+            x = x0.copy()
+            gauss_seidel(A.tocsr(), x, b, iterations=2, sweep='backward')
+            xl1 = x0.copy()
+            l1_gauss_seidel(A, xl1, b, iterations=2, sweep='backward',
+                            partitions=1)
+            assert_almost_equal(xl1, x)
+
+    def test_ilu0(self):
+        """compare to a dense incomplete factorization"""
+        np.random.seed(4008)
+        A = poisson((6, 6), format='csr')
+        N = sprand(A.shape[0], A.shape[1], 2.0 / A.shape[0])
+        An = (A + 0.2 * N).tocsr()
+        Ac = A + 1j * 0.3 * N
+        Ac = (Ac + Ac.H).tocsr()
+        E = elasticity.linear_elasticity((4, 4), format='bsr')[0]
+        for A, symmetric in [(An, False), (Ac, True), (Ac, False),
+                             (E, True)]:
+            n = A.shape[0]
+            Ad = A.toarray()
+            # explicit zeros of the BSR blocks are in the pattern
+            S = A.tocsr(copy=True)
+            S.data[:] = 1
+            pattern = S.toarray() != 0
+
+            # ILU(0) of the dense matrix in the pattern of A
+            LU = Ad.copy()
+            for i in range(n):
+                for k in range(i):
+                    if pattern[i, k]:
+                        LU[i, k] /= LU[k, k]
+                        row = pattern[i, k+1:] & pattern[k, k+1:]
+                        LU[i, k+1:][row] -= LU[i, k] * LU[k, k+1:][row]
+            L = np.tril(LU, -1) + np.eye(n)
+            U = np.triu(LU)
+            if symmetric:
+                U = np.dot(np.diag(np.diag(U)), L.conj().T)
+
+            b = np.random.rand(n).astype(A.dtype)
+            x0 = np.random.rand(n).astype(A.dtype)
+            x = x0.copy()
+            for i in range(2):
+                x = x + 0.8 * solve(np.dot(L, U), b - np.dot(Ad, x))
+
+            for sweeps in [None, n]:
+                xilu = x0.copy()
+                ilu0(A, xilu, b, iterations=2, omega=0.8,
+                     symmetric=symmetric, sweeps=sweeps)
+                assert_almost_equal(xilu, x)
+
+        # rows in the same level of the forward solve are not coupled
+        A = poisson((5, 5), format='csr')
+        LUx, diag, L_rows, L_ptr, U_rows, U_ptr = ilu0_parameters(A)
+        assert_equal(L_ptr.shape[0] - 1, 9)
+        for rows, ptr in [(L_rows, L_ptr), (U_rows, U_ptr)]:
+            assert_equal(np.sort(rows), np.arange(A.shape[0]))
+            for level in range(ptr.shape[0] - 1):
+                r = rows[ptr[level]:ptr[level+1]]
+                assert_equal(A[r, :][:, r].nnz, r.shape[0])
+
+        # a zero pivot is avoided by a diagonal shift
+        A = csr_matrix(np.array([[1.0, 1.0], [1.0, 1.0]]))
+        LUx, diag = ilu0_parameters(A)[:2]
+        assert(np.all(LUx[diag] != 0))
+        check_raises(ValueError, ilu0_parameters,
+                     csr_matrix(np.array([[1.0, 1.0], [0.0, 0.0]])))
+
+    def test_multicolor_gauss_seidel(self):
+        """compare to Gauss-Seidel in the order of the coloring"""
+        np.random.seed(4005)
+        for method in ['MIS', 'JP', 'LDF']:
+            A = poisson((12, 12), format='csr')
+            color_rows, color_ptr = multicolor_parameters(A, method=method)
+            assert_equal(np.sort(color_rows), np.arange(A.shape[0]))
+            # rows of the same color are not coupled
+            for c in range(color_ptr.shape[0] - 1):
+                rows = color_rows[color_ptr[c]:color_ptr[c+1]]
+                Ac = A[rows, :][:, rows]
+                assert_equal(Ac.nnz, len(rows))
+            # the coloring is stored with A
+            assert(multicolor_parameters(A, method=method)[0] is color_rows)
+
+            b = np.random.rand(A.shape[0])
+            x0 = np.random.rand(A.shape[0])
+            for sweep in ['forward', 'backward', 'symmetric']:
+                x = x0.copy()
+                multicolor_gauss_seidel(A, x, b, iterations=2, sweep=sweep,
+                                        color_rows=color_rows,
+                                        color_ptr=color_ptr)
+                xi = x0.copy()
+                gauss_seidel_indexed(A, xi, b, color_rows, iterations=2,
+                                     sweep=sweep)
+                assert_almost_equal(x, xi, decimal=14)
+
+        # BSR matches bsr Gauss-Seidel on the permuted system
+        A = elasticity.linear_elasticity((6, 6), format='bsr')[0]
+        color_rows, color_ptr = multicolor_parameters(A)
+        perm = (2 * color_rows[:, None] + np.arange(2)).ravel()
+        Ap = A.tocsr()[perm, :][:, perm].tobsr(blocksize=(2, 2))
+        b = np.random.rand(A.shape[0])
+        x0 = np.random.rand(A.shape[0])
+        for sweep in ['forward', 'backward', 'symmetric']:
+            x = x0.copy()
+            multicolor_gauss_seidel(A, x, b, iterations=2, sweep=sweep)
+            xp = x0[perm].copy()
+            gauss_seidel(Ap, xp, b[perm], iterations=2, sweep=sweep)
+            assert_almost_equal(x[perm], xp, decimal=12)
+
+        # the result does not depend on the number of threads
+        A = poisson((20, 20), format='csr')
+        b = np.random.rand(A.shape[0], 2)
+        x0 = np.random.rand(A.shape[0], 2)
+        x1 = x0.copy()
+        multicolor_gauss_seidel(A, x1, b, sweep='symmetric', num_threads=1)
+        x3 = x0.copy()
+        multicolor_gauss_seidel(A, x3, b, sweep='symmetric', num_threads=3)
+        assert_equal(x1, x3)
+
     def test_polynomial(self):
         N = 3
         A = spdiags([2 * np.ones(N), -np.ones(N), -np.ones(N)], [0, -1, 1], N, N,
@@ -1,24 +1,34 @@
+import numpy as np
+import scipy as sp
+
 from pyamg.gallery import poisson
 from pyamg import smoothed_aggregation_solver
-from pyamg.util.utils import profile_solver
+from pyamg.util.utils import profile_solver, set_num_threads
 from pyamg.relaxation.smoothing import change_smoothers
 
-from numpy.testing import TestCase
+from numpy.testing import TestCase, assert_equal, assert_array_almost_equal
 
 methods = [('gauss_seidel', {'sweep': 'symmetric'}),
            'jacobi',
            'richardson',
            ('sor', {'sweep': 'symmetric'}),
            'chebyshev',
+           ('chebyshev', {'diagonal': True, 'degree': 2}),
+           'l1_jacobi',
+           ('l1_gauss_seidel', {'sweep': 'symmetric', 'partitions': 3}),
+           'ic0',
+           ('ic0', {'sweeps': 2}),
            ('gauss_seidel_ne', {'sweep': 'symmetric'}),
            'jacobi_ne',
            ('gauss_seidel_nr', {'sweep': 'symmetric'}),
            ('schwarz', {'sweep': 'symmetric'}),
-           ('strength_based_schwarz', {'sweep': 'symmetric'})]
+           ('strength_based_schwarz', {'sweep': 'symmetric'}),
+           ('multicolor_gauss_seidel', {'sweep': 'symmetric'})]
 
 methods2 = [('gauss_seidel', 'richardson'),
             ('gauss_seidel', 'jacobi'),
             ('chebyshev', 'sor'),
+            ('ilu0', 'ic0'),
             (['gauss_seidel', 'chebyshev'], ['sor', 'jacobi']),
             ('gauss_seidel_ne', 'jacobi_ne'),
             (['gauss_seidel_ne', 'gauss_seidel_nr'], 'jacobi_ne'),
@@ -43,7 +53,9 @@ methods3 = [[[('gauss_seidel', {'sweep': 'forward'}), None],
             [[('jacobi_ne', {'iterations': 2}),
               ('block_jacobi', {'iterations': 1})],
              [('jacobi_ne', {'iterations': 2}),
-              ('block_jacobi', {'iterations': 1})]]]
+              ('block_jacobi', {'iterations': 1})]],
+            [[('multicolor_gauss_seidel', {'sweep': 'forward'}), None],
+             [('multicolor_gauss_seidel', {'sweep': 'backward'}), None]]]
 
 # Non-symmetric smoothing schemes
 methods4 = [[[('gauss_seidel', {'sweep': 'forward'}), None],
@@ -63,7 +75,8 @@ methods4 = [[[('gauss_seidel', {'sweep': 'forward'}), None],
             [[('jacobi_ne', {'iterations': 1}),
               ('block_jacobi', {'iterations': 1})],
              [('jacobi_ne', {'iterations': 2}),
-              ('block_jacobi', {'iterations': 1})]]]
+              ('block_jacobi', {'iterations': 1})]],
+            [['ilu0', None], ['ilu0', None]]]
 
 
 class TestSmoothing(TestCase):
@@ -97,3 +110,69 @@ class TestSmoothing(TestCase):
             ml = smoothed_aggregation_solver(A, max_coarse=10)
             change_smoothers(ml, presmoother=method[0], postsmoother=method[1])
             assert(not ml.symmetric_smoothing)
+
+    def test_num_threads(self):
+        """threaded smoothers do not change the result of a solve"""
+        np.random.seed(4009)
+        A = poisson((50, 50), format='csr')
+        b = np.random.rand(A.shape[0])
+        for method in ['jacobi', 'chebyshev', 'l1_jacobi',
+                       ('l1_gauss_seidel', {'rows_per_block': 300}),
+                       'l1_gauss_seidel', 'multicolor_gauss_seidel', 'ic0',
+                       'jacobi_ne']:
+            ml = smoothed_aggregation_solver(A, presmoother=method,
+                                             postsmoother=method,
+                                             max_coarse=10)
+            x1 = ml.solve(b, maxiter=3, tol=1e-30)
+            try:
+                set_num_threads(3)
+                x3 = ml.solve(b, maxiter=3, tol=1e-30)
+            finally:
+                set_num_threads()
+            assert_equal(x3, x1)
+
+    def test_jacobi_ne_AH(self):
+        """jacobi_ne keeps A.H on the level instead of forming it per call"""
+        A = poisson((20, 20), format='csr')
+        U = sp.sparse.triu(A, k=1)
+        A = (A + 1j * (U - U.T)).tocsr()
+        ml = smoothed_aggregation_solver(A, presmoother='jacobi_ne',
+                                         postsmoother='jacobi_ne',
+                                         max_coarse=10)
+        for lvl in ml.levels[:-1]:
+            assert_array_almost_equal(lvl.AHcsr.toarray(),
+                                      lvl.A.H.toarray())
+        AH = ml.levels[0].AHcsr
+        b = np.random.rand(A.shape[0])
+        try:
+            set_num_threads(3)
+            ml.solve(b, maxiter=2)
+        finally:
+            set_num_threads()
+        assert(ml.levels[0].AHcsr is AH)
+
+        # update drops the copy of the old operator
+        ml.update(2.0 * A)
+        assert(ml.levels[0].AHcsr is not AH)
+        assert_array_almost_equal(ml.levels[0].AHcsr.toarray(),
+                                  2.0 * AH.toarray())
+
+    def test_rho_ilu0_inv_A(self):
+        """the ILU(0) estimates are cached and invalidated with A"""
+        from pyamg.relaxation.smoothing import rho_ilu0_inv_A
+        from pyamg.util.linalg import invalidate_spectral_radius
+        A = poisson((10, 10), format='csr')
+        rho = rho_ilu0_inv_A(A)
+        rho_ic = rho_ilu0_inv_A(A, symmetric=True, sweeps=2)
+        assert_equal(A.rho_ilu0_inv, rho)
+        assert_equal(A.rho_ic0_inv_2, rho_ic)
+        A.rho_ilu0_inv = 4.2
+        assert_equal(rho_ilu0_inv_A(A), 4.2)
+
+        # (LU)^-1 A is unchanged for 2 A, up to the accuracy of the estimate
+        A.data *= 2.0
+        invalidate_spectral_radius(A)
+        assert(not hasattr(A, 'rho_ilu0_inv'))
+        assert(not hasattr(A, 'rho_ic0_inv_2'))
+        del A.ilu0_parameters
+        assert(abs(rho_ilu0_inv_A(A) - rho) < 0.01 * rho)
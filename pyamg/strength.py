@@ -318,10 +318,13 @@ def symmetric_strength_of_connection(A, theta=0):
         raise TypeError('expected csr_matrix or bsr_matrix')
 
     # Strength represents "distance", so take the magnitude
-    S.data = np.abs(S.data)
+    if np.iscomplexobj(S.data):
+        S.data = np.abs(S.data)
+    else:
+        np.abs(S.data, out=S.data)
 
-    # Scale S by the largest magnitude entry in each row
-    S = scale_rows_by_largest_entry(S)
+    # Scale S by the largest magnitude entry in each row, S is a new matrix
+    S = scale_rows_by_largest_entry(S, copy=False)
 
     return S
 
@@ -402,6 +405,7 @@ def energy_based_strength_of_connection(A, theta=0.0, k=2):
         bsr_flag = False
 
     # Convert A to csc and Atilde to csr
+    A_in = A
     if sparse.isspmatrix_csr(A):
         Atilde = A.copy()
         A = A.tocsc()
@@ -410,16 +414,15 @@ def energy_based_strength_of_connection(A, theta=0.0, k=2):
         Atilde = A.copy()
         Atilde = Atilde.tocsr()
 
-    # Calculate the weighted-Jacobi parameter
-    from pyamg.util.linalg import approximate_spectral_radius
+    # Calculate the weighted-Jacobi parameter, the estimate of rho(D^-1 A)
+    # is cached with the values of A
+    from pyamg.relaxation.smoothing import rho_D_inv_A
     D = A.diagonal()
     Dinv = 1.0 / D
     Dinv[D == 0] = 0.0
     Dinv = sparse.csc_matrix((Dinv, (np.arange(A.shape[0]),
                                      np.arange(A.shape[1]))), shape=A.shape)
-    DinvA = Dinv * A
-    omega = 1.0 / approximate_spectral_radius(DinvA)
-    del DinvA
+    omega = 1.0 / rho_D_inv_A(A_in)
 
     # Approximate A-inverse with k steps of w-Jacobi and a zero initial guess
     S = sparse.csc_matrix(A.shape, dtype=A.dtype)  # empty matrix
@@ -534,6 +537,7 @@ def evolution_strength_of_connection(A, B=None, epsilon=4.0, k=2,
     # local imports for evolution_strength_of_connection
     from pyamg.util.utils import scale_rows, get_block_diag, scale_columns
     from pyamg.util.linalg import approximate_spectral_radius
+    from pyamg.relaxation.smoothing import rho_D_inv_A, rho_block_D_inv_A
 
     # ====================================================================
     # Check inputs
@@ -556,6 +560,7 @@ def evolution_strength_of_connection(A, B=None, epsilon=4.0, k=2,
 
     # Pre-process A.  We need A in CSR, to be devoid of explicit 0's and have
     # sorted indices
+    A_in = A
     if (not sparse.isspmatrix_csr(A)):
         csrflag = False
         numPDEs = A.blocksize[0]
@@ -592,8 +597,15 @@ def evolution_strength_of_connection(A, B=None, epsilon=4.0, k=2,
     NullDim = Bmat.shape[1]
 
     # Get spectral radius of Dinv*A, this will be used to scale the time step
-    # size for the ODE
-    rho_DinvA = approximate_spectral_radius(Dinv_A)
+    # size for the ODE.  Unless D has zeros, Dinv*A is the operator of the
+    # Jacobi smoothers, and the estimate is cached with the values of A.
+    if not csrflag and block_flag:
+        rho_DinvA = rho_block_D_inv_A(A_in, get_block_diag(
+            A_in, blocksize=numPDEs, inv_flag=True))
+    elif np.all(D != 0):
+        rho_DinvA = rho_D_inv_A(A_in)
+    else:
+        rho_DinvA = approximate_spectral_radius(Dinv_A)
 
     # Calculate D_A for later use in the minimization problem
     if proj_type == "D_A":
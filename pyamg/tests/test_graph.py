@@ -168,6 +168,43 @@ class TestGraph(TestCase):
 
                 distances, clusters, centers = lloyd_cluster(G, n_seeds)
 
+            # with random edge lengths there are no ties, so the threaded
+            # kernel gives the serial clustering
+            seeds = np.random.permutation(G.shape[0])[:3]
+            expected = lloyd_cluster(G, seeds, num_threads=1)
+            for num_threads in [2, 3]:
+                result = lloyd_cluster(G, seeds, num_threads=num_threads)
+                assert_equal(result[0], expected[0])
+                assert_equal(result[1], expected[1])
+                assert_equal(result[2], expected[2])
+
+    def test_index_types(self):
+        # int64 indices give the same results as int indices
+        for G in self.cases:
+            G = sparse.csr_matrix(G)
+            G64 = G.copy()
+            G64.indptr = G64.indptr.astype(np.int64)
+            G64.indices = G64.indices.astype(np.int64)
+
+            mis = maximal_independent_set(G64)
+            assert_equal(mis.dtype, np.int64)
+            assert_equal(mis, maximal_independent_set(G))
+            for method in ['MIS', 'JP', 'LDF']:
+                np.random.seed(0)
+                c32 = vertex_coloring(G, method=method)
+                np.random.seed(0)
+                c64 = vertex_coloring(G64, method=method)
+                assert_equal(c64, c32)
+
+            G.data = np.random.rand(G.nnz)
+            G64.data = G.data
+            seeds = np.arange(0, G.shape[0], 7)
+            D32, S32 = bellman_ford(G, seeds)
+            D64, S64 = bellman_ford(G64, seeds)
+            assert_equal(S64.dtype, np.int64)
+            assert_equal(D64, D32)
+            assert_equal(S64, S32)
+
 
 class TestComplexGraph(TestCase):
     def setUp(self):
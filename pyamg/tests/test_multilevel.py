@@ -30,7 +30,7 @@ class TestMultilevel(TestCase):
         # method should be almost exact for small matrices
         for A in cases:
             for solver in ['splu', 'pinv', 'pinv2', 'lu', 'cholesky',
-                           'cg', fn]:
+                           'cg', 'direct', fn]:
                 s = coarse_grid_solver(solver)
 
                 b = np.arange(A.shape[0], dtype=A.dtype)
@@ -42,6 +42,56 @@ class TestMultilevel(TestCase):
                 x = s(A, b)
                 assert_almost_equal(A*x, b)
 
+    def test_direct_coarse_solver(self):
+        np.random.seed(2121)
+
+        # sparse and dense factorizations, with zero rows and columns
+        A = poisson((30, 30), format='csr')
+        Z = sparse.csr_matrix((2, 2))
+        cases = [A, sparse.block_diag([A, Z], format='csr'),
+                 sparse.block_diag([poisson((5, 5)), Z], format='csr')]
+        for A in cases:
+            for solver in ['splu', 'direct']:
+                s = coarse_grid_solver(solver)
+                b = np.random.rand(A.shape[0], 2)
+                b[A.getnnz(axis=1) == 0] = 0
+                assert_almost_equal(A * s(A, b), b)
+
+                # the symbolic analysis is kept for the same pattern
+                s.refactor()
+                analysis = getattr(s, 'analysis', None)
+                x = s(2.0 * A, b)
+                assert_almost_equal(2.0 * A * x, b)
+                assert(getattr(s, 'analysis', None) is analysis)
+
+                # and recomputed for a new pattern
+                s.refactor()
+                D = sparse.diags(1.0 * (A.getnnz(axis=1) > 0))
+                B = A + D * sparse.eye(A.shape[0], k=3) * D
+                assert_almost_equal(B * s(B, b), b)
+
+        # singular matrices fall back to the pseudoinverse
+        for A in [poisson((4, 4), format='csr'),
+                  poisson((30, 30), format='csr')]:
+            A = A - sparse.diags(np.ravel(A.sum(axis=1)), format='csr')
+            b = np.random.rand(A.shape[0])
+            b -= b.mean()
+            assert_almost_equal(A * coarse_grid_solver('direct')(A, b), b)
+
+        # update keeps the analysis of the coarse solver
+        from pyamg import smoothed_aggregation_solver
+        A = poisson((50, 50), format='csr')
+        ml = smoothed_aggregation_solver(A, max_coarse=500,
+                                         coarse_solver='direct')
+        b = np.random.rand(A.shape[0])
+        ml.solve(b)
+        analysis = ml.coarse_solver.analysis
+        assert(analysis is not None)
+        ml.update(2.0 * A)
+        x = ml.solve(b, tol=1e-8)
+        assert(ml.coarse_solver.analysis is analysis)
+        assert(np.linalg.norm(b - 2.0 * A * x) < 1e-7 * np.linalg.norm(b))
+
     def test_aspreconditioner(self):
         from pyamg import smoothed_aggregation_solver
         from scipy.sparse.linalg import cg
@@ -140,6 +190,728 @@ class TestMultilevel(TestCase):
         assert_equal(mg.cycle_complexity(cycle='AMLI'), 388.0/100.0)  # 2,4,8,4
         assert_equal(mg.cycle_complexity(cycle='F'), 366.0/100.0)  # 2,4,6,3
 
+    def test_coarse_solve_complexity(self):
+        from pyamg import smoothed_aggregation_solver, ruge_stuben_solver,\
+            rootnode_solver
+        from pyamg.multilevel import _coarse_solve_work
+
+        # dense solvers are counted by their operation counts
+        levels = []
+        levels.append(multilevel_solver.level())
+        levels[0].A = sparse.csr_matrix(np.ones((10, 10)))
+        levels[0].P = sparse.csr_matrix(np.ones((10, 5)))
+        levels.append(multilevel_solver.level())
+        levels[1].A = sparse.csr_matrix(np.ones((5, 5)))
+        for solver, setup, solve in [('lu', 125.0/3, 25.0),
+                                     ('cholesky', 125.0/6, 25.0),
+                                     ('pinv2', 1250.0, 25.0),
+                                     ('jacobi', 0.0, 250.0),
+                                     (None, 0.0, 0.0)]:
+            mg = multilevel_solver(levels, coarse_solver=solver)
+            # the setup is amortized over 10 cycles
+            assert_almost_equal(mg.coarse_solve_complexity(),
+                                (solve + setup / 10) / 100.0)
+            assert_almost_equal(mg.cycle_complexity(coarse_solve=True),
+                                2.0 + mg.coarse_solve_complexity())
+            assert_equal(mg.cycle_complexity(), 2.25)
+
+        # sparse LU is counted by the nonzeros of the factors
+        A = poisson((20, 20), format='csr')
+        setup, solve = _coarse_solve_work(A, 'splu')
+        assert(A.nnz < solve < 10 * A.nnz)
+        assert(0 < setup < A.shape[0]**3)
+
+        # max_coarse='auto' picks the cheapest coarsest level, coarsening
+        # stops once the cost estimate rises, so that at most one level is
+        # built in vain
+        from pyamg.multilevel import _coarsest_level
+        A = poisson((100, 100), format='csr')
+        b = np.random.rand(A.shape[0])
+        select = _coarsest_level.select
+        built = []
+
+        def counted(self, levels, store=None):
+            built.append(len(levels))
+            return select(self, levels, store)
+
+        for setup in [smoothed_aggregation_solver, ruge_stuben_solver,
+                      rootnode_solver]:
+            for solver in ['pinv2', 'splu', 'cg']:
+                try:
+                    _coarsest_level.select = counted
+                    ml = setup(A, max_coarse='auto', coarse_solver=solver,
+                               max_levels=20)
+                finally:
+                    _coarsest_level.select = select
+                assert(built[-1] <= len(ml.levels) + 1)
+                cost = ml.cycle_complexity(coarse_solve=True)
+                for max_coarse in [10, 50, 200, 1000]:
+                    ml_fixed = setup(A, max_coarse=max_coarse,
+                                     coarse_solver=solver, max_levels=20)
+                    fixed = ml_fixed.cycle_complexity(coarse_solve=True)
+                    assert(cost < fixed + 0.05)
+
+                res = []
+                ml.solve(b, tol=1e-8, residuals=res)
+                assert(res[-1] < 1e-8 * res[0])
+
+    def test_work_vectors(self):
+        from pyamg import smoothed_aggregation_solver, ruge_stuben_solver
+        from pyamg.gallery import linear_elasticity
+        np.random.seed(2001)
+
+        cases = []
+        A = poisson((30, 30), format='csr')
+        cases.append((A, smoothed_aggregation_solver(A, max_coarse=10)))
+        cases.append((A, ruge_stuben_solver(A, max_coarse=10)))
+        A, B = linear_elasticity((20, 20), format='bsr')
+        cases.append((A, smoothed_aggregation_solver(A, B=B, max_coarse=10)))
+
+        for A, ml in cases:
+            b = np.random.rand(A.shape[0])
+            for cycle in ['V', 'W', 'F', 'AMLI']:
+                x = ml.solve(b, maxiter=2, cycle=cycle)
+
+                # reference cycle with explicit temporaries
+                xr = np.zeros_like(b)
+                for i in range(2):
+                    self._cycle(ml, 0, xr, b, cycle)
+                assert_almost_equal(x, xr)
+
+            # work vectors are allocated once and reused
+            work = [level.work_r for level in ml.levels[:-1]]
+            ml.solve(b, maxiter=2)
+            for level, r in zip(ml.levels[:-1], work):
+                assert(level.work_r is r)
+
+    def _cycle(self, ml, lvl, x, b, cycle):
+        A = ml.levels[lvl].A
+        ml.levels[lvl].presmoother(A, x, b)
+        coarse_b = ml.levels[lvl].R * (b - A * x)
+        coarse_x = np.zeros_like(coarse_b)
+        if lvl == len(ml.levels) - 2:
+            coarse_x[:] = ml.coarse_solver(ml.levels[-1].A, coarse_b)
+        elif cycle == 'AMLI':
+            Ac = ml.levels[lvl + 1].A
+            p = np.zeros((2, coarse_b.shape[0]), dtype=coarse_b.dtype)
+            beta = np.zeros((2, 2), dtype=coarse_b.dtype)
+            for k in range(2):
+                p[k, :] = 1
+                self._cycle(ml, lvl + 1, p[k, :], coarse_b, cycle)
+                for j in range(k):
+                    beta[k, j] = np.inner(p[j, :].conj(), Ac * p[k, :]) /\
+                        np.inner(p[j, :].conj(), Ac * p[j, :])
+                    p[k, :] -= beta[k, j] * p[j, :]
+                Ap = Ac * p[k, :]
+                alpha = np.inner(p[k, :].conj(), coarse_b) /\
+                    np.inner(p[k, :].conj(), Ap)
+                coarse_x += alpha * p[k, :]
+                coarse_b -= alpha * Ap
+        else:
+            self._cycle(ml, lvl + 1, coarse_x, coarse_b, cycle)
+            if cycle == 'W':
+                self._cycle(ml, lvl + 1, coarse_x, coarse_b, cycle)
+            elif cycle == 'F':
+                self._cycle(ml, lvl + 1, coarse_x, coarse_b, 'V')
+        x += ml.levels[lvl].P * coarse_x
+        ml.levels[lvl].postsmoother(A, x, b)
+
+    def test_matvec_kernels(self):
+        from pyamg import amg_core
+        np.random.seed(2002)
+
+        A = sparse.random(20, 12, density=0.3, format='csr')
+        x = np.random.rand(12)
+        b = np.random.rand(20)
+
+        y = b.copy()
+        amg_core.csr_matvec(20, 12, A.indptr, A.indices, A.data, x, y, 1, 1)
+        assert_almost_equal(y, b + A * x)
+
+        Acsc = A.tocsc()
+        y = b.copy()
+        amg_core.csc_matvec(20, 12, Acsc.indptr, Acsc.indices, Acsc.data,
+                            x, y, 1)
+        assert_almost_equal(y, b + A * x)
+
+        r = np.empty_like(b)
+        amg_core.csr_residual(20, 12, A.indptr, A.indices, A.data, x, b, r,
+                              1, 1)
+        assert_almost_equal(r, b - A * x)
+
+        Absr = A.tobsr(blocksize=(4, 3))
+        y = b.copy()
+        amg_core.bsr_matvec(5, 4, 4, 3, Absr.indptr, Absr.indices,
+                            np.ravel(Absr.data), x, y, 1, 1)
+        assert_almost_equal(y, b + A * x)
+        amg_core.bsr_residual(5, 4, 4, 3, Absr.indptr, Absr.indices,
+                              np.ravel(Absr.data), x, b, r, 1, 1)
+        assert_almost_equal(r, b - A * x)
+
+        # k right-hand sides stored row-wise in (n,k) arrays
+        X = np.random.rand(12, 3)
+        B = np.random.rand(20, 3)
+        Y = B.copy()
+        amg_core.csr_matvec(20, 12, A.indptr, A.indices, A.data,
+                            np.ravel(X), np.ravel(Y), 3, 2)
+        assert_almost_equal(Y, B + A * X)
+        Y = B.copy()
+        amg_core.csc_matvec(20, 12, Acsc.indptr, Acsc.indices, Acsc.data,
+                            np.ravel(X), np.ravel(Y), 3)
+        assert_almost_equal(Y, B + A * X)
+        Y = B.copy()
+        amg_core.bsr_matvec(5, 4, 4, 3, Absr.indptr, Absr.indices,
+                            np.ravel(Absr.data), np.ravel(X), np.ravel(Y), 3,
+                            2)
+        assert_almost_equal(Y, B + A * X)
+        R = np.empty_like(B)
+        amg_core.csr_residual(20, 12, A.indptr, A.indices, A.data,
+                              np.ravel(X), np.ravel(B), np.ravel(R), 3, 2)
+        assert_almost_equal(R, B - A * X)
+        R = np.empty_like(B)
+        amg_core.bsr_residual(5, 4, 4, 3, Absr.indptr, Absr.indices,
+                              np.ravel(Absr.data), np.ravel(X), np.ravel(B),
+                              np.ravel(R), 3, 2)
+        assert_almost_equal(R, B - A * X)
+
+    def test_residual_restrict(self):
+        from pyamg import amg_core
+        from pyamg.multilevel import _residual_restrict
+        from pyamg.util.utils import set_num_threads
+        np.random.seed(3113)
+
+        A = sparse.random(24, 24, density=0.3, format='csr') + \
+            1j * sparse.random(24, 24, density=0.3, format='csr')
+        P = sparse.random(24, 6, density=0.4, format='csr') + \
+            1j * sparse.random(24, 6, density=0.4, format='csr')
+
+        cases = [(A, P.H.tocsr()), (A, P.H),
+                 (A.tobsr(blocksize=(4, 4)), P.H),
+                 (A.tobsr(blocksize=(2, 2)), P.tobsr(blocksize=(2, 3)).H),
+                 (A, P.tobsr(blocksize=(1, 3)).H),
+                 (A.tocsc(), P.H), (A.real.tocsr(), P.real.T.tocsr())]
+
+        # R = P.T uses the fused kernel with one thread
+        Ar, Pr = A.real.copy(), P.real.copy()
+        Pb = P.tobsr(blocksize=(2, 3))
+        fused = [(Ar, Pr, Pr.T.tocsr()), (A, P, P.T.tocsr()),
+                 (A.tobsr(blocksize=(2, 2)), Pb, Pb.T),
+                 (Ar.tobsr(blocksize=(4, 1)), Pr.tobsr(blocksize=(4, 3)),
+                  Pr.tobsr(blocksize=(4, 3)).T)]
+        cases = [(A, None, R) for A, R in cases] + fused
+
+        for A, P, R in cases:
+            level = multilevel_solver.level()
+            level.A = A
+            level.R = R
+            if P is not None:
+                level.P = P
+            for k in [1, 3]:
+                shape = (A.shape[0],) if k == 1 else (A.shape[0], k)
+                x = np.random.rand(*shape).astype(A.dtype)
+                b = np.random.rand(*shape).astype(A.dtype)
+                level.work_r = np.empty(shape, dtype=A.dtype)
+                coarse_b = np.ones((R.shape[0],) + shape[1:], dtype=A.dtype)
+                _residual_restrict(level, x, b, coarse_b)
+                assert_almost_equal(coarse_b, 1 + R * (b - A * x))
+
+                # the rows are split over the threads, with the same result
+                try:
+                    set_num_threads(3)
+                    coarse_b3 = np.ones_like(coarse_b)
+                    _residual_restrict(level, x, b, coarse_b3)
+                finally:
+                    set_num_threads()
+                assert_equal(coarse_b3, coarse_b)
+            expected = ['A', 'R', 'work_r']
+            if P is not None:
+                expected = ['A', 'P', 'R', 'R_is_PT', 'work_r']
+                assert(level.R_is_PT[2])
+            assert_equal(sorted(vars(level)), expected)
+
+        # the fused kernel never writes the residual
+        calls = []
+        csr_residual_restrict = amg_core.csr_residual_restrict
+
+        def counted(*args):
+            calls.append(args[0])
+            return csr_residual_restrict(*args)
+
+        A, P, R = fused[0]
+        level = multilevel_solver.level()
+        level.A, level.P, level.R = A, P, R
+        level.work_r = np.full(A.shape[0], np.nan)
+        try:
+            amg_core.csr_residual_restrict = counted
+            _residual_restrict(level, np.ones(A.shape[0]),
+                               np.zeros(A.shape[0]), np.zeros(R.shape[0]))
+        finally:
+            amg_core.csr_residual_restrict = csr_residual_restrict
+        assert_equal(calls, [A.shape[0]])
+        assert(np.isnan(level.work_r).all())
+
+    def test_threaded_operators(self):
+        from pyamg import smoothed_aggregation_solver, amg_core
+        from pyamg.util.utils import set_num_threads
+        np.random.seed(6006)
+
+        A = poisson((40, 40), format='csr')
+        b = np.random.rand(A.shape[0])
+        ml = smoothed_aggregation_solver(A, max_coarse=10)
+        plain = (sparse.csr_matrix, sparse.bsr_matrix)
+        for level in ml.levels[:-1]:
+            assert(type(level.A) in plain)
+            assert(type(level.P) in plain)
+            assert(type(level.R) in plain)
+
+        # the products of the Krylov method use the amg_core kernel
+        calls = []
+        csr_matvec = amg_core.csr_matvec
+
+        def counted(*args):
+            calls.append(args[0])
+            return csr_matvec(*args)
+
+        try:
+            amg_core.csr_matvec = counted
+            x1 = ml.solve(b, maxiter=3, tol=1e-30, accel='cg')
+        finally:
+            amg_core.csr_matvec = csr_matvec
+        assert(calls.count(A.shape[0]) >= 3)
+
+        try:
+            set_num_threads(3)
+            x3 = ml.solve(b, maxiter=3, tol=1e-30, accel='cg')
+        finally:
+            set_num_threads()
+        assert_almost_equal(x1, x3, decimal=12)
+
+    def test_save_load(self):
+        import os
+        import json
+        import shutil
+        import tempfile
+        from pyamg import smoothed_aggregation_solver, ruge_stuben_solver,\
+            load_hierarchy
+        from pyamg.gallery import linear_elasticity
+        np.random.seed(7007)
+
+        cases = []
+        A = poisson((30, 30), format='csr')
+        cases.append(smoothed_aggregation_solver(A, max_coarse=10,
+                                                 coarse_solver='lu'))
+        cases.append(ruge_stuben_solver(
+            A, max_coarse=10, coarse_solver='splu',
+            presmoother=('jacobi', {'omega': 0.8}), postsmoother='jacobi'))
+        cases.append(ruge_stuben_solver(
+            A, max_coarse=10, presmoother=('ilu0', {'sweeps': 2}),
+            postsmoother='ic0'))
+        A = linear_elasticity((12, 12))[0]
+        cases.append(smoothed_aggregation_solver(
+            A, max_coarse=10, coarse_solver='cholesky',
+            presmoother=['block_gauss_seidel',
+                         ('richardson', {'iterations': 2})],
+            postsmoother=('schwarz', {'subdomain': None})))
+        cases.append(smoothed_aggregation_solver(A, max_coarse=10,
+                                                 coarse_solver='pinv2'))
+
+        path = tempfile.mkdtemp()
+        try:
+            for ml in cases:
+                b = np.random.rand(ml.levels[0].A.shape[0])
+                ml.save(path)
+                for mmap in [True, False]:
+                    ml2 = load_hierarchy(path, mmap=mmap)
+                    assert_equal(len(ml2.levels), len(ml.levels))
+                    assert_equal(ml2.coarse_solver.name(),
+                                 ml.coarse_solver.name())
+                    for level, level2 in zip(ml.levels, ml2.levels):
+                        for name in ['A', 'P', 'R', 'B']:
+                            if hasattr(level, name):
+                                M = getattr(level, name)
+                                M2 = getattr(level2, name)
+                                if sparse.isspmatrix(M):
+                                    assert_equal(type(M2), type(M))
+                                    M, M2 = M.toarray(), M2.toarray()
+                                assert_equal(M2, M)
+                        # the spectral radii of the smoothers are kept
+                        for name in ['rho_D_inv', 'rho_ilu0_inv_2',
+                                     'rho_ic0_inv']:
+                            if hasattr(level.A, name):
+                                assert_equal(getattr(level2.A, name),
+                                             getattr(level.A, name))
+                    assert_equal(ml2.levels[0].A.data.flags.writeable,
+                                 not mmap)
+                    assert_almost_equal(ml2.solve(b, maxiter=5, tol=1e-30),
+                                        ml.solve(b, maxiter=5, tol=1e-30),
+                                        decimal=12)
+
+            # hierarchies built with keep=True can be updated after loading
+            from pyamg import rootnode_solver
+            A = poisson((30, 30), format='csr')
+            A2 = A + sparse.diags(np.random.rand(A.shape[0]), format='csr')
+            b = np.random.rand(A.shape[0])
+            updatable = [
+                smoothed_aggregation_solver(
+                    A, max_coarse=10, keep=True,
+                    smooth=('jacobi', {'omega': 1.0}),
+                    sparsify={'max_elements': 3, 'theta': 0.1}),
+                rootnode_solver(A, max_coarse=10, keep=True),
+                ruge_stuben_solver(
+                    A, max_coarse=10, keep=True,
+                    interpolation=('extended_plusi', {'max_elements': 4}))]
+            for ml in updatable:
+                ml.save(path)
+                ml2 = load_hierarchy(path, mmap=False)
+                for level, level2 in zip(ml.levels[:-1], ml2.levels[:-1]):
+                    for name in ['smooth', 'interpolation', 'sparsify']:
+                        if hasattr(level, name):
+                            assert_equal(getattr(level2, name),
+                                         getattr(level, name))
+                # equal up to the spectral radius estimates of the smoothers
+                ml.update(A2, reuse='aggregation')
+                ml2.update(A2, reuse='aggregation')
+                assert_equal(len(ml2.levels), len(ml.levels))
+                for level, level2 in zip(ml.levels, ml2.levels):
+                    assert_almost_equal(level2.A.toarray(), level.A.toarray(),
+                                        decimal=3)
+                x = ml2.solve(b, tol=1e-8)
+                assert(np.linalg.norm(b - A2 * x) < 1e-8 * np.linalg.norm(b))
+
+            # the factored coarse solver is reused
+            ml = cases[0]
+            ml.save(path)
+            assert(os.path.exists(os.path.join(path, 'coarse_LU_0.npy')))
+            ml2 = load_hierarchy(path)
+            assert(isinstance(ml2.coarse_solver.LU, tuple))
+
+            # unsupported versions and solvers
+            with open(os.path.join(path, 'hierarchy.json')) as f:
+                manifest = json.load(f)
+            manifest['version'] += 1
+            with open(os.path.join(path, 'hierarchy.json'), 'w') as f:
+                json.dump(manifest, f)
+            self.assertRaises(ValueError, load_hierarchy, path)
+
+            ml = smoothed_aggregation_solver(
+                A, max_coarse=10, coarse_solver=lambda A, b: b)
+            self.assertRaises(ValueError, ml.save, path)
+        finally:
+            shutil.rmtree(path)
+
+    def test_multiple_rhs(self):
+        from pyamg import smoothed_aggregation_solver, ruge_stuben_solver
+        from pyamg.gallery import linear_elasticity
+        np.random.seed(3003)
+
+        cases = []
+        A = poisson((30, 30), format='csr')
+        cases.append((smoothed_aggregation_solver(A, max_coarse=10), 'V'))
+        cases.append((ruge_stuben_solver(A, max_coarse=10,
+                                         coarse_solver='splu'), 'W'))
+        A = linear_elasticity((15, 15))[0]
+        cases.append((smoothed_aggregation_solver(
+            A, max_coarse=10, presmoother='block_gauss_seidel',
+            postsmoother='block_jacobi', coarse_solver='cg'), 'F'))
+
+        for ml, cycle in cases:
+            A = ml.levels[0].A
+            B = np.random.rand(A.shape[0], 4)
+            B[:, 2] = 0.0
+
+            # one cycle on the block equals one cycle on each column
+            X = ml.solve(B, maxiter=2, tol=1e-30, cycle=cycle)
+            assert_equal(X.shape, B.shape)
+            for j in range(4):
+                xj = ml.solve(B[:, j], maxiter=2, tol=1e-30, cycle=cycle)
+                assert_almost_equal(X[:, j], xj)
+
+            # all columns converge, and residuals are column norms
+            res = []
+            X = ml.solve(B, tol=1e-8, residuals=res, cycle=cycle)
+            assert_equal(res[0].shape, (4,))
+            normB = np.linalg.norm(B, axis=0)
+            normR = np.linalg.norm(B - A * X, axis=0)
+            assert(np.all(normR <= 1e-8 * np.where(normB, normB, 1)))
+
+            # aspreconditioner applies one cycle to all columns at once
+            M = ml.aspreconditioner(cycle=cycle)
+            Y = M * B
+            for j in range(4):
+                assert_almost_equal(Y[:, j], M * B[:, j])
+
+        ml, cycle = cases[0]
+        B = np.random.rand(ml.levels[0].A.shape[0], 2)
+        self.assertRaises(ValueError, ml.solve, B, accel='cg')
+        self.assertRaises(ValueError, ml.solve, B, cycle='AMLI')
+
+    def test_galerkin_transpose(self):
+        from pyamg import smoothed_aggregation_solver, ruge_stuben_solver,\
+            rootnode_solver, amg_core
+
+        A = poisson((20, 20), format='csr')
+        Ac = (A + 1j * sparse.triu(A, 1) - 1j * sparse.tril(A, -1)).tocsr()
+        calls = []
+        kernels = ['bsr_ptap_numeric', 'bsr_rap_numeric']
+        saved = [getattr(amg_core, name) for name in kernels]
+
+        def counted(name, kernel):
+            def call(*args):
+                calls.append(name)
+                return kernel(*args)
+            return call
+
+        # for symmetric problems, R = P.T or P.H is only formed after P.T*A*P
+        cases = [(lambda: smoothed_aggregation_solver(A, max_coarse=10),
+                  'bsr_ptap_numeric'),
+                 (lambda: smoothed_aggregation_solver(
+                     Ac, max_coarse=10, symmetry='hermitian'),
+                  'bsr_ptap_numeric'),
+                 (lambda: rootnode_solver(A, max_coarse=10),
+                  'bsr_ptap_numeric'),
+                 (lambda: ruge_stuben_solver(A, max_coarse=10),
+                  'bsr_ptap_numeric'),
+                 (lambda: smoothed_aggregation_solver(
+                     A, max_coarse=10, symmetry='nonsymmetric'),
+                  'bsr_rap_numeric')]
+        for setup, kernel in cases:
+            del calls[:]
+            try:
+                for name, fn in zip(kernels, saved):
+                    setattr(amg_core, name, counted(name, fn))
+                ml = setup()
+            finally:
+                for name, fn in zip(kernels, saved):
+                    setattr(amg_core, name, fn)
+            assert_equal(calls, [kernel] * (len(ml.levels) - 1))
+            for level, coarse in zip(ml.levels[:-1], ml.levels[1:]):
+                if kernel == 'bsr_ptap_numeric':
+                    assert_almost_equal(level.R.toarray(),
+                                        level.P.H.toarray())
+                assert_almost_equal(coarse.A.toarray(),
+                                    (level.R * level.A * level.P).toarray())
+
+    def test_update(self):
+        from pyamg import smoothed_aggregation_solver, ruge_stuben_solver,\
+            rootnode_solver
+        from pyamg.gallery import linear_elasticity
+        np.random.seed(8008)
+
+        cases = []
+        A = poisson((30, 30), format='csr')
+        cases.append(lambda A: smoothed_aggregation_solver(
+            A, max_coarse=10, keep=True, coarse_solver='splu'))
+        cases.append(lambda A: smoothed_aggregation_solver(
+            A, max_coarse=10, keep=True, symmetry='nonsymmetric',
+            presmoother='jacobi', postsmoother='jacobi'))
+        cases.append(lambda A: rootnode_solver(A, max_coarse=10, keep=True))
+        cases.append(lambda A: ruge_stuben_solver(A, max_coarse=10,
+                                                  keep=True))
+        cases.append(lambda A: ruge_stuben_solver(
+            A, max_coarse=10, keep=True,
+            interpolation=('extended_plusi', {'max_elements': 4})))
+        for setup in cases:
+            ml = setup(A)
+            levels = [(level.A.copy(), getattr(level, 'P', None))
+                      for level in ml.levels]
+            A2 = A + sparse.diags(np.random.rand(A.shape[0]), format='csr')
+            b = np.random.rand(A.shape[0])
+
+            # P and R are kept, the coarse operators are Galerkin products
+            ml.update(A2, reuse='interpolation')
+            for (Ac, P), level in zip(levels, ml.levels):
+                if P is not None:
+                    assert(level.P is P)
+            for level, coarse in zip(ml.levels[:-1], ml.levels[1:]):
+                assert_almost_equal((level.R * level.A * level.P).toarray(),
+                                    coarse.A.toarray())
+            x = ml.solve(b, tol=1e-8)
+            assert(np.linalg.norm(b - A2 * x) < 1e-8 * np.linalg.norm(b))
+
+            # the aggregation is kept and P is recomputed
+            ml.update(A2, reuse='aggregation')
+            assert_equal(len(ml.levels), len(levels))
+            x = ml.solve(b, tol=1e-8)
+            assert(np.linalg.norm(b - A2 * x) < 1e-8 * np.linalg.norm(b))
+
+            # going back to A gives the original hierarchy
+            ml.update(A, reuse='aggregation')
+            for (Ac, P), level in zip(levels, ml.levels):
+                assert_almost_equal(level.A.toarray(), Ac.toarray(),
+                                    decimal=2)
+
+        # the smoothed prolongator is recomputed, up to the spectral radius
+        # estimate of the smoother, which restarts from the old eigenvector
+        ml = smoothed_aggregation_solver(A, max_levels=2, keep=True,
+                                         improve_candidates=None,
+                                         presmoother='gauss_seidel',
+                                         postsmoother='gauss_seidel')
+        P = ml.levels[0].P
+        ml.update(2.0 * A, reuse='aggregation')
+        assert_almost_equal(ml.levels[0].P.toarray(), P.toarray(), decimal=2)
+        P = ml.levels[0].P
+        assert_almost_equal(ml.levels[1].A.toarray(),
+                            2.0 * (P.T * A * P).toarray())
+
+        # BSR hierarchies keep the blocksize
+        A = linear_elasticity((10, 10))[0]
+        ml = smoothed_aggregation_solver(A, max_coarse=10, keep=True)
+        ml.update(A.tocsr(), reuse='aggregation')
+        assert(sparse.isspmatrix_bsr(ml.levels[0].A))
+        assert_equal(ml.levels[0].A.blocksize, A.blocksize)
+
+        ml = smoothed_aggregation_solver(A, max_coarse=10)
+        self.assertRaises(ValueError, ml.update, A, reuse='aggregation')
+        self.assertRaises(ValueError, ml.update, A, reuse='strength')
+        self.assertRaises(ValueError, ml.update, poisson((10,)))
+
+        # truncation and sparsification are applied again
+        A = poisson((30, 30), format='csr')
+        for setup in [smoothed_aggregation_solver, ruge_stuben_solver]:
+            ml = setup(A, max_coarse=10, keep=True,
+                       sparsify={'max_elements': 3, 'theta': 0.1})
+            levels = [level.A.copy() for level in ml.levels]
+            for reuse in ['interpolation', 'aggregation']:
+                ml.update(A, reuse=reuse)
+                for Ac, level in zip(levels, ml.levels):
+                    assert_equal(level.A.nnz, Ac.nnz)
+                    assert_almost_equal(level.A.toarray(), Ac.toarray(),
+                                        decimal=2)
+
+    def test_profile(self):
+        from pyamg import smoothed_aggregation_solver, ruge_stuben_solver,\
+            rootnode_solver
+        from pyamg.multilevel import multilevel_profile
+
+        A = poisson((30, 30), format='csr')
+        b = np.ones(A.shape[0])
+        setup_phases = {smoothed_aggregation_solver: ['strength',
+                                                      'aggregation',
+                                                      'tentative',
+                                                      'prolongation',
+                                                      'galerkin', 'smoother'],
+                        rootnode_solver: ['strength', 'aggregation',
+                                          'tentative', 'prolongation',
+                                          'galerkin', 'smoother'],
+                        ruge_stuben_solver: ['strength', 'splitting',
+                                             'interpolation', 'galerkin',
+                                             'smoother']}
+        for solver, phases in setup_phases.items():
+            ml = solver(A, max_coarse=10, profile=True)
+            assert(isinstance(ml.profile, multilevel_profile))
+            nlevels = len(ml.levels)
+            for lvl in range(nlevels - 1):
+                for phase in phases:
+                    record = ml.profile.records['setup', lvl, phase]
+                    assert(record['time'] >= 0.0)
+                assert_equal(ml.profile.records['setup', lvl, 'smoother']
+                             ['calls'], 2)
+            assert_equal(ml.profile.records['setup', 0, 'galerkin']['nnz'],
+                         A.nnz + ml.levels[0].P.nnz + ml.levels[0].R.nnz)
+
+            residuals = []
+            ml.solve(b, tol=1e-8, residuals=residuals)
+            cycles = len(residuals) - 1
+            for lvl in range(nlevels - 1):
+                for phase in ['presmooth', 'restrict', 'interpolate',
+                              'postsmooth']:
+                    record = ml.profile.records['solve', lvl, phase]
+                    assert_equal(record['calls'], cycles)
+            record = ml.profile.records['solve', nlevels - 1, 'coarse_solve']
+            assert_equal(record['calls'], cycles)
+            record = ml.profile.records['solve', 0, 'presmooth']
+            assert_equal(record['flops'], 2 * A.nnz * cycles)
+            assert(ml.profile.total('solve') > 0.0)
+
+            table = ml.profile.table('solve')
+            assert('presmooth' in table and 'strength' not in table)
+            assert('galerkin' in repr(ml.profile))
+
+            ml.profile.reset('solve')
+            assert(all([key[0] == 'setup' for key in ml.profile.records]))
+
+        # profiling is off by default and can be switched on later
+        ml = smoothed_aggregation_solver(A, max_coarse=10)
+        assert(ml.profile is None)
+        ml.solve(b, maxiter=2)
+        ml.profile = multilevel_profile()
+        ml.solve(np.ones((A.shape[0], 2)), maxiter=1, tol=1e-20)
+        record = ml.profile.records['solve', 0, 'postsmooth']
+        assert_equal(record['calls'], 1)
+        assert_equal(record['flops'], 2 * A.nnz * 2)
+        assert_equal(list(ml.profile.records.keys())[0][0], 'solve')
+
+        self.assertRaises(ValueError, multilevel_solver, ml.levels,
+                          profile='yes')
+
+    def test_mixed_precision(self):
+        import tempfile
+        import shutil
+        from pyamg import smoothed_aggregation_solver, ruge_stuben_solver,\
+            rootnode_solver, load_hierarchy
+        from pyamg.gallery import linear_elasticity
+
+        A = poisson((30, 30), format='csr')
+        E = linear_elasticity((10, 10))[0]
+        cases = [(smoothed_aggregation_solver, A, {}),
+                 (smoothed_aggregation_solver, E, {}),
+                 (smoothed_aggregation_solver, (1.0 + 1.0j) * A, {}),
+                 (rootnode_solver, A, {}),
+                 (ruge_stuben_solver, A, {'presmoother': 'gauss_seidel_nr',
+                                          'postsmoother': 'gauss_seidel_ne'})]
+        for solver, M, kwargs in cases:
+            np.random.seed(1331)
+            b = np.random.rand(M.shape[0])
+            single = np.complex64 if M.dtype.kind == 'c' else np.float32
+
+            np.random.seed(1332)
+            ml = solver(M, max_coarse=10, **kwargs)
+            np.random.seed(1332)
+            mlm = solver(M, max_coarse=10, precision='mixed', **kwargs)
+
+            assert_equal(mlm.levels[0].A.dtype, M.dtype)
+            for level in mlm.levels[1:]:
+                assert_equal(level.A.dtype, single)
+            for level in mlm.levels[:-1]:
+                assert_equal(level.P.dtype, single)
+                assert_equal(level.R.dtype, single)
+            assert_equal(len(mlm.levels), len(ml.levels))
+
+            # the outer iteration is double precision, and the single
+            # precision coarse-grid correction barely changes convergence
+            res, resm = [], []
+            x = ml.solve(b, tol=1e-10, residuals=res)
+            xm = mlm.solve(b, tol=1e-10, residuals=resm)
+            assert_equal(xm.dtype, x.dtype)
+            assert(resm[-1] < 1e-10 * resm[0])
+            assert(len(resm) <= len(res) + 1)
+            for level in mlm.levels[1:]:
+                assert_equal(level.work_x.dtype, single)
+
+            resm = []
+            xm = mlm.solve(b, tol=1e-10, residuals=resm, accel='fgmres')
+            assert(resm[-1] < 1e-10 * resm[0])
+
+        # mixed precision is kept by update, save and load_hierarchy
+        ml = smoothed_aggregation_solver(A, max_coarse=10, precision='mixed')
+        ml.update(2.0 * A)
+        assert_equal(ml.levels[1].A.dtype, np.float32)
+        assert_equal(ml.levels[0].A.dtype, np.float64)
+        path = tempfile.mkdtemp()
+        try:
+            ml.save(path)
+            ml2 = load_hierarchy(path)
+            assert_equal(ml2.precision, 'mixed')
+            assert_equal(ml2.levels[1].A.dtype, np.float32)
+            b = np.ones(A.shape[0])
+            assert_almost_equal(ml2.solve(b), ml.solve(b))
+        finally:
+            del ml2
+            shutil.rmtree(path)
+
+        self.assertRaises(ValueError, multilevel_solver, ml.levels,
+                          precision='half')
+
 
 class TestComplexMultilevel(TestCase):
     def test_coarse_grid_solver(self):
@@ -155,7 +927,8 @@ class TestComplexMultilevel(TestCase):
 
         # method should be almost exact for small matrices
         for A in cases:
-            for solver in ['splu', 'pinv', 'pinv2', 'lu', 'cholesky', 'cg']:
+            for solver in ['splu', 'pinv', 'pinv2', 'lu', 'cholesky', 'cg',
+                           'direct']:
                 s = coarse_grid_solver(solver)
 
                 b = np.arange(A.shape[0], dtype=A.dtype)
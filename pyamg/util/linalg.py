@@ -2,15 +2,15 @@
 from __future__ import print_function
 
 
+import weakref
+
 import numpy as np
 import scipy as sp
 import scipy.sparse as sparse
-from scipy.linalg.lapack import get_lapack_funcs
-from scipy.linalg.lapack import _compute_lwork
 
-__all__ = ['approximate_spectral_radius', 'infinity_norm', 'norm',
-           'residual_norm', 'condest', 'cond', 'ishermitian',
-           'pinv_array']
+__all__ = ['approximate_spectral_radius', 'cached_spectral_radius',
+           'invalidate_spectral_radius', 'infinity_norm', 'norm',
+           'residual_norm', 'condest', 'cond', 'ishermitian', 'pinv_array']
 
 
 def norm(x, pnorm='2'):
@@ -179,8 +179,10 @@ def _approximate_eigenvalues(A, tol, maxiter, symmetric=None,
     To obtain approximate eigenvectors of A, compute V*W.
     """
     from scipy.sparse.linalg import aslinearoperator
+    from pyamg.util.utils import threaded_operator
 
-    A = aslinearoperator(A)  # A could be dense or sparse, or something weird
+    # A could be dense or sparse, or something weird
+    A = aslinearoperator(threaded_operator(A))
 
     # Choose tolerance for deciding if break-down has occurred
     t = A.dtype.char
@@ -319,6 +321,11 @@ def approximate_spectral_radius(A, tol=0.01, maxiter=15, restart=5,
     minimum and maximum values are usually well matched (for the symmetric case
     it is true since the eigenvalues are real).
 
+    For a sparse matrix A and no initial_guess, the estimate is stored as
+    A.rho, so that later calls with at most the same accuracy return it
+    without iterating, see cached_spectral_radius.  After modifying A in
+    place, call invalidate_spectral_radius(A) or delete A.rho.
+
     References
     ----------
     .. [1] Z. Bai, J. Demmel, J. Dongarra, A. Ruhe, and H. van der Vorst,
@@ -337,74 +344,249 @@ def approximate_spectral_radius(A, tol=0.01, maxiter=15, restart=5,
     1.0
 
     """
-    if not hasattr(A, 'rho') or return_vector:
-        # somehow more restart causes a nonsymmetric case to fail...look at
-        # this what about A.dtype=int?  convert somehow?
-
-        # The use of the restart vector v0 requires that the full Krylov
-        # subspace V be stored.  So, set symmetric to False.
-        symmetric = False
-
-        if maxiter < 1:
-            raise ValueError('expected maxiter > 0')
-        if restart < 0:
-            raise ValueError('expected restart >= 0')
-        if A.dtype == int:
-            raise ValueError('expected A to be float (complex or real)')
-        if A.shape[0] != A.shape[1]:
-            raise ValueError('expected square A')
-
-        if initial_guess is None:
-            v0 = np.random.rand(A.shape[1], 1)
-            if A.dtype == complex:
-                v0 = v0 + 1.0j * np.random.rand(A.shape[1], 1)
-        else:
-            if initial_guess.shape[0] != A.shape[0]:
-                raise ValueError('initial_guess and A must have same shape')
-            if (len(initial_guess.shape) > 1) and (initial_guess.shape[1] > 1):
-                raise ValueError('initial_guess must be an (n,1) or\
-                                  (n,) vector')
-            v0 = initial_guess.reshape(-1, 1)
-            v0 = np.array(v0, dtype=A.dtype)
-
-        for j in range(restart+1):
-            [evect, ev, H, V, breakdown_flag] =\
-                _approximate_eigenvalues(A, tol, maxiter,
-                                         symmetric, initial_guess=v0)
-            # Calculate error in dominant eigenvector
-            nvecs = ev.shape[0]
-            max_index = np.abs(ev).argmax()
-            error = H[nvecs, nvecs-1]*evect[-1, max_index]
-
-            # error is a fast way of calculating the following line
-            # error2 = ( A - ev[max_index]*sp.mat(
-            #           sp.eye(A.shape[0],A.shape[1])) )*\
-            #           ( sp.mat(sp.hstack(V[:-1]))*\
-            #           evect[:,max_index].reshape(-1,1) )
-            # print str(error) + "    " + str(sp.linalg.norm(e2))
-
-            if (np.abs(error)/np.abs(ev[max_index]) < tol) or\
-               breakdown_flag:
-                # halt if below relative tolerance
-                v0 = np.dot(np.hstack(V[:-1]),
-                            evect[:, max_index].reshape(-1, 1))
-                break
-            else:
-                v0 = np.dot(np.hstack(V[:-1]),
-                            evect[:, max_index].reshape(-1, 1))
-        # end j-loop
+    if maxiter < 1:
+        raise ValueError('expected maxiter > 0')
+    if restart < 0:
+        raise ValueError('expected restart >= 0')
+    if A.dtype == int:
+        raise ValueError('expected A to be float (complex or real)')
+    if A.shape[0] != A.shape[1]:
+        raise ValueError('expected square A')
 
-        rho = np.abs(ev[max_index])
-        if sparse.isspmatrix(A):
-            A.rho = rho
+    if sparse.isspmatrix(A) and initial_guess is None:
+        rho, v0 = cached_spectral_radius(A, 'A', lambda: A, tol=tol,
+                                         maxiter=maxiter, restart=restart,
+                                         return_vector=return_vector)
+    else:
+        rho, v0 = _spectral_radius(A, tol, maxiter, restart, initial_guess)
+
+    if return_vector:
+        return (rho, v0)
+    else:
+        return rho
 
-        if return_vector:
-            return (rho, v0)
-        else:
-            return rho
 
+def _spectral_radius(A, tol, maxiter, restart, initial_guess):
+    """Restarted Arnoldi estimate of the spectral radius and its vector."""
+    # somehow more restart causes a nonsymmetric case to fail...look at
+    # this what about A.dtype=int?  convert somehow?
+
+    # The use of the restart vector v0 requires that the full Krylov
+    # subspace V be stored.  So, set symmetric to False.
+    symmetric = False
+
+    if initial_guess is None:
+        v0 = np.random.rand(A.shape[1], 1)
+        if A.dtype == complex:
+            v0 = v0 + 1.0j * np.random.rand(A.shape[1], 1)
     else:
-        return A.rho
+        if initial_guess.shape[0] != A.shape[0]:
+            raise ValueError('initial_guess and A must have same shape')
+        if (len(initial_guess.shape) > 1) and (initial_guess.shape[1] > 1):
+            raise ValueError('initial_guess must be an (n,1) or\
+                              (n,) vector')
+        v0 = initial_guess.reshape(-1, 1)
+        v0 = np.array(v0, dtype=A.dtype)
+
+    for j in range(restart+1):
+        [evect, ev, H, V, breakdown_flag] =\
+            _approximate_eigenvalues(A, tol, maxiter,
+                                     symmetric, initial_guess=v0)
+        # Calculate error in dominant eigenvector
+        nvecs = ev.shape[0]
+        max_index = np.abs(ev).argmax()
+        error = H[nvecs, nvecs-1]*evect[-1, max_index]
+
+        # error is a fast way of calculating the following line
+        # error2 = ( A - ev[max_index]*sp.mat(
+        #           sp.eye(A.shape[0],A.shape[1])) )*\
+        #           ( sp.mat(sp.hstack(V[:-1]))*\
+        #           evect[:,max_index].reshape(-1,1) )
+        # print str(error) + "    " + str(sp.linalg.norm(e2))
+
+        v0 = _ritz_vector(V[:-1], evect[:, max_index])
+        # free the Krylov basis before the next cycle
+        del V
+
+        if (np.abs(error)/np.abs(ev[max_index]) < tol) or\
+           breakdown_flag:
+            # halt if below relative tolerance
+            break
+    # end j-loop
+
+    return np.abs(ev[max_index]), v0
+
+
+def _ritz_vector(V, y):
+    """Return sum_i y[i]*V[i], without stacking the Krylov basis V."""
+    v = np.zeros(V[0].shape, dtype=np.result_type(V[0], y))
+    for vi, yi in zip(V, y):
+        v += yi * vi
+    return v
+
+
+# Dominant eigenvectors and accuracy of the spectral radius estimates of
+# sparse matrices, see cached_spectral_radius.  Entries are keyed on
+# id(A.data) and removed with the data array.
+_spectral_radius_cache = {}
+
+# Attributes that mirror the cached estimates, e.g., for
+# multilevel_solver.save
+_spectral_radius_attributes = {'A': 'rho', 'D_inv_A': 'rho_D_inv',
+                               'block_D_inv_A': 'rho_block_D_inv'}
+
+
+def _spectral_radius_attribute(kind):
+    """Return the name of the attribute that mirrors the estimate of kind."""
+    if isinstance(kind, tuple) and kind[0] == 'ilu0_inv_A':
+        # one estimate for each factorization and number of sweeps
+        symmetric, sweeps = kind[1:]
+        attribute = 'rho_ic0_inv' if symmetric else 'rho_ilu0_inv'
+        if sweeps is not None:
+            attribute += '_%d' % sweeps
+        return attribute
+    return _spectral_radius_attributes[kind]
+
+
+def _spectral_radius_entry(A):
+    """Return the cache entry of the values of A, or None for no values."""
+    data = getattr(A, 'data', None)
+    if not isinstance(data, np.ndarray):
+        return None
+    key = id(data)
+    item = _spectral_radius_cache.get(key)
+    if item is not None and item[0]() is data:
+        return item[1]
+
+    def remove(ref, key=key):
+        if _spectral_radius_cache.get(key, (None,))[0] is ref:
+            del _spectral_radius_cache[key]
+
+    entry = {'version': 0}
+    _spectral_radius_cache[key] = (weakref.ref(data, remove), entry)
+    return entry
+
+
+def cached_spectral_radius(A, kind, operator, tol=0.01, maxiter=15,
+                           restart=5, return_vector=False):
+    """Return a cached estimate of the spectral radius of an operator of A.
+
+    Parameters
+    ----------
+    A : sparse matrix
+        Matrix that defines the operator
+    kind : {'A', 'D_inv_A', 'block_D_inv_A', tuple}
+        Name of the operator in the cache, e.g., 'D_inv_A' for D^-1 A, or
+        ('ilu0_inv_A', symmetric, sweeps) for (LU)^-1 A with the factors
+        and solves of relaxation.ilu0
+    operator : callable
+        Returns the operator, e.g., D^-1 A, if it needs to be estimated
+    tol, maxiter, restart : scalar
+        Parameters of approximate_spectral_radius
+    return_vector : bool
+        If True, the approximate dominant eigenvector is returned, too
+
+    Returns
+    -------
+    rho : float
+        Approximate spectral radius
+    v : {array, None}
+        Approximate dominant eigenvector, if return_vector is True
+
+    Notes
+    -----
+    The estimate is stored as the attribute A.rho, A.rho_D_inv,
+    A.rho_block_D_inv, A.rho_ilu0_inv or A.rho_ic0_inv, the latter two
+    with a suffix _<sweeps> for a given number of sweeps.  The attribute
+    is returned by later calls, as long as it is not deleted.  A missing
+    attribute always gives a new estimate.  If the attribute was computed
+    here, it is only reused if it was estimated at least as accurately,
+    i.e., with at most tol and at least maxiter and restart.  An attribute
+    set otherwise, e.g., by load_hierarchy, is used as is.
+
+    The dominant eigenvector of each estimate is kept with the values of
+    A, i.e., with its data array, until the data array is deleted.  After
+    invalidate_spectral_radius(A) or del A.rho, it is the initial guess of
+    the next estimate, which typically converges in the first Arnoldi
+    cycle.
+
+    """
+    entry = _spectral_radius_entry(A)
+    attribute = _spectral_radius_attribute(kind)
+    record = entry.get(kind) if entry is not None else None
+
+    if attribute in getattr(A, '__dict__', {}):
+        rho = getattr(A, attribute)
+        if record is not None and record[0] == entry['version'] and\
+                record[1] == rho:
+            # computed here, reuse it if it is accurate enough
+            if record[3][0] <= tol and record[3][1] >= maxiter and\
+                    record[3][2] >= restart:
+                return record[1], record[2]
+        elif not return_vector:
+            return rho, None
+
+    # warm restart from the previous estimate for the values of A
+    initial_guess = None
+    if record is not None and record[2] is not None and\
+            record[2].shape[0] == A.shape[0]:
+        initial_guess = record[2]
+    rho, v = _spectral_radius(operator(), tol, maxiter, restart,
+                              initial_guess)
+
+    if entry is not None:
+        entry[kind] = (entry['version'], rho, v, (tol, maxiter, restart))
+    setattr(A, attribute, rho)
+    return rho, v
+
+
+def invalidate_spectral_radius(A):
+    """Discard the spectral radius estimates of A after its values changed.
+
+    The estimates of A, D^-1 A, block D^-1 A and (LU)^-1 A that were cached
+    by approximate_spectral_radius, rho_D_inv_A, rho_block_D_inv_A and
+    rho_ilu0_inv_A are discarded, together with the attributes A.rho,
+    A.rho_D_inv, A.rho_block_D_inv, A.rho_ilu0_inv and A.rho_ic0_inv.  The
+    dominant eigenvectors are kept as initial
+    guesses for the next estimates.
+
+    Parameters
+    ----------
+    A : sparse matrix
+        Matrix whose values were modified in place
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.util.linalg import approximate_spectral_radius
+    >>> from pyamg.util.linalg import invalidate_spectral_radius
+    >>> A = poisson((10, 10), format='csr')
+    >>> rho = approximate_spectral_radius(A)
+    >>> A.data *= 2.0
+    >>> invalidate_spectral_radius(A)
+    >>> rho2 = approximate_spectral_radius(A)
+
+    """
+    entry = _spectral_radius_entry(A)
+    kinds = list(_spectral_radius_attributes)
+    if entry is not None:
+        entry['version'] += 1
+        kinds += [kind for kind in entry if kind != 'version']
+    for kind in kinds:
+        attribute = _spectral_radius_attribute(kind)
+        if attribute in getattr(A, '__dict__', {}):
+            delattr(A, attribute)
+
+
+def _transfer_spectral_radius(A, A_new):
+    """Use the eigenvectors cached for A as initial guesses for A_new."""
+    entry, new_entry = _spectral_radius_entry(A), _spectral_radius_entry(A_new)
+    if entry is None or new_entry is None or entry is new_entry or\
+            A.shape != A_new.shape:
+        return
+    for kind in entry:
+        if kind != 'version' and kind not in new_entry:
+            new_entry[kind] = (-1,) + entry[kind][1:]
 
 
 def condest(A, tol=0.1, maxiter=25, symmetric=False):
@@ -578,8 +760,9 @@ def pinv_array(a, cond=None):
     a   : {dense array}
         Is of size (n, m, m)
     cond : {float}
-        Used by gelss to filter numerically zeros singular values.
-        If None, a suitable value is chosen for you.
+        Singular values smaller than cond times the largest singular value
+        of a block are treated as zero.  If None, a suitable value is chosen
+        for you.
 
     Returns
     -------
@@ -588,8 +771,13 @@ def pinv_array(a, cond=None):
 
     Notes
     -----
-    By using lapack wrappers, this can be much faster for large n, than
-    directly calling pinv2
+    The blocks are inverted in batches with the stacked routines of
+    numpy.linalg, i.e., without a Python loop over the blocks.  Blocks that
+    are provably well conditioned are inverted directly, i.e., 2x2 and 3x3
+    blocks in closed form, Hermitian positive definite blocks with a
+    Cholesky factorization, and other blocks with an LU factorization.  An
+    SVD (or an eigendecomposition of Hermitian blocks) is only computed for
+    the remaining, numerically singular or ill-conditioned blocks.
 
     Examples
     --------
@@ -604,6 +792,9 @@ def pinv_array(a, cond=None):
     n = a.shape[0]
     m = a.shape[1]
 
+    if n == 0:
+        return
+
     if m == 1:
         # Pseudo-inverse of 1 x 1 matrices is trivial
         zero_entries = (a == 0.0).nonzero()[0]
@@ -615,13 +806,7 @@ def pinv_array(a, cond=None):
     else:
         # The block size is greater than 1
 
-        # Create necessary arrays and function pointers for calculating pinv
-        gelss, gelss_lwork = get_lapack_funcs(('gelss', 'gelss_lwork'),
-                                              (np.ones((1,), dtype=a.dtype)))
-        RHS = np.eye(m, dtype=a.dtype)
-        lwork = _compute_lwork(gelss_lwork, m, m, m)
-
-        # Choose tolerance for which singular values are zero in *gelss below
+        # Choose tolerance for which singular values are zero
         if cond is None:
             t = a.dtype.char
             eps = np.finfo(np.float).eps
@@ -630,8 +815,147 @@ def pinv_array(a, cond=None):
             _array_precision = {'f': 0, 'd': 1, 'g': 2, 'F': 0, 'D': 1, 'G': 2}
             cond = {0: feps*1e3, 1: eps*1e6, 2: geps*1e6}[_array_precision[t]]
 
-        # Invert each block of a
-        for kk in range(n):
-            gelssoutput = gelss(a[kk], RHS, cond=cond, lwork=lwork,
-                                overwrite_a=True, overwrite_b=False)
-            a[kk] = gelssoutput[1]
+        # The blocks are inverted in rounds, the cheapest method first.  Each
+        # method accepts a block only if its smallest singular value provably
+        # exceeds cond times the largest, i.e., if the inverse is the
+        # pseudoinverse.
+        todo = np.arange(n)
+        hermitian = _hermitian_blocks(a)
+        if m <= 3:
+            todo = _invert_blocks(a, todo, cond, _closed_form_inverse)
+        todo_h = todo[hermitian[todo]]
+        todo = todo[~hermitian[todo]]
+        # numpy.linalg.cholesky fails for the whole batch if a block is not
+        # positive definite, so blocks with a nonpositive diagonal go
+        # directly to the eigendecomposition
+        positive = (a[todo_h].diagonal(axis1=1, axis2=2).real > 0).all(axis=1)
+        todo_h = np.concatenate((
+            _invert_blocks(a, todo_h[positive], cond, _cholesky_inverse),
+            todo_h[~positive]))
+        todo = _invert_blocks(a, todo, cond, _lu_inverse)
+
+        # Pseudoinverses of the remaining blocks
+        if todo_h.shape[0] > 0:
+            a[todo_h] = _eigh_pinv(a[todo_h], cond)
+        if todo.shape[0] > 0:
+            a[todo] = _svd_pinv(a[todo], cond)
+
+
+def _hermitian_blocks(a):
+    """Return a mask of the Hermitian blocks of a."""
+    n, m = a.shape[0], a.shape[1]
+    i, j = np.triu_indices(m, 1)
+    diff = np.abs(a[:, i, j] - np.conjugate(a[:, j, i])).max(axis=1)
+    scale = np.abs(a.reshape(n, m * m)).max(axis=1)
+    return diff <= 10 * np.finfo(a.dtype).eps * scale
+
+
+def _invert_blocks(a, todo, cond, method):
+    """Invert the blocks a[todo] that method accepts, return the others."""
+    if todo.shape[0] == 0:
+        return todo
+    if todo.shape[0] == a.shape[0]:
+        ainv, accepted = method(a, cond)
+    else:
+        ainv, accepted = method(a[todo], cond)
+    if accepted.all():
+        a[todo] = ainv
+        return todo[:0]
+    a[todo[accepted]] = ainv[accepted]
+    return todo[~accepted]
+
+
+def _well_conditioned(a, ainv, cond):
+    """Return a mask of the blocks with sigma_min > cond * sigma_max.
+
+    The 1-norm condition number bounds the 2-norm condition number by
+    kappa_2 <= m * kappa_1 for m x m blocks.
+    """
+    m = a.shape[1]
+    norm_a = np.abs(a).sum(axis=1).max(axis=1)
+    norm_ainv = np.abs(ainv).sum(axis=1).max(axis=1)
+    with np.errstate(invalid='ignore', over='ignore'):
+        # NaN fails the comparison, too
+        return m * cond * norm_a * norm_ainv < 1.0
+
+
+def _closed_form_inverse(a, cond):
+    """Invert 2x2 and 3x3 blocks with the adjugate.
+
+    The determinant bounds the singular values by
+    sigma_min / sigma_max >= |det| / ||a||_F^m.
+    """
+    m = a.shape[1]
+    if m == 2:
+        adj = np.empty_like(a)
+        adj[:, 0, 0] = a[:, 1, 1]
+        adj[:, 1, 1] = a[:, 0, 0]
+        adj[:, 0, 1] = -a[:, 0, 1]
+        adj[:, 1, 0] = -a[:, 1, 0]
+        det = a[:, 0, 0] * a[:, 1, 1] - a[:, 0, 1] * a[:, 1, 0]
+    else:
+        # cofactors, with indices modulo 3,
+        #   C[i, j] = a[i+1, j+1] a[i+2, j+2] - a[i+1, j+2] a[i+2, j+1]
+        cof = np.empty_like(a)
+        for i in range(3):
+            i1, i2 = (i + 1) % 3, (i + 2) % 3
+            for j in range(3):
+                j1, j2 = (j + 1) % 3, (j + 2) % 3
+                cof[:, i, j] = a[:, i1, j1] * a[:, i2, j2] -\
+                    a[:, i1, j2] * a[:, i2, j1]
+        adj = cof.transpose((0, 2, 1))
+        det = (a[:, 0, :] * cof[:, 0, :]).sum(axis=1)
+
+    frobenius = np.sqrt((np.abs(a.reshape(-1, m * m))**2).sum(axis=1))
+    accepted = np.abs(det) > cond * frobenius**m
+    det[~accepted] = 1.0
+    return adj / det[:, np.newaxis, np.newaxis], accepted
+
+
+def _cholesky_inverse(a, cond):
+    """Invert Hermitian positive definite blocks with a Cholesky factor."""
+    try:
+        L = np.linalg.cholesky(a)
+    except np.linalg.LinAlgError:
+        # a block of the batch is not positive definite
+        return a, np.zeros(a.shape[0], dtype=bool)
+    # inv(a) = inv(L)^H inv(L)
+    Linv = np.linalg.inv(L)
+    ainv = np.einsum('nki,nkj->nij', np.conjugate(Linv), Linv)
+    return ainv, _well_conditioned(a, ainv, cond)
+
+
+def _lu_inverse(a, cond):
+    """Invert blocks with an LU factorization."""
+    try:
+        ainv = np.linalg.inv(a)
+    except np.linalg.LinAlgError:
+        # an exactly singular block fails the whole batch
+        return np.zeros_like(a), np.zeros(a.shape[0], dtype=bool)
+    return ainv, _well_conditioned(a, ainv, cond)
+
+
+def _filtered_inverse(s, cond):
+    """Invert the values s with |s| > cond * max|s| in each row of s."""
+    sabs = np.abs(s)
+    keep = sabs > cond * sabs.max(axis=1)[:, np.newaxis]
+    sinv = np.zeros_like(s)
+    sinv[keep] = 1.0 / s[keep]
+    return sinv
+
+
+def _eigh_pinv(a, cond):
+    """Pseudoinverses of Hermitian blocks from their eigendecompositions."""
+    w, V = np.linalg.eigh(a)
+    winv = _filtered_inverse(w, cond)
+    Vh = np.conjugate(V.transpose((0, 2, 1)))
+    return np.matmul(V * winv[:, np.newaxis, :], Vh).astype(a.dtype)
+
+
+def _svd_pinv(a, cond):
+    """Pseudoinverses of blocks from their singular value decompositions."""
+    U, s, Vh = np.linalg.svd(a)
+    sinv = _filtered_inverse(s, cond)
+    V = np.conjugate(Vh.transpose((0, 2, 1)))
+    Uh = np.conjugate(U.transpose((0, 2, 1)))
+    return np.matmul(V * sinv[:, np.newaxis, :], Uh)
@@ -5,7 +5,8 @@ from scipy.linalg import svd, eigvals
 
 from pyamg.util.linalg import approximate_spectral_radius,\
     infinity_norm, norm, condest, cond,\
-    ishermitian, pinv_array
+    ishermitian, pinv_array, invalidate_spectral_radius
+from pyamg.util import linalg as linalg_module
 
 from pyamg import gallery
 
@@ -121,6 +122,62 @@ class TestLinalg(TestCase):
             assert_equal(abs(ans2 - expected)/abs(expected) < 0.001, True)
             assert_equal(abs(ans2 - expected) < 0.1*abs(ans1 - expected), True)
 
+    def test_spectral_radius_cache(self):
+        calls = []
+        estimate = linalg_module._spectral_radius
+
+        def counted(A, tol, maxiter, restart, initial_guess):
+            calls.append(initial_guess)
+            return estimate(A, tol, maxiter, restart, initial_guess)
+
+        linalg_module._spectral_radius = counted
+        try:
+            A = gallery.poisson((20, 20), format='csr')
+            rho = approximate_spectral_radius(A)
+            assert_equal(len(calls), 1)
+            assert_equal(calls[0] is None, True)
+
+            # the estimate is reused, unless more accuracy is requested
+            assert_equal(approximate_spectral_radius(A), rho)
+            assert_equal(len(calls), 1)
+            approximate_spectral_radius(A, tol=1e-8)
+            assert_equal(len(calls), 2)
+            approximate_spectral_radius(A, tol=0.1)
+            assert_equal(len(calls), 2)
+
+            # deleting the attribute gives a new estimate
+            del A.rho
+            approximate_spectral_radius(A)
+            assert_equal(len(calls), 3)
+
+            # a matrix that shares the values has its own estimate
+            B = csr_matrix((A.data, A.indices, A.indptr), shape=A.shape)
+            approximate_spectral_radius(B)
+            assert_equal(len(calls), 4)
+            rho = A.rho
+            calls[:] = [None]
+
+            # invalidation recomputes it, starting from the old eigenvector
+            A.data *= 2.0
+            invalidate_spectral_radius(A)
+            assert_equal(hasattr(A, 'rho'), False)
+            rho2 = approximate_spectral_radius(A)
+            assert_equal(len(calls), 2)
+            assert_equal(calls[1] is None, False)
+
+            # so does an estimate after the attribute is deleted
+            A.data *= 2.0
+            del A.rho
+            assert_almost_equal(approximate_spectral_radius(A) / rho, 4.0,
+                                decimal=4)
+            assert_almost_equal(rho2 / rho, 2.0, decimal=4)
+
+            # a copy has its own values, and its own estimate
+            approximate_spectral_radius(A.copy())
+            assert_equal(len(calls), 4)
+        finally:
+            linalg_module._spectral_radius = estimate
+
     def test_infinity_norm(self):
         A = np.array([[-4]])
         assert_equal(infinity_norm(csr_matrix(A)), 4)
@@ -333,6 +390,19 @@ class TestComplexLinalg(TestCase):
         A[0, 0, :] = A[0, 1, :]
         tests.append(A)
 
+        # batches that mix the closed form, Cholesky, LU and SVD paths
+        for m in [2, 3, 6]:
+            A = np.random.rand(8, m, m)
+            A[:4] = np.matmul(A[:4], A[:4].transpose((0, 2, 1)))
+            A[2, :, 0] = 0.0
+            A[2, 0, :] = 0.0
+            A[5, 1, :] = A[5, 0, :]
+            A[6] = 0.0
+            tests.append(A)
+            B = A + 1.0j*np.random.rand(8, m, m)
+            B[:4] = np.matmul(B[:4], np.conjugate(B[:4].transpose((0, 2, 1))))
+            tests.append(B)
+
         for test in tests:
             pinv_test = np.zeros_like(test)
             for i in range(pinv_test.shape[0]):
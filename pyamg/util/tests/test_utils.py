@@ -12,7 +12,7 @@ from pyamg.util.utils import diag_sparse, profile_solver, to_type,\
     compute_BtBinv, eliminate_diag_dom_nodes
 
 from numpy.testing import TestCase, assert_equal, assert_almost_equal,\
-    assert_array_almost_equal, assert_array_equal
+    assert_array_almost_equal, assert_array_equal, assert_raises
 
 
 class TestUtils(TestCase):
@@ -1009,6 +1009,57 @@ class TestUtils(TestCase):
                           [0., 0., -0.5, 1.]])
         assert_array_almost_equal(A.toarray(), exact)
 
+    def test_truncate_interpolation(self):
+        from pyamg.gallery import poisson, linear_elasticity
+        from pyamg.aggregation import smoothed_aggregation_solver
+        from pyamg.util.utils import truncate_interpolation
+
+        # scalar: row sums are kept and rows hold at most max_elements
+        A = poisson((20, 20), format='csr')
+        P = smoothed_aggregation_solver(A, max_levels=2).levels[0].P.tocsr()
+        for kwargs in [{'trunc_factor': 0.3}, {'max_elements': 2},
+                       {'trunc_factor': 0.1, 'max_elements': 3}]:
+            Pt = truncate_interpolation(P, **kwargs)
+            assert(Pt.format == 'csr')
+            assert(Pt.nnz < P.nnz)
+            assert_array_almost_equal(Pt.sum(axis=1), P.sum(axis=1))
+            if 'max_elements' in kwargs:
+                assert(np.diff(Pt.indptr).max() <= kwargs['max_elements'])
+
+        # nothing to drop
+        assert_array_equal(truncate_interpolation(P).toarray(), P.toarray())
+
+        # blocks: P*Bc is kept
+        A, B = linear_elasticity((10, 10), format='bsr')
+        ml = smoothed_aggregation_solver(A, B=B, max_levels=2)
+        P, Bc = ml.levels[0].P, ml.levels[1].B
+        Pt = truncate_interpolation(P, trunc_factor=0.2, Bc=Bc)
+        assert(Pt.format == 'bsr' and Pt.blocksize == P.blocksize)
+        assert(Pt.nnz < P.nnz)
+        assert_array_almost_equal(Pt * Bc, P * Bc)
+
+    def test_sparsify_operator(self):
+        from pyamg.gallery import poisson
+        from pyamg.aggregation import smoothed_aggregation_solver
+        from pyamg.util.utils import sparsify_operator
+
+        A = poisson((20, 20), format='csr')
+        Ac = smoothed_aggregation_solver(A, max_levels=2).levels[1].A
+        As = sparsify_operator(Ac, 0.2)
+        assert(As.format == Ac.format)
+        assert(As.nnz < Ac.nnz)
+        assert_array_almost_equal(As.sum(axis=1), Ac.sum(axis=1))
+        assert_array_almost_equal(As.toarray(), As.T.toarray())
+        assert_array_equal(sparsify_operator(Ac, 0.0).toarray(),
+                           Ac.toarray())
+
+        # block operators: A*b is kept for a constant b
+        Ab = Ac.tobsr(blocksize=(2, 2))
+        As = sparsify_operator(Ab, 0.2)
+        assert(As.format == 'bsr' and As.blocksize == (2, 2))
+        b = np.ones(Ab.shape[0])
+        assert_array_almost_equal(As * b, Ab * b)
+
     def test_filter_matrix_rows(self):
         from pyamg.util.utils import filter_matrix_rows
         A = csr_matrix(np.array([[0.24, -0.5, 0., 0.],
@@ -1070,6 +1121,195 @@ class TestUtils(TestCase):
                           [0., 0., 0., 0.]])
         assert_array_almost_equal(Acopy.toarray(), exact)
 
+    def test_num_threads(self):
+        import os
+        from pyamg.util.utils import get_num_threads, set_num_threads
+
+        env = os.environ.pop('PYAMG_NUM_THREADS', None)
+        try:
+            assert_equal(get_num_threads(), 1)
+            assert_equal(get_num_threads(3), 3)
+            os.environ['PYAMG_NUM_THREADS'] = '5'
+            assert_equal(get_num_threads(), 5)
+            set_num_threads(2)
+            assert_equal(get_num_threads(), 2)
+            assert_equal(get_num_threads(4), 4)
+            set_num_threads()
+            assert_equal(get_num_threads(), 5)
+            self.assertRaises(ValueError, get_num_threads, 0)
+            self.assertRaises(ValueError, set_num_threads, 'many')
+        finally:
+            set_num_threads()
+            os.environ.pop('PYAMG_NUM_THREADS', None)
+            if env is not None:
+                os.environ['PYAMG_NUM_THREADS'] = env
+
+    def test_threaded_operator(self):
+        from pyamg.util.utils import threaded_operator
+        from pyamg.gallery import linear_elasticity
+        from pyamg.krylov import cg
+        from scipy.sparse.linalg import LinearOperator
+        np.random.seed(6006)
+
+        # rows of very different lengths
+        A = pyamg.gallery.sprand(200, 150, 0.02, format='csr')
+        A[3, :] = np.random.rand(150)
+        A = A.tocsr()
+        Ac = (A + 1j * A).tocsr()
+        B = linear_elasticity((8, 8), format='bsr')[0]
+        cases = [A, Ac, B, A.astype(np.float32), A.tobsr(blocksize=(2, 3))]
+
+        for M in cases:
+            for shape in [(M.shape[1],), (M.shape[1], 1), (M.shape[1], 3)]:
+                x = np.random.rand(*shape).astype(M.dtype)
+                T = threaded_operator(M, num_threads=1)
+                y = T * x
+                assert_equal(y.shape, (M.shape[0],) + shape[1:])
+                assert_array_almost_equal(y, M * x)
+                for num_threads in [2, 4]:
+                    T = threaded_operator(M, num_threads=num_threads)
+                    assert_array_equal(T * x, y)
+                    assert_array_equal(T * np.asfortranarray(x), y)
+            x = np.random.rand(M.shape[0]).astype(M.dtype)
+            assert_array_almost_equal(T.rmatvec(x), M.H * x)
+
+        # types
+        T = threaded_operator(A)
+        assert(isinstance(T, LinearOperator))
+        assert_equal(T.shape, A.shape)
+        assert_equal(T.dtype, A.dtype)
+        assert(threaded_operator(T) is T)
+        C = A.tocsc()
+        assert(threaded_operator(C) is C)
+
+        # the products call the amg_core kernels
+        calls = []
+        csr_matvec = pyamg.amg_core.csr_matvec
+        bsr_matvec = pyamg.amg_core.bsr_matvec
+
+        def counted(kernel):
+            def call(*args):
+                calls.append(kernel.__name__)
+                return kernel(*args)
+            return call
+
+        P = pyamg.gallery.poisson((10, 10), format='csr')
+        b = np.random.rand(P.shape[0])
+        try:
+            pyamg.amg_core.csr_matvec = counted(csr_matvec)
+            pyamg.amg_core.bsr_matvec = counted(bsr_matvec)
+            threaded_operator(A, num_threads=2) * np.random.rand(150)
+            assert_equal(calls, ['csr_matvec'])
+            threaded_operator(B) * np.random.rand(B.shape[1], 2)
+            assert_equal(calls, ['csr_matvec', 'bsr_matvec'])
+            del calls[:]
+            x = cg(P, b, maxiter=5, tol=1e-30)[0]
+            assert_equal(set(calls), set(['csr_matvec']))
+            assert(len(calls) > 5)
+        finally:
+            pyamg.amg_core.csr_matvec = csr_matvec
+            pyamg.amg_core.bsr_matvec = bsr_matvec
+        assert_array_almost_equal(x, cg(P, b, maxiter=5, tol=1e-30)[0])
+
+        # unsupported types fall back to scipy
+        T = threaded_operator(A, num_threads=2)
+        x = np.random.rand(150)
+        assert_array_almost_equal(T * (x + 1j * x), A * (x + 1j * x))
+        A64 = A.copy()
+        A64.indices = A64.indices.astype(np.int64)
+        A64.indptr = A64.indptr.astype(np.int64)
+        assert_array_almost_equal(threaded_operator(A64) * x, A * x)
+
+    def test_galerkin_product(self):
+        from pyamg.util.utils import galerkin_product
+        from pyamg.gallery import linear_elasticity
+        np.random.seed(1405)
+
+        A = pyamg.gallery.poisson((12, 12), format='csr')
+        P = pyamg.gallery.sprand(144, 40, 0.05, format='csr')
+        R = pyamg.gallery.sprand(30, 144, 0.05, format='csr')
+        Ab = linear_elasticity((6, 6), format='bsr')[0]
+        Pb = np.random.rand(72, 12) * (np.random.rand(72, 12) > 0.7)
+        Pb = bsr_matrix(Pb, blocksize=(2, 3))
+        Rb = np.random.rand(15, 72) * (np.random.rand(15, 72) > 0.7)
+        Rb = bsr_matrix(Rb, blocksize=(3, 2))
+        cases = [(A, P, R), (A, P, None), (A, P.astype(np.float32), None),
+                 (A + 1j * A, P + 1j * P, None), (Ab, Pb, Rb), (Ab, Pb, None)]
+
+        for A, P, R in cases:
+            for hermitian in [True, False]:
+                if R is None:
+                    RR = P.H if hermitian else P.T
+                else:
+                    RR = R
+                exact = (RR * A * P).toarray()
+                C = galerkin_product(A, P, R, hermitian=hermitian)
+                assert_equal(C.format, A.format)
+                assert_equal(C.dtype, exact.dtype)
+                assert(C.has_sorted_indices)
+                assert_array_almost_equal(C.toarray(), exact)
+                for num_threads in [2, 3]:
+                    D = galerkin_product(A, P, R, hermitian=hermitian,
+                                         num_threads=num_threads)
+                    assert_array_equal(D.indices, C.indices)
+                    assert_array_almost_equal(D.toarray(), exact)
+
+                # numeric phase only, with shared index arrays
+                D = galerkin_product(2.0 * A, P, R, hermitian=hermitian,
+                                     pattern=C)
+                assert(np.shares_memory(D.indices, C.indices))
+                assert_array_almost_equal(D.toarray(), 2.0 * exact)
+
+        # a pattern missing entries of R*A*P
+        A, P, R = cases[0]
+        C = galerkin_product(A, P, R)
+        C = csr_matrix((C.data[1:], C.indices[1:],
+                        np.maximum(C.indptr - 1, 0)), shape=C.shape)
+        assert_raises(ValueError, galerkin_product, A, P, R, pattern=C)
+        assert_raises(ValueError, galerkin_product, A, P, pattern=C)
+        assert_raises(ValueError, galerkin_product, A, P, R, pattern=P)
+
+        # unsupported formats fall back to scipy
+        C = galerkin_product(A.tocsc(), P, R)
+        assert_array_almost_equal(C.toarray(), (R * A * P).toarray())
+
+        # int64 and mixed index types
+        A64 = A.copy()
+        A64.indptr = A64.indptr.astype(np.int64)
+        A64.indices = A64.indices.astype(np.int64)
+        for RR in [R, None]:
+            C = galerkin_product(A, P, RR)
+            D = galerkin_product(A64, P, RR)
+            assert_equal(D.indices.dtype, np.int64)
+            assert_array_almost_equal(D.toarray(), C.toarray())
+            E = galerkin_product(A64, P, RR, pattern=D)
+            assert(np.shares_memory(E.indices, D.indices))
+            D = galerkin_product(2.0 * A64, P, RR, pattern=C)
+            assert_array_almost_equal(D.toarray(), 2.0 * C.toarray())
+
+    def test_index_types(self):
+        from pyamg.util.utils import _common_index_type, threaded_operator
+        A = pyamg.gallery.poisson((10, 10), format='csr')
+        A64 = A.copy()
+        A64.indptr = A64.indptr.astype(np.int64)
+        A64.indices = A64.indices.astype(np.int64)
+
+        # narrower indices are widened in a shallow copy sharing the data
+        B, B64 = _common_index_type(A, A64)
+        assert(B64 is A64)
+        assert(B is not A)
+        assert(np.shares_memory(B.data, A.data))
+        assert_equal(B.indices.dtype, np.int64)
+        assert_equal(A.indices.dtype, np.intc)
+        B, C = _common_index_type(A, A)
+        assert(B is A and C is A)
+
+        # the threaded kernels take int64 indices
+        x = np.random.rand(A.shape[0])
+        for M in [A64, A64.tobsr(blocksize=(2, 2))]:
+            T = threaded_operator(M, num_threads=2)
+            assert_array_almost_equal(T * x, A * x)
+
 
 class TestComplexUtils(TestCase):
     def test_diag_sparse(self):
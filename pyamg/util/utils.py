@@ -1,6 +1,8 @@
 """General utility functions for pyamg."""
 from __future__ import print_function
 
+import os
+import copy
 from warnings import warn
 
 import numpy as np
@@ -9,6 +11,7 @@ from scipy.sparse import isspmatrix, isspmatrix_csr, isspmatrix_csc, \
 from scipy.sparse.sputils import upcast
 from pyamg.util.linalg import norm, cond, pinv_array
 from scipy.linalg import eigvals
+from scipy.sparse.linalg import LinearOperator
 import pyamg.amg_core
 
 __all__ = ['blocksize', 'diag_sparse', 'profile_solver', 'to_type',
@@ -20,7 +23,9 @@ __all__ = ['blocksize', 'diag_sparse', 'profile_solver', 'to_type',
            'get_Cpt_params', 'compute_BtBinv', 'eliminate_diag_dom_nodes',
            'levelize_strength_or_aggregation',
            'levelize_smooth_or_improve_candidates', 'filter_matrix_columns',
-           'filter_matrix_rows', 'truncate_rows']
+           'filter_matrix_rows', 'truncate_rows', 'truncate_interpolation',
+           'sparsify_operator', 'set_num_threads',
+           'get_num_threads', 'threaded_operator', 'galerkin_product']
 
 try:
     from scipy.sparse._sparsetools import csr_scale_rows, bsr_scale_rows
@@ -29,6 +34,9 @@ except ImportError:
     from scipy.sparse.sparsetools import csr_scale_rows, bsr_scale_rows
     from scipy.sparse.sparsetools import csr_scale_columns, bsr_scale_columns
 
+# Default number of threads for the amg_core kernels, see set_num_threads
+_num_threads = None
+
 
 def blocksize(A):
     """Return the block size of a matrix."""
@@ -571,9 +579,11 @@ def get_diagonal(A, norm_eq=False, inv=False):
         # This transpose involves almost no work, use csr data structures as
         # csc, or vice versa
         At = A.T
-        D = (At.multiply(At.conjugate()))*np.ones((At.shape[0],))
+        D = (At.multiply(At.conjugate()))*np.ones((At.shape[0],),
+                                                  dtype=A.dtype)
     elif norm_eq == 2:
-        D = (A.multiply(A.conjugate()))*np.ones((A.shape[0],))
+        D = (A.multiply(A.conjugate()))*np.ones((A.shape[0],),
+                                                dtype=A.dtype)
     else:
         D = A.diagonal()
 
@@ -665,12 +675,7 @@ def get_block_diag(A, blocksize, inv_flag=True):
 
     if inv_flag:
         # Invert each block
-        if block_diag.shape[1] < 7:
-            # This specialized routine lacks robustness for large matrices
-            pyamg.amg_core.pinv_array(block_diag.ravel(), block_diag.shape[0],
-                                      block_diag.shape[1], 'T')
-        else:
-            pinv_array(block_diag)
+        pinv_array(block_diag)
         A.block_D_inv = block_diag
     else:
         A.block_D = block_diag
@@ -1160,7 +1165,8 @@ def relaxation_as_linear_operator(method, A, b):
     accepted_methods = ['gauss_seidel', 'block_gauss_seidel', 'sor',
                         'gauss_seidel_ne', 'gauss_seidel_nr', 'jacobi',
                         'block_jacobi', 'richardson', 'schwarz',
-                        'strength_based_schwarz', 'jacobi_ne']
+                        'strength_based_schwarz', 'jacobi_ne',
+                        'multicolor_gauss_seidel']
 
     b = np.array(b, dtype=A.dtype)
     fn, kwargs = unpack_arg(method)
@@ -1679,8 +1685,6 @@ def compute_BtBinv(B, C):
 
     # Invert each block of BtBinv, noting that amg_core.calc_BtB(...) returns
     # values in column-major form, thus necessitating the deep transpose
-    #   This is the old call to a specialized routine, but lacks robustness
-    #   pyamg.amg_core.pinv_array(np.ravel(BtBinv), Nnodes, NullDim, 'F')
     BtBinv = BtBinv.transpose((0, 2, 1)).copy()
     pinv_array(BtBinv)
 
@@ -1806,12 +1810,14 @@ def remove_diagonal(S):
     return S.tocsr()
 
 
-def scale_rows_by_largest_entry(S):
+def scale_rows_by_largest_entry(S, copy=True):
     """Scale each row in S by it's largest in magnitude entry.
 
     Parameters
     ----------
     S : csr_matrix
+    copy : bool
+        If False, S is scaled in place
 
     Returns
     -------
@@ -1842,7 +1848,7 @@ def scale_rows_by_largest_entry(S):
 
     largest_row_entry[largest_row_entry != 0] =\
         1.0 / largest_row_entry[largest_row_entry != 0]
-    S = scale_rows(S, largest_row_entry, copy=True)
+    S = scale_rows(S, largest_row_entry, copy=copy)
 
     return S
 
@@ -2192,6 +2198,613 @@ def truncate_rows(A, nz_per_row):
     return A
 
 
+def truncate_interpolation(P, trunc_factor=0.0, max_elements=0, Bc=None,
+                           num_threads=None):
+    """Truncate the rows of an interpolation operator.
+
+    Entries (blocks, if P is a BSR matrix) smaller in magnitude than
+    trunc_factor times the largest entry of the row are dropped, and at most
+    max_elements entries are kept in each row.  The kept entries are then
+    corrected so that P*Bc does not change, or the row sums if Bc is None.
+
+    Parameters
+    ----------
+    P : {csr_matrix, bsr_matrix}
+        Interpolation operator
+    trunc_factor : float
+        Relative drop tolerance in [0, 1]
+    max_elements : int
+        Maximum number of entries (blocks) per row, no limit if <= 0
+    Bc : {array, None}
+        Coarse near null-space modes, such that P*Bc is preserved.  If None,
+        the row sums of P are preserved.
+    num_threads : int, None
+        Number of threads, see get_num_threads
+
+    Returns
+    -------
+    P : {csr_matrix, bsr_matrix}
+        Truncated operator in the format of P
+
+    Notes
+    -----
+    If Bc is None and P is a real CSR matrix, the kept entries of each row
+    are scaled by a common factor.  Otherwise, the smallest correction (in
+    the 2-norm) of the kept entries that restores P*Bc is added, as in
+    energy minimization, see compute_BtBinv.
+
+    Examples
+    --------
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.util.utils import truncate_interpolation
+    >>> from scipy import array
+    >>> from scipy.sparse import csr_matrix
+    >>> P = csr_matrix(array([[0.6, 0.3, 0.1],
+    ...                       [0.0, 1.0, 0.0]]))
+    >>> truncate_interpolation(P, max_elements=2).toarray()
+    array([[0.66666667, 0.33333333, 0.        ],
+           [0.        , 1.        , 0.        ]])
+
+    """
+    if not (isspmatrix_csr(P) or isspmatrix_bsr(P)):
+        raise TypeError('expected csr_matrix or bsr_matrix for P')
+
+    if trunc_factor < 0 or trunc_factor > 1:
+        raise ValueError('trunc_factor must be in [0, 1]')
+
+    if trunc_factor == 0 and max_elements <= 0:
+        return P
+
+    num_threads = get_num_threads(num_threads)
+    real = P.dtype in [np.float32, np.float64]
+
+    if isspmatrix_csr(P) and Bc is None and real:
+        P = P.copy()
+        pyamg.amg_core.truncate_interpolation_rows(P.shape[0], P.indptr,
+                                                   P.data, trunc_factor,
+                                                   max_elements, num_threads)
+        P.eliminate_zeros()
+        return P
+
+    # select the entries (blocks) to keep by magnitude
+    Pformat = P.format
+    if isspmatrix_csr(P):
+        P = P.tobsr(blocksize=(1, 1))
+    R, C = P.blocksize
+    norms = np.sqrt(np.sum(np.abs(P.data.reshape(-1, R*C))**2, axis=1))
+    norms = np.ascontiguousarray(norms, dtype=np.float64)
+    num_rows = int(P.shape[0]/R)
+    pyamg.amg_core.truncate_interpolation_rows(num_rows, P.indptr, norms,
+                                               trunc_factor, max_elements,
+                                               num_threads)
+
+    keep = norms != 0
+    rows = np.repeat(np.arange(num_rows), np.diff(P.indptr))
+    counts = np.bincount(rows[keep], minlength=num_rows)
+    indptr = np.zeros_like(P.indptr)
+    np.cumsum(counts, out=indptr[1:])
+    Pt = bsr_matrix((P.data[keep].copy(), P.indices[keep], indptr),
+                    shape=P.shape)
+
+    # restore P*Bc with the smallest correction of each row
+    if Bc is None:
+        Bc = np.ones((P.shape[1], 1), dtype=P.dtype)
+    Bc = np.asarray(Bc)
+    BtBinv = compute_BtBinv(Bc, Pt)
+    UB = np.ravel(Pt * Bc - P * Bc)
+    pyamg.amg_core.satisfy_constraints_helper(R, C, num_rows,
+                                              Bc.shape[1],
+                                              np.conjugate(np.ravel(Bc)),
+                                              UB, np.ravel(BtBinv),
+                                              Pt.indptr, Pt.indices,
+                                              np.ravel(Pt.data))
+
+    return Pt.asformat(Pformat)
+
+
+def sparsify_operator(A, theta, b=None):
+    """Drop small off-diagonal entries of a coarse operator.
+
+    Non-Galerkin coarsening: the off-diagonal entries (blocks, if A is a BSR
+    matrix) with ||A_ij|| < theta * sqrt(m_i m_j) are removed and lumped into
+    the diagonal, such that A*b does not change.  m_i is the largest norm
+    of the off-diagonal entries of row i.
+
+    Parameters
+    ----------
+    A : {csr_matrix, bsr_matrix}
+        Square matrix, typically a Galerkin product
+    theta : float
+        Drop tolerance, nothing is dropped if theta <= 0
+    b : {array, None}
+        Vector with A*b preserved.  If None, the row sums of A are preserved.
+        Entries (blocks) coupling rows with b_i = 0 are not dropped.
+
+    Returns
+    -------
+    A : {csr_matrix, bsr_matrix}
+        Sparsified matrix in the format of A
+
+    Notes
+    -----
+    The drop criterion is symmetric and only the diagonal changes otherwise,
+    so that a symmetric A stays symmetric.  ||.|| is the Frobenius norm.
+
+    References
+    ----------
+    .. [1] Falgout, R. D., and Schroder, J. B., "Non-Galerkin coarse grids
+       for algebraic multigrid", SIAM Journal on Scientific Computing,
+       36 (2014), pp. C309--C334.
+
+    Examples
+    --------
+    >>> from pyamg.util.utils import sparsify_operator
+    >>> from scipy import array
+    >>> from scipy.sparse import csr_matrix
+    >>> A = csr_matrix(array([[ 2. , -1. ,  0.1],
+    ...                       [-1. ,  2. , -1. ],
+    ...                       [ 0.1, -1. ,  2. ]]))
+    >>> sparsify_operator(A, 0.2).toarray()
+    array([[ 2.1, -1. ,  0. ],
+           [-1. ,  2. , -1. ],
+           [ 0. , -1. ,  2.1]])
+
+    """
+    if not (isspmatrix_csr(A) or isspmatrix_bsr(A)):
+        raise TypeError('expected csr_matrix or bsr_matrix for A')
+
+    if theta <= 0:
+        return A
+
+    Aformat = A.format
+    if isspmatrix_csr(A):
+        A = A.tobsr(blocksize=(1, 1))
+    else:
+        A = A.copy()
+    R = A.blocksize[0]
+    num_rows = int(A.shape[0]/R)
+
+    if b is None:
+        b = np.ones(A.shape[0], dtype=A.dtype)
+    b = np.ravel(b).reshape(num_rows, R)
+
+    rows = np.repeat(np.arange(num_rows), np.diff(A.indptr))
+    cols = A.indices
+    norms = np.sqrt(np.sum(np.abs(A.data.reshape(-1, R*R))**2, axis=1))
+    offdiagonal = rows != cols
+    max_norms = np.zeros(num_rows)
+    np.maximum.at(max_norms, rows[offdiagonal], norms[offdiagonal])
+
+    # rows without a diagonal entry are not lumped into
+    lumpable = np.zeros(num_rows, dtype=bool)
+    lumpable[rows[~offdiagonal]] = True
+    lumpable &= np.all(b != 0, axis=1)
+    drop = offdiagonal & lumpable[rows] & lumpable[cols] & \
+        (norms < theta * np.sqrt(max_norms[rows] * max_norms[cols]))
+
+    # lump A_ij into the diagonal of A_ii, such that A_ij b_j = D b_i
+    lumped = np.zeros((num_rows, R), dtype=np.result_type(A.dtype, b.dtype))
+    np.add.at(lumped, rows[drop],
+              np.einsum('nij,nj->ni', A.data[drop], b[cols[drop]]))
+    lumped[lumpable] /= b[lumpable]
+    diagonal = np.where(~offdiagonal)[0]
+    diagonal = diagonal[np.unique(rows[diagonal], return_index=True)[1]]
+    r = np.arange(R)
+    A.data[diagonal[:, None], r, r] += lumped[rows[diagonal]]
+
+    keep = ~drop
+    counts = np.bincount(rows[keep], minlength=num_rows)
+    indptr = np.zeros_like(A.indptr)
+    np.cumsum(counts, out=indptr[1:])
+    A = bsr_matrix((A.data[keep], A.indices[keep], indptr), shape=A.shape)
+
+    return A.asformat(Aformat)
+
+
+def set_num_threads(num_threads=None):
+    """Set the default number of threads used by the amg_core kernels.
+
+    Parameters
+    ----------
+    num_threads : int, None
+        Number of threads.  If None, the default is restored, which is read
+        from the environment variable PYAMG_NUM_THREADS, or 1 if it is unset.
+
+    Returns
+    -------
+    Nothing, the default is changed for all subsequent calls.
+
+    Notes
+    -----
+    The threaded kernels (e.g., Jacobi relaxation and sparse matrix-vector
+    products) give bitwise identical results for any number of threads.
+    If amg_core was built without OpenMP, the kernels always run serially.
+
+    Examples
+    --------
+    >>> from pyamg.util.utils import set_num_threads, get_num_threads
+    >>> set_num_threads(4)
+    >>> print(get_num_threads())
+    4
+    >>> set_num_threads()
+
+    """
+    global _num_threads
+    if num_threads is not None:
+        num_threads = get_num_threads(num_threads)
+    _num_threads = num_threads
+
+
+def get_num_threads(num_threads=None):
+    """Return the number of threads to be used by the amg_core kernels.
+
+    Parameters
+    ----------
+    num_threads : int, None
+        Requested number of threads.  If None, the default set with
+        set_num_threads is returned, or if that is unset, the value of the
+        environment variable PYAMG_NUM_THREADS, or 1.
+
+    Returns
+    -------
+    num_threads : int
+        Number of threads, at least 1
+
+    Examples
+    --------
+    >>> from pyamg.util.utils import get_num_threads
+    >>> print(get_num_threads(2))
+    2
+
+    """
+    if num_threads is None:
+        num_threads = _num_threads
+    if num_threads is None:
+        num_threads = os.environ.get('PYAMG_NUM_THREADS', 1)
+
+    try:
+        num_threads = int(num_threads)
+    except ValueError:
+        raise ValueError('invalid number of threads: %s' % num_threads)
+    if num_threads < 1:
+        raise ValueError('number of threads must be positive')
+
+    return num_threads
+
+
+def _has_kernel(M, x):
+    """Check if the amg_core kernels can be applied to M and x directly.
+
+    M may be read-only, e.g., memory-mapped by load_hierarchy.  The entries
+    of x are addressed with the index type of M.
+    """
+    return isspmatrix(M) and M.format in ('csr', 'csc', 'bsr') and\
+        M.dtype == x.dtype and _index_dtype(M) is not None and\
+        M.indptr.dtype == M.indices.dtype and M.data.flags.c_contiguous and\
+        M.data.flags.aligned and x.ndim in (1, 2) and x.flags.c_contiguous and\
+        x.size <= np.iinfo(M.indptr.dtype).max
+
+
+def _columns(x):
+    """Return the number of columns k of an (n,) or (n,k) array.
+
+    The amg_core kernels take k as an argument, since the sizes of the
+    arrays are passed as int and n*k may exceed its range.
+    """
+    return 1 if x.ndim == 1 else x.shape[1]
+
+
+def _index_dtype(*matrices):
+    """Return the index type of the amg_core kernels for sparse matrices.
+
+    The kernels are instantiated for int and int64 indices.  If any of the
+    matrices has int64 indices, the index arrays of all matrices are used as
+    int64, otherwise as int.  None is returned for other index types.
+    """
+    index_dtypes = set()
+    for M in matrices:
+        index_dtypes.update([M.indptr.dtype, M.indices.dtype])
+    if not index_dtypes.issubset([np.dtype(np.intc), np.dtype(np.int64)]):
+        return None
+    if np.dtype(np.int64) in index_dtypes:
+        return np.dtype(np.int64)
+    return np.dtype(np.intc)
+
+
+def _common_index_type(*matrices):
+    """Return the matrices with index arrays of a common type.
+
+    scipy.sparse stores the indices of a matrix as int if they fit, so the
+    matrices passed to one amg_core kernel may mix int and int64 indices.
+    Matrices with narrower indices are replaced by shallow copies, which
+    share the data array, with int64 index arrays.  Matrices with an index
+    type not supported by the kernels are returned unchanged.
+    """
+    index_dtype = _index_dtype(*matrices)
+    if index_dtype is None:
+        return list(matrices)
+    result = []
+    for M in matrices:
+        if M.indptr.dtype != index_dtype or M.indices.dtype != index_dtype:
+            M = copy.copy(M)
+            M.indptr = M.indptr.astype(index_dtype)
+            M.indices = M.indices.astype(index_dtype)
+        result.append(M)
+    return result
+
+
+def _matvec(M, x, y, num_threads=None):
+    """Accumulate y += M*x in place.
+
+    CSR, CSC and BSR matrices are handled by amg_core without temporaries.
+    Other operators fall back to M*x.  For (n,k) arrays x and y, all k
+    columns are handled in a single pass over M.  CSR and BSR products
+    are split by rows over num_threads threads, see get_num_threads.
+
+    """
+    if not (_has_kernel(M, x) and _has_kernel(M, y)):
+        y += np.asarray(M * x).reshape(y.shape)
+    elif M.format == 'csr':
+        pyamg.amg_core.csr_matvec(M.shape[0], M.shape[1], M.indptr,
+                                  M.indices, M.data, np.ravel(x), np.ravel(y),
+                                  _columns(x), get_num_threads(num_threads))
+    elif M.format == 'csc':
+        pyamg.amg_core.csc_matvec(M.shape[0], M.shape[1], M.indptr,
+                                  M.indices, M.data, np.ravel(x), np.ravel(y),
+                                  _columns(x))
+    else:
+        R, C = M.blocksize
+        pyamg.amg_core.bsr_matvec(int(M.shape[0]/R), int(M.shape[1]/C), R, C,
+                                  M.indptr, M.indices, np.ravel(M.data),
+                                  np.ravel(x), np.ravel(y), _columns(x),
+                                  get_num_threads(num_threads))
+
+
+def _residual(A, x, b, r, num_threads=None):
+    """Compute r = b - A*x in place.
+
+    CSR and BSR matrices are handled by amg_core without temporaries, split
+    by rows over num_threads threads.  Other operators fall back to b - A*x.
+
+    """
+    if not (_has_kernel(A, x) and _has_kernel(A, b) and _has_kernel(A, r)):
+        r[:] = (b - np.asarray(A * x).reshape(b.shape)).reshape(r.shape)
+    elif A.format == 'csr':
+        pyamg.amg_core.csr_residual(A.shape[0], A.shape[1], A.indptr,
+                                    A.indices, A.data, np.ravel(x),
+                                    np.ravel(b), np.ravel(r), _columns(x),
+                                    get_num_threads(num_threads))
+    elif A.format == 'bsr':
+        R, C = A.blocksize
+        pyamg.amg_core.bsr_residual(int(A.shape[0]/R), int(A.shape[1]/C),
+                                    R, C, A.indptr, A.indices,
+                                    np.ravel(A.data), np.ravel(x),
+                                    np.ravel(b), np.ravel(r), _columns(x),
+                                    get_num_threads(num_threads))
+    else:
+        r[:] = b
+        r *= -1
+        _matvec(A, x, r, num_threads)
+        r *= -1
+
+
+def threaded_operator(A, num_threads=None):
+    """Return a LinearOperator whose products with vectors are threaded.
+
+    Parameters
+    ----------
+    A : {csr_matrix, bsr_matrix, other}
+        Sparse matrix or operator
+    num_threads : int, None
+        Number of threads used by the products.  If None, get_num_threads
+        is used at the time of each product.
+
+    Returns
+    -------
+    A : {LinearOperator, other}
+        For CSR and BSR matrices, a LinearOperator whose products A*x are
+        computed by _matvec, i.e., by the csr_matvec and bsr_matvec kernels
+        of amg_core.  Other operators are returned unchanged.
+
+    Notes
+    -----
+    The threaded products give bitwise identical results for any number of
+    threads.  Products with a dtype or an index type not supported by
+    amg_core fall back to scipy.sparse.  The operator references A, so
+    later changes to the entries of A are seen by the products.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.util.utils import threaded_operator
+    >>> A = poisson((10, 10), format='csr')
+    >>> T = threaded_operator(A, num_threads=2)
+    >>> x = np.random.rand(A.shape[0])
+    >>> print(np.abs(T*x - A*x).max())
+    0.0
+
+    """
+    if not (isspmatrix_csr(A) or isspmatrix_bsr(A)):
+        return A
+    if num_threads is not None:
+        num_threads = get_num_threads(num_threads)
+
+    def matmat(x):
+        x = np.ascontiguousarray(x)
+        y = np.zeros((A.shape[0],) + x.shape[1:],
+                     dtype=np.result_type(A.dtype, x.dtype))
+        _matvec(A, x, y, num_threads)
+        return y
+
+    def rmatvec(x):
+        return A.H * x
+
+    return LinearOperator(A.shape, matvec=matmat, rmatvec=rmatvec,
+                          matmat=matmat, dtype=A.dtype)
+
+
+def _galerkin_blocks(M, index_dtype=np.intc):
+    """Return the index and data arrays and the blocksize of a CSR/BSR M."""
+    indptr = M.indptr.astype(index_dtype, copy=False)
+    indices = M.indices.astype(index_dtype, copy=False)
+    if isspmatrix_csr(M):
+        return indptr, indices, M.data, (1, 1)
+    return indptr, indices, np.ravel(M.data), M.blocksize
+
+
+def _pattern_transpose(M, index_dtype=np.intc):
+    """Return the block row pointer and column indices of M.T."""
+    indptr, indices, data, (R, C) = _galerkin_blocks(M, index_dtype)
+    pattern = csr_matrix((np.ones(len(indices), dtype=bool), indices, indptr),
+                         shape=(int(M.shape[0]/R), int(M.shape[1]/C)))
+    pattern = pattern.T.tocsr()
+    return (pattern.indptr.astype(index_dtype, copy=False),
+            pattern.indices.astype(index_dtype, copy=False))
+
+
+def galerkin_product(A, P, R=None, hermitian=True, pattern=None,
+                     num_threads=None):
+    """Compute the Galerkin product R*A*P.
+
+    Parameters
+    ----------
+    A : {csr_matrix, bsr_matrix}
+        Square matrix
+    P : {csr_matrix, bsr_matrix}
+        Prolongation operator
+    R : {csr_matrix, bsr_matrix, None}
+        Restriction operator.  If None, then R = P.H (or P.T), which is
+        never formed.
+    hermitian : bool
+        If R is None, use R = P.H if True and R = P.T if False
+    pattern : {csr_matrix, bsr_matrix, None}
+        A previous Galerkin product of operators with the same sparsity
+        patterns.  Its index arrays are shared with the result, so that only
+        the numerical values are computed.  If None, the pattern is computed.
+        ValueError is raised if the pattern misses entries of R*A*P.
+    num_threads : int, None
+        Number of threads, see get_num_threads
+
+    Returns
+    -------
+    C : {csr_matrix, bsr_matrix}
+        R*A*P, with sorted indices.  C is a CSR matrix if the operators are
+        CSR matrices, otherwise C is a BSR matrix.
+
+    Notes
+    -----
+    The product is computed in a symbolic phase, which yields the sparsity
+    pattern of R*A*P, followed by a numeric phase.  Neither computes R*A.
+    With R = P.T, the numeric phase scatters the rows of A*P and is serial,
+    otherwise the rows of C are split over the threads.
+
+    The index arrays may be int or int64.  If the operators mix the two, the
+    product is computed with int64 indices, and C keeps int64 index arrays,
+    so that C can be passed as pattern without a copy.  Operators with
+    other formats, dtypes or index types, or with inconsistent blocksizes,
+    are multiplied with scipy.sparse.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pyamg.gallery import poisson
+    >>> from pyamg.classical import direct_interpolation
+    >>> from pyamg.classical.split import RS
+    >>> from pyamg.strength import classical_strength_of_connection
+    >>> from pyamg.util.utils import galerkin_product
+    >>> A = poisson((10, 10), format='csr')
+    >>> C = classical_strength_of_connection(A)
+    >>> P = direct_interpolation(A, C, RS(C))
+    >>> Ac = galerkin_product(A, P)
+    >>> print(abs(Ac - P.T * A * P).max() < 1e-14)
+    True
+    >>> Ac = galerkin_product(2.0 * A, P, pattern=Ac)
+
+    """
+    ptap = R is None
+    operators = [A, P] if ptap else [A, P, R]
+
+    dtype = np.dtype(upcast(*[M.dtype for M in operators]))
+    supported = dtype.char in 'fdFD' and\
+        all([isspmatrix_csr(M) or isspmatrix_bsr(M) for M in operators])
+    if supported:
+        index_dtype = _index_dtype(*operators)
+        supported = index_dtype is not None
+
+    if supported:
+        Ap, Aj, Ax, (AB, AB2) = _galerkin_blocks(A, index_dtype)
+        Pp, Pj, Px, (PB1, PB) = _galerkin_blocks(P, index_dtype)
+        if ptap:
+            RB, RB2 = PB, PB1
+        else:
+            Rp, Rj, Rx, (RB, RB2) = _galerkin_blocks(R, index_dtype)
+        supported = AB == AB2 == PB1 == RB2
+
+    if not supported:
+        if ptap:
+            R = P.H if hermitian else P.T
+        return R * A * P
+
+    num_threads = get_num_threads(num_threads)
+    n_row = int(A.shape[0]/AB)
+    n_col = int(P.shape[1]/PB)
+    if ptap:
+        n_coarse = n_col
+    else:
+        n_coarse = int(R.shape[0]/RB)
+
+    if pattern is not None:
+        if not ((isspmatrix_csr(pattern) or isspmatrix_bsr(pattern)) and
+                pattern.shape == (n_coarse * RB, n_col * PB) and
+                _galerkin_blocks(pattern)[3] == (RB, PB)):
+            raise ValueError('pattern does not match the shape of R*A*P')
+        if not (_index_dtype(pattern) is not None and
+                pattern.has_sorted_indices):
+            pattern = None
+
+    if pattern is None:
+        if ptap:
+            Rp, Rj = _pattern_transpose(P, index_dtype)
+        Cp = np.empty(n_coarse + 1, dtype=index_dtype)
+        pyamg.amg_core.rap_symbolic_pass1(n_coarse, n_col, Rp, Rj, Ap, Aj,
+                                          Pp, Pj, Cp, num_threads)
+        Cj = np.empty(Cp[-1], dtype=index_dtype)
+        pyamg.amg_core.rap_symbolic_pass2(n_coarse, n_col, Rp, Rj, Ap, Aj,
+                                          Pp, Pj, Cp, Cj, num_threads)
+    else:
+        Cp = pattern.indptr.astype(index_dtype, copy=False)
+        Cj = pattern.indices.astype(index_dtype, copy=False)
+
+    Cx = np.empty((len(Cj), RB, PB), dtype=dtype)
+    Ax = np.asarray(Ax, dtype=dtype)
+    Px = np.asarray(Px, dtype=dtype)
+    if ptap:
+        missing = pyamg.amg_core.bsr_ptap_numeric(n_row, n_col, Ap, Aj, Ax,
+                                                  Pp, Pj, Px, Cp, Cj,
+                                                  np.ravel(Cx), AB, PB,
+                                                  int(hermitian))
+    else:
+        Rx = np.asarray(Rx, dtype=dtype)
+        missing = pyamg.amg_core.bsr_rap_numeric(n_coarse, n_col, Rp, Rj, Rx,
+                                                 Ap, Aj, Ax, Pp, Pj, Px, Cp,
+                                                 Cj, np.ravel(Cx), RB, AB, PB,
+                                                 num_threads)
+    if missing:
+        raise ValueError('pattern does not contain the sparsity pattern '
+                         'of R*A*P')
+
+    shape = (n_coarse * RB, n_col * PB)
+    if all([isspmatrix_csr(M) for M in operators]):
+        C = csr_matrix((Cx.reshape(-1), Cj, Cp), shape=shape, copy=False)
+    else:
+        C = bsr_matrix((Cx, Cj, Cp), shape=shape, copy=False)
+    # scipy.sparse narrows int64 index arrays to int if the indices fit
+    C.indptr, C.indices = Cp, Cj
+    C.has_sorted_indices = True
+    return C
+
+
 # from functools import partial, update_wrapper
 # def dispatcher(name_to_handle):
 #    def dispatcher(arg):
@@ -0,0 +1,9 @@
+
+# THIS FILE IS GENERATED FROM SETUP.PY
+short_version = '4.0.0'
+version = '4.0.0'
+full_version = '4.0.0'
+git_revision = '5ef6662a3132e3deebb2893bcac1ea70a73ccd58'
+release = True
+if not release:
+    version = full_version
@@ -31,8 +31,8 @@ version = '4.0.0'
 isreleased = True
 
 install_requires = (
-    'numpy>=1.7.0',
-    'scipy>=0.12.0',
+    'numpy>=1.11.0',
+    'scipy>=0.13.0',
     'pytest>=2',
 )
 
@@ -193,6 +193,12 @@ class BuildExt(build_ext):
             c_opts.append(cpp_flag(self.compiler))
             if has_flag(self.compiler, '-fvisibility=hidden'):
                 c_opts.append('-fvisibility=hidden')
+            # OpenMP is optional, without it the kernels run serially
+            if has_flag(self.compiler, '-fopenmp'):
+                c_opts.append('-fopenmp')
+                l_opts.append('-fopenmp')
+        elif ct == 'msvc':
+            c_opts.append('/openmp')
 
         for ext in self.extensions:
             ext.extra_compile_args = c_opts